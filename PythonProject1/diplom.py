@@ -5,18 +5,27 @@ from PyQt5.QtWidgets import (
     QLabel, QLineEdit, QPushButton, QComboBox, QTabWidget,
     QFormLayout, QMessageBox, QGroupBox, QDoubleSpinBox,
     QSpinBox, QAction, QTextEdit, QFileDialog,
-    QDialog, QTableWidget, QTableWidgetItem, QDialogButtonBox, QInputDialog, QGridLayout  # Добавленные импорты
+    QDialog, QTableWidget, QTableWidgetItem, QDialogButtonBox, QGridLayout,  # Добавленные импорты
+    QProgressBar, QCheckBox, QScrollArea
 )
-from PyQt5.QtGui import QTextDocument
-from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QTextDocument, QColor
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from PyQt5.QtPrintSupport import QPrinter, QPrintDialog
-import math
 from fpdf import FPDF
 import datetime
+import time
 import os
 import csv  # Добавьте в импорты
+import itertools
+import functools
+import json
 import sqlite3
+import shutil
+import tempfile
 from sqlite3 import Error
+import numpy as np
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
 
 
 
@@ -25,6 +34,7 @@ class DatabaseManager:
         self.db_file = db_file
         self.create_connection()
         self.create_tables()
+        self.create_catalog_tables()
 
     def create_connection(self):
         """ Создает соединение с базой данных SQLite """
@@ -88,6 +98,357 @@ class DatabaseManager:
             print(f"Ошибка сохранения отчета: {e}")
             return None
 
+    def create_catalog_tables(self):
+        """ Создает таблицы каталогов деталей с индексами """
+        sql_statements = [
+            """
+            CREATE TABLE IF NOT EXISTS spring_catalog (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                part_number TEXT NOT NULL,
+                manufacturer TEXT,
+                rate REAL NOT NULL,
+                free_length REAL,
+                inner_diameter REAL
+            );
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_spring_rate ON spring_catalog(rate);",
+            "CREATE INDEX IF NOT EXISTS idx_spring_part ON spring_catalog(part_number);",
+            """
+            CREATE TABLE IF NOT EXISTS damper_catalog (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                part_number TEXT NOT NULL,
+                manufacturer TEXT,
+                bump_coef REAL NOT NULL,
+                rebound_coef REAL NOT NULL,
+                mean_coef REAL NOT NULL
+            );
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_damper_mean ON damper_catalog(mean_coef);",
+            "CREATE INDEX IF NOT EXISTS idx_damper_part ON damper_catalog(part_number);",
+            """
+            CREATE TABLE IF NOT EXISTS damper_points (
+                damper_id INTEGER NOT NULL REFERENCES damper_catalog(id),
+                velocity REAL NOT NULL,
+                force REAL NOT NULL
+            );
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_damper_points ON damper_points(damper_id, velocity);",
+            """
+            CREATE TABLE IF NOT EXISTS injector_catalog (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                part_number TEXT NOT NULL,
+                manufacturer TEXT,
+                flow REAL NOT NULL,
+                ref_pressure REAL NOT NULL,
+                dead_time REAL,
+                flow_3bar REAL NOT NULL
+            );
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_injector_flow ON injector_catalog(flow_3bar);",
+            """
+            CREATE TABLE IF NOT EXISTS pump_catalog (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                part_number TEXT NOT NULL,
+                manufacturer TEXT,
+                max_flow REAL NOT NULL,
+                max_pressure REAL NOT NULL
+            );
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_pump_flow ON pump_catalog(max_flow);",
+            """
+            CREATE TABLE IF NOT EXISTS pump_points (
+                pump_id INTEGER NOT NULL REFERENCES pump_catalog(id),
+                pressure REAL NOT NULL,
+                flow REAL NOT NULL
+            );
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_pump_points ON pump_points(pump_id, pressure);",
+            """
+            CREATE TABLE IF NOT EXISTS piston_catalog (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                part_number TEXT NOT NULL,
+                manufacturer TEXT,
+                bore REAL NOT NULL,
+                compression_height REAL NOT NULL,
+                volume REAL NOT NULL
+            );
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_piston_bore ON piston_catalog(bore);",
+            """
+            CREATE TABLE IF NOT EXISTS gasket_catalog (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                part_number TEXT NOT NULL,
+                manufacturer TEXT,
+                bore REAL NOT NULL,
+                thickness REAL NOT NULL
+            );
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_gasket_bore ON gasket_catalog(bore);",
+            """
+            CREATE TABLE IF NOT EXISTS head_catalog (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                part_number TEXT NOT NULL,
+                manufacturer TEXT,
+                chamber_volume REAL NOT NULL
+            );
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_head_chamber ON head_catalog(chamber_volume);"
+        ]
+        try:
+            c = self.conn.cursor()
+            for sql in sql_statements:
+                c.execute(sql)
+            self.conn.commit()
+        except Error as e:
+            print(f"Ошибка создания таблиц каталога: {e}")
+
+    def add_springs(self, springs):
+        """ Добавляет пружины: (артикул, производитель, жесткость Н/мм, свободная длина мм, внутр. диаметр мм) """
+        sql = '''INSERT INTO spring_catalog(part_number, manufacturer, rate, free_length, inner_diameter)
+                 VALUES(?,?,?,?,?)'''
+        try:
+            c = self.conn.cursor()
+            c.executemany(sql, springs)
+            self.conn.commit()
+            return c.rowcount
+        except Error as e:
+            print(f"Ошибка добавления пружин: {e}")
+            return 0
+
+    def add_dampers(self, dampers):
+        """ Добавляет амортизаторы: (артикул, производитель, [(скорость м/с, сила Н), ...])
+
+        Скорость сжатия положительна, отбоя - отрицательна. Для поиска по
+        индексу сохраняются коэффициенты сжатия и отбоя (наклон прямой
+        через ноль по методу наименьших квадратов) и их среднее.
+        """
+        try:
+            c = self.conn.cursor()
+            for part_number, manufacturer, points in dampers:
+                bump_coef, rebound_coef = damper_coefficients(points)
+                c.execute('''INSERT INTO damper_catalog(part_number, manufacturer, bump_coef, rebound_coef, mean_coef)
+                             VALUES(?,?,?,?,?)''',
+                          (part_number, manufacturer, bump_coef, rebound_coef, (bump_coef + rebound_coef) / 2))
+                damper_id = c.lastrowid
+                c.executemany('INSERT INTO damper_points(damper_id, velocity, force) VALUES(?,?,?)',
+                              [(damper_id, float(v), float(f)) for v, f in points])
+            self.conn.commit()
+            return len(dampers)
+        except Error as e:
+            print(f"Ошибка добавления амортизаторов: {e}")
+            return 0
+
+    def add_injectors(self, injectors):
+        """ Добавляет форсунки: (артикул, производитель, производительность г/мин,
+        давление, при котором она указана, бар, мертвое время мс)
+
+        Для поиска по индексу сохраняется производительность, приведенная
+        к 3 бар по квадратичному закону.
+        """
+        sql = '''INSERT INTO injector_catalog(part_number, manufacturer, flow, ref_pressure, dead_time, flow_3bar)
+                 VALUES(?,?,?,?,?,?)'''
+        try:
+            c = self.conn.cursor()
+            c.executemany(sql, [(part, maker, flow, ref_pressure, dead_time, flow * np.sqrt(3.0 / ref_pressure))
+                                for part, maker, flow, ref_pressure, dead_time in injectors])
+            self.conn.commit()
+            return c.rowcount
+        except Error as e:
+            print(f"Ошибка добавления форсунок: {e}")
+            return 0
+
+    def add_pumps(self, pumps):
+        """ Добавляет топливные насосы: (артикул, производитель, [(давление бар, подача л/ч), ...]) """
+        try:
+            c = self.conn.cursor()
+            for part_number, manufacturer, points in pumps:
+                points = sorted((float(pressure), float(flow)) for pressure, flow in points)
+                c.execute('''INSERT INTO pump_catalog(part_number, manufacturer, max_flow, max_pressure)
+                             VALUES(?,?,?,?)''',
+                          (part_number, manufacturer, max(f for _, f in points), points[-1][0]))
+                pump_id = c.lastrowid
+                c.executemany('INSERT INTO pump_points(pump_id, pressure, flow) VALUES(?,?,?)',
+                              [(pump_id, pressure, flow) for pressure, flow in points])
+            self.conn.commit()
+            return len(pumps)
+        except Error as e:
+            print(f"Ошибка добавления насосов: {e}")
+            return 0
+
+    def fuel_catalog_size(self):
+        """ Количество форсунок и насосов в каталоге """
+        try:
+            c = self.conn.cursor()
+            injectors = c.execute('SELECT COUNT(*) FROM injector_catalog').fetchone()[0]
+            pumps = c.execute('SELECT COUNT(*) FROM pump_catalog').fetchone()[0]
+            return injectors, pumps
+        except Error as e:
+            print(f"Ошибка чтения каталога: {e}")
+            return 0, 0
+
+    def injectors_in_range(self, min_flow, max_flow):
+        """ Форсунки с приведенной к 3 бар производительностью в диапазоне (по индексу idx_injector_flow) """
+        try:
+            c = self.conn.cursor()
+            return c.execute('''SELECT id, part_number, manufacturer, flow, ref_pressure, dead_time
+                                FROM injector_catalog WHERE flow_3bar BETWEEN ? AND ? ORDER BY flow_3bar''',
+                             (min_flow, max_flow)).fetchall()
+        except Error as e:
+            print(f"Ошибка поиска форсунок: {e}")
+            return []
+
+    def pump_curves(self, min_flow):
+        """ Характеристики насосов с максимальной подачей не ниже min_flow (л/ч)
+
+        Возвращает строки (id, артикул, производитель, давление, подача),
+        упорядоченные по насосу и давлению.
+        """
+        try:
+            c = self.conn.cursor()
+            return c.execute('''SELECT p.id, p.part_number, p.manufacturer, pt.pressure, pt.flow
+                                FROM pump_catalog p JOIN pump_points pt ON pt.pump_id = p.id
+                                WHERE p.max_flow >= ? ORDER BY p.id, pt.pressure''', (min_flow,)).fetchall()
+        except Error as e:
+            print(f"Ошибка поиска насосов: {e}")
+            return []
+
+    # Таблицы и столбцы каталога деталей двигателя
+    ENGINE_PARTS = {
+        'pistons': ('piston_catalog', ('bore', 'compression_height', 'volume')),
+        'gaskets': ('gasket_catalog', ('bore', 'thickness')),
+        'heads': ('head_catalog', ('chamber_volume',))
+    }
+
+    def add_engine_parts(self, kind, parts):
+        """ Добавляет детали двигателя: kind - 'pistons', 'gaskets' или 'heads'
+
+        Поршни: (артикул, производитель, диаметр мм, компрессионная высота мм,
+        объем выборки см³ - купол отрицательный), прокладки: (артикул,
+        производитель, диаметр отверстия мм, толщина в сжатом состоянии мм),
+        головки: (артикул, производитель, объем камеры сгорания см³).
+        """
+        table, columns = self.ENGINE_PARTS[kind]
+        sql = (f"INSERT INTO {table}(part_number, manufacturer, {', '.join(columns)}) "
+               f"VALUES({','.join('?' * (len(columns) + 2))})")
+        try:
+            c = self.conn.cursor()
+            c.executemany(sql, parts)
+            self.conn.commit()
+            return c.rowcount
+        except Error as e:
+            print(f"Ошибка добавления деталей двигателя: {e}")
+            return 0
+
+    def engine_parts_size(self):
+        """ Количество поршней, прокладок и головок в каталоге """
+        try:
+            c = self.conn.cursor()
+            return tuple(c.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                         for table, _ in self.ENGINE_PARTS.values())
+        except Error as e:
+            print(f"Ошибка чтения каталога: {e}")
+            return 0, 0, 0
+
+    def engine_parts(self, kind, min_bore=None, max_bore=None):
+        """ Детали двигателя (id, артикул, производитель, параметры...)
+
+        Поршни и прокладки отбираются по диаметру (по индексу), головки
+        возвращаются упорядоченными по объему камеры.
+        """
+        table, columns = self.ENGINE_PARTS[kind]
+        sql = f"SELECT id, part_number, manufacturer, {', '.join(columns)} FROM {table}"
+        try:
+            c = self.conn.cursor()
+            if kind == 'heads':
+                return c.execute(sql + ' ORDER BY chamber_volume').fetchall()
+            return c.execute(sql + ' WHERE bore BETWEEN ? AND ? ORDER BY bore', (min_bore, max_bore)).fetchall()
+        except Error as e:
+            print(f"Ошибка поиска деталей двигателя: {e}")
+            return []
+
+    def catalog_size(self):
+        """ Количество пружин и амортизаторов в каталоге """
+        try:
+            c = self.conn.cursor()
+            springs = c.execute('SELECT COUNT(*) FROM spring_catalog').fetchone()[0]
+            dampers = c.execute('SELECT COUNT(*) FROM damper_catalog').fetchone()[0]
+            return springs, dampers
+        except Error as e:
+            print(f"Ошибка чтения каталога: {e}")
+            return 0, 0
+
+    def nearest_springs(self, target_rate, count=5, min_length=None, max_length=None):
+        """ Ближайшие по жесткости пружины
+
+        Два запроса по индексу idx_spring_rate - вверх и вниз от целевой
+        жесткости - возвращают не более count кандидатов с каждой стороны,
+        поэтому время поиска не зависит от размера каталога.
+        """
+        conditions, params = [], []
+        if min_length is not None:
+            conditions.append('free_length >= ?')
+            params.append(min_length)
+        if max_length is not None:
+            conditions.append('free_length <= ?')
+            params.append(max_length)
+        extra = ''.join(f' AND {condition}' for condition in conditions)
+        columns = 'id, part_number, manufacturer, rate, free_length, inner_diameter'
+        try:
+            c = self.conn.cursor()
+            above = c.execute(f'SELECT {columns} FROM spring_catalog WHERE rate >= ?{extra} '
+                              f'ORDER BY rate LIMIT ?', [target_rate] + params + [count]).fetchall()
+            below = c.execute(f'SELECT {columns} FROM spring_catalog WHERE rate < ?{extra} '
+                              f'ORDER BY rate DESC LIMIT ?', [target_rate] + params + [count]).fetchall()
+            return sorted(above + below, key=lambda row: abs(row[3] - target_rate))[:count]
+        except Error as e:
+            print(f"Ошибка поиска пружин: {e}")
+            return []
+
+    def nearest_dampers(self, target_bump, target_rebound, count=5, window=50):
+        """ Ближайшие амортизаторы по коэффициентам сжатия и отбоя
+
+        Кандидаты выбираются по индексу среднего коэффициента (window
+        записей с каждой стороны), затем ранжируются по относительному
+        отклонению обоих коэффициентов.
+        """
+        target_mean = (target_bump + target_rebound) / 2
+        columns = 'id, part_number, manufacturer, bump_coef, rebound_coef, mean_coef'
+        try:
+            c = self.conn.cursor()
+            above = c.execute(f'SELECT {columns} FROM damper_catalog WHERE mean_coef >= ? '
+                              f'ORDER BY mean_coef LIMIT ?', (target_mean, window)).fetchall()
+            below = c.execute(f'SELECT {columns} FROM damper_catalog WHERE mean_coef < ? '
+                              f'ORDER BY mean_coef DESC LIMIT ?', (target_mean, window)).fetchall()
+
+            def distance(row):
+                return np.hypot((row[3] - target_bump) / target_bump, (row[4] - target_rebound) / target_rebound)
+
+            return sorted(above + below, key=distance)[:count]
+        except Error as e:
+            print(f"Ошибка поиска амортизаторов: {e}")
+            return []
+
+    def find_damper(self, part_number):
+        """ Идентификатор амортизатора по артикулу (None, если не найден) """
+        try:
+            c = self.conn.cursor()
+            row = c.execute('SELECT id FROM damper_catalog WHERE part_number = ? LIMIT 1',
+                            (part_number,)).fetchone()
+            return row[0] if row else None
+        except Error as e:
+            print(f"Ошибка поиска амортизатора: {e}")
+            return None
+
+    def damper_curve(self, damper_id):
+        """ Точки характеристики амортизатора (скорость, сила), упорядоченные по скорости """
+        try:
+            c = self.conn.cursor()
+            return c.execute('SELECT velocity, force FROM damper_points WHERE damper_id = ? ORDER BY velocity',
+                             (damper_id,)).fetchall()
+        except Error as e:
+            print(f"Ошибка чтения характеристики амортизатора: {e}")
+            return []
+
     def get_history(self, limit=10):
         """ Получает историю расчетов """
         sql = '''SELECT * FROM calculations ORDER BY timestamp DESC LIMIT ?'''
@@ -106,6 +467,3764 @@ class DatabaseManager:
 
 
 
+# ==================== РАСЧЕТНЫЕ МОДЕЛИ ====================
+# Формулы вкладок вынесены в отдельные функции: они принимают как отдельные
+# числа, так и массивы NumPy, поэтому одни и те же формулы используются
+# и в обработчиках кнопок, и в исследованиях по плану эксперимента.
+
+def engine_efficiency_model(power_hp, fuel_consumption, fuel_energy):
+    """Эффективный КПД двигателя (%) по мощности и часовому расходу топлива"""
+    power_kw = power_hp * 0.7355
+    fuel_energy_kj = fuel_consumption * fuel_energy * 1000
+    efficiency = (power_kw * 3600) / fuel_energy_kj
+    return {'efficiency': efficiency * 100}
+
+
+def engine_mep_model(displacement, torque):
+    """Среднее эффективное давление по рабочему объему (см³) и моменту"""
+    mep = (2 * np.pi * torque * 4) / (displacement / 1e6)
+    mep_bar = mep / 1e5
+    return {'mep_bar': mep_bar, 'mep_kgcm2': mep_bar / 10.197}
+
+
+def engine_power_model(torque, rpm):
+    """Мощность по крутящему моменту и оборотам"""
+    power_hp = (torque * rpm) / 7024
+    return {'power_hp': power_hp, 'power_kw': power_hp * 0.7355}
+
+
+def engine_air_flow_model(displacement, rpm, volumetric_efficiency):
+    """Расход воздуха двигателем (объем в литрах)"""
+    air_density = 1.2  # кг/м³
+    # л/с · кг/м³ = г/с, переводим в кг/ч
+    return {'air_flow': (displacement * rpm * volumetric_efficiency * air_density) / 120 * 3.6}
+
+
+def charge_air_model(boost, ambient_pressure=101.325, ambient_temp=20.0, compressor_efficiency=0.72,
+                     intercooler_efficiency=0.75, pressure_drop=0.0):
+    """Давление, температура и плотность заряда во впуске
+
+    boost - избыточное давление во впуске (кПа, отрицательное - разрежение),
+    pressure_drop - потери давления в интеркулере (кПа, только при наддуве).
+    Нагрев в компрессоре - по адиабатическому КПД, охлаждение в интеркулере
+    - по его эффективности относительно температуры окружающего воздуха.
+    """
+    manifold_pressure = ambient_pressure + np.asarray(boost, dtype=float)
+    outlet_pressure = manifold_pressure + np.where(manifold_pressure > ambient_pressure, pressure_drop, 0.0)
+    pressure_ratio = np.maximum(outlet_pressure / ambient_pressure, 1.0)
+    inlet_temp = ambient_temp + 273.15
+    outlet_temp = inlet_temp * (1 + (pressure_ratio ** (0.4 / 1.4) - 1) / compressor_efficiency)
+    charge_temp = outlet_temp - intercooler_efficiency * (outlet_temp - inlet_temp)
+    return {
+        'pressure_ratio': pressure_ratio,
+        'manifold_pressure': manifold_pressure,
+        'compressor_outlet_temp': outlet_temp - 273.15,
+        'charge_temperature': charge_temp - 273.15,
+        'density': manifold_pressure * 1000 / (287.05 * charge_temp)
+    }
+
+
+def engine_compression_model(cylinder_volume, chamber_volume):
+    """Геометрическая степень сжатия"""
+    return {'compression_ratio': (cylinder_volume + chamber_volume) / chamber_volume}
+
+
+def gear_speed_model(gear_ratio, final_drive, tire_diameter, redline_rpm):
+    """Скорость на передаче при максимальных оборотах (диаметр колеса в мм)"""
+    wheel_circumference = np.pi * tire_diameter / 1000
+    speed_ms = (redline_rpm * wheel_circumference) / (gear_ratio * final_drive * 60)
+    return {'speed': speed_ms * 3.6}
+
+
+def gear_ratio_model(rpm1, speed1, rpm2, speed2):
+    """Передаточное отношение по двум парам обороты/скорость"""
+    return {'calculated_ratio': (rpm1 * speed2) / (rpm2 * speed1)}
+
+
+def transmission_efficiency_model(engine_power, wheel_power):
+    """КПД трансмиссии (%)"""
+    return {'efficiency': (wheel_power / engine_power) * 100}
+
+
+def traction_force_model(torque, gear_ratio, final_drive, tire_radius):
+    """Тяговая сила на колесах: F = T * i * η / r, η ≈ 0.9"""
+    traction_force = (torque * gear_ratio * final_drive * 0.9) / tire_radius
+    return {'traction_force': traction_force, 'equivalent_force': traction_force / 9.81}
+
+
+def acceleration_model(weight, power, drag_coef, frontal_area):
+    """Удельная мощность, максимальная скорость и разгон 0-100 км/ч"""
+    rho = 1.225  # Плотность воздуха кг/м3
+    specific_power = (power * 1000) / (weight * 9.81)
+    max_speed = (2 * power * 735.5 / (rho * drag_coef * frontal_area)) ** (1 / 3)
+    t_0_100 = 2.5 * np.sqrt(weight / (power * 0.7))
+    return {
+        'specific_power': specific_power,
+        'max_speed': max_speed * 3.6,
+        'acceleration_0_100': t_0_100
+    }
+
+
+def shift_points_model(rpm, gear_ratio, final_drive, tire_radius):
+    """Обороты и скорость переключения (на 10% выше оборотов максимума)"""
+    shift_rpm = rpm * 1.1
+    speed = (shift_rpm * 60 * 2 * np.pi * tire_radius) / (gear_ratio * final_drive * 1000) * 3.6
+    return {'optimal_rpm': shift_rpm, 'speed': speed}
+
+
+def brake_torque_model(piston_count, piston_diameter, disc_diameter, pad_coef, pressure):
+    """Тормозной момент одного механизма (диаметры в мм, давление в бар)"""
+    piston_area = np.pi * ((piston_diameter / 1000) ** 2) / 4
+    normal_force = pressure * 1e5 * piston_area * piston_count
+    effective_radius = 0.4 * (disc_diameter / 1000 / 2)  # Эффективный радиус
+    return {
+        'brake_torque': normal_force * pad_coef * effective_radius,
+        'friction_force': normal_force * pad_coef
+    }
+
+
+def stopping_distance_model(speed, weight, road_coef, front_percent):
+    """Тормозной путь S = v² / (2 * μ * g) и нагрузки на оси"""
+    speed_mps = speed / 3.6
+    front_fraction = front_percent / 100
+    # Учитываем перераспределение веса при торможении (примерно 30% смещение)
+    front_load = weight * 9.81 * (front_fraction + 0.3)
+    rear_load = weight * 9.81 * ((1 - front_fraction) - 0.3)
+    deceleration = road_coef * 9.81
+    return {
+        'front_load': front_load,
+        'rear_load': rear_load,
+        'stopping_distance': (speed_mps ** 2) / (2 * road_coef * 9.81),
+        'stopping_time': speed_mps / deceleration,
+        'deceleration': deceleration / 9.81
+    }
+
+
+def brake_balance_model(front_percent, brake_torque, weight):
+    """Распределение тормозных сил и эмпирически оптимальный баланс"""
+    front_fraction = front_percent / 100
+    return {
+        'front_force': brake_torque * front_fraction,
+        'rear_force': brake_torque * (1 - front_fraction),
+        'optimal_percent': (0.6 + (weight - 1000) * 0.0001) * 100
+    }
+
+
+def brake_temperature_model(speed, weight, disc_diameter, disc_thickness):
+    """Адиабатический нагрев диска за одно торможение (размеры в мм)"""
+    speed_mps = speed / 3.6
+    kinetic_energy = 0.5 * weight * (speed_mps ** 2)
+    # Предположим, что 90% энергии переходит в тепло
+    heat_energy = kinetic_energy * 0.9
+    # Плотность чугуна ~7200 кг/м³, теплоемкость ~500 Дж/(кг·K)
+    disc_volume = np.pi * (disc_diameter / 1000 / 2) ** 2 * (disc_thickness / 1000)
+    disc_mass = disc_volume * 7200
+    return {
+        'kinetic_energy': kinetic_energy / 1000,
+        'heat_energy': heat_energy / 1000,
+        'temperature_rise': heat_energy / (disc_mass * 500)
+    }
+
+
+def wheel_rate_model(spring_rate, motion_ratio, preload):
+    """Жесткость, приведенная к колесу, и сила предварительного натяга"""
+    return {
+        'wheel_rate': spring_rate * (motion_ratio ** 2),
+        'force_at_ride': spring_rate * preload * motion_ratio
+    }
+
+
+def suspension_frequency_model(weight, corner_weight, wheel_rate):
+    """Собственная частота подвески (жесткость колеса в Н/мм)"""
+    wheel_rate_nm = wheel_rate * 1000
+    return {
+        'frequency': (1 / (2 * np.pi)) * np.sqrt(wheel_rate_nm / (weight * 9.81)),
+        'ride_height_change': (corner_weight * 9.81) / wheel_rate_nm * 1000
+    }
+
+
+def damping_model(rebound, bump, crit_damping):
+    """Коэффициенты отбоя/сжатия и средний коэффициент демпфирования"""
+    rebound_coeff = rebound / crit_damping
+    bump_coeff = bump / crit_damping
+    return {
+        'rebound_coeff': rebound_coeff,
+        'bump_coeff': bump_coeff,
+        'damping_ratio': (rebound_coeff + bump_coeff) / 2
+    }
+
+
+def kinematics_model(arm_length, pivot_height):
+    """Упрощенная высота мгновенного центра"""
+    return {'instant_center_height': pivot_height + arm_length * 0.5}
+
+
+def fuel_system_flow_model(injector_count, injector_flow, pressure, temperature, system_factor):
+    """Производительность топливной системы с поправками на давление и температуру"""
+    temp_correction = 1 + (temperature - 20) * 0.001
+    corrected_flow = injector_flow * np.sqrt(pressure / 3.0) * temp_correction * system_factor
+    total_flow = corrected_flow * injector_count
+    return {
+        'corrected_flow': corrected_flow,
+        'total_flow': total_flow,
+        'flow_per_second': total_flow / 60
+    }
+
+
+def injector_duty_model(power, bsfc, rpm, total_flow):
+    """Цикл впрыска по мощности и производительности системы (г/мин)"""
+    required_flow = (power * bsfc) / 3600 * 1000  # г/сек
+    duty_cycle = (required_flow / (total_flow / 60)) * 100
+    cycle_time = 60 / rpm * 1000  # время цикла в мс
+    return {
+        'duty_cycle': duty_cycle,
+        'injector_open_time': cycle_time * duty_cycle / 100,
+        'required_volume': required_flow * 3600
+    }
+
+
+# Мертвое время форсунки (мс) в зависимости от напряжения бортовой сети (В)
+INJECTOR_DEAD_TIME = "8:1.90, 10:1.35, 12:1.00, 13:0.90, 14:0.80, 15:0.72, 16:0.65"
+
+
+def injector_pulse_map(rpm, torque, bsfc, total_flow, dead_time):
+    """Время впрыска и цикл с учетом мертвого времени форсунки
+
+    rpm и torque - массивы рабочих точек (об/мин, Н·м), bsfc - кг/(л.с.*час)
+    (число или массив той же формы), total_flow - производительность системы
+    (г/мин), dead_time - мертвое время (мс). Время цикла, как и в
+    injector_duty_model, отсчитывается за один оборот.
+    """
+    power = rpm * torque / 9549 / 0.7355
+    duty = injector_duty_model(power, bsfc, rpm, total_flow)
+    effective_time = np.maximum(duty['injector_open_time'], 0.0)
+    pulse_width = np.where(effective_time > 0, effective_time + dead_time, 0.0)
+    return {
+        'effective_time': effective_time,
+        'pulse_width': pulse_width,
+        'duty_cycle': pulse_width / (60 / rpm * 1000) * 100
+    }
+
+
+# Свойства топлив: стехиометрическое соотношение воздух/топливо (по массе),
+# низшая теплота сгорания (МДж/кг) и плотность (кг/л)
+FUEL_PROPERTIES = {
+    'gasoline': {'title': 'Бензин', 'afr': 14.7, 'lhv': 42.7, 'density': 0.745},
+    'diesel': {'title': 'Дизель', 'afr': 14.5, 'lhv': 43.4, 'density': 0.832},
+    'ethanol': {'title': 'Этанол', 'afr': 9.0, 'lhv': 26.8, 'density': 0.789},
+    'methanol': {'title': 'Метанол', 'afr': 6.45, 'lhv': 19.9, 'density': 0.792}
+}
+
+
+def fuel_properties(fuel, ethanol_share=0.0):
+    """AFR, теплота сгорания и плотность топлива
+
+    fuel - ключ FUEL_PROPERTIES или 'blend' - бензин-этанольная смесь с
+    объемной долей этанола ethanol_share (%, число или массив: E0-E100).
+    Плотность смеси складывается по объему, AFR и теплота сгорания - по
+    массовой доле этанола.
+    """
+    if fuel != 'blend':
+        props = FUEL_PROPERTIES[fuel]
+        return {key: props[key] for key in ('afr', 'lhv', 'density')}
+    gasoline, ethanol = FUEL_PROPERTIES['gasoline'], FUEL_PROPERTIES['ethanol']
+    volume = np.clip(np.asarray(ethanol_share, dtype=float), 0, 100) / 100
+    density = volume * ethanol['density'] + (1 - volume) * gasoline['density']
+    mass = volume * ethanol['density'] / density
+    return {
+        'afr': mass * ethanol['afr'] + (1 - mass) * gasoline['afr'],
+        'lhv': mass * ethanol['lhv'] + (1 - mass) * gasoline['lhv'],
+        'density': density
+    }
+
+
+def fuel_injector_duty_model(power, bsfc, rpm, total_flow, fuel, ethanol_share=0.0):
+    """Цикл впрыска для выбранного топлива
+
+    Удельный расход bsfc и производительность total_flow заданы для
+    бензина: при том же КПД массовый расход топлива растет обратно
+    теплоте сгорания, а массовая производительность форсунки - как корень
+    из плотности.
+    """
+    props = fuel_properties(fuel, ethanol_share)
+    gasoline = FUEL_PROPERTIES['gasoline']
+    return injector_duty_model(power, bsfc * gasoline['lhv'] / props['lhv'], rpm,
+                               total_flow * np.sqrt(props['density'] / gasoline['density']))
+
+
+def fuel_optimization_model(target_duty, required_volume, total_flow):
+    """Оптимальная производительность и давление по квадратичному закону"""
+    optimal_flow = (required_volume / 3600 * 100) / target_duty * 60
+    return {
+        'optimal_flow': optimal_flow,
+        'optimal_pressure': 3.0 * (optimal_flow / total_flow) ** 2
+    }
+
+
+# Описание моделей для исследований: ключи совпадают с типами расчетов,
+# которые сохраняются через save_calculation
+CALCULATION_MODELS = {
+    'engine_efficiency': {
+        'title': 'КПД двигателя',
+        'function': engine_efficiency_model,
+        'inputs': [
+            ('power_hp', 'Мощность (л.с.)', 150.0),
+            ('fuel_consumption', 'Расход топлива (кг/ч)', 35.0),
+            ('fuel_energy', 'Теплота сгорания (МДж/кг)', 42.7)
+        ],
+        'outputs': [('efficiency', 'Эффективный КПД (%)')]
+    },
+    'engine_mep': {
+        'title': 'Среднее эффективное давление',
+        'function': engine_mep_model,
+        'inputs': [
+            ('displacement', 'Рабочий объем (см³)', 2000.0),
+            ('torque', 'Крутящий момент (Н·м)', 200.0)
+        ],
+        'outputs': [
+            ('mep_bar', 'Среднее эффективное давление (бар)'),
+            ('mep_kgcm2', 'Среднее эффективное давление (кгс/см²)')
+        ]
+    },
+    'engine_power': {
+        'title': 'Мощность двигателя',
+        'function': engine_power_model,
+        'inputs': [
+            ('torque', 'Крутящий момент (Н·м)', 200.0),
+            ('rpm', 'Обороты (об/мин)', 5500.0)
+        ],
+        'outputs': [
+            ('power_hp', 'Мощность (л.с.)'),
+            ('power_kw', 'Мощность (кВт)')
+        ]
+    },
+    'engine_air_flow': {
+        'title': 'Расход воздуха',
+        'function': engine_air_flow_model,
+        'inputs': [
+            ('displacement', 'Объем двигателя (л)', 2.0),
+            ('rpm', 'Обороты (об/мин)', 6000.0),
+            ('volumetric_efficiency', 'КПД наполнения', 0.85)
+        ],
+        'outputs': [('air_flow', 'Расход воздуха (кг/ч)')]
+    },
+    'engine_compression': {
+        'title': 'Степень сжатия',
+        'function': engine_compression_model,
+        'inputs': [
+            ('cylinder_volume', 'Объем цилиндра (см³)', 500.0),
+            ('chamber_volume', 'Объем камеры сгорания (см³)', 50.0)
+        ],
+        'outputs': [('compression_ratio', 'Степень сжатия')]
+    },
+    'transmission_gear_speeds': {
+        'title': 'Скорости на передачах',
+        'function': gear_speed_model,
+        'inputs': [
+            ('gear_ratio', 'Передаточное число', 1.0),
+            ('final_drive', 'Главная передача', 4.1),
+            ('tire_diameter', 'Диаметр колеса (мм)', 630.0),
+            ('redline_rpm', 'Максимальные обороты (об/мин)', 6500.0)
+        ],
+        'outputs': [('speed', 'Скорость (км/ч)')]
+    },
+    'transmission_ratio_calculation': {
+        'title': 'Расчет передаточного отношения',
+        'function': gear_ratio_model,
+        'inputs': [
+            ('rpm1', 'Обороты 1 (об/мин)', 3000.0),
+            ('speed1', 'Скорость 1 (км/ч)', 60.0),
+            ('rpm2', 'Обороты 2 (об/мин)', 3000.0),
+            ('speed2', 'Скорость 2 (км/ч)', 90.0)
+        ],
+        'outputs': [('calculated_ratio', 'Расчетное передаточное число')]
+    },
+    'transmission_efficiency': {
+        'title': 'КПД трансмиссии',
+        'function': transmission_efficiency_model,
+        'inputs': [
+            ('engine_power', 'Мощность двигателя (л.с.)', 150.0),
+            ('wheel_power', 'Мощность на колесах (л.с.)', 130.0)
+        ],
+        'outputs': [('efficiency', 'КПД трансмиссии (%)')]
+    },
+    'traction_force': {
+        'title': 'Тяговая сила',
+        'function': traction_force_model,
+        'inputs': [
+            ('torque', 'Крутящий момент (Н·м)', 200.0),
+            ('gear_ratio', 'Передаточное число', 3.5),
+            ('final_drive', 'Главная передача', 4.1),
+            ('tire_radius', 'Радиус колеса (м)', 0.33)
+        ],
+        'outputs': [
+            ('traction_force', 'Тяговая сила (Н)'),
+            ('equivalent_force', 'Эквивалентная сила (кгс)')
+        ]
+    },
+    'acceleration': {
+        'title': 'Разгонная динамика',
+        'function': acceleration_model,
+        'inputs': [
+            ('weight', 'Масса (кг)', 1300.0),
+            ('power', 'Мощность (л.с.)', 150.0),
+            ('drag_coef', 'Коэффициент аэродинамического сопротивления', 0.35),
+            ('frontal_area', 'Лобовая площадь (м²)', 2.2)
+        ],
+        'outputs': [
+            ('specific_power', 'Удельная мощность (кВт/т)'),
+            ('max_speed', 'Максимальная скорость (км/ч)'),
+            ('acceleration_0_100', 'Разгон 0-100 км/ч (с)')
+        ]
+    },
+    'shift_points': {
+        'title': 'Точки переключения',
+        'function': shift_points_model,
+        'inputs': [
+            ('rpm', 'Обороты (об/мин)', 5500.0),
+            ('gear_ratio', 'Передаточное число', 3.5),
+            ('final_drive', 'Главная передача', 4.1),
+            ('tire_radius', 'Радиус колеса (м)', 0.33)
+        ],
+        'outputs': [
+            ('optimal_rpm', 'Оптимальные обороты (об/мин)'),
+            ('speed', 'Скорость (км/ч)')
+        ]
+    },
+    'brake_torque': {
+        'title': 'Тормозной момент',
+        'function': brake_torque_model,
+        'inputs': [
+            ('piston_count', 'Количество поршней', 4.0),
+            ('piston_diameter', 'Диаметр поршня (мм)', 40.0),
+            ('disc_diameter', 'Диаметр диска (мм)', 300.0),
+            ('pad_coef', 'Коэффициент трения колодок', 0.4),
+            ('pressure', 'Давление в системе (бар)', 80.0)
+        ],
+        'outputs': [
+            ('brake_torque', 'Тормозной момент (Н·м)'),
+            ('friction_force', 'Сила трения (Н)')
+        ]
+    },
+    'stopping_distance': {
+        'title': 'Тормозной путь',
+        'function': stopping_distance_model,
+        'inputs': [
+            ('speed', 'Скорость (км/ч)', 100.0),
+            ('weight', 'Масса (кг)', 1300.0),
+            ('road_coef', 'Коэффициент сцепления с дорогой', 0.8),
+            ('front_percent', 'Передние тормоза (%)', 60.0)
+        ],
+        'outputs': [
+            ('stopping_distance', 'Тормозной путь (м)'),
+            ('stopping_time', 'Время торможения (с)'),
+            ('deceleration', 'Замедление (g)'),
+            ('front_load', 'Нагрузка на переднюю ось (Н)'),
+            ('rear_load', 'Нагрузка на заднюю ось (Н)')
+        ]
+    },
+    'brake_balance': {
+        'title': 'Баланс тормозов',
+        'function': brake_balance_model,
+        'inputs': [
+            ('front_percent', 'Передние тормоза (%)', 60.0),
+            ('brake_torque', 'Тормозной момент (Н·м)', 1500.0),
+            ('weight', 'Масса (кг)', 1300.0)
+        ],
+        'outputs': [
+            ('front_force', 'Сила на передних тормозах (Н·м)'),
+            ('rear_force', 'Сила на задних тормозах (Н·м)'),
+            ('optimal_percent', 'Оптимальный баланс (%)')
+        ]
+    },
+    'brake_temperature': {
+        'title': 'Нагрев тормозов',
+        'function': brake_temperature_model,
+        'inputs': [
+            ('speed', 'Скорость (км/ч)', 100.0),
+            ('weight', 'Масса (кг)', 1300.0),
+            ('disc_diameter', 'Диаметр диска (мм)', 300.0),
+            ('disc_thickness', 'Толщина диска (мм)', 25.0)
+        ],
+        'outputs': [
+            ('kinetic_energy', 'Кинетическая энергия (кДж)'),
+            ('heat_energy', 'Тепловая энергия (кДж)'),
+            ('temperature_rise', 'Рост температуры (°C)')
+        ]
+    },
+    'suspension_wheel_rate': {
+        'title': 'Жесткость подвески',
+        'function': wheel_rate_model,
+        'inputs': [
+            ('spring_rate', 'Жесткость пружины (Н/мм)', 50.0),
+            ('motion_ratio', 'Коэффициент рычага', 1.0),
+            ('preload', 'Предварительная нагрузка (мм)', 0.0)
+        ],
+        'outputs': [
+            ('wheel_rate', 'Эффективная жесткость колеса (Н/мм)'),
+            ('force_at_ride', "Сила в положении 'покоя' (Н)")
+        ]
+    },
+    'suspension_frequency': {
+        'title': 'Частота подвески',
+        'function': suspension_frequency_model,
+        'inputs': [
+            ('weight', 'Масса на колесо (кг)', 300.0),
+            ('corner_weight', 'Нагрузка на колесо (кг)', 330.0),
+            ('wheel_rate', 'Эффективная жесткость колеса (Н/мм)', 30.0)
+        ],
+        'outputs': [
+            ('frequency', 'Частота подвески (Гц)'),
+            ('ride_height_change', 'Изменение клиренса (мм)')
+        ]
+    },
+    'suspension_damping': {
+        'title': 'Демпфирование подвески',
+        'function': damping_model,
+        'inputs': [
+            ('rebound', 'Скорость отбоя (мм/с)', 300.0),
+            ('bump', 'Скорость сжатия (мм/с)', 200.0),
+            ('crit_damping', 'Критическое демпфирование', 1000.0)
+        ],
+        'outputs': [
+            ('rebound_coeff', 'Коэффициент отбоя'),
+            ('bump_coeff', 'Коэффициент сжатия'),
+            ('damping_ratio', 'Коэффициент демпфирования')
+        ]
+    },
+    'suspension_kinematics': {
+        'title': 'Кинематика подвески',
+        'function': kinematics_model,
+        'inputs': [
+            ('arm_length', 'Длина рычага (мм)', 350.0),
+            ('pivot_height', 'Высота оси вращения (мм)', 200.0)
+        ],
+        'outputs': [('instant_center_height', 'Высота мгновенного центра (мм)')]
+    },
+    'fuel_system_flow': {
+        'title': 'Производительность топливной системы',
+        'function': fuel_system_flow_model,
+        'inputs': [
+            ('injector_count', 'Количество форсунок', 4.0),
+            ('injector_flow', 'Производительность форсунки (г/мин)', 250.0),
+            ('pressure', 'Давление в системе (бар)', 3.0),
+            ('temperature', 'Температура (°C)', 20.0),
+            ('system_factor', 'Коэффициент типа системы', 1.0)
+        ],
+        'outputs': [
+            ('corrected_flow', 'Производительность форсунки с поправками (г/мин)'),
+            ('total_flow', 'Общий расход топлива (г/мин)'),
+            ('flow_per_second', 'Расход топлива в секунду (г/сек)')
+        ]
+    },
+    'injector_duty': {
+        'title': 'Время впрыска',
+        'function': injector_duty_model,
+        'inputs': [
+            ('power', 'Мощность (л.с.)', 150.0),
+            ('bsfc', 'Удельный расход топлива (кг/(л.с.*час))', 0.45),
+            ('rpm', 'Обороты (об/мин)', 6000.0),
+            ('total_flow', 'Общий расход топлива (г/мин)', 1000.0)
+        ],
+        'outputs': [
+            ('duty_cycle', 'Цикл впрыска (%)'),
+            ('injector_open_time', 'Время открытия форсунки (мс)'),
+            ('required_volume', 'Требуемый объем топлива (г/час)')
+        ]
+    },
+    'fuel_optimization': {
+        'title': 'Оптимизация топливной системы',
+        'function': fuel_optimization_model,
+        'inputs': [
+            ('target_duty', 'Целевой цикл впрыска (%)', 80.0),
+            ('required_volume', 'Требуемый объем топлива (г/час)', 67500.0),
+            ('total_flow', 'Общий расход топлива (г/мин)', 1000.0)
+        ],
+        'outputs': [
+            ('optimal_flow', 'Оптимальный расход топлива (г/мин)'),
+            ('optimal_pressure', 'Оптимальное давление (бар)')
+        ]
+    }
+}
+
+
+def evaluate_model(calc_type, values):
+    """Вычисляет модель для словаря входов (числа или массивы одинаковой длины)"""
+    model = CALCULATION_MODELS[calc_type]
+    args = [values[key] if key in values else default for key, _, default in model['inputs']]
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        return model['function'](*args)
+
+
+# ==================== ПЛАН ЭКСПЕРИМЕНТА И ИССЛЕДОВАНИЯ ====================
+SWEEP_DESIGNS = {
+    'full_factorial': 'Полный факторный',
+    'latin_hypercube': 'Латинский гиперкуб',
+    'random': 'Случайный'
+}
+
+
+class ParameterSweep:
+    """План эксперимента для одной расчетной модели с поблочной генерацией точек
+
+    variables - словарь {ключ входа: массив уровней}. Для полного факторного
+    плана уровни перебираются целиком, для гиперкуба и случайного плана
+    значения выбираются на отрезке [min, max] (или из списка, если
+    continuous[ключ] = False). Входы без вариации берутся из fixed.
+    """
+
+    def __init__(self, calc_type, variables, fixed=None, design='full_factorial',
+                 n_points=1000, continuous=None, seed=None, chunk_size=100000):
+        if calc_type not in CALCULATION_MODELS:
+            raise ValueError(f"Неизвестный тип расчета: {calc_type}")
+        if design not in SWEEP_DESIGNS:
+            raise ValueError(f"Неизвестный план эксперимента: {design}")
+
+        self.calc_type = calc_type
+        self.model = CALCULATION_MODELS[calc_type]
+        self.variables = {k: np.asarray(v, dtype=float) for k, v in variables.items()}
+        self.fixed = dict(fixed or {})
+        self.design = design
+        self.continuous = continuous or {k: True for k in self.variables}
+        self.chunk_size = int(chunk_size)
+        self.rng = np.random.default_rng(seed)
+
+        if design == 'full_factorial':
+            self.shape = tuple(len(v) for v in self.variables.values())
+            self.size = int(np.prod(self.shape)) if self.shape else 1
+        else:
+            self.size = int(n_points)
+            self.shape = None
+
+        # Для гиперкуба храним только перестановки страт (int32), сами точки
+        # генерируются поблочно
+        if design == 'latin_hypercube':
+            self._strata = [self.rng.permutation(self.size).astype(np.int32)
+                            for _ in self.variables]
+
+    @property
+    def input_keys(self):
+        return [key for key, _, _ in self.model['inputs']]
+
+    @property
+    def output_keys(self):
+        return [key for key, _ in self.model['outputs']]
+
+    def _scale(self, key, u):
+        """Переводит равномерные числа u ∈ [0, 1) в значения входа"""
+        levels = self.variables[key]
+        if self.continuous.get(key, True):
+            return levels.min() + u * (levels.max() - levels.min())
+        index = np.minimum((u * len(levels)).astype(np.int64), len(levels) - 1)
+        return levels[index]
+
+    def chunk_inputs(self, start, stop):
+        """Значения входов для точек плана с номерами [start, stop)"""
+        count = stop - start
+        values = {}
+        if self.design == 'full_factorial':
+            if self.shape:
+                indices = np.unravel_index(np.arange(start, stop), self.shape)
+                for (key, levels), index in zip(self.variables.items(), indices):
+                    values[key] = levels[index]
+        elif self.design == 'latin_hypercube':
+            for (key, _), strata in zip(self.variables.items(), self._strata):
+                u = (strata[start:stop] + self.rng.random(count)) / self.size
+                values[key] = self._scale(key, u)
+        else:
+            for key in self.variables:
+                values[key] = self._scale(key, self.rng.random(count))
+
+        for key, _, default in self.model['inputs']:
+            if key not in values:
+                values[key] = np.full(count, float(self.fixed.get(key, default)))
+        return values
+
+    def chunks(self):
+        """Генератор блоков (входы, выходы) размером не более chunk_size"""
+        for start in range(0, self.size, self.chunk_size):
+            stop = min(start + self.chunk_size, self.size)
+            inputs = self.chunk_inputs(start, stop)
+            outputs = evaluate_model(self.calc_type, inputs)
+            count = stop - start
+            outputs = {k: np.broadcast_to(np.asarray(v, dtype=float), (count,))
+                       for k, v in outputs.items()}
+            yield inputs, outputs
+
+    def run(self, store, progress_callback=None, is_cancelled=None):
+        """Выполняет план, записывая результаты в колоночное хранилище"""
+        done = 0
+        for inputs, outputs in self.chunks():
+            if is_cancelled and is_cancelled():
+                break
+            store.append({**inputs, **outputs})
+            done += len(next(iter(outputs.values())))
+            if progress_callback:
+                progress_callback(int(done * 100 / self.size))
+        return store
+
+
+class SweepResultStore:
+    """Колоночное хранилище результатов исследования
+
+    Каждый столбец - отдельный массив float64. Для больших планов столбцы
+    размещаются в файлах .npy во временном каталоге (memory-map), поэтому
+    миллион точек не занимает оперативную память целиком.
+    """
+
+    MEMMAP_THRESHOLD = 200000
+
+    def __init__(self, columns, size):
+        self.columns = list(columns)
+        self.size = int(size)
+        self.count = 0
+        self._dir = None
+        self._data = {}
+
+        if self.size > self.MEMMAP_THRESHOLD:
+            self._dir = tempfile.mkdtemp(prefix="sweep_")
+            for name in self.columns:
+                path = os.path.join(self._dir, f"{name}.npy")
+                self._data[name] = np.lib.format.open_memmap(
+                    path, mode='w+', dtype=np.float64, shape=(self.size,))
+        else:
+            for name in self.columns:
+                self._data[name] = np.empty(self.size, dtype=np.float64)
+
+    def append(self, chunk):
+        """Дописывает блок значений {столбец: массив}"""
+        count = len(next(iter(chunk.values())))
+        if self.count + count > self.size:
+            raise ValueError("Хранилище результатов переполнено")
+        for name in self.columns:
+            self._data[name][self.count:self.count + count] = chunk[name]
+        self.count += count
+
+    def column(self, name):
+        """Заполненная часть столбца"""
+        return self._data[name][:self.count]
+
+    def rows(self, start, stop):
+        """Строки [start, stop) в виде списков значений по порядку столбцов"""
+        stop = min(stop, self.count)
+        block = np.column_stack([self._data[name][start:stop] for name in self.columns])
+        return block.tolist()
+
+    def sample_indices(self, max_points, seed=0):
+        """Случайная выборка номеров строк для построения графиков"""
+        if self.count <= max_points:
+            return np.arange(self.count)
+        rng = np.random.default_rng(seed)
+        return np.sort(rng.choice(self.count, size=max_points, replace=False))
+
+    def summary(self, chunk_size=200000):
+        """Минимум, среднее и максимум по каждому столбцу (поблочно)"""
+        result = {}
+        for name in self.columns:
+            total, finite_count = 0.0, 0
+            minimum, maximum = np.inf, -np.inf
+            for start in range(0, self.count, chunk_size):
+                block = self._data[name][start:min(start + chunk_size, self.count)]
+                block = block[np.isfinite(block)]
+                if block.size:
+                    total += block.sum()
+                    finite_count += block.size
+                    minimum = min(minimum, block.min())
+                    maximum = max(maximum, block.max())
+            mean = total / finite_count if finite_count else float('nan')
+            result[name] = (float(minimum), float(mean), float(maximum))
+        return result
+
+    def export_csv(self, file_name, chunk_size=100000):
+        """Экспорт результатов в CSV поблочно"""
+        with open(file_name, mode='w', newline='', encoding='utf-8-sig') as csv_file:
+            writer = csv.writer(csv_file, delimiter=';')
+            writer.writerow(self.columns)
+            for start in range(0, self.count, chunk_size):
+                writer.writerows(self.rows(start, start + chunk_size))
+
+    def close(self):
+        """Освобождает временные файлы"""
+        self._data = {}
+        if self._dir:
+            shutil.rmtree(self._dir, ignore_errors=True)
+            self._dir = None
+
+
+class CalculationWorker(QThread):
+    """Выполняет длительный расчет в отдельном потоке, не блокируя интерфейс
+
+    task - функция task(progress_callback, is_cancelled), результат которой
+    передается через сигнал result_ready.
+    """
+    progress = pyqtSignal(int)
+    result_ready = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, task, parent=None):
+        super().__init__(parent)
+        self.task = task
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def is_cancelled(self):
+        return self._cancelled
+
+    def run(self):
+        try:
+            result = self.task(self.progress.emit, self.is_cancelled)
+            self.result_ready.emit(result)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+# ==================== ЧУВСТВИТЕЛЬНОСТЬ И НЕОПРЕДЕЛЕННОСТЬ ====================
+INPUT_DISTRIBUTIONS = {
+    'normal': 'Нормальное',
+    'uniform': 'Равномерное',
+    'triangular': 'Треугольное',
+    'lognormal': 'Логнормальное'
+}
+
+# Типичный разброс неточно известных на практике входов (%)
+UNCERTAIN_INPUTS = {
+    'pad_coef': ('normal', 10.0),
+    'road_coef': ('normal', 10.0),
+    'volumetric_efficiency': ('normal', 5.0),
+    'bsfc': ('normal', 8.0)
+}
+
+
+def sample_distribution(rng, kind, nominal, spread, size):
+    """Выборка входа: spread - разброс в % от номинала
+
+    Для нормального и логнормального распределения разброс - это
+    коэффициент вариации, для равномерного и треугольного - полуширина.
+    """
+    width = abs(nominal) * spread / 100
+    if kind == 'normal':
+        return rng.normal(nominal, width, size)
+    if kind == 'uniform':
+        return rng.uniform(nominal - width, nominal + width, size)
+    if kind == 'triangular':
+        if width == 0:
+            return np.full(size, float(nominal))
+        return rng.triangular(nominal - width, nominal, nominal + width, size)
+    if kind == 'lognormal':
+        sigma = np.sqrt(np.log(1 + (spread / 100) ** 2))
+        return rng.lognormal(np.log(nominal) - sigma ** 2 / 2, sigma, size)
+    raise ValueError(f"Неизвестное распределение: {kind}")
+
+
+def sample_inputs(calc_type, distributions, size, rng, nominal=None):
+    """Матрица входов модели: случайные для входов с разбросом, остальные - номинал"""
+    values = {}
+    for key, _, default in CALCULATION_MODELS[calc_type]['inputs']:
+        if key in distributions:
+            kind, center, spread = distributions[key]
+            values[key] = sample_distribution(rng, kind, center, spread, size)
+        else:
+            values[key] = np.full(size, float((nominal or {}).get(key, default)))
+    return values
+
+
+def local_sensitivities(calc_type, nominal=None, rel_step=1e-3):
+    """Локальные чувствительности центральными разностями в номинальной точке
+
+    Возвращает {выход: {вход: (производная, эластичность)}}, где
+    эластичность - относительное изменение выхода на 1% изменения входа.
+    Все 2*d смещенных точек считаются одним векторным вызовом модели.
+    """
+    model = CALCULATION_MODELS[calc_type]
+    keys = [key for key, _, _ in model['inputs']]
+    base = np.array([float((nominal or {}).get(key, default)) for key, _, default in model['inputs']])
+
+    steps = rel_step * np.where(base != 0, np.abs(base), 1.0)
+    points = np.tile(base, (2 * len(keys) + 1, 1))
+    for i in range(len(keys)):
+        points[2 * i, i] += steps[i]
+        points[2 * i + 1, i] -= steps[i]
+
+    outputs = evaluate_model(calc_type, {key: points[:, i] for i, key in enumerate(keys)})
+
+    result = {}
+    for out_key, _ in model['outputs']:
+        y = np.broadcast_to(np.asarray(outputs[out_key], dtype=float), (len(points),))
+        y0 = y[-1]
+        result[out_key] = {}
+        for i, key in enumerate(keys):
+            derivative = (y[2 * i] - y[2 * i + 1]) / (2 * steps[i])
+            elasticity = derivative * base[i] / y0 if y0 != 0 else float('nan')
+            result[out_key][key] = (float(derivative), float(elasticity))
+    return result
+
+
+def sobol_indices(calc_type, distributions, n_samples=100000, nominal=None, seed=None,
+                  chunk_size=50000, progress_callback=None, is_cancelled=None):
+    """Глобальные индексы Соболя (первого порядка и полные)
+
+    Схема Сальтелли: матрицы A, B и A_B(i) генерируются поблочно, оценки
+    первого порядка - по Saltelli (2010), полные - по Jansen. Входы без
+    разброса в distributions считаются фиксированными. Суммы копятся
+    относительно среднего первого блока, чтобы дисперсия не терялась при
+    вычитании больших чисел. При отмене до первого блока возвращается
+    пустой словарь.
+    """
+    model = CALCULATION_MODELS[calc_type]
+    varied = [key for key, _, _ in model['inputs'] if key in distributions]
+    if not varied:
+        raise ValueError("Задайте разброс хотя бы для одного входа")
+    out_keys = [key for key, _ in model['outputs']]
+
+    rng = np.random.default_rng(seed)
+    sums = {k: {'shift': None, 'y': 0.0, 'y2': 0.0, 'first': np.zeros(len(varied)),
+                'total': np.zeros(len(varied))}
+            for k in out_keys}
+    count = 0
+
+    for start in range(0, n_samples, chunk_size):
+        if is_cancelled and is_cancelled():
+            break
+        size = min(chunk_size, n_samples - start)
+        a = sample_inputs(calc_type, distributions, size, rng, nominal)
+        b = sample_inputs(calc_type, distributions, size, rng, nominal)
+        y_a = evaluate_model(calc_type, a)
+        y_b = evaluate_model(calc_type, b)
+
+        for key in out_keys:
+            fa = np.broadcast_to(np.asarray(y_a[key], dtype=float), (size,))
+            fb = np.broadcast_to(np.asarray(y_b[key], dtype=float), (size,))
+            if sums[key]['shift'] is None:
+                sums[key]['shift'] = (fa.mean() + fb.mean()) / 2
+            da = fa - sums[key]['shift']
+            db = fb - sums[key]['shift']
+            sums[key]['y'] += da.sum() + db.sum()
+            sums[key]['y2'] += (da ** 2).sum() + (db ** 2).sum()
+
+        for i, var_key in enumerate(varied):
+            ab = dict(a)
+            ab[var_key] = b[var_key]
+            y_ab = evaluate_model(calc_type, ab)
+            for key in out_keys:
+                fa = np.broadcast_to(np.asarray(y_a[key], dtype=float), (size,))
+                fb = np.broadcast_to(np.asarray(y_b[key], dtype=float), (size,))
+                fab = np.broadcast_to(np.asarray(y_ab[key], dtype=float), (size,))
+                sums[key]['first'][i] += ((fb - sums[key]['shift']) * (fab - fa)).sum()
+                sums[key]['total'][i] += 0.5 * ((fa - fab) ** 2).sum()
+
+        count += size
+        if progress_callback:
+            progress_callback(int(count * 100 / n_samples))
+
+    if count == 0:
+        return {}
+
+    result = {}
+    for key in out_keys:
+        offset = sums[key]['y'] / (2 * count)
+        mean = sums[key]['shift'] + offset
+        variance = sums[key]['y2'] / (2 * count) - offset ** 2
+        result[key] = {}
+        for i, var_key in enumerate(varied):
+            if variance > 1e-12 * max(mean ** 2, 1.0):
+                first = sums[key]['first'][i] / count / variance
+                total = sums[key]['total'][i] / count / variance
+            else:
+                first = total = 0.0
+            result[key][var_key] = (float(first), float(total))
+    return result
+
+
+def monte_carlo(calc_type, distributions, n_samples=1000000, nominal=None, seed=None,
+                percentiles=(5, 50, 95), chunk_size=200000, progress_callback=None,
+                is_cancelled=None):
+    """Распространение неопределенности методом Монте-Карло
+
+    Возвращает {выход: {'mean', 'std', 'P5', 'P50', 'P95'}} по конечным
+    значениям выборки.
+    """
+    model = CALCULATION_MODELS[calc_type]
+    out_keys = [key for key, _ in model['outputs']]
+    rng = np.random.default_rng(seed)
+    samples = {key: np.empty(n_samples) for key in out_keys}
+    count = 0
+
+    for start in range(0, n_samples, chunk_size):
+        if is_cancelled and is_cancelled():
+            break
+        size = min(chunk_size, n_samples - start)
+        outputs = evaluate_model(calc_type, sample_inputs(calc_type, distributions, size, rng, nominal))
+        for key in out_keys:
+            samples[key][start:start + size] = outputs[key]
+        count += size
+        if progress_callback:
+            progress_callback(int(count * 100 / n_samples))
+
+    result = {}
+    for key in out_keys:
+        values = samples[key][:count]
+        values = values[np.isfinite(values)]
+        if not values.size:
+            continue
+        stats = {'mean': float(values.mean()), 'std': float(values.std())}
+        for p, value in zip(percentiles, np.percentile(values, percentiles)):
+            stats[f"P{p}"] = float(value)
+        result[key] = stats
+    return result
+
+
+# ==================== ДИНАМИЧЕСКОЕ ТОРМОЖЕНИЕ ====================
+def tire_friction(road_coef, speed_mps, locked):
+    """Коэффициент сцепления шины: снижение с ростом скорости и при блокировке
+
+    Пиковое сцепление падает на 2% на каждые 10 м/с (не ниже 70% от
+    номинала), коэффициент скольжения заблокированного колеса принят
+    равным 0.8 от пикового.
+    """
+    peak = road_coef * np.clip(1 - 0.002 * speed_mps, 0.7, 1.0)
+    return np.where(locked, 0.8 * peak, peak)
+
+
+def simulate_braking(speed, road_coef, front_percent, weight, brake_torque,
+                     tire_radius=0.31, cg_height=0.55, wheelbase=2.6, static_front=55.0,
+                     drag_coef=0.35, frontal_area=2.2, rolling_resist=0.015,
+                     ramp_time=0.2, dt=0.005, trace_interval=0.02, max_time=30.0):
+    """Пошаговое моделирование экстренного торможения
+
+    Все параметры могут быть массивами одинаковой (или совместимой) формы -
+    тогда моделируется сразу вся совокупность вариантов. brake_torque -
+    момент одного тормозного механизма при заданном давлении
+    (brake_torque_model), он распределяется по осям согласно балансу
+    front_percent. Давление нарастает линейно за ramp_time.
+
+    На каждом шаге учитываются перераспределение нагрузки по осям от
+    замедления, аэродинамическое сопротивление, сопротивление качению и
+    ограничение тормозной силы сцеплением (tire_friction). Ось, у которой
+    требуемая тормозная сила превышает пиковое сцепление, считается
+    заблокированной.
+
+    Возвращает словарь с итоговыми массивами (тормозной путь, время,
+    среднее замедление, момент блокировки осей) и прореженными по времени
+    траекториями ('time', 'speed', 'distance', 'deceleration').
+    """
+    g = 9.81
+    rho = 1.225
+    arrays = np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in (
+        speed, road_coef, front_percent, weight, brake_torque, tire_radius, cg_height,
+        wheelbase, static_front, drag_coef, frontal_area, rolling_resist)])
+    shape = arrays[0].shape
+    (speed, road_coef, front_percent, weight, brake_torque, tire_radius, cg_height,
+     wheelbase, static_front, drag_coef, frontal_area, rolling_resist) = [a.ravel() for a in arrays]
+
+    total_torque = 4 * brake_torque  # два механизма на каждой оси
+    front_capacity = total_torque * front_percent / 100 / tire_radius
+    rear_capacity = total_torque * (1 - front_percent / 100) / tire_radius
+    static_front_load = weight * g * static_front / 100
+    static_rear_load = weight * g - static_front_load
+    drag_factor = 0.5 * rho * drag_coef * frontal_area
+    rolling_force = rolling_resist * weight * g
+
+    v = speed / 3.6
+    x = np.zeros_like(v)
+    decel = np.zeros_like(v)
+    stop_time = np.where(v > 0, np.nan, 0.0)
+    front_lock_time = np.full(v.shape, np.nan)
+    rear_lock_time = np.full(v.shape, np.nan)
+
+    # Интегрируем только еще движущиеся варианты: остановившиеся
+    # исключаются из рабочего набора, чтобы не тратить на них время
+    active = np.flatnonzero(v > 0)
+    a_v = v[active]
+    a_x = np.zeros_like(a_v)
+    a_decel = np.zeros_like(a_v)
+
+    record_every = max(1, int(round(trace_interval / dt)))
+    times, speeds, distances, decels = [], [], [], []
+
+    steps = int(max_time / dt)
+    for step in range(steps + 1):
+        t = step * dt
+        if step % record_every == 0:
+            v[active], x[active], decel[active] = a_v, a_x, a_decel
+            times.append(t)
+            speeds.append(v * 3.6)
+            distances.append(x.copy())
+            decels.append(decel / g)
+        if not active.size:
+            break
+
+        # Перераспределение нагрузки от замедления предыдущего шага
+        transfer = weight[active] * a_decel * cg_height[active] / wheelbase[active]
+        front_load = np.maximum(static_front_load[active] + transfer, 0.0)
+        rear_load = np.maximum(static_rear_load[active] - transfer, 0.0)
+
+        ramp = min(t / ramp_time, 1.0) if ramp_time > 0 else 1.0
+        front_demand = front_capacity[active] * ramp
+        rear_demand = rear_capacity[active] * ramp
+
+        peak = tire_friction(road_coef[active], a_v, False)
+        front_locked = front_demand > peak * front_load
+        rear_locked = rear_demand > peak * rear_load
+        front_force = np.where(front_locked, 0.8 * peak * front_load, front_demand)
+        rear_force = np.where(rear_locked, 0.8 * peak * rear_load, rear_demand)
+
+        new_front = active[front_locked & np.isnan(front_lock_time[active])]
+        front_lock_time[new_front] = t
+        new_rear = active[rear_locked & np.isnan(rear_lock_time[active])]
+        rear_lock_time[new_rear] = t
+
+        a_decel = (front_force + rear_force + drag_factor[active] * a_v ** 2
+                   + rolling_force[active]) / weight[active]
+        new_v = a_v - a_decel * dt
+
+        # Момент остановки уточняем внутри шага
+        stopping = new_v <= 0
+        fraction = np.where(stopping, a_v / np.maximum(a_decel * dt, 1e-12), 1.0)
+        a_x = a_x + a_v * dt * fraction - 0.5 * a_decel * (dt * fraction) ** 2
+        a_v = new_v
+
+        if stopping.any():
+            stopped = active[stopping]
+            stop_time[stopped] = t + fraction[stopping] * dt
+            x[stopped] = a_x[stopping]
+            v[stopped] = 0.0
+            decel[stopped] = 0.0
+            keep = ~stopping
+            active, a_v, a_x, a_decel = active[keep], a_v[keep], a_x[keep], a_decel[keep]
+
+    # Не успевшие остановиться за max_time варианты
+    v[active], x[active] = a_v, a_x
+
+    initial = speed / 3.6
+    mean_decel = np.where(x > 0, initial ** 2 / (2 * np.maximum(x, 1e-12)) / g, 0.0)
+    return {
+        'stopping_distance': x.reshape(shape),
+        'stopping_time': stop_time.reshape(shape),
+        'mean_deceleration': mean_decel.reshape(shape),
+        'front_lock_time': front_lock_time.reshape(shape),
+        'rear_lock_time': rear_lock_time.reshape(shape),
+        'time': np.array(times),
+        'speed': np.stack(speeds, axis=-1).reshape(shape + (-1,)),
+        'distance': np.stack(distances, axis=-1).reshape(shape + (-1,)),
+        'deceleration': np.stack(decels, axis=-1).reshape(shape + (-1,))
+    }
+
+
+def braking_table(speeds, road_coefs, balances, **vehicle):
+    """Таблица торможения скорость × сцепление × баланс за один вызов
+
+    Результаты имеют форму (len(speeds), len(road_coefs), len(balances)).
+    """
+    speed, road_coef, balance = np.meshgrid(
+        np.asarray(speeds, dtype=float), np.asarray(road_coefs, dtype=float),
+        np.asarray(balances, dtype=float), indexing='ij')
+    return simulate_braking(speed, road_coef, balance, **vehicle)
+
+
+# ==================== ТЕПЛОВОЙ РЕЖИМ ТОРМОЗОВ ====================
+# Участки цикла: (вид, начальная скорость км/ч, конечная скорость км/ч,
+# значение, уклон %). Для 'brake' и 'accel' значение - замедление или
+# ускорение в g, для 'hold' - длительность участка в секундах.
+# Отрицательный уклон - спуск.
+BRAKE_CYCLES = {
+    'mountain_descent': {
+        'title': 'Спуск с перевала (серпантин, уклон 8%)',
+        'cycles': 30,
+        'segments': [
+            ('hold', 60, 60, 25.0, -8.0),
+            ('brake', 60, 30, 0.3, -8.0),
+            ('hold', 30, 30, 5.0, -8.0),
+            ('accel', 30, 60, 0.1, -8.0)
+        ]
+    },
+    'track_lap': {
+        'title': 'Круг по гоночной трассе',
+        'cycles': 15,
+        'segments': [
+            ('accel', 90, 220, 0.3, 0.0),
+            ('brake', 220, 90, 1.2, 0.0),
+            ('hold', 90, 90, 8.0, 0.0),
+            ('accel', 90, 180, 0.35, 0.0),
+            ('brake', 180, 70, 1.2, 0.0),
+            ('hold', 70, 70, 10.0, 0.0),
+            ('accel', 70, 160, 0.4, 0.0),
+            ('brake', 160, 110, 1.0, 0.0),
+            ('hold', 110, 110, 15.0, 0.0),
+            ('accel', 110, 200, 0.3, 0.0),
+            ('brake', 200, 60, 1.2, 0.0),
+            ('hold', 60, 60, 12.0, 0.0),
+            ('accel', 60, 90, 0.45, 0.0)
+        ]
+    },
+    'ams_fade': {
+        'title': 'Тест AMS (торможения 100-0 км/ч с разгоном)',
+        'cycles': 10,
+        'segments': [
+            ('brake', 100, 0, 1.0, 0.0),
+            ('hold', 0, 0, 2.0, 0.0),
+            ('accel', 0, 100, 0.35, 0.0)
+        ]
+    }
+}
+
+BRAKE_TEMPERATURE_LIMITS = (300.0, 600.0)  # деформация, потеря эффективности
+
+
+def brake_cycle_profile(segments, weight, drag_coef=0.35, frontal_area=2.2,
+                        rolling_resist=0.015, dt=0.1):
+    """Скорость и тормозная мощность автомобиля на одном цикле
+
+    Тормозная сила - это часть требуемого замедления, которую не дают
+    аэродинамика, качение и уклон. Возвращает массивы скорости (м/с) и
+    мощности торможения (Вт) с шагом dt.
+    """
+    g = 9.81
+    drag_factor = 0.5 * 1.225 * drag_coef * frontal_area
+    speeds, powers = [], []
+    for kind, v_start, v_end, value, grade in segments:
+        v1, v2 = v_start / 3.6, v_end / 3.6
+        if kind == 'hold':
+            duration, accel = value, 0.0
+        elif kind in ('brake', 'accel'):
+            accel = value * g
+            duration = abs(v1 - v2) / accel
+        else:
+            raise ValueError(f"Неизвестный участок цикла: {kind}")
+
+        steps = max(1, int(round(duration / dt)))
+        v = np.linspace(v1, v2, steps, endpoint=False)
+        resistance = drag_factor * v ** 2 + rolling_resist * weight * g + weight * g * grade / 100
+        if kind == 'brake':
+            force = weight * accel - resistance
+        elif kind == 'hold':
+            force = -resistance
+        else:
+            force = np.zeros_like(v)
+        speeds.append(v)
+        powers.append(np.maximum(force, 0.0) * v)
+    return np.concatenate(speeds), np.concatenate(powers)
+
+
+def disc_heat_transfer(speed_mps, disc_diameter):
+    """Коэффициент конвективной теплоотдачи диска, Вт/(м²·K)
+
+    Корреляция для вращающегося диска по Лимперту: ламинарный режим при
+    Re < 2.4·10^5, турбулентный - выше. Нижняя граница 10 Вт/(м²·K)
+    соответствует естественной конвекции на стоянке.
+    """
+    air_conductivity = 0.0257
+    air_viscosity = 1.6e-5
+    reynolds = speed_mps * disc_diameter / air_viscosity
+    laminar = 0.70 * air_conductivity / disc_diameter * reynolds ** 0.55
+    turbulent = 0.04 * air_conductivity / disc_diameter * reynolds ** 0.8
+    return np.maximum(np.where(reynolds < 2.4e5, laminar, turbulent), 10.0)
+
+
+def simulate_brake_thermal(segments, n_cycles, weight, disc_diameter, disc_thickness,
+                           front_percent=60.0, ambient=20.0, initial=None,
+                           drag_coef=0.35, frontal_area=2.2, rolling_resist=0.015,
+                           heat_fraction=0.9, vented=True, dt=0.1):
+    """Нестационарный нагрев переднего тормозного диска в серии циклов
+
+    Диск - сосредоточенная масса (размеры в мм, чугун 7200 кг/м³,
+    500 Дж/(кг·K)), получающая heat_fraction тормозной энергии своей оси
+    пополам с парным диском и отдающая тепло конвекцией с обеих
+    поверхностей и, у вентилируемого диска, каналов (disc_heat_transfer;
+    излучение не учитывается, что идет в запас при высоких температурах).
+    На каждом шаге используется точное решение линейного уравнения,
+    поэтому цикл сводится к отображению θ_конец = Φ·θ_начало + Γ, и
+    температуры в начале всех циклов находятся в замкнутом виде без
+    пошагового интегрирования.
+
+    disc_diameter и disc_thickness могут быть массивами - тогда результаты
+    получают ведущие оси вариантов. Возвращает траектории 'time', 'speed'
+    (км/ч), 'temperature', пиковые температуры каждого цикла, общий и
+    установившийся максимум и номер цикла превышения порогов 300/600 °C
+    (nan - порог не достигается).
+    """
+    speed, power = brake_cycle_profile(segments, weight, drag_coef, frontal_area,
+                                       rolling_resist, dt)
+    diameter = np.asarray(disc_diameter, dtype=float)[..., None] / 1000
+    thickness = np.asarray(disc_thickness, dtype=float)[..., None] / 1000
+
+    disc_mass = np.pi * (diameter / 2) ** 2 * thickness * 7200
+    heat_capacity = disc_mass * 500
+    cooling_area = 2 * np.pi * (diameter / 2) ** 2 * (1 - 0.35 ** 2)  # без ступицы
+    if vented:
+        cooling_area = cooling_area * 2.0  # каналы между щеками диска
+
+    heating = power * heat_fraction * front_percent / 100 / 2 / heat_capacity  # K/с
+    cooling = disc_heat_transfer(speed, diameter) * cooling_area / heat_capacity  # 1/с
+    decay = np.exp(-cooling * dt)
+    increment = heating / cooling * (1 - decay)
+
+    # θ_k = P_k·θ_0 + Q_k для превышения температуры над окружающей
+    shape = np.broadcast_shapes(decay.shape, increment.shape)
+    decay = np.broadcast_to(decay, shape)
+    increment = np.broadcast_to(increment, shape)
+    log_p = np.concatenate([np.zeros(shape[:-1] + (1,)), np.cumsum(np.log(decay), axis=-1)], axis=-1)
+    p = np.exp(log_p)
+    q = p * np.concatenate([np.zeros(shape[:-1] + (1,)),
+                            np.cumsum(increment * np.exp(-log_p[..., 1:]), axis=-1)], axis=-1)
+    phi, gamma = p[..., -1], q[..., -1]
+
+    theta_0 = (ambient if initial is None else initial) - ambient
+    cycles = np.arange(n_cycles)
+    theta_start = gamma[..., None] / (1 - phi[..., None]) * (1 - phi[..., None] ** cycles) \
+        + theta_0 * phi[..., None] ** cycles
+
+    # Траектории всех циклов: (..., цикл, шаг)
+    theta = theta_start[..., None] * p[..., None, :-1] + q[..., None, :-1]
+    temperature = ambient + theta
+    cycle_peak = temperature.max(axis=-1)
+
+    theta_steady = gamma / (1 - phi)
+    steady_peak = ambient + (theta_steady[..., None] * p + q).max(axis=-1)
+
+    def cycles_to(limit):
+        exceeded = cycle_peak >= limit
+        return np.where(exceeded.any(axis=-1), exceeded.argmax(axis=-1) + 1.0, np.nan)
+
+    steps = speed.size
+    return {
+        'time': np.arange(n_cycles * steps) * dt,
+        'speed': np.tile(speed * 3.6, n_cycles),
+        'temperature': temperature.reshape(temperature.shape[:-2] + (-1,)),
+        'cycle_peak': cycle_peak,
+        'peak_temperature': cycle_peak.max(axis=-1),
+        'final_temperature': ambient + theta_start[..., -1] * phi + gamma,
+        'steady_peak': steady_peak,
+        'steady_start': ambient + theta_steady,
+        'cycle_time': steps * dt,
+        'cycles_to_300': cycles_to(BRAKE_TEMPERATURE_LIMITS[0]),
+        'cycles_to_600': cycles_to(BRAKE_TEMPERATURE_LIMITS[1])
+    }
+
+
+# ==================== ДИНАМИКА ПОДВЕСКИ (RIDE) ====================
+# Классы дорог ISO 8608: Gd(n0) при n0 = 0.1 цикл/м, м³ (среднее геометрическое)
+ISO_8608_CLASSES = {
+    'A': 16e-6,
+    'B': 64e-6,
+    'C': 256e-6,
+    'D': 1024e-6,
+    'E': 4096e-6
+}
+
+
+def iso8608_road(road_class, length, dx=0.02, n_waves=200, seed=None):
+    """Случайный микропрофиль дороги по ISO 8608 (высоты в метрах)
+
+    Профиль строится суммой гармоник со случайными фазами и спектральной
+    плотностью Gd(n) = Gd(n0)·(n/n0)^-2 в диапазоне 0.011-2.83 цикл/м.
+    """
+    if road_class not in ISO_8608_CLASSES:
+        raise ValueError(f"Неизвестный класс дороги: {road_class}")
+    rng = np.random.default_rng(seed)
+    x = np.arange(0, length, dx)
+    n = np.geomspace(0.011, 2.83, n_waves)
+    dn = np.gradient(n)
+    amplitude = np.sqrt(2 * ISO_8608_CLASSES[road_class] * (n / 0.1) ** -2 * dn)
+    phase = rng.uniform(0, 2 * np.pi, n_waves)
+    z = np.empty_like(x)
+    for start in range(0, x.size, 20000):
+        part = x[start:start + 20000]
+        z[start:start + 20000] = np.cos(2 * np.pi * np.outer(part, n) + phase) @ amplitude
+    return x, z
+
+
+def bump_road(length, height, bump_length=0.5, position=5.0, dx=0.02):
+    """Одиночная неровность в форме полуволны косинуса (высота и длина в метрах)"""
+    x = np.arange(0, length, dx)
+    inside = (x >= position) & (x <= position + bump_length)
+    z = np.where(inside, height / 2 * (1 - np.cos(2 * np.pi * (x - position) / bump_length)), 0.0)
+    return x, z
+
+
+def simulate_ride(road_x, road_z, speed, sprung_mass, unsprung_mass, spring_rate, damping,
+                  tire_rate, model='quarter', wheelbase=2.6, damper=None, dt=0.002,
+                  duration=None, trace_every=5):
+    """Моделирование подвески при движении по профилю дороги
+
+    model='quarter' - четверть автомобиля (кузов и колесо), 'half' -
+    половина автомобиля (кузов с продольной угловой колебательностью и два
+    колеса; задняя ось повторяет профиль с запаздыванием wheelbase/speed,
+    динамический индекс принят равным 1). Массы - на колесо в кг,
+    жесткости в Н/м, демпфирование в Н·с/м, скорость в км/ч.
+
+    Параметры подвески могут быть массивами - все варианты интегрируются
+    одновременно методом Рунге-Кутты 4-го порядка. damper - необязательная
+    функция силы амортизатора от скорости штока (м/с) вместо линейного
+    damping. Колесо может отрываться от дороги (шина не тянет).
+
+    Возвращает СКЗ и пик ускорения кузова, вариацию нагрузки на шину
+    (СКО динамической нагрузки к статической), минимум нагрузки, СКЗ и
+    пределы хода подвески, а также прореженные траектории.
+    """
+    g = 9.81
+    params = np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in (
+        sprung_mass, unsprung_mass, spring_rate, damping, tire_rate)])
+    shape = params[0].shape
+    ms, mu, k, c, kt = [p.ravel() for p in params]
+    variants = ms.size
+    v = speed / 3.6
+    if v <= 0:
+        raise ValueError("Скорость должна быть больше нуля")
+
+    if duration is None:
+        duration = road_x[-1] / v - (wheelbase / v if model == 'half' else 0.0)
+    steps = int(duration / dt)
+    if steps < 2:
+        raise ValueError("Профиль дороги слишком короткий для заданной скорости")
+
+    # Профиль под колесами на целых и половинных шагах (для РК4)
+    t = np.arange(2 * steps + 1) * dt / 2
+    axles = 1 if model == 'quarter' else 2
+    inputs = np.empty((axles, t.size))
+    inputs[0] = np.interp(v * t + (wheelbase if model == 'half' else 0.0), road_x, road_z)
+    if model == 'half':
+        inputs[1] = np.interp(v * t, road_x, road_z)
+
+    static_tire = (ms + mu) * g
+    if model == 'half':
+        inertia = 2 * ms * (wheelbase / 2) ** 2  # на половину автомобиля, динамический индекс 1
+        arm = wheelbase / 2
+
+    def suspension_force(deflection, rate):
+        return k * deflection + (damper(rate) if damper is not None else c * rate)
+
+    def tire_force(zr, zu):
+        # Динамическая добавка с ограничением отрыва колеса
+        return np.maximum(kt * (zr - zu), -static_tire)
+
+    def derivatives(state, zr):
+        if model == 'quarter':
+            zs, vs, zu, vu = state
+            fs = suspension_force(zu - zs, vu - vs)
+            ft = tire_force(zr[0], zu)
+            return np.array([vs, fs / ms, vu, (ft - fs) / mu]), ft[None]
+        zs, vs, th, w, zuf, vuf, zur, vur = state
+        # Перемещения кузова над осями: перед zs - a·θ, зад zs + b·θ
+        fsf = suspension_force(zuf - (zs - arm * th), vuf - (vs - arm * w))
+        fsr = suspension_force(zur - (zs + arm * th), vur - (vs + arm * w))
+        ftf = tire_force(zr[0], zuf)
+        ftr = tire_force(zr[1], zur)
+        return np.array([
+            vs, (fsf + fsr) / (2 * ms),
+            w, (-arm * fsf + arm * fsr) / inertia,
+            vuf, (ftf - fsf) / mu,
+            vur, (ftr - fsr) / mu
+        ]), np.array([ftf, ftr])
+
+    state = np.zeros((4 if model == 'quarter' else 8, variants))
+    n_trace = (steps - 1) // trace_every + 1
+    trace_accel = np.empty((n_trace, variants), dtype=np.float32)
+    trace_travel = np.empty((n_trace, axles, variants), dtype=np.float32)
+    trace_tire = np.empty((n_trace, axles, variants), dtype=np.float32)
+
+    accel_sq = np.zeros(variants)
+    accel_peak = np.zeros(variants)
+    tire_sq = np.zeros((axles, variants))
+    tire_min = np.full((axles, variants), np.inf)
+    travel_sq = np.zeros((axles, variants))
+    travel_max = np.full((axles, variants), -np.inf)
+    travel_min = np.full((axles, variants), np.inf)
+
+    for step in range(steps):
+        zr0, zr_half, zr1 = inputs[:, 2 * step], inputs[:, 2 * step + 1], inputs[:, 2 * step + 2]
+        k1, tire = derivatives(state, zr0)
+        k2, _ = derivatives(state + dt / 2 * k1, zr_half)
+        k3, _ = derivatives(state + dt / 2 * k2, zr_half)
+        k4, _ = derivatives(state + dt * k3, zr1)
+
+        # Статистика в начале шага
+        body_accel = k1[1]
+        if model == 'quarter':
+            travel = (state[2] - state[0])[None]
+        else:
+            travel = np.array([state[4] - (state[0] - arm * state[2]),
+                               state[6] - (state[0] + arm * state[2])])
+        accel_sq += body_accel ** 2
+        accel_peak = np.maximum(accel_peak, np.abs(body_accel))
+        tire_sq += tire ** 2
+        tire_min = np.minimum(tire_min, tire)
+        travel_sq += travel ** 2
+        travel_max = np.maximum(travel_max, travel)
+        travel_min = np.minimum(travel_min, travel)
+        if step % trace_every == 0:
+            row = step // trace_every
+            trace_accel[row] = body_accel
+            trace_travel[row] = travel
+            trace_tire[row] = tire + static_tire
+
+        state = state + dt / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+    def out(values):
+        return values.reshape(shape)
+
+    return {
+        'body_accel_rms': out(np.sqrt(accel_sq / steps)),
+        'body_accel_peak': out(accel_peak),
+        'tire_load_variation': out(np.sqrt(tire_sq / steps).max(axis=0) / static_tire),
+        'min_tire_load': out((tire_min.min(axis=0) + static_tire) / static_tire),
+        'travel_rms': out(np.sqrt(travel_sq / steps).max(axis=0)),
+        'travel_max': out(travel_max.max(axis=0)),
+        'travel_min': out(travel_min.min(axis=0)),
+        'time': np.arange(n_trace) * dt * trace_every,
+        'body_accel': trace_accel.T.reshape(shape + (n_trace,)),
+        'travel': trace_travel.transpose(1, 2, 0).reshape((axles,) + shape + (n_trace,)),
+        'tire_load': trace_tire.transpose(1, 2, 0).reshape((axles,) + shape + (n_trace,))
+    }
+
+
+def array_cache(size):
+    """Декоратор кэша результатов по значениям аргументов
+
+    Массивы, списки и кортежи входят в ключ формой и содержимым (числа -
+    как float), остальные аргументы - как есть. Хранится не более size
+    последних конфигураций, при переполнении удаляется самая старая.
+    """
+    def key_part(value):
+        if isinstance(value, (np.ndarray, list, tuple)):
+            array = np.asarray(value)
+            if array.dtype.kind in 'biuf':
+                array = array.astype(float)
+            return array.dtype.str, array.shape, array.tobytes()
+        return value
+
+    def decorator(function):
+        cache = {}
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            key = (tuple(key_part(v) for v in args),
+                   tuple((k, key_part(kwargs[k])) for k in sorted(kwargs)))
+            if key not in cache:
+                if len(cache) >= size:
+                    cache.pop(next(iter(cache)))
+                cache[key] = function(*args, **kwargs)
+            return cache[key]
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+# ==================== ЧАСТОТНАЯ ХАРАКТЕРИСТИКА ПОДВЕСКИ ====================
+FRF_CACHE_SIZE = 64
+
+
+def transmissibility(frequencies, sprung_mass, unsprung_mass, spring_rate, damping, tire_rate):
+    """Комплексные передаточные функции четверти автомобиля от профиля дороги
+
+    Жесткости в Н/м, демпфирование в Н·с/м, массы в кг. Параметры
+    подвески могут быть сетками - результаты имеют форму
+    (форма параметров) + (число частот,). Возвращает:
+    'body' - перемещение кузова / профиль, 'wheel' - перемещение колеса /
+    профиль, 'travel' - ход подвески / профиль, 'tire_force' - динамическая
+    нагрузка на шину / (статическая нагрузка · профиль в метрах),
+    'body_accel' - ускорение кузова / профиль, (м/с²)/м.
+    """
+    omega = 2 * np.pi * np.asarray(frequencies, dtype=float)
+    ms, mu, k, c, kt = [np.asarray(v, dtype=float)[..., None] for v in (
+        sprung_mass, unsprung_mass, spring_rate, damping, tire_rate)]
+
+    suspension = k + 1j * omega * c
+    body_term = suspension - ms * omega ** 2
+    wheel_term = suspension + kt - mu * omega ** 2
+    determinant = body_term * wheel_term - suspension ** 2
+
+    body = kt * suspension / determinant
+    wheel = kt * body_term / determinant
+    return {
+        'body': body,
+        'wheel': wheel,
+        'travel': wheel - body,
+        'tire_force': kt * (1 - wheel) / ((ms + mu) * 9.81),
+        'body_accel': -omega ** 2 * body
+    }
+
+
+@array_cache(FRF_CACHE_SIZE)
+def cached_transmissibility(frequencies, sprung_mass, unsprung_mass, spring_rate, damping, tire_rate):
+    """transmissibility с кэшем по конфигурации (частоты и параметры подвески)
+
+    Повторный запрос той же сетки (например, при переключении графиков)
+    возвращается без пересчета. Хранится не более FRF_CACHE_SIZE
+    последних конфигураций.
+    """
+    return transmissibility(*[np.asarray(v, dtype=float) for v in (
+        frequencies, sprung_mass, unsprung_mass, spring_rate, damping, tire_rate)])
+
+
+def frf_peaks(frequencies, response, split=None):
+    """Резонансы кузова и колеса: частоты и модули максимумов АЧХ
+
+    Полоса делится на «кузовную» и «колесную» части по частоте split
+    (по умолчанию 4 Гц).
+    """
+    frequencies = np.asarray(frequencies, dtype=float)
+    magnitude = np.abs(response)
+    low = frequencies < (4.0 if split is None else split)
+    body_index = np.argmax(np.where(low, magnitude, -np.inf), axis=-1)
+    wheel_index = np.argmax(np.where(low, -np.inf, magnitude), axis=-1)
+    return {
+        'body_frequency': frequencies[body_index],
+        'body_gain': np.take_along_axis(magnitude, body_index[..., None], axis=-1)[..., 0],
+        'wheel_frequency': frequencies[wheel_index],
+        'wheel_gain': np.take_along_axis(magnitude, wheel_index[..., None], axis=-1)[..., 0]
+    }
+
+
+# ==================== КИНЕМАТИКА ПОДВЕСКИ ПО ТОЧКАМ КРЕПЛЕНИЯ ====================
+# Точки крепления в поперечной плоскости: (Y от оси автомобиля, Z от дороги), мм
+SUSPENSION_GEOMETRIES = {
+    'double_wishbone': {
+        'title': 'Двухрычажная',
+        'hardpoints': [
+            ('lower_inner', 'Нижний рычаг, внутренняя', (300.0, 180.0)),
+            ('lower_outer', 'Нижний рычаг, шаровая опора', (700.0, 150.0)),
+            ('upper_inner', 'Верхний рычаг, внутренняя', (380.0, 420.0)),
+            ('upper_outer', 'Верхний рычаг, шаровая опора', (660.0, 450.0)),
+            ('contact_patch', 'Пятно контакта', (780.0, 0.0)),
+            ('spring_lower', 'Пружина, на нижнем рычаге', (600.0, 165.0)),
+            ('spring_upper', 'Пружина, на кузове', (560.0, 600.0))
+        ]
+    },
+    'macpherson': {
+        'title': 'Макферсон',
+        'hardpoints': [
+            ('lower_inner', 'Нижний рычаг, внутренняя', (320.0, 170.0)),
+            ('lower_outer', 'Нижний рычаг, шаровая опора', (720.0, 140.0)),
+            ('strut_top', 'Верхняя опора стойки', (600.0, 700.0)),
+            ('contact_patch', 'Пятно контакта', (760.0, 0.0))
+        ]
+    }
+}
+
+
+def _line_intersection(p1, d1, p2, d2):
+    """Точка пересечения прямых p1 + t·d1 и p2 + s·d2 (массивы (..., 2))"""
+    cross = d1[..., 0] * d2[..., 1] - d1[..., 1] * d2[..., 0]
+    diff = p2 - p1
+    t = (diff[..., 0] * d2[..., 1] - diff[..., 1] * d2[..., 0]) / np.where(np.abs(cross) > 1e-12, cross, np.nan)
+    return p1 + t[..., None] * d1
+
+
+def _rotate(vectors, angle):
+    """Поворот векторов (..., 2) на углы angle (рад)"""
+    cos, sin = np.cos(angle), np.sin(angle)
+    return np.stack([vectors[..., 0] * cos - vectors[..., 1] * sin,
+                     vectors[..., 0] * sin + vectors[..., 1] * cos], axis=-1)
+
+
+def suspension_kinematics(hardpoints, travel, geometry='double_wishbone', static_camber=0.0,
+                          arm_steps=4001):
+    """Плоская кинематика двухрычажной подвески и Макферсона
+
+    hardpoints - словарь точек крепления {ключ: (Y, Z)} в мм (правое колесо,
+    Y наружу от оси автомобиля, Z от дороги в статике), travel - массив
+    ходов колеса в мм (+ сжатие). Положение механизма находится сразу для
+    arm_steps углов нижнего рычага (пересечение окружностей для верхнего
+    рычага, поворот оси стойки для Макферсона), затем интерполируется на
+    заданные ходы.
+
+    Возвращает массивы по ходу: развал (°), его градиент (°/мм),
+    мгновенный центр (Y, Z от дороги), высота центра крена, изменение
+    колеи (на одно колесо) и передаточное отношение пружины (ход пружины /
+    ход колеса). Пространственная модель в этой версии не реализована.
+    """
+    points = {key: np.asarray(value, dtype=float) for key, value in hardpoints.items()}
+    travel = np.asarray(travel, dtype=float)
+    lower_inner, lower_outer = points['lower_inner'], points['lower_outer']
+    contact = points['contact_patch']
+
+    # Положение нижнего рычага для сетки углов
+    angle = np.linspace(-0.6, 0.6, arm_steps)
+    outer = lower_inner + _rotate(lower_outer - lower_inner, angle)
+
+    if geometry == 'double_wishbone':
+        upper_inner, upper_outer = points['upper_inner'], points['upper_outer']
+        upper_length = np.linalg.norm(upper_outer - upper_inner)
+        upright_length = np.linalg.norm(upper_outer - lower_outer)
+
+        # Верхняя шаровая опора - пересечение окружностей вокруг upper_inner и outer
+        delta = upper_inner - outer
+        distance = np.linalg.norm(delta, axis=-1)
+        a = (upright_length ** 2 - upper_length ** 2 + distance ** 2) / (2 * distance)
+        h = np.sqrt(np.maximum(upright_length ** 2 - a ** 2, 0.0))
+        valid = np.abs(a) <= upright_length
+        base = outer + (a / distance)[:, None] * delta
+        normal = np.stack([-delta[:, 1], delta[:, 0]], axis=-1) / distance[:, None]
+        candidates = np.stack([base + h[:, None] * normal, base - h[:, None] * normal])
+        nearest = np.argmin(np.linalg.norm(candidates - upper_outer, axis=-1), axis=0)
+        top = candidates[nearest, np.arange(arm_steps)]
+        reference = upper_outer - lower_outer
+    elif geometry == 'macpherson':
+        strut_top = points['strut_top']
+        top = np.broadcast_to(strut_top, outer.shape)
+        valid = np.ones(arm_steps, dtype=bool)
+        reference = strut_top - lower_outer
+    else:
+        raise ValueError(f"Неизвестная схема подвески: {geometry}")
+
+    # Поворот поворотного кулака относительно статики
+    axis = top - outer
+    upright_angle = np.arctan2(axis[:, 1], axis[:, 0]) - np.arctan2(reference[1], reference[0])
+    wheel = outer + _rotate(contact - lower_outer, upright_angle)
+    wheel_travel = wheel[:, 1] - contact[1]
+
+    # Мгновенный центр: пересечение нижнего рычага с верхним рычагом
+    # (у Макферсона - с перпендикуляром к оси стойки в верхней опоре)
+    if geometry == 'double_wishbone':
+        instant_center = _line_intersection(lower_inner, outer - lower_inner, upper_inner, top - upper_inner)
+        spring = lower_inner + _rotate(points['spring_lower'] - lower_inner, angle)
+        spring_length = np.linalg.norm(points['spring_upper'] - spring, axis=-1)
+    else:
+        normal = np.stack([-axis[:, 1], axis[:, 0]], axis=-1)
+        instant_center = _line_intersection(lower_inner, outer - lower_inner, top, normal)
+        spring_length = np.linalg.norm(axis, axis=-1)
+
+    # Центр крена - пересечение линии «пятно контакта - мгновенный центр» с осью автомобиля
+    roll_center = _line_intersection(wheel, instant_center - wheel, np.zeros(2), np.array([0.0, 1.0]))
+
+    # Интерполяция на заданные ходы по монотонному участку вокруг статики
+    static = np.argmin(np.abs(angle))
+    direction = np.sign(wheel_travel[static + 1] - wheel_travel[static - 1])
+    good = (np.diff(wheel_travel) * direction > 0) & valid[1:] & valid[:-1]
+    low = static
+    while low > 0 and good[low - 1]:
+        low -= 1
+    high = static
+    while high < good.size and good[high]:
+        high += 1
+    section = slice(low, high + 1)
+    order = np.argsort(wheel_travel[section])
+    travel_grid = wheel_travel[section][order]
+    if travel.min() < travel_grid[0] or travel.max() > travel_grid[-1]:
+        raise ValueError(f"Ход вне рабочего диапазона механизма: "
+                         f"{travel_grid[0]:.0f}...{travel_grid[-1]:.0f} мм")
+
+    def along(values):
+        return np.interp(travel, travel_grid, values[section][order])
+
+    # Поворот кулака против часовой стрелки (верх внутрь) уменьшает развал
+    camber = static_camber - np.degrees(along(upright_angle))
+    spring_travel = -(spring_length - spring_length[static])
+    motion_ratio = np.gradient(spring_travel[section][order], travel_grid)
+    ground = travel + contact[1]  # дорога поднимается вместе с колесом относительно кузова
+    return {
+        'travel': travel,
+        'camber': camber,
+        'camber_gain': np.gradient(camber, travel) if travel.size > 1 else np.zeros_like(travel),
+        'instant_center_y': along(instant_center[:, 0]),
+        'instant_center_height': along(instant_center[:, 1]) - ground,
+        'roll_center_height': along(roll_center[:, 1]) - ground,
+        'track_change': along(wheel[:, 0]) - contact[0],
+        'motion_ratio': np.interp(travel, travel_grid, motion_ratio)
+    }
+
+
+# ==================== КРЕН И ПОПЕРЕЧНОЕ ПЕРЕРАСПРЕДЕЛЕНИЕ НАГРУЗКИ ====================
+def antiroll_bar_stiffness(diameter, lever_arm, length, motion_ratio, track, wall=None):
+    """Угловая жесткость стабилизатора, приведенная к крену кузова, Н·м/рад
+
+    Размеры в мм: diameter - наружный диаметр, wall - толщина стенки
+    трубчатого стабилизатора (None - сплошной), length - длина
+    скручиваемой части, lever_arm - плечо рычага, motion_ratio - отношение
+    хода конца стабилизатора к ходу колеса. Изгиб рычагов не учитывается.
+    """
+    shear_modulus = 79.3e9  # Па, пружинная сталь
+    outer = np.asarray(diameter, dtype=float) / 1000
+    inner = 0.0 if wall is None else np.maximum(outer - 2 * np.asarray(wall, dtype=float) / 1000, 0.0)
+    polar_moment = np.pi * (outer ** 4 - inner ** 4) / 32
+    torsion = shear_modulus * polar_moment / (length / 1000)  # Н·м/рад на закручивание
+    return torsion * (motion_ratio * (track / 1000) / (lever_arm / 1000)) ** 2
+
+
+def axle_roll_stiffness(wheel_rate, track, bar_stiffness=0.0, tire_rate=None):
+    """Жесткость оси в крене, Н·м/рад (жесткости колеса и шины в Н/мм, колея в мм)
+
+    Пружины и стабилизатор работают параллельно, шины - последовательно с ними.
+    """
+    half_track_sq = (np.asarray(track, dtype=float) / 1000) ** 2 / 2
+    suspension = np.asarray(wheel_rate, dtype=float) * 1000 * half_track_sq + bar_stiffness
+    if tire_rate is None:
+        return suspension
+    tire = np.asarray(tire_rate, dtype=float) * 1000 * half_track_sq
+    return suspension * tire / (suspension + tire)
+
+
+def lateral_load_transfer(mass, cg_height, front_weight, wheelbase, track_front, track_rear,
+                          rc_front, rc_rear, roll_front, roll_rear, lateral_g=None):
+    """Крен и поперечное перераспределение нагрузки по осям
+
+    Размеры в мм, front_weight в %, жесткости осей в крене в Н·м/рад.
+    Переносы нагрузки складываются из геометрической части (через центры
+    крена) и упругой (через крен кузова с учетом дестабилизирующего
+    момента от смещения центра масс). Масса считается целиком
+    подрессоренной. Все параметры могут быть массивами.
+
+    Возвращает градиент крена (°/g), долю переноса на переднюю ось LLTD
+    (%), переносы на 1 g (Н) и, если задан lateral_g, нагрузки на колеса
+    (Н) формы (..., число значений) для внешнего и внутреннего колес.
+    """
+    g = 9.81
+    front_share = np.asarray(front_weight, dtype=float) / 100
+    h = np.asarray(cg_height, dtype=float) / 1000
+    # Ось крена на продольной координате центра масс
+    roll_axis = (rc_front * front_share + rc_rear * (1 - front_share)) / 1000
+    roll_arm = h - roll_axis
+    total = roll_front + roll_rear
+    weight = mass * g
+
+    roll_per_g = weight * roll_arm / (total - weight * roll_arm)  # рад на 1 g
+    elastic_front = roll_front * roll_per_g / (track_front / 1000)
+    elastic_rear = roll_rear * roll_per_g / (track_rear / 1000)
+    geometric_front = weight * front_share * rc_front / 1000 / (track_front / 1000)
+    geometric_rear = weight * (1 - front_share) * rc_rear / 1000 / (track_rear / 1000)
+    transfer_front = elastic_front + geometric_front
+    transfer_rear = elastic_rear + geometric_rear
+
+    result = {
+        'roll_gradient': np.degrees(roll_per_g),
+        'lltd': transfer_front / (transfer_front + transfer_rear) * 100,
+        'transfer_front': transfer_front,
+        'transfer_rear': transfer_rear
+    }
+    if lateral_g is not None:
+        ay = np.asarray(lateral_g, dtype=float)
+        static_front = (weight * front_share / 2)[..., None]
+        static_rear = (weight * (1 - front_share) / 2)[..., None]
+        result.update({
+            'front_outer': static_front + transfer_front[..., None] * ay,
+            'front_inner': np.maximum(static_front - transfer_front[..., None] * ay, 0.0),
+            'rear_outer': static_rear + transfer_rear[..., None] * ay,
+            'rear_inner': np.maximum(static_rear - transfer_rear[..., None] * ay, 0.0)
+        })
+    return result
+
+
+# ==================== РАЗВЕСКА ПО УГЛАМ ====================
+CORNERS = ('ЛП', 'ПП', 'ЛЗ', 'ПЗ')  # левое/правое переднее, левое/правое заднее
+
+
+def weight_distribution(loads):
+    """Диагональная (ПП + ЛЗ), передняя и левая доли нагрузки, %
+
+    loads - нагрузки на колеса формы (..., 4) в порядке CORNERS.
+    """
+    loads = np.asarray(loads, dtype=float)
+    total = loads.sum(axis=-1)
+    return {
+        'cross': (loads[..., 1] + loads[..., 2]) / total * 100,
+        'front': (loads[..., 0] + loads[..., 1]) / total * 100,
+        'left': (loads[..., 0] + loads[..., 2]) / total * 100
+    }
+
+
+def corner_weight_response(scales, spring_rates, motion_ratios, wheelbase, track_front, track_rear,
+                           perch, ballast=0.0, ballast_offset=(0.0, 0.0)):
+    """Нагрузки на колеса после регулировки опор пружин и установки балласта
+
+    scales - показания весов, кг; spring_rates (Н/мм) и motion_ratios -
+    по углам в порядке CORNERS; размеры в мм. perch - смещение опор
+    пружин формы (..., 4), мм (+ поднимает угол), ballast_offset -
+    положение балласта (продольное назад, поперечное влево) относительно
+    текущего центра масс формы (..., 2), мм.
+
+    Кузов считается жестким и опирается на четыре колесные пружины:
+    смещение опоры на δ эквивалентно предварительному поджатию колеса на
+    δ / MR, после чего кузов находит новое равновесие по вертикали,
+    тангажу и крену. Все варианты perch считаются одним векторным вызовом.
+
+    Возвращает нагрузки (кг), подъем кузова над каждым колесом (мм) и
+    доли нагрузки weight_distribution.
+    """
+    scales = np.asarray(scales, dtype=float)
+    motion_ratios = np.asarray(motion_ratios, dtype=float)
+    wheel_rates = np.asarray(spring_rates, dtype=float) * motion_ratios ** 2 / 9.81  # кг/мм
+    x = np.array([0.0, 0.0, wheelbase, wheelbase])
+    y = np.array([track_front, -track_front, track_rear, -track_rear]) / 2
+    a = np.stack([np.ones(4), x, y], axis=1)
+    stiffness_inv = np.linalg.inv(a.T @ (wheel_rates[:, None] * a))
+
+    total = scales.sum()
+    center = np.array([1.0, scales @ x / total, scales @ y / total])
+    offset = np.asarray(ballast_offset, dtype=float)
+    ballast_load = ballast * (center + np.concatenate(
+        [np.zeros(offset.shape[:-1] + (1,)), offset], axis=-1))
+
+    preload = np.asarray(perch, dtype=float) / motion_ratios
+    body = ((preload * wheel_rates) @ a - ballast_load) @ stiffness_inv
+    rise = body @ a.T
+    loads = scales + wheel_rates * (preload - rise)
+    return {'loads': loads, 'rise': rise, **weight_distribution(loads)}
+
+
+def solve_corner_weights(scales, spring_rates, motion_ratios, wheelbase, track_front, track_rear,
+                         target_cross, target_front=None, ballast=0.0, height_weight=1.0):
+    """Регулировка опор пружин под целевую диагональ методом наименьших квадратов
+
+    Неизвестные - смещения четырех опор и, при ballast > 0, положение
+    балласта. Уравнения: диагональная доля = target_cross, передняя доля =
+    target_front (достижимо только балластом - опоры меняют лишь
+    диагональ) и нулевое изменение высоты кузова над каждым колесом с
+    весом height_weight (% на мм). Отклик линеен по неизвестным, поэтому
+    матрица системы получается одним векторным вызовом
+    corner_weight_response для нулевого и единичных векторов.
+    """
+    n = 6 if ballast > 0 else 4
+    basis = np.vstack([np.zeros(n), np.eye(n)])
+    geometry = (scales, spring_rates, motion_ratios, wheelbase, track_front, track_rear)
+    response = corner_weight_response(*geometry, basis[:, :4], ballast,
+                                      basis[:, 4:] if n == 6 else np.zeros((n + 1, 2)))
+
+    rows = [response['cross'] - target_cross]
+    if target_front is not None and ballast > 0:
+        rows.append(response['front'] - target_front)
+    rows += list(height_weight * response['rise'].T)
+    columns = np.array(rows)  # уравнения × (нулевой вектор + единичные)
+    base = columns[:, 0]
+    matrix = columns[:, 1:] - base[:, None]
+    solution = np.linalg.lstsq(matrix, -base, rcond=None)[0]
+
+    perch = solution[:4]
+    offset = solution[4:] if n == 6 else np.zeros(2)
+    result = corner_weight_response(*geometry, perch, ballast, offset)
+    result.update({'perch': perch, 'ballast_offset': offset})
+    return result
+
+
+def corner_weight_candidates(scales, spring_rates, motion_ratios, wheelbase, track_front, track_rear,
+                             target_cross, step=0.75, max_steps=6, ballast=0.0,
+                             ballast_offset=(0.0, 0.0), height_tolerance=1.0, center=None):
+    """Перебор дискретных регулировок опор (шаг резьбы) для всех углов сразу
+
+    Сетка строится вокруг center (обычно решение solve_corner_weights),
+    округленного до шага. Все (2·max_steps + 1)^4 вариантов считаются одним вызовом
+    corner_weight_response. Оценка варианта - отклонение диагонали от цели
+    (%) плюс СКЗ изменения высоты кузова, деленное на height_tolerance (мм).
+    Возвращает смещения опор и результаты, отсортированные по оценке.
+    """
+    steps = np.arange(-max_steps, max_steps + 1)
+    origin = np.zeros(4) if center is None else np.round(np.asarray(center, dtype=float) / step)
+    perch = (np.stack(np.meshgrid(steps, steps, steps, steps, indexing='ij'), axis=-1).reshape(-1, 4)
+             + origin) * step
+    result = corner_weight_response(scales, spring_rates, motion_ratios, wheelbase, track_front,
+                                    track_rear, perch, ballast, ballast_offset)
+    score = np.abs(result['cross'] - target_cross) + \
+        np.sqrt((result['rise'] ** 2).mean(axis=-1)) / height_tolerance
+    order = np.argsort(score, kind='stable')
+    ranked = {key: value[order] for key, value in result.items()}
+    ranked.update({'perch': perch[order], 'score': score[order]})
+    return ranked
+
+
+# ==================== ДИАГРАММА G-G ====================
+GG_CACHE_SIZE = 32
+
+DRIVE_LAYOUTS = {
+    'rwd': 'Задний привод',
+    'fwd': 'Передний привод',
+    'awd': 'Полный привод'
+}
+
+
+def gg_envelope(mass, speeds, cg_height=500.0, wheelbase=2600.0, front_weight=55.0,
+                track_front=1500.0, track_rear=1480.0, tire_mu=1.1, load_sensitivity=0.1,
+                drag_area=0.77, lift_area=0.0, aero_balance=45.0, lltd=55.0, power=None,
+                drive='rwd', rolling_resist=0.015, drivetrain_efficiency=0.9, n_directions=73,
+                iterations=30):
+    """Предельные продольные и поперечные ускорения (огибающая g-g) по сетке скоростей
+
+    Модель - точечная масса с переносом нагрузки: продольный перенос через
+    высоту центра масс и базу, поперечный - по осям в доле lltd (%).
+    Прижимная сила (lift_area = Cl·A, м²) распределяется по осям согласно
+    aero_balance (% на перед), сопротивление воздуха - drag_area = Cx·A.
+    Сцепление шины падает с нагрузкой: μ = tire_mu·(1 - load_sensitivity·
+    (Fz/Fz0 - 1)), Fz0 - статическая нагрузка на колесо. Каждая ось
+    проверяется по эллипсу трения; тормозные силы распределяются по осям
+    пропорционально их сцеплению, тяговые - на ведущие оси (drive) и
+    ограничены мощностью power (кВт).
+
+    Для каждой скорости (км/ч) и направления в полуплоскости ay >= 0
+    (0 - разгон, 180° - торможение) предельная величина ускорения ищется
+    бисекцией одновременно для всей сетки. Возвращает 'ax' и 'ay' формы
+    (скорости, направления) в g и максимумы по осям.
+    """
+    g = 9.81
+    rho = 1.225
+    v = np.asarray(speeds, dtype=float)[:, None] / 3.6
+    angles = np.linspace(0, np.pi, n_directions)[None, :]
+    h, base = cg_height / 1000, wheelbase / 1000
+    tracks = np.array([track_front, track_rear]) / 1000
+    front_share = front_weight / 100
+
+    static = np.array([front_share, 1 - front_share]) * mass * g  # на ось
+    nominal_wheel = static / 2
+    aero = 0.5 * rho * v ** 2
+    downforce = aero * lift_area * np.array([aero_balance / 100, 1 - aero_balance / 100])[:, None, None]
+    resistance = aero * drag_area + rolling_resist * (mass * g + aero * lift_area)
+    lateral_share = np.array([lltd / 100, 1 - lltd / 100])
+    driven = {'rwd': np.array([0.0, 1.0]), 'fwd': np.array([1.0, 0.0]),
+              'awd': np.array([1.0, 1.0])}[drive]
+    traction_limit = np.inf if not power else power * 1000 * drivetrain_efficiency / np.maximum(v, 1.0)
+
+    def feasible(magnitude):
+        ax = magnitude * np.cos(angles)
+        ay = magnitude * np.sin(angles)
+        longitudinal = mass * ax * h / base  # перенос на заднюю ось при разгоне
+        axle_load = static[:, None, None] + downforce + np.array([-1.0, 1.0])[:, None, None] * longitudinal
+        lateral = lateral_share[:, None, None] * mass * ay * h / tracks[:, None, None]
+        outer = np.maximum(axle_load / 2 + lateral, 0.0)
+        inner = np.maximum(axle_load / 2 - lateral, 0.0)
+        grip = np.zeros_like(axle_load)
+        for wheel in (outer, inner):
+            mu = tire_mu * np.maximum(1 - load_sensitivity * (wheel / nominal_wheel[:, None, None] - 1), 0.1)
+            grip = grip + mu * wheel
+
+        # Поперечная сила по осям из равновесия моментов относительно центра масс
+        side = mass * ay * np.array([front_share, 1 - front_share])[:, None, None]
+        tire_force = mass * ax + resistance
+        braking = tire_force < 0
+        weights = np.where(braking, grip, driven[:, None, None] * grip)
+        share = weights / np.maximum(weights.sum(axis=0), 1e-9)
+        drive_force = share * tire_force
+        usage = (drive_force / np.maximum(grip, 1e-9)) ** 2 + (side / np.maximum(grip, 1e-9)) ** 2
+        return (usage.max(axis=0) <= 1.0) & (braking | (tire_force <= traction_limit))
+
+    low = np.zeros(np.broadcast(v, angles).shape)
+    high = np.full(low.shape, 6 * g)
+    for _ in range(iterations):
+        middle = (low + high) / 2
+        ok = feasible(middle)
+        low = np.where(ok, middle, low)
+        high = np.where(ok, high, middle)
+
+    ax = low * np.cos(angles) / g
+    ay = low * np.sin(angles) / g
+    return {
+        'speeds': np.asarray(speeds, dtype=float),
+        'angles': np.degrees(angles[0]),
+        'ax': ax,
+        'ay': ay,
+        'max_lateral': ay.max(axis=1),
+        'max_accel': ax.max(axis=1),
+        'max_brake': -ax.min(axis=1)
+    }
+
+
+@array_cache(GG_CACHE_SIZE)
+def cached_gg_envelope(mass, speeds, **vehicle):
+    """gg_envelope с кэшем по конфигурации автомобиля и сетке скоростей
+
+    Хранится не более GG_CACHE_SIZE последних конфигураций.
+    """
+    return gg_envelope(mass, np.asarray(speeds, dtype=float), **vehicle)
+
+
+# ==================== ШИННАЯ МОДЕЛЬ PACEJKA ====================
+class TireModel:
+    """Шина по Magic Formula (подмножество MF 5.2 без развала и поворотных шин)
+
+    Коэффициенты называются как в файлах .tir: FNOMIN - номинальная
+    нагрузка (Н), PCX1...PVX1 - продольная сила, PCY1...PVY1 - боковая,
+    RBX1...RCY1 - взаимное влияние при комбинированном скольжении,
+    LMUX/LMUY - масштаб коэффициента сцепления (покрытие дороги).
+    Все методы принимают массивы и вычисляются с broadcasting.
+    """
+
+    DEFAULTS = {
+        'FNOMIN': 4000.0, 'UNLOADED_RADIUS': 0.31,
+        'PCX1': 1.65, 'PDX1': 1.2, 'PDX2': -0.1, 'PEX1': 0.3, 'PEX2': 0.0,
+        'PKX1': 21.7, 'PKX2': 13.6, 'PKX3': -0.4, 'PHX1': 0.0, 'PVX1': 0.0,
+        'PCY1': 1.35, 'PDY1': 1.1, 'PDY2': -0.1, 'PEY1': -0.8, 'PEY2': -0.6,
+        'PKY1': 15.0, 'PKY2': 1.7, 'PHY1': 0.0, 'PVY1': 0.0,
+        'RBX1': 12.0, 'RBX2': 10.0, 'RCX1': 1.0, 'RBY1': 10.0, 'RBY2': 10.0, 'RCY1': 1.0,
+        'LMUX': 1.0, 'LMUY': 1.0
+    }
+
+    def __init__(self, name="", **coefficients):
+        unknown = set(coefficients) - set(self.DEFAULTS)
+        if unknown:
+            raise ValueError(f"Неизвестные коэффициенты шины: {', '.join(sorted(unknown))}")
+        self.name = name
+        self.params = dict(self.DEFAULTS, **{k: float(v) for k, v in coefficients.items()})
+
+    def _load(self, fz):
+        fz = np.maximum(np.asarray(fz, dtype=float), 0.0)
+        return fz, (fz - self.params['FNOMIN']) / self.params['FNOMIN']
+
+    @staticmethod
+    def _magic(b, c, d, e, x):
+        bx = b * x
+        return d * np.sin(c * np.arctan(bx - e * (bx - np.arctan(bx))))
+
+    def fx(self, slip_ratio, fz, mu_scale=1.0):
+        """Продольная сила (Н) при чистом продольном скольжении"""
+        p = self.params
+        fz, dfz = self._load(fz)
+        c = p['PCX1']
+        d = (p['PDX1'] + p['PDX2'] * dfz) * p['LMUX'] * mu_scale * fz
+        e = np.minimum(p['PEX1'] + p['PEX2'] * dfz, 1.0)
+        k = fz * (p['PKX1'] + p['PKX2'] * dfz) * np.exp(p['PKX3'] * dfz)
+        b = k / np.where(c * d != 0, c * d, np.inf)
+        return self._magic(b, c, d, e, np.asarray(slip_ratio, dtype=float) + p['PHX1']) + p['PVX1'] * fz
+
+    def fy(self, slip_angle, fz, mu_scale=1.0):
+        """Боковая сила (Н) при чистом уводе, slip_angle в радианах"""
+        p = self.params
+        fz, dfz = self._load(fz)
+        c = p['PCY1']
+        d = (p['PDY1'] + p['PDY2'] * dfz) * p['LMUY'] * mu_scale * fz
+        e = np.minimum(p['PEY1'] + p['PEY2'] * dfz, 1.0)
+        k = p['PKY1'] * p['FNOMIN'] * np.sin(2 * np.arctan(fz / (p['PKY2'] * p['FNOMIN'])))
+        b = k / np.where(c * d != 0, c * d, np.inf)
+        return self._magic(b, c, d, e, np.asarray(slip_angle, dtype=float) + p['PHY1']) + p['PVY1'] * fz
+
+    def combined(self, slip_ratio, slip_angle, fz, mu_scale=1.0):
+        """Продольная и боковая силы при комбинированном скольжении (весовые функции MF)"""
+        p = self.params
+        kappa = np.asarray(slip_ratio, dtype=float)
+        alpha = np.asarray(slip_angle, dtype=float)
+        bxa = p['RBX1'] * np.cos(np.arctan(p['RBX2'] * kappa))
+        gxa = np.cos(p['RCX1'] * np.arctan(bxa * alpha))
+        byk = p['RBY1'] * np.cos(np.arctan(p['RBY2'] * alpha))
+        gyk = np.cos(p['RCY1'] * np.arctan(byk * kappa))
+        return self.fx(kappa, fz, mu_scale) * gxa, self.fy(alpha, fz, mu_scale) * gyk
+
+    def peak_fx(self, fz, mu_scale=1.0, slip_grid=None):
+        """Максимальная продольная сила (Н) и скольжение, при котором она достигается"""
+        slip = np.linspace(0.0, 0.4, 401) if slip_grid is None else np.asarray(slip_grid, dtype=float)
+        fz = np.asarray(fz, dtype=float)
+        forces = self.fx(slip, fz[..., None], mu_scale)
+        index = forces.argmax(axis=-1)
+        return np.take_along_axis(forces, index[..., None], axis=-1)[..., 0], slip[index]
+
+    @classmethod
+    def from_tir(cls, file_name):
+        """Коэффициенты из файла .tir (строки «KEY = value $комментарий»)
+
+        Коэффициенты, которых нет в модели, пропускаются.
+        """
+        coefficients = {}
+        with open(file_name, 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                line = line.split('$')[0].strip()
+                if '=' not in line or line.startswith('['):
+                    continue
+                key, value = [part.strip() for part in line.split('=', 1)]
+                key = key.upper()
+                if key in cls.DEFAULTS:
+                    try:
+                        coefficients[key] = float(value.strip("'"))
+                    except ValueError:
+                        continue
+        if not coefficients:
+            raise ValueError("В файле нет коэффициентов Magic Formula")
+        return cls(os.path.splitext(os.path.basename(file_name))[0], **coefficients)
+
+    @classmethod
+    def from_json(cls, file_name):
+        """Коэффициенты из JSON: {"name": ..., "PCX1": ..., ...}"""
+        with open(file_name, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        name = data.pop('name', os.path.splitext(os.path.basename(file_name))[0])
+        return cls(name, **{key.upper(): value for key, value in data.items()})
+
+
+# Встроенные наборы коэффициентов
+TIRE_LIBRARY = {
+    'Дорожная 205/55 R16': TireModel('Дорожная 205/55 R16'),
+    'Спортивная 245/40 R18': TireModel('Спортивная 245/40 R18', FNOMIN=4500.0, UNLOADED_RADIUS=0.32,
+                                       PDX1=1.35, PDX2=-0.12, PKX1=25.0, PDY1=1.3, PDY2=-0.12,
+                                       PKY1=18.0),
+    'Слик': TireModel('Слик', FNOMIN=3500.0, UNLOADED_RADIUS=0.30, PCX1=1.5, PDX1=1.65, PDX2=-0.15,
+                      PEX1=0.5, PKX1=30.0, PCY1=1.4, PDY1=1.7, PDY2=-0.15, PKY1=22.0)
+}
+
+
+def traction_limited_force(traction_force, mass, tire, front_weight=55.0, cg_height=500.0,
+                           wheelbase=2600.0, drive='rwd', mu_scale=1.0, iterations=20):
+    """Тяговая сила старта, ограниченная сцеплением ведущих колес
+
+    Нагрузка на ведущую ось учитывает продольный перенос от ускорения
+    a = F / m, поэтому предел сцепления ищется итерациями; предел каждой
+    оси - удвоенная пиковая сила шины (tire.peak_fx) при нагрузке на
+    колесо. Параметры могут быть массивами. Возвращает ограниченную силу
+    (Н), предел сцепления ведущих осей (Н) и нагрузки на оси (Н).
+    """
+    g = 9.81
+    traction_force = np.asarray(traction_force, dtype=float)
+    static = np.array([front_weight / 100, 1 - front_weight / 100]) * mass * g
+    driven = {'rwd': np.array([0.0, 1.0]), 'fwd': np.array([1.0, 0.0]),
+              'awd': np.array([1.0, 1.0])}[drive]
+    transfer_arm = cg_height / wheelbase
+    force = traction_force
+    for _ in range(iterations):
+        transfer = force * transfer_arm
+        axle_load = np.maximum(static + np.stack([-transfer, transfer], axis=-1), 0.0)
+        grip = 2 * tire.peak_fx(axle_load / 2, mu_scale)[0]
+        limit = (grip * driven).sum(axis=-1)
+        force = np.minimum(traction_force, limit)
+    return {'force': force, 'grip_limit': limit, 'axle_load': axle_load}
+
+
+# ==================== СТАРТ С ПРОБУКСОВКОЙ ====================
+QUARTER_MILE_60FT = 18.288  # м
+
+
+def simulate_launch(launch_rpm, mass, torque_rpm, torque_nm, gear_ratios, final_drive, tire_radius,
+                    redline, tire, mu_scale=1.0, front_weight=55.0, cg_height=500.0, wheelbase=2600.0,
+                    drive='rwd', clutch_capacity=400.0, engage_time=0.3, engine_inertia=0.2,
+                    wheel_inertia=2.5, shift_time=0.2, grade=0.0, drag_area=0.77, rolling_resist=0.015,
+                    stall_rpm=600.0, shift_slip=0.15, efficiency=0.9, dt=0.002, max_time=20.0,
+                    trace_interval=0.02):
+    """Старт с места: пробуксовка сцепления и колес, перенос нагрузки, переключения
+
+    launch_rpm - массив оборотов старта, все варианты моделируются
+    одновременно. Сцепление замыкается линейно за engage_time до момента
+    clutch_capacity (Н·м) и блокируется, когда обороты двигателя падают до
+    оборотов вала. Пока сцепление не включено полностью, момент двигателя
+    ограничивается так, чтобы удерживать обороты старта (если полного
+    момента не хватает - обороты падают), затем двигатель работает на
+    полной нагрузке. Сила на
+    ведущих колесах - из шинной модели tire (TireModel) по скольжению и
+    нагрузке на ведущую ось с учетом продольного переноса и уклона grade
+    (%). Скорость колеса интегрируется полунеявно (линеаризация силы шины
+    по скольжению), что устойчиво при жесткой шине. Переключение - на
+    отсечке и только при скольжении ведущих колес не более shift_slip,
+    без тяги в течение shift_time; двигатель в это время вращается
+    свободно, а затем сцепление снова буксует до выравнивания оборотов.
+    Вариант, в котором обороты при замкнутом сцеплении падают ниже
+    stall_rpm, считается заглохшим.
+
+    Возвращает время на 60 футов и до 100 км/ч (NaN, если не достигнуто
+    или двигатель заглох), энергию буксования сцепления (Дж), признак
+    остановки двигателя и прореженные траектории.
+    """
+    g = 9.81
+    rho = 1.225
+    launch = np.asarray(launch_rpm, dtype=float)
+    n = launch.size
+    ratios = np.asarray(gear_ratios, dtype=float) * final_drive
+    theta = np.arctan(grade / 100)
+    arm = cg_height / wheelbase
+    share = front_weight / 100
+    # Статические нагрузки на оси на уклоне (подъем вперед)
+    static = mass * g * np.array([np.cos(theta) * share - np.sin(theta) * arm,
+                                  np.cos(theta) * (1 - share) + np.sin(theta) * arm])
+    driven = {'rwd': np.array([0.0, 1.0]), 'fwd': np.array([1.0, 0.0]),
+              'awd': np.array([1.0, 1.0])}[drive]
+    tires = 2 * driven.sum()
+    slope = -1.0 if drive == 'fwd' else (0.0 if drive == 'awd' else 1.0)  # знак переноса на ведущую ось
+    to_rad = 2 * np.pi / 60
+
+    omega_engine = launch * to_rad
+    omega_wheel = np.zeros(n)
+    v = np.zeros(n)
+    x = np.zeros(n)
+    accel = np.zeros(n)
+    gear = np.zeros(n, dtype=int)
+    locked = np.zeros(n, dtype=bool)
+    shift_timer = np.zeros(n)
+    clutch_energy = np.zeros(n)
+    stalled = np.zeros(n, dtype=bool)
+    time_60ft = np.full(n, np.nan)
+    time_100 = np.full(n, np.nan)
+
+    record_every = max(1, int(round(trace_interval / dt)))
+    trace = {'time': [], 'speed': [], 'rpm': [], 'slip': [], 'distance': []}
+
+    for step in range(int(max_time / dt) + 1):
+        t = step * dt
+        ratio = ratios[gear]
+        rpm = omega_engine / to_rad
+        engine_torque = np.where(rpm < redline,
+                                 np.interp(np.maximum(rpm, torque_rpm[0]), torque_rpm, torque_nm), 0.0)
+
+        axle_load = (static * driven).sum() + slope * mass * accel * arm
+        wheel_load = np.maximum(axle_load, 0.0) / tires
+        reference = np.maximum(v, 0.5)
+        slip = (omega_wheel * tire_radius - v) / reference
+        force = tires * tire.fx(slip, wheel_load, mu_scale)
+        stiffness = tires * (tire.fx(slip + 1e-3, wheel_load, mu_scale) -
+                             tire.fx(slip - 1e-3, wheel_load, mu_scale)) / 2e-3
+
+        if step % record_every == 0:
+            trace['time'].append(t)
+            trace['speed'].append(v * 3.6)
+            trace['rpm'].append(rpm)
+            trace['slip'].append(slip * 100)
+            trace['distance'].append(x.copy())
+
+        shifting = shift_timer > 0
+        clutch_torque = np.where(locked, engine_torque,
+                                 clutch_capacity * min(t / engage_time, 1.0) if engage_time > 0 else clutch_capacity)
+        clutch_torque = np.where(shifting, 0.0, clutch_torque)
+        if t < engage_time:
+            # Удержание оборотов старта до полного включения сцепления
+            hold_torque = clutch_torque + engine_inertia * (launch * to_rad - omega_engine) / dt
+            engine_torque = np.where(locked, engine_torque, np.clip(hold_torque, 0.0, engine_torque))
+        wheel_torque = clutch_torque * ratio * efficiency
+        inertia = wheel_inertia + np.where(locked & ~shifting, engine_inertia * ratio ** 2, 0.0)
+
+        # Полунеявный шаг скорости колеса
+        d_omega = dt * (wheel_torque - tire_radius * force) / \
+            (inertia + dt * tire_radius ** 2 * np.maximum(stiffness, 0.0) / reference)
+        omega_previous = omega_wheel
+        omega_wheel = np.maximum(omega_wheel + d_omega, 0.0)
+        force = force + stiffness * (omega_wheel - omega_previous) * tire_radius / reference * \
+            (stiffness > 0)
+
+        resistance = 0.5 * rho * drag_area * v ** 2 + rolling_resist * mass * g * np.cos(theta) + \
+            mass * g * np.sin(theta)
+        accel = (force - resistance) / mass
+        accel = np.where((v <= 0) & (accel < 0), 0.0, accel)  # удержание тормозом на подъеме
+        x_previous, v_previous = x, v
+        x = x + v * dt + 0.5 * accel * dt ** 2
+        v = np.maximum(v + accel * dt, 0.0)
+
+        # Двигатель: при буксовании сцепления и во время переключения вращается
+        # на собственной инерции, при замкнутом сцеплении - вместе с колесами
+        slipping = ~locked & ~shifting
+        clutch_speed = omega_wheel * ratio
+        clutch_energy += np.where(slipping, clutch_torque * np.maximum(omega_engine - clutch_speed, 0.0) * dt, 0.0)
+        omega_engine = np.where(locked, clutch_speed,
+                                omega_engine + dt * (engine_torque - clutch_torque) / engine_inertia)
+        omega_engine = np.minimum(omega_engine, redline * to_rad * 1.02)
+        # Блокировка с сохранением момента импульса двигателя и ведущей оси
+        engaging = slipping & (omega_engine <= clutch_speed)
+        reflected = wheel_inertia / ratio ** 2
+        common = (engine_inertia * omega_engine + reflected * clutch_speed) / (engine_inertia + reflected)
+        omega_wheel = np.where(engaging, common / ratio, omega_wheel)
+        locked = locked | engaging
+        omega_engine = np.where(locked, omega_wheel * ratio, omega_engine)
+
+        # Переключение на отсечке: сцепление выключается и после переключения
+        # снова буксует, пока обороты двигателя не сравняются с оборотами вала
+        shift_timer = np.maximum(shift_timer - dt, 0.0)
+        upshift = locked & (omega_engine >= redline * to_rad) & (gear < len(ratios) - 1) & \
+            (slip <= shift_slip)
+        gear = np.where(upshift, gear + 1, gear)
+        shift_timer = np.where(upshift, shift_time, shift_timer)
+        locked = locked & ~upshift
+
+        # Заглохание - только при замкнутом сцеплении
+        stalled = stalled | (locked & (omega_engine < stall_rpm * to_rad))
+        # Моменты пересечения отметок - с линейной интерполяцией внутри шага
+        time_60ft = np.where(np.isnan(time_60ft) & (x >= QUARTER_MILE_60FT),
+                             t + dt * (QUARTER_MILE_60FT - x_previous) / np.maximum(x - x_previous, 1e-9),
+                             time_60ft)
+        time_100 = np.where(np.isnan(time_100) & (v >= 100 / 3.6),
+                            t + dt * (100 / 3.6 - v_previous) / np.maximum(v - v_previous, 1e-9), time_100)
+        if (~np.isnan(time_100) | stalled).all() and (~np.isnan(time_60ft) | stalled).all():
+            break
+
+    return {
+        'launch_rpm': launch,
+        'time_60ft': np.where(stalled, np.nan, time_60ft),
+        'time_100': np.where(stalled, np.nan, time_100),
+        'clutch_energy': clutch_energy,
+        'stalled': stalled,
+        'time': np.array(trace['time']),
+        'speed': np.array(trace['speed']).T,
+        'rpm': np.array(trace['rpm']).T,
+        'slip': np.array(trace['slip']).T,
+        'distance': np.array(trace['distance']).T
+    }
+
+
+# ==================== МОДЕЛИРОВАНИЕ КРУГА ====================
+# Демонстрационная трасса: (длина участка, м; радиус, м - None для прямой; +1 левый, -1 правый)
+DEMO_TRACK = [
+    (600, None, 0), (90, 40, 1), (250, None, 0), (180, 120, -1), (120, None, 0),
+    (70, 25, 1), (70, 25, -1), (400, None, 0), (160, 60, 1), (200, 250, 1),
+    (300, None, 0), (110, 35, -1), (150, None, 0), (240, 80, 1), (420, None, 0),
+    (130, 45, 1)
+]
+
+DEFAULT_TORQUE_CURVE = "1000:160, 2000:200, 3000:230, 4000:245, 5000:240, 6000:220, 6500:205"
+
+
+def demo_track(ds=2.0):
+    """Кривизна по дистанции для DEMO_TRACK с шагом ds (м)"""
+    lengths = np.array([segment[0] for segment in DEMO_TRACK], dtype=float)
+    curvatures = np.array([0.0 if radius is None else side / radius for _, radius, side in DEMO_TRACK])
+    distance = np.arange(0, lengths.sum(), ds)
+    index = np.searchsorted(np.cumsum(lengths), distance, side='right')
+    return distance, curvatures[np.minimum(index, len(curvatures) - 1)]
+
+
+def read_csv_rows(file_name):
+    """Непустые строки CSV-файла; разделитель - запятая или точка с запятой"""
+    with open(file_name, 'r', encoding='utf-8') as f:
+        lines = [line for line in f.read().splitlines() if line.strip()]
+    if not lines:
+        raise ValueError("Файл не содержит данных")
+    delimiter = ';' if lines[0].count(';') > lines[0].count(',') else ','
+    return list(csv.reader(lines, delimiter=delimiter))
+
+
+def read_two_column_csv(file_name, names):
+    """Два столбца CSV как массив (n, 2)
+
+    Столбцы ищутся в заголовке по именам names; если первая строка -
+    числа, берутся два первых столбца.
+    """
+    rows = read_csv_rows(file_name)
+    columns = (0, 1)
+    try:
+        float(rows[0][0])
+    except ValueError:
+        header = [name.strip().lower() for name in rows[0]]
+        columns = tuple(header.index(name) for name in names)
+        rows = rows[1:]
+    return np.array([[float(row[columns[0]]), float(row[columns[1]])] for row in rows])
+
+
+def load_track_csv(file_name):
+    """Трасса из CSV: столбцы distance (м) и curvature (1/м)
+
+    Без заголовка берутся два первых столбца. Разделитель - запятая или
+    точка с запятой.
+    """
+    data = read_two_column_csv(file_name, ('distance', 'curvature'))
+    order = np.argsort(data[:, 0], kind='stable')
+    if len(data) < 2:
+        raise ValueError("В файле трассы меньше двух точек")
+    return data[order, 0] - data[order[0], 0], data[order, 1]
+
+
+def parse_torque_curve(text):
+    """Характеристика момента из строки «об/мин:Н·м, ...»"""
+    points = []
+    for item in text.replace(';', ',').split(','):
+        if item.strip():
+            rpm, torque = item.split(':')
+            points.append((float(rpm), float(torque)))
+    if len(points) < 2:
+        raise ValueError("Характеристика момента должна содержать не менее двух точек")
+    points.sort()
+    return np.array([p[0] for p in points]), np.array([p[1] for p in points])
+
+
+def engine_force_table(speeds, torque_rpm, torque_nm, gear_ratios, final_drive, tire_radius,
+                       redline, efficiency=0.9):
+    """Максимальная тяговая сила на колесах и лучшая передача для каждой скорости (м/с)
+
+    Ниже минимальных оборотов характеристики момент берется по первой
+    точке (пробуксовка сцепления), выше отсечки передача недоступна.
+    Возвращает силу (Н) и номер передачи (с 1).
+    """
+    ratios = np.asarray(gear_ratios, dtype=float)[None, :] * final_drive
+    rpm = np.asarray(speeds, dtype=float)[:, None] / tire_radius * ratios * 60 / (2 * np.pi)
+    torque = np.interp(np.maximum(rpm, torque_rpm[0]), torque_rpm, torque_nm)
+    force = np.where(rpm <= redline, torque * ratios * efficiency / tire_radius, 0.0)
+    gear = np.argmax(force, axis=1)
+    return force[np.arange(len(gear)), gear], gear + 1
+
+
+def simulate_lap(distance, curvature, mass, torque_rpm, torque_nm, gear_ratios, final_drive,
+                 tire_radius, redline, brake_force=None, ds=2.0, drivetrain_efficiency=0.9,
+                 n_speeds=80, **vehicle):
+    """Время круга по методу прямого и обратного прохода для точечной массы
+
+    Трасса задается кривизной (1/м) по дистанции (м) и передискретизируется
+    с шагом ds. Пределы сцепления берутся из огибающей g-g
+    (cached_gg_envelope, параметры vehicle), тяга - из характеристики
+    момента и передаточных чисел, brake_force (Н) - предел тормозных
+    механизмов. Для каждой точки трассы заранее векторно строятся таблицы
+    допустимых ускорения и замедления по сетке скоростей, поэтому проходы
+    сводятся к скалярной интерполяции. Круг считается «летящим»: скорость
+    на старте равна скорости на финише.
+
+    Возвращает время круга (с) и по дистанции скорость (км/ч), передачу,
+    продольное ускорение (g), время и накопленную энергию торможения (кДж).
+    """
+    g = 9.81
+    distance = np.asarray(distance, dtype=float)
+    points = np.arange(distance[0], distance[-1], ds)
+    kappa = np.abs(np.interp(points, distance, np.asarray(curvature, dtype=float)))
+    n = len(points)
+
+    top_speed = redline * 2 * np.pi / 60 * tire_radius / (min(gear_ratios) * final_drive)
+    speed_grid = np.linspace(1.0, top_speed * 1.02, n_speeds)  # м/с
+    envelope = cached_gg_envelope(mass, speed_grid * 3.6, power=None, **vehicle)
+    engine_force, best_gear = engine_force_table(speed_grid, torque_rpm, torque_nm, gear_ratios,
+                                                 final_drive, tire_radius, redline, drivetrain_efficiency)
+    rho = 1.225
+    resistance = 0.5 * rho * vehicle.get('drag_area', 0.77) * speed_grid ** 2 + \
+        vehicle.get('rolling_resist', 0.015) * mass * g
+    engine_accel = (engine_force - resistance) / mass
+
+    # Предельная скорость в повороте: наибольшая скорость сетки, где хватает бокового сцепления
+    lateral_limit = envelope['max_lateral'][None, :] * g >= speed_grid[None, :] ** 2 * kappa[:, None]
+    reachable = np.where(lateral_limit, speed_grid[None, :], 0.0).max(axis=1)
+    speed_limit = np.where(kappa > 0, np.maximum(reachable, speed_grid[0]), speed_grid[-1])
+
+    # Допустимые ускорение и замедление (м/с²) в каждой точке для каждой скорости сетки
+    accel_table = np.empty((n, n_speeds))
+    brake_table = np.empty((n, n_speeds))
+    half = len(envelope['angles']) // 2
+    for j in range(n_speeds):
+        lateral = speed_grid[j] ** 2 * kappa / g
+        ay_accel = np.maximum.accumulate(envelope['ay'][j, :half + 1])
+        ay_brake = np.maximum.accumulate(envelope['ay'][j, half:][::-1])
+        tire_accel = np.interp(lateral, ay_accel, envelope['ax'][j, :half + 1], right=0.0) * g
+        tire_brake = -np.interp(lateral, ay_brake, envelope['ax'][j, half:][::-1], right=0.0) * g
+        accel_table[:, j] = np.minimum(tire_accel, engine_accel[j])
+        if brake_force is not None:
+            tire_brake = np.minimum(tire_brake, (brake_force + resistance[j]) / mass)
+        brake_table[:, j] = tire_brake
+
+    step = speed_grid[1] - speed_grid[0]
+
+    def lookup(table, i, v):
+        position = min(max((v - speed_grid[0]) / step, 0.0), n_speeds - 1.000001)
+        j = int(position)
+        fraction = position - j
+        return table[i, j] * (1 - fraction) + table[i, j + 1] * fraction
+
+    limit = speed_limit.tolist()
+
+    def forward(start):
+        v = np.empty(n)
+        v[0] = min(start, limit[0])
+        for i in range(n - 1):
+            accel = max(lookup(accel_table, i, v[i]), 0.0)
+            v[i + 1] = min((v[i] ** 2 + 2 * accel * ds) ** 0.5, limit[i + 1])
+        return v
+
+    def backward(end):
+        v = np.empty(n)
+        v[-1] = min(end, limit[-1])
+        for i in range(n - 1, 0, -1):
+            decel = max(lookup(brake_table, i, v[i]), 0.0)
+            v[i - 1] = min((v[i] ** 2 + 2 * decel * ds) ** 0.5, limit[i - 1])
+        return v
+
+    # Первый проход со стартовой скоростью из предела, затем - замыкание круга
+    speed = np.minimum(forward(limit[0]), backward(limit[-1]))
+    speed = np.minimum(forward(speed[-1]), backward(speed[0]))
+
+    dt = 2 * ds / (speed[1:] + speed[:-1])
+    time = np.concatenate([[0.0], np.cumsum(dt)])
+    accel = np.concatenate([(speed[1:] ** 2 - speed[:-1] ** 2) / (2 * ds), [0.0]])
+    drag = np.interp(speed, speed_grid, resistance)
+    brake_power_force = np.maximum(-accel * mass - drag, 0.0)
+    brake_energy = np.concatenate([[0.0], np.cumsum(brake_power_force[:-1] * ds)]) / 1000
+    gear = np.interp(speed, speed_grid, best_gear).round().astype(int)
+
+    return {
+        'lap_time': float(time[-1] + ds / speed[-1]),
+        'distance': points,
+        'speed': speed * 3.6,
+        'gear': gear,
+        'accel': accel / g,
+        'time': time,
+        'brake_energy': brake_energy,
+        'speed_limit': speed_limit * 3.6
+    }
+
+
+# ==================== ЕЗДОВЫЕ ЦИКЛЫ И РАСХОД ТОПЛИВА ====================
+# Городской цикл ECE-15: (время, с; скорость, км/ч) в узловых точках
+ECE15_POINTS = [
+    (0, 0), (11, 0), (15, 15), (23, 15), (25, 10), (28, 0), (49, 0), (54, 15), (56, 15),
+    (61, 32), (85, 32), (93, 10), (96, 0), (117, 0), (122, 15), (124, 15), (133, 35),
+    (135, 35), (143, 50), (155, 50), (163, 35), (176, 35), (185, 10), (188, 0), (195, 0)
+]
+# Загородный цикл EUDC
+EUDC_POINTS = [
+    (0, 0), (20, 0), (41, 70), (91, 70), (99, 50), (168, 50), (181, 70), (231, 70),
+    (266, 100), (296, 100), (316, 120), (326, 120), (342, 80), (350, 50), (376, 0), (400, 0)
+]
+# Фазы WLTC класса 3 (приближение микропоездками): (макс. скорость, км/ч; время
+# движения с постоянной скоростью, с; стоянка после поездки, с)
+WLTC_PHASES = {
+    'Low': [(25, 10, 50), (45, 40, 45), (56.5, 30, 45), (30, 20, 40), (50, 69, 40), (20, 10, 45)],
+    'Medium': [(60, 40, 25), (76.6, 48, 25), (50, 40, 20), (70, 50, 16)],
+    'High': [(80, 55, 13), (97.4, 50, 10), (70, 50, 10), (90, 40, 5)],
+    'Extra High': [(100, 40, 0), (131.3, 127, 3)]
+}
+
+DRIVE_CYCLES = {
+    'nedc': 'NEDC',
+    'wltc': 'WLTC класс 3 (приближенный)'
+}
+
+
+def cycle_from_points(points):
+    """Скорость (км/ч) с шагом 1 с по узловым точкам (время, скорость)"""
+    times = np.array([p[0] for p in points], dtype=float)
+    speeds = np.array([p[1] for p in points], dtype=float)
+    grid = np.arange(0, times[-1] + 1)
+    return grid, np.interp(grid, times, speeds)
+
+
+def micro_trip(peak, cruise, idle, accel=0.8, decel=0.9):
+    """Узловые точки одной поездки: разгон, движение с постоянной скоростью, торможение, стоянка"""
+    v = peak / 3.6
+    t_accel = round(v / accel)
+    t_decel = round(v / decel)
+    return [(t_accel, peak), (t_accel + cruise, peak), (t_accel + cruise + t_decel, 0),
+            (t_accel + cruise + t_decel + idle, 0)]
+
+
+def drive_cycle(name):
+    """Встроенный цикл: NEDC (4 × ECE-15 + EUDC) или приближенный WLTC класса 3
+
+    Точная таблица WLTC (1800 с) не входит в программу - для сертификационного
+    расчета загрузите ее из CSV (load_cycle_csv).
+    """
+    if name == 'nedc':
+        points = []
+        for repeat in range(4):
+            points += [(t + 195 * repeat, v) for t, v in ECE15_POINTS]
+        points += [(t + 780, v) for t, v in EUDC_POINTS]
+    elif name == 'wltc':
+        points, start = [(0, 0), (11, 0)], 11
+        for phase in WLTC_PHASES.values():
+            for peak, cruise, idle in phase:
+                trip = micro_trip(peak, cruise, idle)
+                points += [(start + t, v) for t, v in trip]
+                start += trip[-1][0]
+    else:
+        raise ValueError(f"Неизвестный цикл: {name}")
+    unique = {}
+    for t, v in points:
+        unique[t] = v
+    return cycle_from_points(sorted(unique.items()))
+
+
+def load_cycle_csv(file_name):
+    """Цикл из CSV: столбцы time (с) и speed (км/ч), передискретизация на 1 Гц"""
+    data = read_two_column_csv(file_name, ('time', 'speed'))
+    if len(data) < 2:
+        raise ValueError("В файле цикла меньше двух точек")
+    data = data[np.argsort(data[:, 0], kind='stable')]
+    grid = np.arange(data[0, 0], data[-1, 0] + 1)
+    return grid - grid[0], np.maximum(np.interp(grid, data[:, 0], data[:, 1]), 0.0)
+
+
+def default_bsfc(rpm, torque, torque_rpm, torque_nm, bsfc_min=245.0):
+    """Приближенная карта удельного расхода, г/(кВт·ч)
+
+    Минимум bsfc_min при ~75% момента и ~45% диапазона оборотов, рост
+    при малых нагрузках (насосные потери) и на краях диапазона оборотов.
+    """
+    full_load = np.interp(rpm, torque_rpm, torque_nm)
+    load = np.clip(torque / np.maximum(full_load, 1e-9), 0.02, 1.0)
+    speed = (rpm - torque_rpm[0]) / (torque_rpm[-1] - torque_rpm[0])
+    return bsfc_min * (1 + 0.9 * (1 - load) ** 3 / load ** 0.6 * 0.35 + 0.25 * (load - 0.75) ** 2
+                       + 0.15 * (speed - 0.45) ** 2)
+
+
+def simulate_drive_cycle(time, speed, mass, gear_ratios, final_drive, tire_radius, torque_rpm, torque_nm,
+                         drag_area=0.77, rolling_resist=0.015, bsfc=None, idle_rpm=800.0,
+                         upshift_rpm=1500.0, redline=6500.0, idle_fuel=0.25, fuel_density=0.745,
+                         efficiency=0.9, rotating_mass=1.05, chunk_size=600, keep_trace=True):
+    """Расход топлива в ездовом цикле для множества конфигураций сразу
+
+    mass, final_drive, tire_radius и drag_area могут быть массивами одной
+    формы (конфигурации). Цикл обрабатывается блоками по chunk_size
+    отсчетов: на каждом отсчете выбирается самая высокая передача, на
+    которой обороты не ниже upshift_rpm и момента хватает на требуемую
+    мощность, затем определяются рабочая точка двигателя и расход по
+    карте bsfc(rpm, torque) (г/(кВт·ч), по умолчанию default_bsfc). При
+    торможении подача отключается, на стоянке - холостой ход idle_fuel (г/с).
+
+    Возвращает для каждой конфигурации расход топлива (г), путь (км) и
+    л/100 км, а при keep_trace - посекундные передачу, обороты, момент и
+    расход (г/с) формы (конфигурации, отсчеты).
+    """
+    g = 9.81
+    rho = 1.225
+    if bsfc is None:
+        def bsfc(rpm, torque):
+            return default_bsfc(rpm, torque, torque_rpm, torque_nm)
+    configs = np.broadcast_arrays(*[np.atleast_1d(np.asarray(v, dtype=float))
+                                    for v in (mass, final_drive, tire_radius, drag_area)])
+    mass, final_drive, tire_radius, drag_area = [c[:, None] for c in configs]
+    n_configs = mass.shape[0]
+    ratios = np.asarray(gear_ratios, dtype=float)
+    v_all = np.asarray(speed, dtype=float) / 3.6
+    dt_all = np.diff(np.asarray(time, dtype=float), append=time[-1] + 1)
+    accel_all = np.gradient(v_all, np.asarray(time, dtype=float))
+
+    fuel = np.zeros(n_configs)
+    distance = np.zeros(n_configs)
+    trace = {key: [] for key in ('gear', 'rpm', 'torque', 'fuel_rate')}
+    to_rpm = 60 / (2 * np.pi)
+
+    for start in range(0, len(v_all), chunk_size):
+        v = v_all[None, start:start + chunk_size]
+        accel = accel_all[None, start:start + chunk_size]
+        dt = dt_all[None, start:start + chunk_size]
+
+        wheel_force = rotating_mass * mass * accel + 0.5 * rho * drag_area * v ** 2 + \
+            np.where(v > 0, rolling_resist * mass * g, 0.0)
+        wheel_power = wheel_force * v
+        engine_power = np.maximum(wheel_power, 0.0) / efficiency
+
+        # Обороты и доступный момент на каждой передаче: (конфигурации, отсчеты, передачи)
+        rpm = (v / tire_radius)[..., None] * (ratios * final_drive[..., None]) * to_rpm
+        usable = np.maximum(rpm, idle_rpm)
+        torque = engine_power[..., None] / (usable / to_rpm)
+        available = np.interp(usable, torque_rpm, torque_nm)
+        feasible = (rpm >= upshift_rpm) & (rpm <= redline) & (torque <= available)
+        feasible[..., 0] |= ~feasible.any(axis=-1)  # на малой скорости - первая передача
+        gear = len(ratios) - 1 - np.argmax(feasible[..., ::-1], axis=-1)
+
+        engine_rpm = np.take_along_axis(usable, gear[..., None], axis=-1)[..., 0]
+        engine_torque = np.take_along_axis(torque, gear[..., None], axis=-1)[..., 0]
+        moving = v > 0
+        fuel_rate = np.where(engine_power > 0, bsfc(engine_rpm, engine_torque) * engine_power / 3.6e6, 0.0)
+        fuel_rate = np.where(moving, fuel_rate, idle_fuel)
+        fuel_rate = np.where(moving & (wheel_power <= 0), 0.0, fuel_rate)  # отключение подачи
+        engine_rpm = np.where(moving, engine_rpm, idle_rpm)
+
+        fuel += (fuel_rate * dt).sum(axis=1)
+        distance += np.broadcast_to(v * dt, fuel_rate.shape).sum(axis=1)
+        if keep_trace:
+            trace['gear'].append(np.where(moving, gear + 1, 0))
+            trace['rpm'].append(engine_rpm)
+            trace['torque'].append(np.where(moving, engine_torque, 0.0))
+            trace['fuel_rate'].append(fuel_rate)
+
+    result = {
+        'fuel': fuel,
+        'distance': distance / 1000,
+        'consumption': fuel / 1000 / fuel_density / np.maximum(distance / 1000, 1e-9) * 100
+    }
+    if keep_trace:
+        result.update({key: np.concatenate(value, axis=1) for key, value in trace.items()})
+    return result
+
+
+# ==================== КАРТА УДЕЛЬНОГО РАСХОДА ====================
+class EngineMap:
+    """Карта двигателя (по умолчанию - удельный расход, г/(кВт·ч)) на сетке обороты × момент
+
+    Оси и значения хранятся в float32. Поиск - билинейная интерполяция с
+    ограничением по краям сетки, вычисляется векторно для массивов любой
+    формы. Ячейки без данных (NaN) при построении заполняются ближайшими.
+    """
+
+    axis_labels = ("Обороты, об/мин", "Момент, Н·м")
+    label_format = '%.0f'
+
+    def __init__(self, rpm_axis, torque_axis, values, name="", full_load=None):
+        self.rpm = np.asarray(rpm_axis, dtype=np.float32)
+        self.torque = np.asarray(torque_axis, dtype=np.float32)
+        self.values = np.asarray(values, dtype=np.float32)
+        if self.values.shape != (len(self.rpm), len(self.torque)):
+            raise ValueError("Размер карты не совпадает с осями")
+        if len(self.rpm) < 2 or len(self.torque) < 2:
+            raise ValueError("Карта должна содержать не менее двух значений по каждой оси")
+        if np.any(np.diff(self.rpm) <= 0) or np.any(np.diff(self.torque) <= 0):
+            raise ValueError("Оси карты должны возрастать")
+        self.name = name
+        # Внешняя характеристика: (обороты, максимальный момент) или None
+        self.full_load = None if full_load is None else tuple(np.asarray(a, dtype=np.float32) for a in full_load)
+
+    @staticmethod
+    def locate(axis, x):
+        """Индекс левого узла и доля интервала для билинейной интерполяции"""
+        x = np.clip(np.asarray(x, dtype=float), axis[0], axis[-1])
+        index = np.clip(np.searchsorted(axis, x, side='right') - 1, 0, len(axis) - 2)
+        return index, (x - axis[index]) / (axis[index + 1] - axis[index])
+
+    def lookup(self, rpm, torque):
+        """Значение карты в точках (rpm, torque)"""
+        i, u = self.locate(self.rpm, rpm)
+        j, w = self.locate(self.torque, torque)
+        v = self.values
+        return ((1 - u) * (1 - w) * v[i, j] + u * (1 - w) * v[i + 1, j] +
+                (1 - u) * w * v[i, j + 1] + u * w * v[i + 1, j + 1])
+
+    def __call__(self, rpm, torque):
+        return self.lookup(rpm, torque)
+
+    def grid(self, n_rpm=60, n_torque=60):
+        """Сетка рабочих точек внутри внешней характеристики (обороты, момент, маска)"""
+        rpm, torque = np.meshgrid(np.linspace(self.rpm[0], self.rpm[-1], n_rpm),
+                                  np.linspace(self.torque[0], self.torque[-1], n_torque), indexing='ij')
+        inside = np.ones(rpm.shape, dtype=bool)
+        if self.full_load is not None:
+            inside = torque <= np.interp(rpm, *self.full_load)
+        return rpm, torque, inside
+
+    def efficiency(self, rpm, torque, fuel_energy=42.7):
+        """Эффективный КПД (%) по удельному расходу и теплоте сгорания (МДж/кг)"""
+        return 3600 / (self.lookup(rpm, torque) * fuel_energy) * 100
+
+    def fuel_flow(self, rpm, torque):
+        """Часовой расход топлива, кг/ч"""
+        power_kw = np.asarray(rpm) * np.asarray(torque) / 9549
+        return self.lookup(rpm, torque) * np.maximum(power_kw, 0.0) / 1000
+
+    @classmethod
+    def from_points(cls, rpm, torque, values, rpm_axis=None, torque_axis=None, name="", full_load=None):
+        """Карта по разрозненным точкам (например, записи стенда)
+
+        Точки усредняются в ячейках ближайших узлов сетки, пустые узлы
+        заполняются значением ближайшего заполненного (в нормированных
+        координатах).
+        """
+        rpm, torque, values = [np.asarray(a, dtype=float).ravel() for a in (rpm, torque, values)]
+        valid = np.isfinite(values) & (values > 0)
+        rpm, torque, values = rpm[valid], torque[valid], values[valid]
+        if len(values) < 4:
+            raise ValueError("Для построения карты нужно не менее четырех точек")
+        if rpm_axis is None:
+            rpm_axis = np.linspace(rpm.min(), rpm.max(), 16)
+        if torque_axis is None:
+            torque_axis = np.linspace(torque.min(), torque.max(), 16)
+        rpm_axis, torque_axis = np.asarray(rpm_axis, dtype=float), np.asarray(torque_axis, dtype=float)
+
+        i = np.abs(rpm[:, None] - rpm_axis[None, :]).argmin(axis=1)
+        j = np.abs(torque[:, None] - torque_axis[None, :]).argmin(axis=1)
+        shape = (len(rpm_axis), len(torque_axis))
+        sums = np.bincount(i * shape[1] + j, values, shape[0] * shape[1])
+        counts = np.bincount(i * shape[1] + j, None, shape[0] * shape[1])
+        filled = counts > 0
+        grid = np.where(filled, sums / np.maximum(counts, 1), np.nan)
+
+        # Заполнение пустых узлов ближайшими
+        if not filled.all():
+            gi, gj = np.divmod(np.arange(grid.size), shape[1])
+            coords = np.stack([gi / max(shape[0] - 1, 1), gj / max(shape[1] - 1, 1)], axis=1)
+            distance = ((coords[~filled][:, None, :] - coords[filled][None, :, :]) ** 2).sum(axis=-1)
+            grid[~filled] = grid[filled][distance.argmin(axis=1)]
+
+        if full_load is None:
+            peak = np.zeros(shape[0])
+            np.maximum.at(peak, i, torque)
+            full_load = (rpm_axis[peak > 0], peak[peak > 0])
+        return cls(rpm_axis, torque_axis, grid.reshape(shape), name, full_load)
+
+    @classmethod
+    def from_torque_curve(cls, torque_rpm, torque_nm, bsfc_min=245.0, name="", n_rpm=16, n_torque=16):
+        """Приближенная карта по внешней характеристике (default_bsfc)"""
+        rpm_axis = np.linspace(torque_rpm[0], torque_rpm[-1], n_rpm)
+        torque_axis = np.linspace(0, max(torque_nm) * 1.05, n_torque)[1:]
+        rpm, torque = np.meshgrid(rpm_axis, torque_axis, indexing='ij')
+        values = default_bsfc(rpm, torque, torque_rpm, torque_nm, bsfc_min)
+        return cls(rpm_axis, torque_axis, values, name, (torque_rpm, torque_nm))
+
+    @classmethod
+    def from_csv(cls, file_name):
+        """Карта из CSV
+
+        Поддерживаются два вида файла: таблица (первая строка - значения
+        момента, первый столбец - обороты) и журнал стенда со столбцами
+        rpm, torque и bsfc (г/(кВт·ч)) или fuel_flow (кг/ч).
+        """
+        rows = read_csv_rows(file_name)
+        name = os.path.splitext(os.path.basename(file_name))[0]
+        header = [cell.strip().lower() for cell in rows[0]]
+
+        if 'rpm' in header and 'torque' in header:
+            data = np.array([[float(cell) if cell.strip() else np.nan for cell in row] for row in rows[1:]])
+            rpm = data[:, header.index('rpm')]
+            torque = data[:, header.index('torque')]
+            if 'bsfc' in header:
+                values = data[:, header.index('bsfc')]
+            elif 'fuel_flow' in header:
+                power_kw = rpm * torque / 9549
+                values = data[:, header.index('fuel_flow')] * 1000 / np.where(power_kw > 0, power_kw, np.nan)
+            else:
+                raise ValueError("В журнале нет столбца bsfc или fuel_flow")
+            return cls.from_points(rpm, torque, values, name=name)
+
+        torque_axis = [float(cell) for cell in rows[0][1:] if cell.strip()]
+        rpm_axis = [float(row[0]) for row in rows[1:]]
+        values = [[float(cell) for cell in row[1:len(torque_axis) + 1]] for row in rows[1:]]
+        return cls(rpm_axis, torque_axis, values, name)
+
+    def save(self, file_name):
+        """Компактное сохранение в .npz"""
+        arrays = {'rpm': self.rpm, 'torque': self.torque, 'values': self.values}
+        if self.full_load is not None:
+            arrays.update({'full_load_rpm': self.full_load[0], 'full_load_torque': self.full_load[1]})
+        np.savez_compressed(file_name, name=np.array(self.name), **arrays)
+
+    @classmethod
+    def load(cls, file_name):
+        with np.load(file_name) as data:
+            full_load = (data['full_load_rpm'], data['full_load_torque']) if 'full_load_rpm' in data else None
+            return cls(data['rpm'], data['torque'], data['values'], str(data['name']), full_load)
+
+    def plot(self, ax, values=None, levels=15, title=None):
+        """Контурная карта values (по умолчанию - удельный расход) на сетке grid()"""
+        rpm, torque, inside = self.grid()
+        values = self.lookup(rpm, torque) if values is None else values
+        contour = ax.contourf(rpm, torque, np.where(inside, values, np.nan), levels=levels, cmap='viridis')
+        lines = ax.contour(rpm, torque, np.where(inside, values, np.nan), levels=levels,
+                           colors='k', linewidths=0.4)
+        ax.clabel(lines, fontsize=6, fmt=self.label_format)
+        if self.full_load is not None:
+            ax.plot(*self.full_load, color='red', linewidth=1.5)
+        ax.set_xlabel(self.axis_labels[0])
+        ax.set_ylabel(self.axis_labels[1])
+        if title:
+            ax.set_title(title, fontsize=9)
+        return contour
+
+
+# ==================== ТАБЛИЦА НАПОЛНЕНИЯ ПО ЖУРНАЛУ ====================
+# Допустимые названия столбцов журнала ЭБУ (без учета регистра)
+LOG_COLUMNS = {
+    'rpm': ('rpm', 'engine_speed', 'обороты'),
+    'map': ('map', 'map_kpa', 'manifold_pressure'),
+    'iat': ('iat', 'intake_temp', 'iat_c'),
+    'maf': ('maf', 'maf_gs', 'mass_air_flow'),
+    'afr': ('afr', 'afr_measured', 'wideband'),
+    'afr_target': ('afr_target', 'target_afr'),
+    've': ('ve', 've_current')
+}
+
+
+class VETable(EngineMap):
+    """Таблица наполнения (доля от рабочего объема) на сетке обороты × давление во впуске, кПа"""
+
+    axis_labels = ("Обороты, об/мин", "Давление во впуске, кПа")
+    label_format = '%.2f'
+
+    def air_flow(self, rpm, pressure, displacement):
+        """Расход воздуха (кг/ч) - engine_air_flow_model с поправкой на давление во впуске"""
+        ve = self.lookup(rpm, pressure)
+        return engine_air_flow_model(displacement, rpm, ve)['air_flow'] * np.asarray(pressure) / 101.325
+
+
+def read_log_chunks(file_name, chunk_size=200000, progress_callback=None):
+    """Потоковое чтение журнала CSV блоками по chunk_size строк
+
+    Генератор словарей {столбец: массив} для столбцов LOG_COLUMNS, найденных
+    в заголовке; в памяти одновременно находится только один блок.
+    """
+    total = max(os.path.getsize(file_name), 1)
+    with open(file_name, 'r', encoding='utf-8-sig', newline='') as f:
+        header_line = f.readline()
+        delimiter = ';' if header_line.count(';') > header_line.count(',') else ','
+        header = [cell.strip().lower() for cell in header_line.strip().split(delimiter)]
+        columns = {}
+        for key, aliases in LOG_COLUMNS.items():
+            for alias in aliases:
+                if alias in header:
+                    columns[key] = header.index(alias)
+                    break
+        if 'rpm' not in columns or 'map' not in columns:
+            raise ValueError("В журнале нет столбцов rpm и map")
+
+        done = len(header_line)
+        while True:
+            lines = list(itertools.islice(f, chunk_size))
+            if not lines:
+                break
+            done += sum(len(line) for line in lines)
+            data = np.loadtxt(lines, delimiter=delimiter, usecols=list(columns.values()), ndmin=2)
+            yield {key: data[:, index] for index, key in enumerate(columns)}
+            if progress_callback:
+                progress_callback(min(int(done * 100 / total), 100))
+
+
+def fit_ve_table(chunks, rpm_axis, map_axis, displacement, base=0.85, target_afr=14.7,
+                 min_weight=3.0, ve_limits=(0.2, 1.6), is_cancelled=None):
+    """Таблица наполнения по блокам журнала (read_log_chunks)
+
+    Наполнение каждой записи определяется по расходомеру (maf, г/с) и
+    плотности воздуха во впуске или, если расходомера нет, коррекцией
+    исходного наполнения по измеренному AFR: VE · AFR / AFR_цель. Исходное
+    наполнение - столбец ve журнала или base (VETable или число). Запись
+    распределяется по четырем соседним узлам с билинейными весами, узлы с
+    суммарным весом меньше min_weight сохраняют исходное значение.
+
+    Возвращает таблицу, суммарные веса узлов, число прочитанных и
+    использованных записей.
+    """
+    rpm_axis = np.asarray(rpm_axis, dtype=float)
+    map_axis = np.asarray(map_axis, dtype=float)
+    size = len(rpm_axis) * len(map_axis)
+    sums, weights = np.zeros(size), np.zeros(size)
+    rows = used = 0
+
+    def base_ve(rpm, pressure):
+        return base.lookup(rpm, pressure) if isinstance(base, EngineMap) else np.full(np.shape(rpm), float(base))
+
+    for chunk in chunks:
+        if is_cancelled and is_cancelled():
+            break
+        rpm, pressure = chunk['rpm'], chunk['map']
+        if 'maf' in chunk:
+            temperature = chunk.get('iat', 25.0)
+            density = pressure * 1000 / (287.05 * (temperature + 273.15))  # кг/м³
+            ve = chunk['maf'] / 1000 / (displacement / 1000 * rpm / 120 * density)
+        elif 'afr' in chunk:
+            current = chunk['ve'] if 've' in chunk else base_ve(rpm, pressure)
+            ve = current * chunk['afr'] / chunk.get('afr_target', target_afr)
+        else:
+            raise ValueError("В журнале нет столбца maf или afr")
+
+        rows += len(rpm)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            valid = (np.isfinite(ve) & (ve >= ve_limits[0]) & (ve <= ve_limits[1]) &
+                     (rpm >= rpm_axis[0]) & (rpm <= rpm_axis[-1]) &
+                     (pressure >= map_axis[0]) & (pressure <= map_axis[-1]))
+        used += int(valid.sum())
+        i, u = EngineMap.locate(rpm_axis, rpm[valid])
+        j, w = EngineMap.locate(map_axis, pressure[valid])
+        ve = ve[valid]
+        for di, dj, weight in ((0, 0, (1 - u) * (1 - w)), (1, 0, u * (1 - w)),
+                               (0, 1, (1 - u) * w), (1, 1, u * w)):
+            flat = (i + di) * len(map_axis) + j + dj
+            weights += np.bincount(flat, weight, size)
+            sums += np.bincount(flat, weight * ve, size)
+
+    grid_rpm, grid_map = np.meshgrid(rpm_axis, map_axis, indexing='ij')
+    fitted = np.where(weights >= min_weight, sums / np.maximum(weights, 1e-12),
+                      base_ve(grid_rpm, grid_map).ravel())
+    shape = (len(rpm_axis), len(map_axis))
+    return VETable(rpm_axis, map_axis, fitted.reshape(shape)), weights.reshape(shape), rows, used
+
+
+# ==================== НАДДУВ И КАРТА КОМПРЕССОРА ====================
+def corrected_flow(mass_flow, ambient_pressure=101.325, ambient_temp=20.0):
+    """Приведенный расход через компрессор (кг/с) к 298 К и 100 кПа"""
+    return mass_flow * np.sqrt((ambient_temp + 273.15) / 298.15) / (ambient_pressure / 100.0)
+
+
+class CompressorMap:
+    """Карта компрессора: степень повышения давления от приведенного расхода (кг/с)
+
+    Граница помпажа и линия запирания задаются точками (расход, степень
+    повышения давления), острова КПД - точками (расход, степень, КПД).
+    КПД между точками - обратно взвешенное по расстоянию среднее в
+    нормированных координатах, вычисляется векторно.
+    """
+
+    def __init__(self, surge, choke, islands, name=""):
+        self.surge = self._line(surge)
+        self.choke = self._line(choke)
+        self.islands = np.asarray(islands, dtype=float).reshape(-1, 3)
+        if len(self.surge[0]) < 2 or len(self.choke[0]) < 2 or len(self.islands) < 3:
+            raise ValueError("Карта должна содержать границу помпажа, линию запирания и острова КПД")
+        if self.islands[:, 2].max() > 1:
+            self.islands[:, 2] /= 100  # КПД в процентах
+        self.scale = self.islands[:, :2].max(axis=0)
+        self.name = name
+
+    @staticmethod
+    def _line(points):
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        points = points[np.argsort(points[:, 1])]
+        return points[:, 0], points[:, 1]
+
+    def efficiency(self, flow, pressure_ratio):
+        flow, pressure_ratio = np.broadcast_arrays(np.asarray(flow, dtype=float),
+                                                   np.asarray(pressure_ratio, dtype=float))
+        points = np.stack([flow, pressure_ratio], axis=-1)[..., None, :] / self.scale
+        distance = ((points - self.islands[:, :2] / self.scale) ** 2).sum(axis=-1)
+        weight = 1 / (distance + 1e-9)
+        return (weight * self.islands[:, 2]).sum(axis=-1) / weight.sum(axis=-1)
+
+    def surge_margin(self, flow, pressure_ratio):
+        """Запас по помпажу, % - насколько расход больше расхода на границе при той же степени"""
+        surge_flow = np.interp(pressure_ratio, self.surge[1], self.surge[0])
+        return (np.asarray(flow) - surge_flow) / np.asarray(flow) * 100
+
+    def choke_margin(self, flow, pressure_ratio):
+        """Запас по запиранию, % - насколько расход меньше расхода запирания"""
+        choke_flow = np.interp(pressure_ratio, self.choke[1], self.choke[0])
+        return (choke_flow - np.asarray(flow)) / choke_flow * 100
+
+    @classmethod
+    def from_csv(cls, file_name):
+        """Карта из CSV со столбцами type (surge, choke или island), flow, pr, efficiency"""
+        rows = read_catalog_csv(file_name)
+        parts = {'surge': [], 'choke': [], 'island': []}
+        for row in rows:
+            kind = row['type'].strip().lower()
+            if kind not in parts:
+                raise ValueError(f"Неизвестный тип точки: {kind}")
+            point = [float(row['flow']), float(row['pr'])]
+            if kind == 'island':
+                point.append(float(row['efficiency']))
+            parts[kind].append(point)
+        return cls(parts['surge'], parts['choke'], parts['island'],
+                   os.path.splitext(os.path.basename(file_name))[0])
+
+    @classmethod
+    def demo(cls):
+        """Демонстрационная карта компрессора (данные синтетические)"""
+        pr = np.linspace(1.1, 3.0, 12)
+        surge = np.stack([0.02 + 0.055 * (pr - 1), pr], axis=1)
+        choke = np.stack([0.23 - 0.01 * (pr - 1) ** 2, pr], axis=1)
+        flow, ratio = [a.ravel() for a in np.meshgrid(np.linspace(0.02, 0.23, 22), np.linspace(1.1, 3.0, 20))]
+        inside = (flow > np.interp(ratio, surge[:, 1], surge[:, 0])) & (flow < np.interp(ratio, choke[:, 1], choke[:, 0]))
+        eff = 0.77 - 9 * (flow - 0.04 - 0.05 * (ratio - 1)) ** 2 - 0.06 * (ratio - 2.1) ** 2
+        islands = np.stack([flow, ratio, np.clip(eff, 0.55, None)], axis=1)[inside]
+        return cls(surge, choke, islands, "Демонстрационный компрессор")
+
+    def plot(self, ax):
+        contour = ax.tricontourf(self.islands[:, 0], self.islands[:, 1], self.islands[:, 2] * 100,
+                                 levels=np.arange(55, 81, 3), cmap='viridis')
+        ax.plot(*self.surge, color='red', linewidth=1.5, label="Помпаж")
+        ax.plot(*self.choke, color='black', linewidth=1.5, linestyle='--', label="Запирание")
+        ax.set_xlabel("Приведенный расход, кг/с")
+        ax.set_ylabel("Степень повышения давления")
+        return contour
+
+
+def boost_operating_line(rpm, displacement, volumetric_efficiency, boost, compressor_map=None,
+                         ambient_pressure=101.325, ambient_temp=20.0, compressor_efficiency=0.72,
+                         intercooler_efficiency=0.75, pressure_drop=0.0, iterations=4):
+    """Рабочие точки двигателя с наддувом для массива оборотов
+
+    Наполнение и давление наддува - числа или массивы по оборотам. При
+    заданной карте КПД компрессора берется по карте в рабочей точке; так
+    как он влияет на температуру заряда, а через нее на расход, расчет
+    повторяется iterations раз сразу для всех оборотов.
+    """
+    rpm = np.asarray(rpm, dtype=float)
+    efficiency = np.full(rpm.shape, float(compressor_efficiency))
+    for _ in range(iterations):
+        charge = charge_air_model(boost, ambient_pressure, ambient_temp, efficiency,
+                                  intercooler_efficiency, pressure_drop)
+        air_flow = engine_air_flow_model(displacement, rpm, volumetric_efficiency)['air_flow'] * charge['density'] / 1.2
+        flow = corrected_flow(air_flow / 3600, ambient_pressure, ambient_temp)
+        if compressor_map is None:
+            break
+        efficiency = compressor_map.efficiency(flow, charge['pressure_ratio'])
+
+    result = {
+        'air_flow': air_flow,
+        'corrected_flow': flow,
+        'pressure_ratio': np.broadcast_to(charge['pressure_ratio'], rpm.shape),
+        'charge_temperature': np.broadcast_to(charge['charge_temperature'], rpm.shape),
+        'compressor_efficiency': efficiency,
+        'surge_margin': np.full(rpm.shape, np.nan),
+        'choke_margin': np.full(rpm.shape, np.nan)
+    }
+    if compressor_map is not None:
+        result['surge_margin'] = compressor_map.surge_margin(flow, result['pressure_ratio'])
+        result['choke_margin'] = compressor_map.choke_margin(flow, result['pressure_ratio'])
+    return result
+
+
+# ==================== РАБОЧИЙ ЦИКЛ ПО УГЛУ ПОВОРОТА КОЛЕНВАЛА ====================
+def crank_kinematics(angle, bore, stroke, rod, compression_ratio):
+    """Объем цилиндра (м³), его производная по углу (м³/°) и площадь стенок (м²)
+
+    angle - угол поворота коленвала от ВМТ (°), размеры - в мм. Кривошипно-
+    шатунный механизм центральный, площадь теплообмена - днище поршня,
+    головка и открытая часть гильзы.
+    """
+    bore, stroke, rod = bore / 1000, stroke / 1000, rod / 1000
+    crank = stroke / 2
+    piston_area = np.pi * bore ** 2 / 4
+    clearance = piston_area * stroke / (compression_ratio - 1)
+    theta = np.radians(angle)
+    root = np.sqrt(rod ** 2 - (crank * np.sin(theta)) ** 2)
+    volume = clearance + piston_area * (rod + crank - crank * np.cos(theta) - root)
+    dvolume = piston_area * crank * np.sin(theta) * (1 + crank * np.cos(theta) / root) * np.pi / 180
+    return volume, dvolume, np.pi * bore ** 2 / 2 + 4 * volume / bore
+
+
+def wiebe_function(angle, start, duration, a=5.0, m=2.0):
+    """Доля сгоревшего топлива по Вибе и скорость тепловыделения (1/°)"""
+    x = np.maximum((angle - start) / duration, 0.0)
+    burned = 1 - np.exp(-a * x ** (m + 1))
+    rate = np.where(x > 0, a * (m + 1) / duration * x ** m * np.exp(-a * x ** (m + 1)), 0.0)
+    return burned, rate
+
+
+def simulate_engine_cycle(bore, stroke, rod, compression_ratio, spark_advance, burn_duration=50.0,
+                          rpm=3000.0, intake_pressure=101.325, intake_temp=40.0, excess_air=1.0,
+                          afr=14.7, lhv=42.7, wall_temp=180.0, combustion_efficiency=0.95,
+                          wiebe_a=5.0, wiebe_m=2.0, step=0.5):
+    """Нульмерная модель замкнутой части цикла (от НМТ такта впуска до НМТ рабочего хода)
+
+    Все параметры могут быть массивами совместимой формы - тогда за один
+    проход по углу рассчитывается вся совокупность вариантов (например,
+    угол опережения зажигания × степень сжатия). Давление интегрируется
+    по первому закону термодинамики методом Хойна, тепловыделение - по
+    Вибе с началом в момент искры, теплоотдача - по Вошни, показатель
+    адиабаты зависит от температуры. Газообмен и остаточные газы не
+    учитываются, поэтому IMEP - индикаторное давление замкнутой части.
+
+    Давление на впуске - кПа, температуры - °C, теплота сгорания - МДж/кг.
+    Возвращает массивы вариантов ('imep', 'peak_pressure' - бар,
+    'peak_angle', 'burn_50' - °, 'efficiency', 'heat_loss' - %) и кривые
+    'pressure' (бар) и 'temperature' (°C) по углу 'angle'.
+    """
+    gas_constant = 287.0
+    arrays = np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in (
+        bore, stroke, rod, compression_ratio, spark_advance, burn_duration, rpm, intake_pressure,
+        intake_temp, excess_air, afr, lhv, wall_temp, combustion_efficiency)])
+    shape = arrays[0].shape
+    (bore, stroke, rod, compression_ratio, spark_advance, burn_duration, rpm, intake_pressure,
+     intake_temp, excess_air, afr, lhv, wall_temp, combustion_efficiency) = [a.reshape(-1, 1) for a in arrays]
+    if np.any(compression_ratio <= 1) or np.any(rod <= stroke / 2):
+        raise ValueError("Степень сжатия должна быть больше 1, а шатун длиннее радиуса кривошипа")
+
+    angle = np.arange(-180.0, 180.0 + step / 2, step)
+    volume, dvolume, area = crank_kinematics(angle, bore, stroke, rod, compression_ratio)
+    _, burn_rate = wiebe_function(angle, -spark_advance, burn_duration, wiebe_a, wiebe_m)
+
+    displacement = np.pi * (bore / 1000) ** 2 / 4 * stroke / 1000
+    p1, t1 = intake_pressure * 1000, intake_temp + 273.15
+    mass = p1 * volume[:, :1] / (gas_constant * t1)
+    fuel_energy = mass / (afr * excess_air + 1) * lhv * 1e6
+    heat_release = combustion_efficiency * fuel_energy * burn_rate  # Дж/°
+
+    # Теплоотдача по Вошни: скорость газа с поправкой на сгорание
+    piston_speed = 2 * stroke / 1000 * rpm / 60
+    motored = p1 * (volume[:, :1] / volume) ** 1.35
+    combustion_term = np.where(angle >= -spark_advance, 3.24e-3, 0.0) * displacement * t1 / (p1 * volume[:, :1])
+    seconds_per_degree = 1 / (6 * rpm)
+    wall = wall_temp + 273.15
+
+    def derivative(p, i):
+        temperature = p * volume[:, i:i + 1] / (mass * gas_constant)
+        gamma = 1.392 - 8.13e-5 * temperature
+        velocity = 2.28 * piston_speed + combustion_term[:, i:i + 1] * np.maximum(p - motored[:, i:i + 1], 0.0)
+        h = 3.26 * (bore / 1000) ** -0.2 * (p / 1000) ** 0.8 * temperature ** -0.55 * velocity ** 0.8
+        heat_loss = h * area[:, i:i + 1] * (temperature - wall) * seconds_per_degree
+        dp = ((gamma - 1) * (heat_release[:, i:i + 1] - heat_loss)
+              - gamma * p * dvolume[:, i:i + 1]) / volume[:, i:i + 1]
+        return dp, heat_loss
+
+    pressure = np.empty(volume.shape)
+    pressure[:, :1] = p1
+    total_loss = np.zeros_like(mass)
+    for i in range(len(angle) - 1):
+        p = pressure[:, i:i + 1]
+        dp, loss = derivative(p, i)
+        dp_next, loss_next = derivative(p + dp * step, i + 1)
+        pressure[:, i + 1:i + 2] = p + 0.5 * (dp + dp_next) * step
+        total_loss += 0.5 * (loss + loss_next) * step
+
+    temperature = pressure * volume / (mass * gas_constant)
+    work = (0.5 * (pressure[:, 1:] + pressure[:, :-1]) * np.diff(volume, axis=1)).sum(axis=1, keepdims=True)
+    peak = pressure.argmax(axis=1)
+    burn_50 = -spark_advance + burn_duration * (np.log(2) / wiebe_a) ** (1 / (wiebe_m + 1))
+
+    result = {
+        'imep': work / displacement / 1e5,
+        'peak_pressure': pressure.max(axis=1, keepdims=True) / 1e5,
+        'peak_angle': angle[peak][:, None],
+        'burn_50': burn_50,
+        'efficiency': work / fuel_energy * 100,
+        'heat_loss': total_loss / fuel_energy * 100
+    }
+    result = {key: np.broadcast_to(value, (len(mass), 1)).reshape(shape) for key, value in result.items()}
+    result.update({
+        'angle': angle,
+        'pressure': (pressure / 1e5).reshape(shape + (-1,)),
+        'temperature': (temperature - 273.15).reshape(shape + (-1,))
+    })
+    return result
+
+
+# ==================== ГЕОМЕТРИЯ ДВИГАТЕЛЯ И ПОДБОР ДЕТАЛЕЙ ====================
+def engine_geometry_model(bore, stroke, rod, chamber_volume, piston_volume=0.0, gasket_bore=None,
+                          gasket_thickness=0.0, deck_clearance=0.0, ivc=50.0, rpm=6000.0, cylinders=4):
+    """Рабочий объем, степени сжатия и кинематические показатели
+
+    Размеры - в мм, объемы - в см³. piston_volume - объем выборки в днище
+    поршня (купол - отрицательный), deck_clearance - утопание поршня в ВМТ
+    относительно плоскости блока (выступание - отрицательное), ivc - закрытие
+    впускного клапана после НМТ, °. Динамическая степень сжатия считается
+    по объему цилиндра в момент закрытия клапана (центральный кривошипно-
+    шатунный механизм), ivc_volume - объем от ВМТ до закрытия клапана.
+    Все параметры могут быть массивами.
+    """
+    gasket_bore = bore if gasket_bore is None else gasket_bore
+    area = np.pi * np.asarray(bore, dtype=float) ** 2 / 4
+    cylinder_volume = area * stroke / 1000
+    clearance = (chamber_volume + piston_volume + np.pi * np.asarray(gasket_bore, dtype=float) ** 2 / 4
+                 * gasket_thickness / 1000 + area * deck_clearance / 1000)
+    crank = np.asarray(stroke, dtype=float) / 2
+    theta = np.radians(180 - np.asarray(ivc, dtype=float))
+    travel = crank * (1 - np.cos(theta)) + rod - np.sqrt(rod ** 2 - (crank * np.sin(theta)) ** 2)
+    ivc_volume = area * travel / 1000
+    return {
+        'displacement': cylinder_volume * cylinders,
+        'cylinder_volume': cylinder_volume,
+        'clearance_volume': clearance,
+        'static_cr': (cylinder_volume + clearance) / clearance,
+        'ivc_volume': ivc_volume,
+        'dynamic_cr': (ivc_volume + clearance) / clearance,
+        'mean_piston_speed': 2 * np.asarray(stroke, dtype=float) / 1000 * rpm / 60,
+        'rod_ratio': np.asarray(rod, dtype=float) / stroke,
+        'quench': np.asarray(deck_clearance, dtype=float) + gasket_thickness
+    }
+
+
+def demo_engine_parts(n_pistons=3000, n_gaskets=600, n_heads=400, seed=0):
+    """Демонстрационный каталог поршней, прокладок и головок (данные синтетические)"""
+    rng = np.random.default_rng(seed)
+    bores = np.array([81.0, 82.0, 82.5, 83.0, 83.5, 84.0, 86.0])
+    pistons = [(f"PS-{i:05d}", "Demo", float(rng.choice(bores)), float(np.round(rng.uniform(29.5, 33.5), 1)),
+                float(np.round(rng.uniform(-8.0, 20.0) * 2) / 2))
+               for i in range(n_pistons)]
+    thickness = np.array([0.4, 0.5, 0.6, 0.7, 0.8, 1.0, 1.2, 1.5, 1.8, 2.0])
+    gaskets = [(f"HG-{i:05d}", "Demo", float(np.round((rng.choice(bores) + rng.uniform(0.5, 2.5)) * 2) / 2),
+                float(rng.choice(thickness)))
+               for i in range(n_gaskets)]
+    heads = [(f"HD-{i:05d}", "Demo", float(np.round(rng.uniform(36.0, 56.0), 1))) for i in range(n_heads)]
+    return pistons, gaskets, heads
+
+
+def engine_build_combinations(piston_bore, compression_height, piston_volume, gasket_bore, gasket_thickness,
+                              chamber_volume, stroke, rod, deck_height, ivc=50.0, target_cr=11.0,
+                              cr_tolerance=0.3, quench_range=(0.7, 1.2), gasket_overhang=(0.3, 3.0),
+                              max_dynamic_cr=None, limit=20):
+    """Допустимые сочетания поршень × прокладка × головка, ранжированные по оценке
+
+    Поршни и прокладки сочетаются матрицей P × G: пара допустима, если
+    отверстие прокладки больше диаметра поршня на gasket_overhang (мм), а
+    вытеснитель (зазор между поршнем в ВМТ и головкой) лежит в quench_range.
+    Степень сжатия монотонно убывает с объемом камеры, поэтому допустимые
+    головки для каждой пары - непрерывный отрезок каталога, упорядоченного
+    по объему камеры, и число сочетаний считается через searchsorted без
+    перебора всех P × G × H. Ограничение max_dynamic_cr сводится к
+    минимальному объему камеры так же.
+
+    Оценка - отклонение степени сжатия от target_cr плюс половина
+    отклонения вытеснителя от середины диапазона (мм); для рейтинга по
+    каждой паре берутся головки, ближайшие к требуемому объему камеры.
+    """
+    piston_bore, compression_height, piston_volume = [np.asarray(a, dtype=float)[:, None] for a in (
+        piston_bore, compression_height, piston_volume)]
+    gasket_bore, gasket_thickness = [np.asarray(a, dtype=float)[None, :] for a in (gasket_bore, gasket_thickness)]
+    chamber_volume = np.asarray(chamber_volume, dtype=float)
+    order = np.argsort(chamber_volume, kind='stable')
+    chambers = chamber_volume[order]
+
+    # Пары поршень × прокладка: объем без камеры сгорания и вытеснитель
+    deck_clearance = deck_height - (stroke / 2 + rod + compression_height)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        geometry = engine_geometry_model(piston_bore, stroke, rod, 0.0, piston_volume, gasket_bore,
+                                         gasket_thickness, deck_clearance, ivc)
+    swept, base = geometry['cylinder_volume'], geometry['clearance_volume']
+    swept_ivc = geometry['ivc_volume']
+    quench = geometry['quench']
+    overhang = gasket_bore - piston_bore
+    pair_ok = ((overhang >= gasket_overhang[0]) & (overhang <= gasket_overhang[1]) &
+               (quench >= quench_range[0]) & (quench <= quench_range[1]))
+
+    # Допустимый отрезок объемов камеры для каждой пары
+    chamber_min = swept / (target_cr + cr_tolerance - 1) - base
+    chamber_max = swept / (target_cr - cr_tolerance - 1) - base
+    if max_dynamic_cr:
+        chamber_min = np.maximum(chamber_min, swept_ivc / (max_dynamic_cr - 1) - base)
+    low = np.searchsorted(chambers, chamber_min, side='left')
+    high = np.searchsorted(chambers, chamber_max, side='right')
+    counts = np.where(pair_ok, np.maximum(high - low, 0), 0)
+
+    # Кандидаты в рейтинг: несколько головок около требуемого объема камеры
+    i, j = np.nonzero(counts)
+    position = np.searchsorted(chambers, swept[i, 0] / (target_cr - 1) - base[i, j])
+    k = np.clip(position[:, None] + np.arange(-2, 2)[None, :], low[i, j][:, None], high[i, j][:, None] - 1)
+    i, j, k = np.repeat(i, k.shape[1]), np.repeat(j, k.shape[1]), k.ravel()
+    unique = np.unique(np.stack([i, j, k], axis=1), axis=0)
+    i, j, k = unique[:, 0], unique[:, 1], unique[:, 2]
+
+    clearance = base[i, j] + chambers[k]
+    static_cr = (swept[i, 0] + clearance) / clearance
+    dynamic_cr = (swept_ivc[i, 0] + clearance) / clearance
+    score = np.abs(static_cr - target_cr) + 0.5 * np.abs(quench[i, j] - sum(quench_range) / 2)
+    best = np.argsort(score, kind='stable')[:limit]
+    i, j, k = i[best], j[best], k[best]
+    return {
+        'count': int(counts.sum()),
+        'piston': i,
+        'gasket': j,
+        'head': order[k],
+        'static_cr': static_cr[best],
+        'dynamic_cr': dynamic_cr[best],
+        'quench': quench[i, j],
+        'deck_clearance': deck_clearance[i, 0],
+        'cylinder_volume': swept[i, 0],
+        'score': score[best]
+    }
+
+
+# ==================== НАСТРОЙКА ВПУСКА И ВЫПУСКА ====================
+TUNING_CACHE_SIZE = 32
+
+
+def speed_of_sound(temperature):
+    """Скорость звука в воздухе (газах), м/с, по температуре в °C"""
+    return np.sqrt(1.4 * 287.05 * (np.asarray(temperature, dtype=float) + 273.15))
+
+
+def wave_tuned_length(rpm, window, order=1, temperature=20.0, diameter=0.0):
+    """Длина трубы (мм) для волновой настройки
+
+    Волна давления, отраженная от открытого конца, должна совершить order
+    пробегов туда и обратно за окно window (° поворота коленвала): для
+    впуска - время, пока клапан закрыт (720 - продолжительность фазы), для
+    выпуска - продолжительность фазы выпуска. Из акустической длины
+    вычитается концевая поправка 0.3 диаметра трубы (мм).
+    """
+    seconds = window / (6 * np.asarray(rpm, dtype=float))
+    return speed_of_sound(temperature) * seconds / (2 * np.asarray(order)) * 1000 - 0.3 * diameter
+
+
+def wave_tuned_rpm(length, window, order=1, temperature=20.0, diameter=0.0):
+    """Обороты волновой настройки трубы длиной length (мм) - обращение wave_tuned_length"""
+    return speed_of_sound(temperature) * window * 1000 / (12 * np.asarray(order) * (length + 0.3 * diameter))
+
+
+def helmholtz_frequency(diameter, length, volume, temperature=20.0):
+    """Частота резонатора Гельмгольца, Гц: горловина (мм) и объем (см³)"""
+    area = np.pi * (np.asarray(diameter, dtype=float) / 1000) ** 2 / 4
+    effective_length = (length + 0.3 * np.asarray(diameter, dtype=float)) / 1000
+    return speed_of_sound(temperature) / (2 * np.pi) * np.sqrt(area / (effective_length * volume * 1e-6))
+
+
+def runner_helmholtz_rpm(length, diameter, cylinder_volume, compression_ratio, temperature=20.0, ratio=2.0):
+    """Обороты резонансного наддува системы «впускной канал - цилиндр» (по Энгельману)
+
+    Объем резонатора - средний объем цилиндра за такт впуска
+    Vh/2·(ε+1)/(ε-1), пик наполнения - при частоте резонанса в ratio раз
+    выше частоты вращения коленвала.
+    """
+    volume = cylinder_volume / 2 * (compression_ratio + 1) / (compression_ratio - 1)
+    return 60 * helmholtz_frequency(diameter, length, volume, temperature) / ratio
+
+
+def runner_helmholtz_length(rpm, diameter, cylinder_volume, compression_ratio, temperature=20.0, ratio=2.0):
+    """Длина впускного канала (мм) для резонанса на оборотах rpm - обращение runner_helmholtz_rpm"""
+    volume = cylinder_volume / 2 * (compression_ratio + 1) / (compression_ratio - 1) * 1e-6
+    area = np.pi * (np.asarray(diameter, dtype=float) / 1000) ** 2 / 4
+    k = 2 * np.pi * (rpm * ratio / 60) / speed_of_sound(temperature)
+    return area / (volume * k ** 2) * 1000 - 0.3 * np.asarray(diameter, dtype=float)
+
+
+def plenum_volume(rpm, cylinders, neck_diameter, neck_length, order=1, temperature=20.0):
+    """Объем ресивера (л), настроенного как резонатор Гельмгольца
+
+    Горловина - дроссельный узел (диаметр и длина в мм). Ресивер
+    настраивается на частоту импульсов впуска всех цилиндров
+    rpm·cylinders/120, деленную на order.
+    """
+    frequency = np.asarray(rpm, dtype=float) * cylinders / 120 / order
+    area = np.pi * (np.asarray(neck_diameter, dtype=float) / 1000) ** 2 / 4
+    effective_length = (neck_length + 0.3 * np.asarray(neck_diameter, dtype=float)) / 1000
+    return area / effective_length * (speed_of_sound(temperature) / (2 * np.pi * frequency)) ** 2 * 1000
+
+
+def tuning_map(lengths, diameters, rpms, cylinder_volume, compression_ratio, window, temperature=20.0,
+               ratio=2.0, damping=0.2, orders=4):
+    """Карты настройки впускного канала по сетке длина × диаметр × обороты
+
+    'helmholtz_rpm' (длины × диаметры) - обороты резонанса Гельмгольца,
+    'response' (длины × диаметры × обороты) - коэффициент усиления
+    колебательного звена с демпфированием damping на частоте возбуждения,
+    'wave_rpm' (порядки × длины × диаметры) - обороты волновой настройки
+    для порядков 1..orders.
+    """
+    lengths = np.asarray(lengths, dtype=float)[:, None]
+    diameters = np.asarray(diameters, dtype=float)[None, :]
+    rpms = np.asarray(rpms, dtype=float)
+    resonance = runner_helmholtz_rpm(lengths, diameters, cylinder_volume, compression_ratio, temperature, ratio)
+    r = rpms / resonance[..., None]
+    order = np.arange(1, orders + 1)[:, None, None]
+    return {
+        'helmholtz_rpm': resonance,
+        'response': 1 / np.sqrt((1 - r ** 2) ** 2 + (2 * damping * r) ** 2),
+        'wave_rpm': wave_tuned_rpm(lengths[None], window, order, temperature, diameters[None])
+    }
+
+
+@array_cache(TUNING_CACHE_SIZE)
+def cached_tuning_map(lengths, diameters, rpms, **engine):
+    """tuning_map с кэшем по конфигурации двигателя и сеткам
+
+    Хранится не более TUNING_CACHE_SIZE последних конфигураций.
+    """
+    return tuning_map(*[np.asarray(v, dtype=float) for v in (lengths, diameters, rpms)], **engine)
+
+
+# ==================== КАТАЛОГ ФОРСУНОК И НАСОСОВ ====================
+def read_catalog_csv(file_name):
+    """Строки CSV-файла каталога как словари по заголовку
+
+    Разделитель - точка с запятой, если она есть в заголовке, иначе запятая.
+    """
+    with open(file_name, 'r', encoding='utf-8-sig', newline='') as file:
+        lines = file.read().splitlines()
+    return list(csv.DictReader(lines, delimiter=';' if lines and ';' in lines[0] else ','))
+
+
+def demo_fuel_catalog(n_injectors=5000, n_pumps=2000, seed=0):
+    """Демонстрационный каталог форсунок и топливных насосов (данные синтетические)"""
+    rng = np.random.default_rng(seed)
+    flows = np.round(np.exp(rng.uniform(np.log(80), np.log(1600), n_injectors)), 0)
+    injectors = [(f"INJ-{i:05d}", "Demo", float(flow), float(rng.choice([3.0, 3.0, 4.0])),
+                  float(np.round(rng.uniform(0.6, 1.3), 2)))
+                 for i, flow in enumerate(flows)]
+
+    pressures = np.arange(1.0, 10.01, 1.0)
+    pumps = []
+    for i in range(n_pumps):
+        free_flow = rng.uniform(80, 600)  # л/ч без противодавления
+        max_pressure = rng.uniform(5.0, 10.0)
+        flow = free_flow * np.clip(1 - (pressures / max_pressure) ** 1.5, 0.0, None)
+        pumps.append((f"FP-{i:05d}", "Demo", list(zip(pressures.tolist(), flow.round(1).tolist()))))
+    return injectors, pumps
+
+
+def pump_flow_matrix(rows, pressures):
+    """Подача насосов (л/ч) на сетке давлений по строкам DatabaseManager.pump_curves
+
+    Возвращает идентификаторы, артикулы, производителей и матрицу
+    (насосы × давления); выше последней точки характеристики подача равна нулю.
+    """
+    if not rows:
+        return [], [], [], np.zeros((0, len(pressures)))
+    data = np.array([(row[0], row[3], row[4]) for row in rows], dtype=float)
+    starts = np.flatnonzero(np.r_[True, np.diff(data[:, 0]) != 0])
+    ends = np.r_[starts[1:], len(data)]
+    flow = np.array([np.interp(pressures, data[a:b, 1], data[a:b, 2], right=0.0)
+                     for a, b in zip(starts, ends)])
+    return ([rows[i][0] for i in starts], [rows[i][1] for i in starts],
+            [rows[i][2] for i in starts], flow)
+
+
+def fuel_part_combinations(injector_flow, ref_pressure, dead_time, pump_flow, pressures, power, bsfc, rpm,
+                           injector_count, target_duty=80.0, min_duty=40.0, temperature=20.0,
+                           system_factor=1.0, fuel_density=0.745, pump_margin=20.0, limit=20):
+    """Допустимые сочетания форсунка × насос × давление, ранжированные по оценке
+
+    injector_flow (г/мин при ref_pressure), ref_pressure и dead_time -
+    массивы по форсункам, pump_flow - подача насосов (л/ч) на сетке
+    pressures. Форсунка допустима, если цикл впрыска с учетом мертвого
+    времени при мощности power (л.с.) и оборотах rpm лежит между min_duty и
+    target_duty, насос - если подает требуемый расход с запасом pump_margin (%).
+
+    Оценка сочетания - недоиспользование форсунки (target_duty - цикл) /
+    target_duty плюс относительный избыток подачи насоса; она аддитивна,
+    поэтому для каждого давления достаточно сложить limit лучших форсунок
+    с limit лучшими насосами, не перебирая все сочетания.
+    """
+    pressures = np.asarray(pressures, dtype=float)
+    injector_flow = np.asarray(injector_flow, dtype=float)[:, None]
+    ref_pressure = np.asarray(ref_pressure, dtype=float)[:, None]
+    dead_time = np.asarray(dead_time, dtype=float)[:, None]
+    pump_flow = np.asarray(pump_flow, dtype=float).reshape(-1, len(pressures))
+
+    # Форсунки: производительность при каждом давлении и цикл впрыска
+    total_flow = fuel_system_flow_model(injector_count, injector_flow * np.sqrt(3.0 / ref_pressure),
+                                        pressures[None, :], temperature, system_factor)['total_flow']
+    torque = power * 0.7355 * 9549 / rpm
+    duty = injector_pulse_map(rpm, torque, bsfc, total_flow, dead_time)['duty_cycle']
+    injector_ok = (duty <= target_duty) & (duty >= min_duty)
+    injector_score = np.where(injector_ok, (target_duty - duty) / target_duty, np.inf)
+
+    # Насосы: требуемая подача, л/ч
+    required = power * bsfc / fuel_density * (1 + pump_margin / 100)
+    pump_ok = pump_flow >= required
+    pump_score = np.where(pump_ok, pump_flow / required - 1, np.inf)
+
+    count = int((injector_ok.sum(axis=0) * pump_ok.sum(axis=0)).sum())
+    candidates = []
+    for k in range(len(pressures)):
+        best_injectors = np.argsort(injector_score[:, k])[:limit]
+        best_pumps = np.argsort(pump_score[:, k])[:limit]
+        best_injectors = best_injectors[np.isfinite(injector_score[best_injectors, k])]
+        best_pumps = best_pumps[np.isfinite(pump_score[best_pumps, k])]
+        i, j = [a.ravel() for a in np.meshgrid(best_injectors, best_pumps, indexing='ij')]
+        candidates.append(np.stack([i, j, np.full(i.shape, k),
+                                    injector_score[i, k] + pump_score[j, k]], axis=1))
+
+    table = np.concatenate(candidates) if candidates else np.zeros((0, 4))
+    table = table[np.argsort(table[:, 3], kind='stable')[:limit]]
+    i, j, k = [table[:, c].astype(int) for c in range(3)]
+    return {
+        'count': count,
+        'injector': i,
+        'pump': j,
+        'pressure': pressures[k],
+        'duty_cycle': duty[i, k],
+        'pump_flow': pump_flow[j, k],
+        'required_pump_flow': required,
+        'score': table[:, 3]
+    }
+
+
+# ==================== КАТАЛОГ ПРУЖИН И АМОРТИЗАТОРОВ ====================
+def damper_coefficients(points):
+    """Коэффициенты сжатия и отбоя амортизатора, Н·с/м
+
+    Наклон прямой через ноль по методу наименьших квадратов отдельно для
+    положительных (сжатие) и отрицательных (отбой) скоростей.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    velocity, force = points[:, 0], points[:, 1]
+    coefficients = []
+    for side in (velocity > 0, velocity < 0):
+        v, f = velocity[side], force[side]
+        coefficients.append(float((v * f).sum() / (v ** 2).sum()) if v.size else 0.0)
+    return abs(coefficients[0]), abs(coefficients[1])
+
+
+def required_wheel_rate(frequency, weight):
+    """Жесткость колеса (Н/мм) для заданной частоты - обращение suspension_frequency_model"""
+    return (2 * np.pi * frequency) ** 2 * weight * 9.81 / 1000
+
+
+def required_damping(damping_ratio, crit_damping, rebound_share=0.6):
+    """Коэффициенты отбоя и сжатия для заданного коэффициента демпфирования
+
+    Обращение damping_model: среднее коэффициентов отбоя и сжатия равно
+    damping_ratio · crit_damping, rebound_share - доля отбоя в сумме.
+    """
+    total = 2 * damping_ratio * crit_damping
+    return {'rebound': total * rebound_share, 'bump': total * (1 - rebound_share)}
+
+
+def demo_catalog(n_springs=20000, n_dampers=5000, seed=0):
+    """Демонстрационный каталог: пружины со стандартным шагом жесткости и
+    амортизаторы с дегрессивной характеристикой (данные синтетические)"""
+    rng = np.random.default_rng(seed)
+    lengths = np.array([100, 127, 152, 178, 203, 229, 254, 305])
+    diameters = np.array([47, 52, 57, 62, 65, 70])
+    rates = np.round(np.exp(rng.uniform(np.log(10), np.log(1000), n_springs)), 1)
+    springs = [(f"SP-{i:05d}", "Demo", float(rate), float(rng.choice(lengths)), float(rng.choice(diameters)))
+               for i, rate in enumerate(rates)]
+
+    velocities = np.array([-1.0, -0.5, -0.25, -0.1, -0.05, 0.05, 0.1, 0.25, 0.5, 1.0])
+    dampers = []
+    for i in range(n_dampers):
+        bump = rng.uniform(500, 12000)
+        rebound = bump * rng.uniform(1.2, 3.0)
+        knee = rng.uniform(0.05, 0.15)
+        coef = np.where(velocities > 0, bump, rebound)
+        # Дегрессивная характеристика: после колена наклон уменьшается вдвое
+        force = coef * np.where(np.abs(velocities) <= knee, velocities,
+                                np.sign(velocities) * (knee + 0.5 * (np.abs(velocities) - knee)))
+        dampers.append((f"DM-{i:05d}", "Demo", list(zip(velocities.tolist(), force.round(1).tolist()))))
+    return springs, dampers
+
+
+# ==================== ХАРАКТЕРИСТИКА АМОРТИЗАТОРА ====================
+class DamperCurve:
+    """Силовая характеристика амортизатора F(v) с точкой перегиба
+
+    Для каждой стороны (сжатие v > 0, отбой v < 0) характеристика
+    двухлинейная: до скорости колена knee действует коэффициент low, после -
+    high (Н·с/м). high < low - дегрессивная, high > low - прогрессивная.
+    """
+
+    SIDES = ('bump', 'rebound')
+
+    def __init__(self, bump_low, bump_high, bump_knee, rebound_low, rebound_high, rebound_knee,
+                 name="", points=None):
+        self.params = {
+            'bump': (float(bump_low), float(bump_high), float(bump_knee)),
+            'rebound': (float(rebound_low), float(rebound_high), float(rebound_knee))
+        }
+        self.name = name
+        self.points = points  # исходные точки стенда (скорость, сила), если есть
+
+    def force(self, velocity):
+        """Сила амортизатора (Н) для массива скоростей штока (м/с)"""
+        velocity = np.asarray(velocity, dtype=float)
+        speed = np.abs(velocity)
+        result = np.empty_like(speed)
+        for side, mask in (('bump', velocity >= 0), ('rebound', velocity < 0)):
+            low, high, knee = self.params[side]
+            magnitude = low * np.minimum(speed, knee) + high * np.maximum(speed - knee, 0.0)
+            result = np.where(mask, magnitude, result)
+        return np.sign(velocity) * result
+
+    def equivalent_coefficients(self, velocity_amplitude=0.1):
+        """Эквивалентные линейные коэффициенты сжатия и отбоя, Н·с/м
+
+        Равенство рассеянной энергии за полупериод синусоидального движения
+        штока с амплитудой скорости velocity_amplitude: c = ∫F·v dt / ∫v² dt.
+        """
+        # Равномерная сетка по фазе - интегралы заменяются суммами
+        velocity = velocity_amplitude * np.sin(np.linspace(0, np.pi, 181))
+        energy = (velocity ** 2).sum()
+        bump = (self.force(velocity) * velocity).sum() / energy
+        rebound = (self.force(-velocity) * -velocity).sum() / energy
+        return float(bump), float(rebound)
+
+    def characteristic(self, side):
+        """Тип характеристики стороны: дегрессивная, линейная или прогрессивная"""
+        low, high, _ = self.params[side]
+        if high < 0.85 * low:
+            return "дегрессивная"
+        if high > 1.15 * low:
+            return "прогрессивная"
+        return "линейная"
+
+    @classmethod
+    def fit(cls, velocity, force, knees=None, name=""):
+        """Подбор характеристики по точкам стенда методом наименьших квадратов
+
+        Для каждой стороны при фиксированном колене задача линейна по
+        (low, high), поэтому нормальные уравнения 2×2 решаются сразу для
+        всей сетки кандидатов колена, и выбирается колено с наименьшей
+        невязкой.
+        """
+        velocity = np.asarray(velocity, dtype=float)
+        force = np.asarray(force, dtype=float)
+        if knees is None:
+            knees = np.linspace(0.01, 0.5, 99)
+        knees = np.asarray(knees, dtype=float)
+
+        params = {}
+        for side, mask in (('bump', velocity > 0), ('rebound', velocity < 0)):
+            speed, magnitude = np.abs(velocity[mask]), np.abs(force[mask])
+            if speed.size < 2:
+                raise ValueError("Нужно не менее двух точек характеристики на сжатие и на отбой")
+            # Базисные функции для всех колен: (колено, точка)
+            low_basis = np.minimum(speed[None, :], knees[:, None])
+            high_basis = np.maximum(speed[None, :] - knees[:, None], 0.0)
+            a11 = (low_basis ** 2).sum(axis=1)
+            a12 = (low_basis * high_basis).sum(axis=1)
+            a22 = (high_basis ** 2).sum(axis=1)
+            b1 = (low_basis * magnitude).sum(axis=1)
+            b2 = (high_basis * magnitude).sum(axis=1)
+            det = a11 * a22 - a12 ** 2
+            # Колено выше всех точек дает вырожденную систему - тогда характеристика линейная
+            singular = np.abs(det) < 1e-12 * np.maximum(a11 * a22, 1e-30)
+            low = np.where(singular, b1 / a11, (b1 * a22 - b2 * a12) / np.where(singular, 1.0, det))
+            high = np.where(singular, low, (a11 * b2 - a12 * b1) / np.where(singular, 1.0, det))
+            residual = ((low[:, None] * low_basis + high[:, None] * high_basis - magnitude[None, :]) ** 2).sum(axis=1)
+            best = np.argmin(residual)
+            params[side] = (low[best], high[best], knees[best])
+
+        return cls(*params['bump'], *params['rebound'], name=name,
+                   points=np.column_stack([velocity, force]))
+
+    @classmethod
+    def from_csv(cls, file_name):
+        """Загрузка точек стенда из CSV (столбцы velocity и force) и подбор характеристики
+
+        Скорость в м/с (при значениях больше 10 считается, что она в мм/с),
+        сила в Н; отбой - отрицательные скорость и сила.
+        """
+        rows = read_catalog_csv(file_name)
+        velocity = np.array([float(row['velocity']) for row in rows])
+        force = np.array([float(row['force']) for row in rows])
+        if np.abs(velocity).max() > 10:
+            velocity = velocity / 1000
+        return cls.fit(velocity, force, name=os.path.basename(file_name))
+
+
 class AdvancedVehicleCalculator(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -116,6 +4235,7 @@ class AdvancedVehicleCalculator(QMainWindow):
         self.create_menu()
         self.create_history_menu()
         self.db = DatabaseManager()
+        self.update_catalog_size()
 
     def initUI(self):
         main_widget = QWidget()
@@ -132,6 +4252,7 @@ class AdvancedVehicleCalculator(QMainWindow):
         self.create_braking_tab()
         self.create_suspension_tab()  # Новая вкладка
         self.create_fuel_tab()  # Новая вкладка
+        self.create_research_tab()  # Исследования по плану эксперимента
         self.create_report_tab()  # Вкладка для просмотра отчета
 
         self.statusBar().showMessage("Готово к работе")
@@ -210,7 +4331,34 @@ class AdvancedVehicleCalculator(QMainWindow):
                 'suspension_kinematics': 'Кинематика подвески',
                 'fuel_system_flow': 'Производительность топливной системы',
                 'injector_duty': 'Время впрыска',
-                'fuel_optimization': 'Оптимизация топливной системы'
+                'fuel_optimization': 'Оптимизация топливной системы',
+                'parameter_sweep': 'Исследование параметров',
+                'local_sensitivity': 'Локальная чувствительность',
+                'sobol_indices': 'Индексы Соболя',
+                'monte_carlo': 'Неопределенность (Монте-Карло)',
+                'braking_simulation': 'Динамическое торможение',
+                'ride_simulation': 'Динамика подвески',
+                'suspension_frequency_response': 'Частотная характеристика подвески',
+                'suspension_hardpoint_kinematics': 'Кинематика по точкам крепления',
+                'suspension_roll': 'Крен и распределение нагрузки',
+                'suspension_catalog_match': 'Подбор по каталогу',
+                'damper_curve_fit': 'Характеристика амортизатора',
+                'corner_weight': 'Развеска по углам',
+                'gg_diagram': 'Диаграмма g-g',
+                'lap_simulation': 'Моделирование круга',
+                'launch_optimization': 'Оптимизация старта',
+                'drive_cycle_fuel': 'Расход в ездовом цикле',
+                'engine_map': 'Карта удельного расхода',
+                'injector_map': 'Карта впрыска',
+                'fuel_catalog_match': 'Подбор форсунок и насоса',
+                'flex_fuel_sweep': 'Смеси бензин/этанол',
+                've_autotune': 'Таблица наполнения по журналу',
+                'boost_operating_line': 'Рабочая линия наддува',
+                'engine_cycle': 'Рабочий цикл по углу коленвала',
+                'engine_geometry': 'Геометрия двигателя',
+                'engine_build_match': 'Подбор поршней, прокладок и головок',
+                'intake_tuning': 'Настройка впуска и выпуска',
+                'tuning_map': 'Карты настройки впуска'
             }
 
             param_translation = {
@@ -265,12 +4413,62 @@ class AdvancedVehicleCalculator(QMainWindow):
                 "kinetic_energy": "Кинетическая энергия (кДж)",
                 "heat_energy": "Тепловая энергия (кДж)",
                 "temperature_rise": "Рост температуры (°C)",
+                "cg_height": "Высота центра масс (м)",
+                "wheelbase": "Колесная база (м)",
+                "static_front": "Статическая нагрузка на переднюю ось (%)",
+                "tire_radius": "Радиус колеса (м)",
+                "optimal_balance": "Лучший баланс",
+                "brake_cycle": "Цикл торможений",
+                "cycles": "Число циклов",
+                "ambient_temperature": "Температура воздуха (°C)",
+                "peak_temperature": "Пиковая температура диска (°C)",
+                "final_temperature": "Температура в конце серии (°C)",
+                "steady_peak": "Установившийся пик температуры (°C)",
                 "vehicle_weight": "Масса автомобиля (кг)",
 
                 # Двигатель
                 "power_hp": "Мощность (л.с.)",
                 "fuel_consumption": "Расход топлива (кг/ч)",
                 "fuel_type": "Тип топлива",
+                "ethanol_share": "Содержание этанола (%)",
+                "excess_air": "Коэффициент избытка воздуха",
+                "boost": "Давление наддува (кПа)",
+                "manifold_pressure": "Давление во впуске",
+                "ambient_pressure": "Атмосферное давление (кПа)",
+                "ambient_temp": "Температура воздуха (°C)",
+                "intercooler_efficiency": "Эффективность интеркулера",
+                "compressor": "Компрессор",
+                "bore": "Диаметр цилиндра (мм)",
+                "stroke": "Ход поршня (мм)",
+                "rod": "Длина шатуна (мм)",
+                "burn_duration": "Продолжительность сгорания (°)",
+                "wall_temp": "Температура стенок (°C)",
+                "intake_pressure": "Давление на впуске (кПа)",
+                "intake_temp": "Температура на впуске (°C)",
+                "compression_ratios": "Степени сжатия",
+                "spark_advances": "Углы опережения зажигания (°)",
+                "gasket_bore": "Отверстие прокладки (мм)",
+                "gasket_thickness": "Толщина прокладки (мм)",
+                "deck_clearance": "Утопание поршня (мм)",
+                "piston_volume": "Выборка в поршне (см³)",
+                "ivc": "Закрытие впуска после НМТ (°)",
+                "cylinders": "Число цилиндров",
+                "deck_height": "Высота блока (мм)",
+                "target_cr": "Целевая степень сжатия",
+                "cr_tolerance": "Допуск степени сжатия",
+                "quench_range": "Диапазон вытеснителя (мм)",
+                "max_dynamic_cr": "Максимальная динамическая степень сжатия",
+                "target_rpm": "Обороты настройки",
+                "harmonic_order": "Порядок гармоники",
+                "intake_duration": "Фаза впуска (°)",
+                "exhaust_duration": "Фаза выпуска (°)",
+                "runner_diameter": "Диаметр впускного канала (мм)",
+                "neck_diameter": "Диаметр дросселя (мм)",
+                "neck_length": "Длина дросселя (мм)",
+                "exhaust_temp": "Температура газов выпуска (°C)",
+                "length_range": "Длина канала (мм)",
+                "diameter_range": "Диаметр канала (мм)",
+                "rpm_range": "Обороты (об/мин)",
                 "efficiency": "Эффективный КПД (%)",
                 "displacement": "Объем двигателя (см³)",
                 "torque": "Крутящий момент (Н·м)",
@@ -288,6 +4486,7 @@ class AdvancedVehicleCalculator(QMainWindow):
 
                 # Динамика
                 "traction_force": "Тяговая сила (Н)",
+                "traction_limited_force": "Тяговая сила с учетом сцепления (Н)",
                 "gear_ratio": "Передаточное число",
                 "equivalent_force": "Эквивалентная сила (кгс)",
                 "specific_power": "Удельная мощность (кВт/т)",
@@ -449,7 +4648,34 @@ class AdvancedVehicleCalculator(QMainWindow):
                 'aerodynamics': 'Аэродинамика',
                 'braking': 'Тормозная система',
                 'suspension': 'Подвеска',
-                'fuel_system': 'Топливная система'
+                'fuel_system': 'Топливная система',
+                'parameter_sweep': 'Исследование параметров',
+                'local_sensitivity': 'Локальная чувствительность',
+                'sobol_indices': 'Индексы Соболя',
+                'monte_carlo': 'Неопределенность (Монте-Карло)',
+                'braking_simulation': 'Динамическое торможение',
+                'ride_simulation': 'Динамика подвески',
+                'suspension_frequency_response': 'Частотная характеристика подвески',
+                'suspension_hardpoint_kinematics': 'Кинематика по точкам крепления',
+                'suspension_roll': 'Крен и распределение нагрузки',
+                'suspension_catalog_match': 'Подбор по каталогу',
+                'damper_curve_fit': 'Характеристика амортизатора',
+                'corner_weight': 'Развеска по углам',
+                'gg_diagram': 'Диаграмма g-g',
+                'lap_simulation': 'Моделирование круга',
+                'launch_optimization': 'Оптимизация старта',
+                'drive_cycle_fuel': 'Расход в ездовом цикле',
+                'engine_map': 'Карта удельного расхода',
+                'injector_map': 'Карта впрыска',
+                'fuel_catalog_match': 'Подбор форсунок и насоса',
+                'flex_fuel_sweep': 'Смеси бензин/этанол',
+                've_autotune': 'Таблица наполнения по журналу',
+                'boost_operating_line': 'Рабочая линия наддува',
+                'engine_cycle': 'Рабочий цикл по углу коленвала',
+                'engine_geometry': 'Геометрия двигателя',
+                'engine_build_match': 'Подбор поршней, прокладок и головок',
+                'intake_tuning': 'Настройка впуска и выпуска',
+                'tuning_map': 'Карты настройки впуска'
             }
 
             # Словарь для перевода параметров (расширенный)
@@ -504,12 +4730,62 @@ class AdvancedVehicleCalculator(QMainWindow):
                 "kinetic_energy": "Кинетическая энергия (кДж)",
                 "heat_energy": "Тепловая энергия (кДж)",
                 "temperature_rise": "Рост температуры (°C)",
+                "cg_height": "Высота центра масс (м)",
+                "wheelbase": "Колесная база (м)",
+                "static_front": "Статическая нагрузка на переднюю ось (%)",
+                "tire_radius": "Радиус колеса (м)",
+                "optimal_balance": "Лучший баланс",
+                "brake_cycle": "Цикл торможений",
+                "cycles": "Число циклов",
+                "ambient_temperature": "Температура воздуха (°C)",
+                "peak_temperature": "Пиковая температура диска (°C)",
+                "final_temperature": "Температура в конце серии (°C)",
+                "steady_peak": "Установившийся пик температуры (°C)",
                 "vehicle_weight": "Масса автомобиля (кг)",
 
                 # Двигатель
                 "power_hp": "Мощность (л.с.)",
                 "fuel_consumption": "Расход топлива (кг/ч)",
                 "fuel_type": "Тип топлива",
+                "ethanol_share": "Содержание этанола (%)",
+                "excess_air": "Коэффициент избытка воздуха",
+                "boost": "Давление наддува (кПа)",
+                "manifold_pressure": "Давление во впуске",
+                "ambient_pressure": "Атмосферное давление (кПа)",
+                "ambient_temp": "Температура воздуха (°C)",
+                "intercooler_efficiency": "Эффективность интеркулера",
+                "compressor": "Компрессор",
+                "bore": "Диаметр цилиндра (мм)",
+                "stroke": "Ход поршня (мм)",
+                "rod": "Длина шатуна (мм)",
+                "burn_duration": "Продолжительность сгорания (°)",
+                "wall_temp": "Температура стенок (°C)",
+                "intake_pressure": "Давление на впуске (кПа)",
+                "intake_temp": "Температура на впуске (°C)",
+                "compression_ratios": "Степени сжатия",
+                "spark_advances": "Углы опережения зажигания (°)",
+                "gasket_bore": "Отверстие прокладки (мм)",
+                "gasket_thickness": "Толщина прокладки (мм)",
+                "deck_clearance": "Утопание поршня (мм)",
+                "piston_volume": "Выборка в поршне (см³)",
+                "ivc": "Закрытие впуска после НМТ (°)",
+                "cylinders": "Число цилиндров",
+                "deck_height": "Высота блока (мм)",
+                "target_cr": "Целевая степень сжатия",
+                "cr_tolerance": "Допуск степени сжатия",
+                "quench_range": "Диапазон вытеснителя (мм)",
+                "max_dynamic_cr": "Максимальная динамическая степень сжатия",
+                "target_rpm": "Обороты настройки",
+                "harmonic_order": "Порядок гармоники",
+                "intake_duration": "Фаза впуска (°)",
+                "exhaust_duration": "Фаза выпуска (°)",
+                "runner_diameter": "Диаметр впускного канала (мм)",
+                "neck_diameter": "Диаметр дросселя (мм)",
+                "neck_length": "Длина дросселя (мм)",
+                "exhaust_temp": "Температура газов выпуска (°C)",
+                "length_range": "Длина канала (мм)",
+                "diameter_range": "Диаметр канала (мм)",
+                "rpm_range": "Обороты (об/мин)",
                 "efficiency": "Эффективный КПД (%)",
                 "displacement": "Объем двигателя (см³)",
                 "torque": "Крутящий момент (Н·м)",
@@ -528,6 +4804,7 @@ class AdvancedVehicleCalculator(QMainWindow):
 
                 # Динамика
                 "traction_force": "Тяговая сила (Н)",
+                "traction_limited_force": "Тяговая сила с учетом сцепления (Н)",
                 "gear_ratio": "Передаточное число",
                 "equivalent_force": "Эквивалентная сила (кгс)",
                 "specific_power": "Удельная мощность (кВт/т)",
@@ -603,12 +4880,62 @@ class AdvancedVehicleCalculator(QMainWindow):
                 "kinetic_energy": "Кинетическая энергия (кДж)",
                 "heat_energy": "Тепловая энергия (кДж)",
                 "temperature_rise": "Рост температуры (°C)",
+                "cg_height": "Высота центра масс (м)",
+                "wheelbase": "Колесная база (м)",
+                "static_front": "Статическая нагрузка на переднюю ось (%)",
+                "tire_radius": "Радиус колеса (м)",
+                "optimal_balance": "Лучший баланс",
+                "brake_cycle": "Цикл торможений",
+                "cycles": "Число циклов",
+                "ambient_temperature": "Температура воздуха (°C)",
+                "peak_temperature": "Пиковая температура диска (°C)",
+                "final_temperature": "Температура в конце серии (°C)",
+                "steady_peak": "Установившийся пик температуры (°C)",
                 "vehicle_weight": "Масса автомобиля (кг)",
 
                 # Двигатель
                 "power_hp": "Мощность (л.с.)",
                 "fuel_consumption": "Расход топлива (кг/ч)",
                 "fuel_type": "Тип топлива",
+                "ethanol_share": "Содержание этанола (%)",
+                "excess_air": "Коэффициент избытка воздуха",
+                "boost": "Давление наддува (кПа)",
+                "manifold_pressure": "Давление во впуске",
+                "ambient_pressure": "Атмосферное давление (кПа)",
+                "ambient_temp": "Температура воздуха (°C)",
+                "intercooler_efficiency": "Эффективность интеркулера",
+                "compressor": "Компрессор",
+                "bore": "Диаметр цилиндра (мм)",
+                "stroke": "Ход поршня (мм)",
+                "rod": "Длина шатуна (мм)",
+                "burn_duration": "Продолжительность сгорания (°)",
+                "wall_temp": "Температура стенок (°C)",
+                "intake_pressure": "Давление на впуске (кПа)",
+                "intake_temp": "Температура на впуске (°C)",
+                "compression_ratios": "Степени сжатия",
+                "spark_advances": "Углы опережения зажигания (°)",
+                "gasket_bore": "Отверстие прокладки (мм)",
+                "gasket_thickness": "Толщина прокладки (мм)",
+                "deck_clearance": "Утопание поршня (мм)",
+                "piston_volume": "Выборка в поршне (см³)",
+                "ivc": "Закрытие впуска после НМТ (°)",
+                "cylinders": "Число цилиндров",
+                "deck_height": "Высота блока (мм)",
+                "target_cr": "Целевая степень сжатия",
+                "cr_tolerance": "Допуск степени сжатия",
+                "quench_range": "Диапазон вытеснителя (мм)",
+                "max_dynamic_cr": "Максимальная динамическая степень сжатия",
+                "target_rpm": "Обороты настройки",
+                "harmonic_order": "Порядок гармоники",
+                "intake_duration": "Фаза впуска (°)",
+                "exhaust_duration": "Фаза выпуска (°)",
+                "runner_diameter": "Диаметр впускного канала (мм)",
+                "neck_diameter": "Диаметр дросселя (мм)",
+                "neck_length": "Длина дросселя (мм)",
+                "exhaust_temp": "Температура газов выпуска (°C)",
+                "length_range": "Длина канала (мм)",
+                "diameter_range": "Диаметр канала (мм)",
+                "rpm_range": "Обороты (об/мин)",
                 "efficiency": "Эффективный КПД (%)",
                 "displacement": "Объем двигателя (см³)",
                 "torque": "Крутящий момент (Н·м)",
@@ -626,6 +4953,7 @@ class AdvancedVehicleCalculator(QMainWindow):
 
                 # Динамика
                 "traction_force": "Тяговая сила (Н)",
+                "traction_limited_force": "Тяговая сила с учетом сцепления (Н)",
                 "gear_ratio": "Передаточное число",
                 "equivalent_force": "Эквивалентная сила (кгс)",
                 "specific_power": "Удельная мощность (кВт/т)",
@@ -867,6 +5195,8 @@ class AdvancedVehicleCalculator(QMainWindow):
                         index = self.engine_fuel_energy.findText(fuel_type, Qt.MatchContains)
                         if index >= 0:
                             self.engine_fuel_energy.setCurrentIndex(index)
+                    if 'ethanol_share' in params:
+                        self.engine_ethanol_share.setValue(int(params['ethanol_share']))
                     self.calculate_engine_efficiency()
                     tab_index = 0
 
@@ -1133,7 +5463,15 @@ class AdvancedVehicleCalculator(QMainWindow):
         self.engine_power_hp = QLineEdit()
         self.engine_fuel_consumption = QLineEdit()
         self.engine_fuel_energy = QComboBox()
-        self.engine_fuel_energy.addItems(["Бензин (42.7 МДж/кг)", "Дизель (43.4 МДж/кг)", "Этанол (26.8 МДж/кг)"])
+        for fuel in ('gasoline', 'diesel', 'ethanol', 'methanol'):
+            props = FUEL_PROPERTIES[fuel]
+            self.engine_fuel_energy.addItem(f"{props['title']} ({props['lhv']} МДж/кг)", fuel)
+        self.engine_fuel_energy.addItem("Смесь бензин/этанол (E0-E100)", 'blend')
+        self.engine_ethanol_share = QSpinBox()
+        self.engine_ethanol_share.setRange(0, 100)
+        self.engine_ethanol_share.setValue(85)
+        self.engine_ethanol_share.setPrefix("E")
+        self.engine_fuel_energy.currentIndexChanged.connect(self.update_fuel_type)
 
         calculate_eff_btn = QPushButton("Рассчитать КПД")
         calculate_eff_btn.clicked.connect(self.calculate_engine_efficiency)
@@ -1144,9 +5482,11 @@ class AdvancedVehicleCalculator(QMainWindow):
         eff_layout.addRow("Мощность (л.с.):", self.engine_power_hp)
         eff_layout.addRow("Расход топлива (кг/ч):", self.engine_fuel_consumption)
         eff_layout.addRow("Тип топлива:", self.engine_fuel_energy)
+        eff_layout.addRow("Содержание этанола (% об.):", self.engine_ethanol_share)
         eff_layout.addRow(calculate_eff_btn)
         eff_layout.addRow("Эффективный КПД:", self.engine_efficiency_result)
         eff_group.setLayout(eff_layout)
+        self.update_fuel_type()
 
         # ===== 2. Группа "Среднее эффективное давление" =====
         mep_group = QGroupBox("Среднее эффективное давление (MEP)")
@@ -1196,6 +5536,10 @@ class AdvancedVehicleCalculator(QMainWindow):
         self.engine_volumetric_efficiency = QDoubleSpinBox()
         self.engine_volumetric_efficiency.setRange(0.5, 1.2)
         self.engine_volumetric_efficiency.setValue(0.85)
+        self.engine_lambda = QDoubleSpinBox()
+        self.engine_lambda.setRange(0.6, 2.0)
+        self.engine_lambda.setSingleStep(0.01)
+        self.engine_lambda.setValue(1.0)
 
         calculate_air_flow_btn = QPushButton("Рассчитать расход воздуха")
         calculate_air_flow_btn.clicked.connect(self.calculate_air_flow)
@@ -1206,10 +5550,131 @@ class AdvancedVehicleCalculator(QMainWindow):
         air_flow_layout.addRow("Объем двигателя (л):", self.engine_displacement_air)
         air_flow_layout.addRow("Обороты (об/мин):", self.engine_rpm_air)
         air_flow_layout.addRow("КПД наполнения:", self.engine_volumetric_efficiency)
+        air_flow_layout.addRow("Коэффициент избытка воздуха λ:", self.engine_lambda)
         air_flow_layout.addRow(calculate_air_flow_btn)
         air_flow_layout.addRow("Расход воздуха:", self.air_flow_result)
+        self.fuel_flow_result = QLabel("")
+        self.fuel_flow_result.setStyleSheet("font-weight: bold; color: #0066CC;")
+        air_flow_layout.addRow("Расход топлива:", self.fuel_flow_result)
         air_flow_group.setLayout(air_flow_layout)
 
+        # ===== Группа "Таблица наполнения по журналу" =====
+        ve_group = QGroupBox("Таблица наполнения по журналу ЭБУ")
+        ve_layout = QGridLayout()
+
+        self.ve_table = None
+        self.ve_worker = None
+        self.ve_rpm_range = (QLineEdit("1000"), QLineEdit("7000"))
+        self.ve_rpm_step = QLineEdit("500")
+        self.ve_map_range = (QLineEdit("20"), QLineEdit("100"))
+        self.ve_map_step = QLineEdit("10")
+        self.ve_min_weight = QDoubleSpinBox()
+        self.ve_min_weight.setRange(0.5, 1000)
+        self.ve_min_weight.setValue(3)
+
+        ve_fields = [
+            ("Обороты от / до:", self.ve_rpm_range),
+            ("Шаг оборотов:", self.ve_rpm_step),
+            ("Давление от / до, кПа:", self.ve_map_range),
+            ("Шаг давления:", self.ve_map_step),
+            ("Минимальный вес ячейки:", self.ve_min_weight)
+        ]
+        for index, (title, widget) in enumerate(ve_fields):
+            row, column = index // 2, (index % 2) * 3
+            ve_layout.addWidget(QLabel(title), row, column)
+            if isinstance(widget, tuple):
+                ve_layout.addWidget(widget[0], row, column + 1)
+                ve_layout.addWidget(widget[1], row, column + 2)
+            else:
+                ve_layout.addWidget(widget, row, column + 1, 1, 2)
+
+        ve_buttons = QHBoxLayout()
+        self.ve_import_btn = QPushButton("Журнал (CSV: rpm, map, maf или afr)")
+        self.ve_import_btn.clicked.connect(self.import_ve_log)
+        open_ve_btn = QPushButton("Открыть (.npz)")
+        open_ve_btn.clicked.connect(self.open_ve_table)
+        save_ve_btn = QPushButton("Сохранить (.npz)")
+        save_ve_btn.clicked.connect(self.save_ve_table)
+        ve_buttons.addWidget(self.ve_import_btn)
+        ve_buttons.addWidget(open_ve_btn)
+        ve_buttons.addWidget(save_ve_btn)
+
+        self.engine_use_ve_table = QCheckBox("Использовать таблицу в расчете расхода воздуха")
+        self.ve_progress = QProgressBar()
+        self.ve_progress.setRange(0, 100)
+        self.ve_result = QLabel("Таблица не задана")
+        self.ve_result.setWordWrap(True)
+
+        row = (len(ve_fields) + 1) // 2
+        ve_layout.addLayout(ve_buttons, row, 0, 1, 6)
+        ve_layout.addWidget(self.engine_use_ve_table, row + 1, 0, 1, 6)
+        ve_layout.addWidget(self.ve_progress, row + 2, 0, 1, 6)
+        ve_layout.addWidget(self.ve_result, row + 3, 0, 1, 6)
+        ve_group.setLayout(ve_layout)
+
+        # ===== Группа "Наддув и карта компрессора" =====
+        boost_group = QGroupBox("Наддув и карта компрессора")
+        boost_layout = QGridLayout()
+
+        self.compressor_map = None
+        self.boost_pressure = QLineEdit("0")
+        self.boost_pressure.setPlaceholderText("кПа, разрежение - отрицательное")
+        self.boost_ambient_pressure = QLineEdit("101.3")
+        self.boost_ambient_temp = QLineEdit("20")
+        self.boost_compressor_efficiency = QDoubleSpinBox()
+        self.boost_compressor_efficiency.setRange(0.3, 0.9)
+        self.boost_compressor_efficiency.setSingleStep(0.01)
+        self.boost_compressor_efficiency.setValue(0.72)
+        self.boost_intercooler_efficiency = QDoubleSpinBox()
+        self.boost_intercooler_efficiency.setRange(0.0, 1.0)
+        self.boost_intercooler_efficiency.setSingleStep(0.05)
+        self.boost_intercooler_efficiency.setValue(0.75)
+        self.boost_pressure_drop = QLineEdit("10")
+        self.boost_rpm_range = (QLineEdit("1500"), QLineEdit("7000"))
+        self.boost_rpm_step = QLineEdit("250")
+
+        boost_fields = [
+            ("Давление наддува, кПа:", self.boost_pressure),
+            ("Потери в интеркулере, кПа:", self.boost_pressure_drop),
+            ("Атмосферное давление, кПа:", self.boost_ambient_pressure),
+            ("Температура воздуха, °C:", self.boost_ambient_temp),
+            ("КПД компрессора (без карты):", self.boost_compressor_efficiency),
+            ("Эффективность интеркулера:", self.boost_intercooler_efficiency),
+            ("Обороты от / до:", self.boost_rpm_range),
+            ("Шаг оборотов:", self.boost_rpm_step)
+        ]
+        for index, (title, widget) in enumerate(boost_fields):
+            row, column = index // 2, (index % 2) * 3
+            boost_layout.addWidget(QLabel(title), row, column)
+            if isinstance(widget, tuple):
+                boost_layout.addWidget(widget[0], row, column + 1)
+                boost_layout.addWidget(widget[1], row, column + 2)
+            else:
+                boost_layout.addWidget(widget, row, column + 1, 1, 2)
+
+        compressor_buttons = QHBoxLayout()
+        import_compressor_btn = QPushButton("Карта компрессора (CSV)")
+        import_compressor_btn.clicked.connect(self.import_compressor_map)
+        demo_compressor_btn = QPushButton("Демонстрационная карта")
+        demo_compressor_btn.clicked.connect(lambda: self.set_compressor_map(CompressorMap.demo()))
+        calculate_boost_btn = QPushButton("Рассчитать рабочую линию")
+        calculate_boost_btn.clicked.connect(self.calculate_boost)
+        compressor_buttons.addWidget(import_compressor_btn)
+        compressor_buttons.addWidget(demo_compressor_btn)
+        compressor_buttons.addWidget(calculate_boost_btn)
+
+        self.compressor_map_label = QLabel("Карта компрессора не задана")
+        self.boost_result = QTextEdit()
+        self.boost_result.setReadOnly(True)
+        self.boost_result.setStyleSheet("font-family: monospace;")
+        self.boost_result.setMaximumHeight(200)
+
+        row = (len(boost_fields) + 1) // 2
+        boost_layout.addLayout(compressor_buttons, row, 0, 1, 6)
+        boost_layout.addWidget(self.compressor_map_label, row + 1, 0, 1, 6)
+        boost_layout.addWidget(self.boost_result, row + 2, 0, 1, 6)
+        boost_group.setLayout(boost_layout)
+
         # ===== 5. Группа "Степень сжатия" =====
         compression_group = QGroupBox("Степень сжатия")
         compression_layout = QFormLayout()
@@ -1229,175 +5694,1400 @@ class AdvancedVehicleCalculator(QMainWindow):
         compression_layout.addRow("Степень сжатия:", self.compression_result)
         compression_group.setLayout(compression_layout)
 
+        # Группа "Геометрия двигателя" - размеры, степени сжатия и подбор деталей
+        geometry_group = QGroupBox("Геометрия двигателя и подбор деталей")
+        geometry_layout = QGridLayout()
+
+        self.geometry_bore = QLineEdit("82")
+        self.geometry_stroke = QLineEdit("93")
+        self.geometry_rod = QLineEdit("144")
+        self.geometry_cylinders = QSpinBox()
+        self.geometry_cylinders.setRange(1, 16)
+        self.geometry_cylinders.setValue(4)
+        self.geometry_gasket_bore = QLineEdit("83")
+        self.geometry_gasket_thickness = QLineEdit("1.0")
+        self.geometry_deck_clearance = QLineEdit("0.2")
+        self.geometry_deck_clearance.setPlaceholderText("мм, выступание - отрицательное")
+        self.geometry_piston_volume = QLineEdit("6")
+        self.geometry_piston_volume.setPlaceholderText("см³, купол - отрицательный")
+        self.geometry_chamber_volume = QLineEdit("42")
+        self.geometry_ivc = QLineEdit("50")
+        self.geometry_rpm = QLineEdit("7000")
+        self.geometry_deck_height = QLineEdit("222")
+        self.geometry_target_cr = QLineEdit("11.0")
+        self.geometry_cr_tolerance = QLineEdit("0.3")
+        self.geometry_quench_range = (QLineEdit("0.7"), QLineEdit("1.2"))
+        self.geometry_max_overbore = QLineEdit("1.0")
+        self.geometry_max_dynamic_cr = QLineEdit("")
+        self.geometry_max_dynamic_cr.setPlaceholderText("без ограничения")
+
+        geometry_fields = [
+            ("Диаметр цилиндра, мм:", self.geometry_bore),
+            ("Ход поршня, мм:", self.geometry_stroke),
+            ("Длина шатуна, мм:", self.geometry_rod),
+            ("Число цилиндров:", self.geometry_cylinders),
+            ("Отверстие прокладки, мм:", self.geometry_gasket_bore),
+            ("Толщина прокладки, мм:", self.geometry_gasket_thickness),
+            ("Утопание поршня в ВМТ, мм:", self.geometry_deck_clearance),
+            ("Выборка в поршне, см³:", self.geometry_piston_volume),
+            ("Объем камеры сгорания, см³:", self.geometry_chamber_volume),
+            ("Закрытие впуска после НМТ, °:", self.geometry_ivc),
+            ("Обороты, об/мин:", self.geometry_rpm)
+        ]
+        catalog_fields = [
+            ("Высота блока, мм:", self.geometry_deck_height),
+            ("Целевая степень сжатия:", self.geometry_target_cr),
+            ("Допуск степени сжатия:", self.geometry_cr_tolerance),
+            ("Вытеснитель от / до, мм:", self.geometry_quench_range),
+            ("Максимальная расточка, мм:", self.geometry_max_overbore),
+            ("Динамическая степень сжатия не более:", self.geometry_max_dynamic_cr)
+        ]
+        for offset, fields in ((0, geometry_fields), ((len(geometry_fields) + 1) // 2 + 2, catalog_fields)):
+            for index, (title, widget) in enumerate(fields):
+                row, column = offset + index // 2, (index % 2) * 3
+                geometry_layout.addWidget(QLabel(title), row, column)
+                if isinstance(widget, tuple):
+                    geometry_layout.addWidget(widget[0], row, column + 1)
+                    geometry_layout.addWidget(widget[1], row, column + 2)
+                else:
+                    geometry_layout.addWidget(widget, row, column + 1, 1, 2)
+
+        calculate_geometry_btn = QPushButton("Рассчитать геометрию")
+        calculate_geometry_btn.clicked.connect(self.calculate_engine_geometry)
+
+        parts_buttons = QHBoxLayout()
+        for kind, title in (('pistons', "Поршни (CSV)"), ('gaskets', "Прокладки (CSV)"), ('heads', "Головки (CSV)")):
+            import_parts_btn = QPushButton(title)
+            import_parts_btn.clicked.connect(lambda _, kind=kind: self.import_engine_parts(kind))
+            parts_buttons.addWidget(import_parts_btn)
+        demo_parts_btn = QPushButton("Демонстрационный каталог")
+        demo_parts_btn.clicked.connect(self.create_demo_engine_parts)
+        parts_buttons.addWidget(demo_parts_btn)
+
+        match_parts_btn = QPushButton("Подобрать поршни, прокладки и головки")
+        match_parts_btn.clicked.connect(self.match_engine_parts)
+
+        self.engine_parts_size_label = QLabel("")
+        self.geometry_result = QTextEdit()
+        self.geometry_result.setReadOnly(True)
+        self.geometry_result.setStyleSheet("font-family: monospace;")
+        self.geometry_result.setMinimumHeight(200)
+
+        row = (len(geometry_fields) + 1) // 2
+        geometry_layout.addWidget(calculate_geometry_btn, row, 0, 1, 6)
+        geometry_layout.addWidget(QLabel("Подбор по каталогу:"), row + 1, 0, 1, 6)
+        row += 2 + (len(catalog_fields) + 1) // 2
+        geometry_layout.addLayout(parts_buttons, row, 0, 1, 6)
+        geometry_layout.addWidget(self.engine_parts_size_label, row + 1, 0, 1, 6)
+        geometry_layout.addWidget(match_parts_btn, row + 2, 0, 1, 6)
+        geometry_layout.addWidget(self.geometry_result, row + 3, 0, 1, 6)
+        geometry_group.setLayout(geometry_layout)
+
+        # Группа "Настройка впуска и выпуска" - волновая и резонансная
+        tuning_group = QGroupBox("Настройка впуска и выпуска")
+        tuning_layout = QGridLayout()
+
+        self.tuning_rpm = QLineEdit("6000")
+        self.tuning_order = QSpinBox()
+        self.tuning_order.setRange(1, 6)
+        self.tuning_order.setValue(3)
+        self.tuning_intake_duration = QLineEdit("250")
+        self.tuning_exhaust_duration = QLineEdit("250")
+        self.tuning_runner_diameter = QLineEdit("40")
+        self.tuning_primary_diameter = QLineEdit("38")
+        self.tuning_exhaust_temp = QLineEdit("600")
+        self.tuning_neck = (QLineEdit("60"), QLineEdit("150"))
+        self.tuning_length_range = (QLineEdit("100"), QLineEdit("800"))
+        self.tuning_length_step = QLineEdit("5")
+        self.tuning_diameter_range = (QLineEdit("30"), QLineEdit("55"))
+        self.tuning_diameter_step = QLineEdit("0.5")
+        self.tuning_rpm_range = (QLineEdit("2000"), QLineEdit("8000"))
+        self.tuning_rpm_step = QLineEdit("50")
+
+        tuning_fields = [
+            ("Обороты настройки:", self.tuning_rpm),
+            ("Порядок гармоники:", self.tuning_order),
+            ("Фаза впуска, °:", self.tuning_intake_duration),
+            ("Фаза выпуска, °:", self.tuning_exhaust_duration),
+            ("Диаметр впускного канала, мм:", self.tuning_runner_diameter),
+            ("Диаметр трубы выпуска, мм:", self.tuning_primary_diameter),
+            ("Температура газов выпуска, °C:", self.tuning_exhaust_temp),
+            ("Дроссель: диаметр / длина, мм:", self.tuning_neck),
+            ("Длина канала от / до, мм:", self.tuning_length_range),
+            ("Шаг длины, мм:", self.tuning_length_step),
+            ("Диаметр канала от / до, мм:", self.tuning_diameter_range),
+            ("Шаг диаметра, мм:", self.tuning_diameter_step),
+            ("Обороты от / до:", self.tuning_rpm_range),
+            ("Шаг оборотов:", self.tuning_rpm_step)
+        ]
+        for index, (title, widget) in enumerate(tuning_fields):
+            row, column = index // 2, (index % 2) * 3
+            tuning_layout.addWidget(QLabel(title), row, column)
+            if isinstance(widget, tuple):
+                tuning_layout.addWidget(widget[0], row, column + 1)
+                tuning_layout.addWidget(widget[1], row, column + 2)
+            else:
+                tuning_layout.addWidget(widget, row, column + 1, 1, 2)
+
+        tuning_buttons = QHBoxLayout()
+        calculate_tuning_btn = QPushButton("Рассчитать длины и объем ресивера")
+        calculate_tuning_btn.clicked.connect(self.calculate_intake_tuning)
+        tuning_map_btn = QPushButton("Построить карты настройки")
+        tuning_map_btn.clicked.connect(self.calculate_tuning_map)
+        tuning_buttons.addWidget(calculate_tuning_btn)
+        tuning_buttons.addWidget(tuning_map_btn)
+        tuning_note = QLabel("Объем цилиндра, степень сжатия и число цилиндров - по группе «Геометрия двигателя», "
+                             "температура на впуске - по группе «Наддув»")
+        tuning_note.setWordWrap(True)
+
+        self.tuning_result = QTextEdit()
+        self.tuning_result.setReadOnly(True)
+        self.tuning_result.setStyleSheet("font-family: monospace;")
+        self.tuning_result.setMaximumHeight(220)
+
+        row = (len(tuning_fields) + 1) // 2
+        tuning_layout.addWidget(tuning_note, row, 0, 1, 6)
+        tuning_layout.addLayout(tuning_buttons, row + 1, 0, 1, 6)
+        tuning_layout.addWidget(self.tuning_result, row + 2, 0, 1, 6)
+        tuning_group.setLayout(tuning_layout)
+
+        # Группа "Рабочий цикл" - 0D модель по углу поворота коленвала
+        cycle_group = QGroupBox("Рабочий цикл по углу поворота коленвала")
+        cycle_layout = QGridLayout()
+
+        self.engine_cycle_bore = QLineEdit("82")
+        self.engine_cycle_stroke = QLineEdit("93")
+        self.engine_cycle_rod = QLineEdit("144")
+        self.engine_cycle_compression_ratios = QLineEdit("9, 10, 11, 12")
+        self.engine_cycle_spark_range = (QLineEdit("0"), QLineEdit("50"))
+        self.engine_cycle_spark_step = QLineEdit("1")
+        self.engine_cycle_burn_duration = QLineEdit("50")
+        self.engine_cycle_rpm = QLineEdit("3000")
+        self.engine_cycle_wall_temp = QLineEdit("180")
+
+        cycle_fields = [
+            ("Диаметр цилиндра, мм:", self.engine_cycle_bore),
+            ("Ход поршня, мм:", self.engine_cycle_stroke),
+            ("Длина шатуна, мм:", self.engine_cycle_rod),
+            ("Степени сжатия:", self.engine_cycle_compression_ratios),
+            ("Опережение зажигания от / до, °:", self.engine_cycle_spark_range),
+            ("Шаг опережения, °:", self.engine_cycle_spark_step),
+            ("Продолжительность сгорания, °:", self.engine_cycle_burn_duration),
+            ("Обороты, об/мин:", self.engine_cycle_rpm),
+            ("Температура стенок, °C:", self.engine_cycle_wall_temp)
+        ]
+        for index, (title, widget) in enumerate(cycle_fields):
+            row, column = index // 2, (index % 2) * 3
+            cycle_layout.addWidget(QLabel(title), row, column)
+            if isinstance(widget, tuple):
+                cycle_layout.addWidget(widget[0], row, column + 1)
+                cycle_layout.addWidget(widget[1], row, column + 2)
+            else:
+                cycle_layout.addWidget(widget, row, column + 1, 1, 2)
+
+        calculate_cycle_btn = QPushButton("Рассчитать цикл")
+        calculate_cycle_btn.clicked.connect(self.calculate_engine_cycle)
+        cycle_note = QLabel("Давление и температура на впуске - по группе «Наддув», "
+                            "топливо и коэффициент избытка воздуха - по группе «Расход воздуха»")
+        cycle_note.setWordWrap(True)
+
+        self.engine_cycle_result = QTextEdit()
+        self.engine_cycle_result.setReadOnly(True)
+        self.engine_cycle_result.setStyleSheet("font-family: monospace;")
+        self.engine_cycle_result.setMaximumHeight(200)
+
+        row = (len(cycle_fields) + 1) // 2
+        cycle_layout.addWidget(cycle_note, row, 0, 1, 6)
+        cycle_layout.addWidget(calculate_cycle_btn, row + 1, 0, 1, 6)
+        cycle_layout.addWidget(self.engine_cycle_result, row + 2, 0, 1, 6)
+        cycle_group.setLayout(cycle_layout)
+
+        # Группа "Карта удельного расхода" - обороты × момент
+        map_group = QGroupBox("Карта удельного расхода топлива")
+        map_layout = QFormLayout()
+
+        self.engine_map = None
+        self.engine_map_label = QLabel("Карта не задана")
+        self.engine_map_bsfc_min = QLineEdit("245")
+        self.engine_map_bsfc_min.setPlaceholderText("г/(кВт·ч)")
+
+        map_buttons = QHBoxLayout()
+        import_map_btn = QPushButton("Импорт CSV (таблица или журнал стенда)")
+        import_map_btn.clicked.connect(self.import_engine_map)
+        generate_map_btn = QPushButton("По внешней характеристике")
+        generate_map_btn.clicked.connect(self.generate_engine_map)
+        map_buttons.addWidget(import_map_btn)
+        map_buttons.addWidget(generate_map_btn)
+
+        file_buttons = QHBoxLayout()
+        open_map_btn = QPushButton("Открыть (.npz)")
+        open_map_btn.clicked.connect(self.open_engine_map)
+        save_map_btn = QPushButton("Сохранить (.npz)")
+        save_map_btn.clicked.connect(self.save_engine_map)
+        file_buttons.addWidget(open_map_btn)
+        file_buttons.addWidget(save_map_btn)
+
+        calculate_map_btn = QPushButton("Рассчитать КПД, расход и цикл впрыска по карте")
+        calculate_map_btn.clicked.connect(self.calculate_engine_map)
+
+        self.engine_map_result = QTextEdit()
+        self.engine_map_result.setReadOnly(True)
+        self.engine_map_result.setStyleSheet("font-family: monospace;")
+        self.engine_map_result.setMaximumHeight(150)
+
+        map_layout.addRow("Минимальный удельный расход:", self.engine_map_bsfc_min)
+        map_layout.addRow(map_buttons)
+        map_layout.addRow(file_buttons)
+        map_layout.addRow("Карта:", self.engine_map_label)
+        map_layout.addRow(calculate_map_btn)
+        map_layout.addRow(self.engine_map_result)
+        map_group.setLayout(map_layout)
+
+        self.engine_figure = Figure(figsize=(6, 3))
+        self.engine_canvas = FigureCanvas(self.engine_figure)
+        self.engine_canvas.setMinimumHeight(300)
+
         # Добавляем все группы на вкладку
         layout.addWidget(eff_group)
         layout.addWidget(mep_group)
         layout.addWidget(power_group)
         layout.addWidget(air_flow_group)
+        layout.addWidget(ve_group)
+        layout.addWidget(boost_group)
         layout.addWidget(compression_group)
+        layout.addWidget(geometry_group)
+        layout.addWidget(tuning_group)
+        layout.addWidget(cycle_group)
+        layout.addWidget(map_group)
+        layout.addWidget(self.engine_canvas)
         layout.addStretch()
 
         tab.setLayout(layout)
-        self.tabs.addTab(tab, "Двигатель")
 
-    def calculate_engine_efficiency(self):
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setWidget(tab)
+        self.tabs.addTab(scroll, "Двигатель")
+
+    def read_engine_geometry(self):
+        """Размеры из группы «Геометрия двигателя»"""
+        fields = {
+            'bore': self.geometry_bore,
+            'stroke': self.geometry_stroke,
+            'rod': self.geometry_rod,
+            'gasket_bore': self.geometry_gasket_bore,
+            'gasket_thickness': self.geometry_gasket_thickness,
+            'deck_clearance': self.geometry_deck_clearance,
+            'piston_volume': self.geometry_piston_volume,
+            'chamber_volume': self.geometry_chamber_volume,
+            'ivc': self.geometry_ivc,
+            'rpm': self.geometry_rpm
+        }
+        values = {key: float(field.text()) for key, field in fields.items()}
+        if min(values['bore'], values['stroke'], values['rpm']) <= 0 or values['rod'] <= values['stroke'] / 2:
+            raise ValueError("Диаметр, ход и обороты должны быть больше нуля, а шатун длиннее радиуса кривошипа")
+        values['cylinders'] = self.geometry_cylinders.value()
+        return values
+
+    def calculate_engine_geometry(self):
+        """Рабочий объем, статическая и динамическая степени сжатия, скорость поршня"""
         try:
-            power_hp = float(self.engine_power_hp.text())
-            fuel_consumption = float(self.engine_fuel_consumption.text())
-            fuel_type = self.engine_fuel_energy.currentText()
-
-            fuel_energy = {
-                "Бензин (42.7 МДж/кг)": 42.7,
-                "Дизель (43.4 МДж/кг)": 43.4,
-                "Этанол (26.8 МДж/кг)": 26.8
-            }[fuel_type]
-
-            power_kw = power_hp * 0.7355
-            fuel_energy_kj = fuel_consumption * fuel_energy * 1000
-            efficiency = (power_kw * 3600) / fuel_energy_kj
-
-            self.engine_efficiency_result.setText(f"{efficiency * 100:.1f}%")
+            values = self.read_engine_geometry()
+            geometry = {key: float(value) for key, value in engine_geometry_model(**values).items()}
+            if geometry['clearance_volume'] <= 0:
+                raise ValueError("Объем камеры сжатия получился неположительным - проверьте купол и утопание поршня")
+
+            lines = [
+                "=== ГЕОМЕТРИЯ ДВИГАТЕЛЯ ===",
+                f"Рабочий объем: {geometry['displacement']:.0f} см³ ({geometry['cylinder_volume']:.1f} см³ на цилиндр)",
+                f"Объем камеры сжатия: {geometry['clearance_volume']:.2f} см³",
+                f"Статическая степень сжатия: {geometry['static_cr']:.2f}:1",
+                f"Динамическая степень сжатия: {geometry['dynamic_cr']:.2f}:1 "
+                f"(закрытие впуска {values['ivc']:.0f}° после НМТ)",
+                f"Вытеснитель: {geometry['quench']:.2f} мм",
+                f"Средняя скорость поршня: {geometry['mean_piston_speed']:.1f} м/с при {values['rpm']:.0f} об/мин",
+                f"Отношение длины шатуна к ходу: {geometry['rod_ratio']:.2f}"
+            ]
+            self.geometry_result.setText("\n".join(lines))
+
+            # Размеры передаются в расчет рабочего цикла
+            self.engine_cycle_bore.setText(f"{values['bore']:g}")
+            self.engine_cycle_stroke.setText(f"{values['stroke']:g}")
+            self.engine_cycle_rod.setText(f"{values['rod']:g}")
 
-            # Сохранение для отчета
-            self.report_data['engine'] = {
-                'power_hp': power_hp,
-                'fuel_consumption': fuel_consumption,
-                'fuel_type': fuel_type,
-                'efficiency': f"{efficiency * 100:.1f}%"
+            # Сохраняем для отчета
+            if 'engine' not in self.report_data:
+                self.report_data['engine'] = {}
+            self.report_data['engine']['engine_geometry'] = {
+                'displacement': f"{geometry['displacement']:.0f} см³",
+                'clearance_volume': f"{geometry['clearance_volume']:.2f} см³",
+                'static_cr': f"{geometry['static_cr']:.2f}:1",
+                'dynamic_cr': f"{geometry['dynamic_cr']:.2f}:1",
+                'quench': f"{geometry['quench']:.2f} мм",
+                'mean_piston_speed': f"{geometry['mean_piston_speed']:.1f} м/с",
+                'rod_ratio': f"{geometry['rod_ratio']:.2f}"
             }
 
-            # Сохранение в БД
-            self.db.save_calculation(
-                'engine_efficiency',
-                {
-                    'power': f"{power_hp} л.с.",
-                    'fuel_consumption': f"{fuel_consumption} кг/ч",
-                    'fuel_type': fuel_type.split()[0]
-                },
-                {'efficiency': f"{efficiency * 100:.1f}%"}
-            )
+            # Сохраняем в базу данных
+            calc_id = self.db.save_calculation('engine_geometry', values, geometry)
 
             self.update_report_tab()
+            self.statusBar().showMessage(f"Расчет геометрии сохранен (ID: {calc_id})", 3000)
 
-        except ValueError:
-            QMessageBox.warning(self, "Ошибка", "Пожалуйста, введите корректные числовые значения")
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Пожалуйста, введите корректные значения\n{str(e)}")
 
-    def calculate_mep(self):
+    def import_engine_parts(self, kind):
+        """Импорт поршней, прокладок или головок из CSV
+
+        Поршни: part_number, manufacturer, bore (мм), compression_height (мм),
+        volume (см³, купол - отрицательный). Прокладки: part_number,
+        manufacturer, bore (мм), thickness (мм). Головки: part_number,
+        manufacturer, chamber_volume (см³).
+        """
+        file_name, _ = QFileDialog.getOpenFileName(self, "Импорт каталога", "", "CSV Files (*.csv)")
+        if not file_name:
+            return
         try:
-            displacement = float(self.engine_displacement.text()) / 1e6  # в м³
-            torque = float(self.engine_torque.text())
+            rows = read_catalog_csv(file_name)
+            columns = self.db.ENGINE_PARTS[kind][1]
+            added = self.db.add_engine_parts(kind, [
+                (row['part_number'], row.get('manufacturer', ''), *[float(row[column]) for column in columns])
+                for row in rows
+            ])
+            self.update_catalog_size()
+            self.statusBar().showMessage(f"Импортировано записей: {added}", 3000)
 
-            mep = (2 * math.pi * torque * 4) / displacement
-            mep_bar = mep / 1e5  # в бар
-            mep_kgcm2 = mep_bar / 10.197
+        except (KeyError, ValueError, OSError) as e:
+            QMessageBox.warning(self, "Ошибка", f"Некорректный формат файла каталога\n{str(e)}")
 
-            self.mep_result.setText(f"{mep_bar:.2f} бар ({(mep_kgcm2):.2f} кгс/см²)")
+    def create_demo_engine_parts(self):
+        """Заполняет каталог деталей двигателя синтетическими данными"""
+        for kind, parts in zip(('pistons', 'gaskets', 'heads'), demo_engine_parts()):
+            self.db.add_engine_parts(kind, parts)
+        self.update_catalog_size()
 
-            # Сохранение для отчета
+    def match_engine_parts(self):
+        """Подбор сочетаний поршня, прокладки и головки под целевую степень сжатия"""
+        try:
+            values = self.read_engine_geometry()
+            deck_height = float(self.geometry_deck_height.text())
+            target_cr = float(self.geometry_target_cr.text())
+            cr_tolerance = float(self.geometry_cr_tolerance.text())
+            quench_range = tuple(float(field.text()) for field in self.geometry_quench_range)
+            max_overbore = float(self.geometry_max_overbore.text())
+            max_dynamic_cr = float(self.geometry_max_dynamic_cr.text()) if self.geometry_max_dynamic_cr.text() else None
+            if target_cr - cr_tolerance <= 1 or cr_tolerance < 0 or max_overbore < 0:
+                raise ValueError("Некорректная целевая степень сжатия, допуск или расточка")
+            if quench_range[0] > quench_range[1]:
+                raise ValueError("Некорректный диапазон вытеснителя")
+
+            bore = values['bore']
+            gasket_overhang = (0.3, 3.0)
+            start = time.perf_counter()
+            pistons = self.db.engine_parts('pistons', bore, bore + max_overbore)
+            gaskets = self.db.engine_parts('gaskets', bore + gasket_overhang[0],
+                                           bore + max_overbore + gasket_overhang[1])
+            heads = self.db.engine_parts('heads')
+            if pistons and gaskets and heads:
+                piston_data = np.array([row[3:6] for row in pistons], dtype=float)
+                gasket_data = np.array([row[3:5] for row in gaskets], dtype=float)
+                result = engine_build_combinations(
+                    piston_data[:, 0], piston_data[:, 1], piston_data[:, 2], gasket_data[:, 0], gasket_data[:, 1],
+                    [row[3] for row in heads], values['stroke'], values['rod'], deck_height, values['ivc'],
+                    target_cr, cr_tolerance, quench_range, gasket_overhang, max_dynamic_cr)
+            else:
+                result = {'count': 0, 'piston': []}
+            elapsed = time.perf_counter() - start
+
+            lines = [
+                "=== ПОДБОР ДЕТАЛЕЙ ДВИГАТЕЛЯ ===",
+                f"Кандидатов: поршней {len(pistons)}, прокладок {len(gaskets)}, головок {len(heads)}; "
+                f"допустимых сочетаний: {result['count']} ({elapsed * 1000:.0f} мс)",
+                "",
+                f"{'Поршень':<9} {'Ø':>5} {'см³':>5} {'Прокладка':<9} {'мм':>4} {'Головка':<9} {'см³':>5} "
+                f"{'ε':>6} {'ε дин.':>6} {'Вытесн.':>7}"
+            ]
+            best = []
+            for n, i in enumerate(result['piston']):
+                piston, gasket, head = pistons[i], gaskets[result['gasket'][n]], heads[result['head'][n]]
+                lines.append(f"{piston[1]:<9} {piston[3]:5.1f} {piston[5]:5.1f} {gasket[1]:<9} {gasket[4]:4.1f} "
+                             f"{head[1]:<9} {head[3]:5.1f} {result['static_cr'][n]:6.2f} "
+                             f"{result['dynamic_cr'][n]:6.2f} {result['quench'][n]:7.2f}")
+                best.append(f"{piston[1]} + {gasket[1]} + {head[1]}")
+            if not result['count']:
+                lines.append("\nДопустимых сочетаний нет - расширьте допуски или каталог")
+            self.geometry_result.setText("\n".join(lines))
+
+            # Лучшее сочетание подставляется в поля расчета геометрии
+            if result['count']:
+                piston, gasket, head = pistons[result['piston'][0]], gaskets[result['gasket'][0]], heads[result['head'][0]]
+                self.geometry_bore.setText(f"{piston[3]:g}")
+                self.geometry_piston_volume.setText(f"{piston[5]:g}")
+                self.geometry_deck_clearance.setText(f"{result['deck_clearance'][0]:.2f}")
+                self.geometry_gasket_bore.setText(f"{gasket[3]:g}")
+                self.geometry_gasket_thickness.setText(f"{gasket[4]:g}")
+                self.geometry_chamber_volume.setText(f"{head[3]:g}")
+
+            # Сохраняем для отчета
             if 'engine' not in self.report_data:
                 self.report_data['engine'] = {}
-            self.report_data['engine'].update({
-                'displacement': f"{displacement * 1e6:.0f} см³",
-                'torque': f"{torque:.1f} Н·м",
-                'mep': f"{mep_bar:.2f} бар",
-                'mep_kgcm2': f"{mep_kgcm2:.2f} кгс/см²"
-            })
+            self.report_data['engine']['build_combinations'] = {
+                'target_cr': f"{target_cr:.1f}:1",
+                'combinations': result['count'],
+                'best_build': best[0] if best else "-",
+                'static_cr': f"{result['static_cr'][0]:.2f}:1" if best else "-",
+                'dynamic_cr': f"{result['dynamic_cr'][0]:.2f}:1" if best else "-",
+                'quench': f"{result['quench'][0]:.2f} мм" if best else "-"
+            }
 
-            # Сохранение в БД
-            self.db.save_calculation(
-                'engine_mep',
+            # Сохраняем в базу данных
+            calc_id = self.db.save_calculation(
+                'engine_build_match',
                 {
-                    'displacement': f"{displacement * 1e6:.0f} см³",
-                    'torque': f"{torque:.1f} Н·м"
+                    'bore': bore,
+                    'stroke': values['stroke'],
+                    'rod': values['rod'],
+                    'deck_height': deck_height,
+                    'ivc': values['ivc'],
+                    'target_cr': target_cr,
+                    'cr_tolerance': cr_tolerance,
+                    'quench_range': list(quench_range),
+                    'max_dynamic_cr': max_dynamic_cr
                 },
                 {
-                    'mep_bar': f"{mep_bar:.2f} бар",
-                    'mep_kgcm2': f"{mep_kgcm2:.2f} кгс/см²"
+                    'combinations': result['count'],
+                    'best': best[:5]
                 }
             )
 
             self.update_report_tab()
+            self.statusBar().showMessage(f"Подбор деталей двигателя сохранен (ID: {calc_id})", 3000)
 
-        except ValueError:
-            QMessageBox.warning(self, "Ошибка", "Пожалуйста, введите рабочий объем и крутящий момент")
-
-    def calculate_power_from_torque(self):
-        try:
-            torque = float(self.engine_torque_for_power.text())
-            rpm = float(self.engine_rpm_for_power.text())
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Пожалуйста, введите корректные значения\n{str(e)}")
 
-            power_hp = (torque * rpm) / 7024
-            power_kw = power_hp * 0.7355
+    def tuning_engine(self):
+        """Объем цилиндра, степень сжатия, число цилиндров и температура на впуске для настройки"""
+        values = self.read_engine_geometry()
+        geometry = engine_geometry_model(**values)
+        compression_ratio = float(geometry['static_cr'])
+        if compression_ratio <= 1:
+            raise ValueError("Проверьте геометрию двигателя: степень сжатия должна быть больше 1")
+        charge = charge_air_model(**self.charge_air())
+        return {
+            'cylinder_volume': float(geometry['cylinder_volume']),
+            'compression_ratio': compression_ratio,
+            'cylinders': values['cylinders'],
+            'temperature': float(charge['charge_temperature'])
+        }
 
-            self.power_result.setText(f"{power_hp:.1f} л.с. ({power_kw:.1f} кВт)")
+    def calculate_intake_tuning(self):
+        """Длины впускных каналов и труб выпуска, объем ресивера для оборотов настройки"""
+        try:
+            engine = self.tuning_engine()
+            rpm = float(self.tuning_rpm.text())
+            order = self.tuning_order.value()
+            intake_duration = float(self.tuning_intake_duration.text())
+            exhaust_duration = float(self.tuning_exhaust_duration.text())
+            runner_diameter = float(self.tuning_runner_diameter.text())
+            primary_diameter = float(self.tuning_primary_diameter.text())
+            exhaust_temp = float(self.tuning_exhaust_temp.text())
+            neck_diameter, neck_length = [float(field.text()) for field in self.tuning_neck]
+            if rpm <= 0 or min(runner_diameter, primary_diameter, neck_diameter, neck_length) <= 0:
+                raise ValueError("Обороты, диаметры и длина дросселя должны быть больше нуля")
+            if not 0 < intake_duration < 720 or not 0 < exhaust_duration < 720:
+                raise ValueError("Продолжительность фаз должна быть от 0 до 720°")
+
+            orders = np.arange(1, self.tuning_order.maximum() + 1)
+            intake = wave_tuned_length(rpm, 720 - intake_duration, orders, engine['temperature'], runner_diameter)
+            exhaust = wave_tuned_length(rpm, exhaust_duration, orders, exhaust_temp, primary_diameter)
+            helmholtz = float(runner_helmholtz_length(rpm, runner_diameter, engine['cylinder_volume'],
+                                                      engine['compression_ratio'], engine['temperature']))
+            plenum = float(plenum_volume(rpm, engine['cylinders'], neck_diameter, neck_length,
+                                         temperature=engine['temperature']))
+            displacement = engine['cylinder_volume'] * engine['cylinders'] / 1000
+
+            lines = [
+                "=== НАСТРОЙКА ВПУСКА И ВЫПУСКА ===",
+                f"Обороты настройки: {rpm:.0f} об/мин; скорость звука: впуск "
+                f"{float(speed_of_sound(engine['temperature'])):.0f} м/с, выпуск {float(speed_of_sound(exhaust_temp)):.0f} м/с",
+                "",
+                "Волновая настройка (длина от клапана до открытого конца):",
+                f"{'Порядок':>8} {'Впуск, мм':>10} {'Выпуск, мм':>11}"
+            ]
+            for k, intake_length, exhaust_length in zip(orders, intake, exhaust):
+                mark = " <" if k == order else ""
+                lines.append(f"{k:8d} {intake_length:10.0f} {exhaust_length:11.0f}{mark}")
+            lines += [
+                "",
+                f"Резонанс Гельмгольца, канал Ø{runner_diameter:g} мм: " +
+                (f"длина {helmholtz:.0f} мм" if helmholtz > 0 else "недостижим - уменьшите диаметр канала"),
+                f"Объем ресивера (основная гармоника): {plenum:.2f} л ({plenum / displacement:.2f} рабочего объема)"
+            ]
+            self.tuning_result.setText("\n".join(lines))
 
-            # Сохранение для отчета
-            self.report_data['engine_power_calc'] = {
-                'torque': f"{torque:.1f} Н·м",
-                'rpm': f"{rpm:.0f} об/мин",
-                'power_hp': f"{power_hp:.1f} л.с.",
-                'power_kw': f"{power_kw:.1f} кВт"
+            # Сохраняем для отчета
+            if 'engine' not in self.report_data:
+                self.report_data['engine'] = {}
+            self.report_data['engine']['intake_tuning'] = {
+                'target_rpm': f"{rpm:.0f} об/мин",
+                'harmonic_order': order,
+                'intake_runner_length': f"{intake[order - 1]:.0f} мм",
+                'exhaust_primary_length': f"{exhaust[order - 1]:.0f} мм",
+                'helmholtz_length': f"{helmholtz:.0f} мм" if helmholtz > 0 else "-",
+                'plenum_volume': f"{plenum:.2f} л"
             }
 
-            # Сохранение в БД
-            self.db.save_calculation(
-                'engine_power',
+            # Сохраняем в базу данных
+            calc_id = self.db.save_calculation(
+                'intake_tuning',
                 {
-                    'torque': f"{torque:.1f} Н·м",
-                    'rpm': f"{rpm:.0f} об/мин"
+                    'target_rpm': rpm,
+                    'harmonic_order': order,
+                    'intake_duration': intake_duration,
+                    'exhaust_duration': exhaust_duration,
+                    'runner_diameter': runner_diameter,
+                    'neck_diameter': neck_diameter,
+                    'neck_length': neck_length,
+                    'exhaust_temp': exhaust_temp,
+                    **engine
                 },
                 {
-                    'power_hp': f"{power_hp:.1f} л.с.",
-                    'power_kw': f"{power_kw:.1f} кВт"
+                    'intake_runner_length': [float(v) for v in intake],
+                    'exhaust_primary_length': [float(v) for v in exhaust],
+                    'helmholtz_length': helmholtz,
+                    'plenum_volume': plenum
                 }
             )
 
             self.update_report_tab()
+            self.statusBar().showMessage(f"Расчет настройки сохранен (ID: {calc_id})", 3000)
 
-        except ValueError:
-            QMessageBox.warning(self, "Ошибка", "Введите корректные значения момента и оборотов")
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Пожалуйста, введите корректные значения\n{str(e)}")
 
-    def calculate_air_flow(self):
+    def calculate_tuning_map(self):
+        """Карты резонансной и волновой настройки по сетке длина × диаметр × обороты"""
         try:
-            displacement = float(self.engine_displacement_air.text())  # в литрах
-            rpm = float(self.engine_rpm_air.text())
-            efficiency = self.engine_volumetric_efficiency.value()
-
-            air_density = 1.2  # кг/м³
-            air_flow = (displacement * rpm * efficiency * air_density) / 120  # кг/ч
+            engine = self.tuning_engine()
+            grids = []
+            for (start_field, stop_field), step_field in ((self.tuning_length_range, self.tuning_length_step),
+                                                          (self.tuning_diameter_range, self.tuning_diameter_step),
+                                                          (self.tuning_rpm_range, self.tuning_rpm_step)):
+                start, stop, step = float(start_field.text()), float(stop_field.text()), float(step_field.text())
+                if step <= 0 or not 0 < start <= stop:
+                    raise ValueError("Некорректный диапазон длины, диаметра или оборотов")
+                grids.append(np.arange(start, stop + step / 2, step))
+            lengths, diameters, rpms = grids
+            target_rpm = float(self.tuning_rpm.text())
+            runner_diameter = float(self.tuning_runner_diameter.text())
+            intake_duration = float(self.tuning_intake_duration.text())
+            if not 0 < intake_duration < 720:
+                raise ValueError("Продолжительность фазы впуска должна быть от 0 до 720°")
+
+            start = time.perf_counter()
+            maps = cached_tuning_map(lengths, diameters, rpms, cylinder_volume=engine['cylinder_volume'],
+                                     compression_ratio=engine['compression_ratio'], window=720 - intake_duration,
+                                     temperature=engine['temperature'])
+            elapsed = time.perf_counter() - start
+
+            # Для каждого диаметра - длина с резонансом на оборотах настройки
+            column = np.abs(rpms - target_rpm).argmin()
+            best = lengths[np.abs(maps['helmholtz_rpm'] - rpms[column]).argmin(axis=0)]
+            j = np.abs(diameters - runner_diameter).argmin()
+            shown = np.unique(np.linspace(0, len(diameters) - 1, min(len(diameters), 8)).round().astype(int))
+
+            lines = [
+                "=== КАРТЫ НАСТРОЙКИ ВПУСКА ===",
+                f"Сетка: {len(lengths)} × {len(diameters)} × {len(rpms)} "
+                f"(длина × диаметр × обороты), {elapsed * 1000:.1f} мс",
+                "",
+                f"Длина канала для резонанса на {rpms[column]:.0f} об/мин:",
+                f"{'Диаметр, мм':>12} {'Длина, мм':>10}"
+            ]
+            for i in shown:
+                lines.append(f"{diameters[i]:12.1f} {best[i]:10.0f}")
+            self.tuning_result.setText("\n".join(lines))
+
+            # Усиление по длине и оборотам для диаметра канала и линии волновой настройки
+            self.engine_figure.clear()
+            ax_response = self.engine_figure.add_subplot(121)
+            rpm_grid, length_grid = np.meshgrid(rpms, lengths)
+            contour = ax_response.contourf(rpm_grid, length_grid, maps['response'][:, j, :], levels=15, cmap='viridis')
+            self.engine_figure.colorbar(contour, ax=ax_response, label="Усиление")
+            for k, wave in enumerate(maps['wave_rpm'][:, :, j], start=1):
+                ax_response.plot(wave, lengths, color='white', linewidth=0.8, linestyle='--')
+                inside = (wave >= rpms[0]) & (wave <= rpms[-1])
+                if inside.any():
+                    ax_response.annotate(str(k), (wave[inside][0], lengths[inside][0]), color='white', fontsize=7)
+            ax_response.set_xlim(rpms[0], rpms[-1])
+            ax_response.set_xlabel("Обороты, об/мин")
+            ax_response.set_ylabel("Длина канала, мм")
+            ax_response.set_title(f"Канал Ø{diameters[j]:g} мм", fontsize=9)
+            ax_resonance = self.engine_figure.add_subplot(122)
+            diameter_grid, length_grid = np.meshgrid(diameters, lengths)
+            lines_rpm = ax_resonance.contour(diameter_grid, length_grid, maps['helmholtz_rpm'], levels=12,
+                                             cmap='viridis')
+            ax_resonance.clabel(lines_rpm, fontsize=6, fmt='%.0f')
+            ax_resonance.set_xlabel("Диаметр канала, мм")
+            ax_resonance.set_ylabel("Длина канала, мм")
+            ax_resonance.set_title("Обороты резонанса", fontsize=9)
+            self.engine_figure.tight_layout()
+            self.engine_canvas.draw()
 
-            self.air_flow_result.setText(f"{air_flow:.2f} кг/ч")
-
-            # Сохранение для отчета
-            self.report_data['engine_air_flow'] = {
-                'displacement': f"{displacement:.1f} л",
-                'rpm': f"{rpm:.0f} об/мин",
-                'volumetric_efficiency': f"{efficiency:.2f}",
-                'air_flow': f"{air_flow:.2f} кг/ч"
+            # Сохраняем для отчета
+            if 'engine' not in self.report_data:
+                self.report_data['engine'] = {}
+            self.report_data['engine']['tuning_map'] = {
+                'length_range': f"{lengths[0]:g}-{lengths[-1]:g} мм",
+                'diameter_range': f"{diameters[0]:g}-{diameters[-1]:g} мм",
+                'rpm_range': f"{rpms[0]:g}-{rpms[-1]:g} об/мин",
+                'target_rpm': f"{rpms[column]:.0f} об/мин",
+                'helmholtz_length': f"{best[j]:.0f} мм (Ø{diameters[j]:g} мм)"
             }
 
-            # Сохранение в БД
-            self.db.save_calculation(
-                'engine_air_flow',
+            # Сохраняем в базу данных
+            calc_id = self.db.save_calculation(
+                'tuning_map',
                 {
-                    'displacement': f"{displacement:.1f} л",
-                    'rpm': f"{rpm:.0f} об/мин",
-                    'volumetric_efficiency': f"{efficiency:.2f}"
+                    'length_range': [float(lengths[0]), float(lengths[-1]), len(lengths)],
+                    'diameter_range': [float(diameters[0]), float(diameters[-1]), len(diameters)],
+                    'rpm_range': [float(rpms[0]), float(rpms[-1]), len(rpms)],
+                    'target_rpm': float(rpms[column]),
+                    'intake_duration': intake_duration,
+                    **engine
                 },
-                {'air_flow': f"{air_flow:.2f} кг/ч"}
+                {'best_lengths': {f"{d:g}": float(v) for d, v in zip(diameters[shown], best[shown])}}
             )
 
             self.update_report_tab()
+            self.statusBar().showMessage(f"Карты настройки сохранены (ID: {calc_id})", 3000)
 
-        except ValueError:
-            QMessageBox.warning(self, "Ошибка", "Введите объем двигателя и обороты")
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Пожалуйста, введите корректные значения\n{str(e)}")
 
-    def calculate_compression_ratio(self):
+    def calculate_engine_cycle(self):
+        """Рабочий цикл для всех сочетаний степени сжатия и угла опережения зажигания"""
         try:
-            cylinder_volume = float(self.engine_cylinder_volume.text())  # см³
-            chamber_volume = float(self.engine_combustion_chamber_volume.text())  # см³
-
-            compression_ratio = (cylinder_volume + chamber_volume) / chamber_volume
+            bore, stroke, rod, burn_duration, rpm, wall_temp = [float(field.text()) for field in (
+                self.engine_cycle_bore, self.engine_cycle_stroke, self.engine_cycle_rod, self.engine_cycle_burn_duration,
+                self.engine_cycle_rpm, self.engine_cycle_wall_temp)]
+            ratios = [float(v) for v in self.engine_cycle_compression_ratios.text().replace(';', ',').split(',') if v.strip()]
+            spark_from, spark_to = [float(field.text()) for field in self.engine_cycle_spark_range]
+            spark_step = float(self.engine_cycle_spark_step.text())
+            if min(bore, stroke, rod, burn_duration, rpm) <= 0 or spark_step <= 0 or spark_from > spark_to:
+                raise ValueError("Размеры, обороты, продолжительность сгорания и шаг должны быть больше нуля")
+            if not ratios:
+                raise ValueError("Задайте хотя бы одну степень сжатия")
+
+            charge = charge_air_model(**self.charge_air())
+            _, _, fuel_type, fuel = self.selected_fuel()
+            excess_air = self.engine_lambda.value()
+            sparks = np.arange(spark_from, spark_to + spark_step / 2, spark_step)
+            ratio_grid, spark_grid = np.meshgrid(ratios, sparks, indexing='ij')
+
+            start = time.perf_counter()
+            cycle = simulate_engine_cycle(bore, stroke, rod, ratio_grid, spark_grid, burn_duration, rpm,
+                                          charge['manifold_pressure'], charge['charge_temperature'],
+                                          excess_air, fuel['afr'], fuel['lhv'], wall_temp)
+            elapsed = time.perf_counter() - start
+
+            # Угол наибольшего IMEP (MBT) для каждой степени сжатия
+            best = cycle['imep'].argmax(axis=1)
+            lines = [
+                "=== РАБОЧИЙ ЦИКЛ ===",
+                f"Рассчитано циклов: {ratio_grid.size} за {elapsed:.2f} с",
+                f"Впуск {float(charge['manifold_pressure']):.1f} кПа, {float(charge['charge_temperature']):.1f} °C; "
+                f"{fuel_type}, λ = {excess_air:.2f}",
+                "",
+                f"{'ε':>5} {'ОЗ, °':>6} {'IMEP, бар':>10} {'pmax, бар':>10} {'∠pmax, °':>9} "
+                f"{'CA50, °':>8} {'КПД, %':>7} {'Тепл., %':>9}"
+            ]
+            mbt_table = {}
+            for i, ratio in enumerate(ratios):
+                j = best[i]
+                lines.append(f"{ratio:5.1f} {sparks[j]:6.1f} {cycle['imep'][i, j]:10.2f} "
+                             f"{cycle['peak_pressure'][i, j]:10.1f} {cycle['peak_angle'][i, j]:9.1f} "
+                             f"{cycle['burn_50'][i, j]:8.1f} {cycle['efficiency'][i, j]:7.1f} "
+                             f"{cycle['heat_loss'][i, j]:9.1f}")
+                mbt_table[f"ε = {ratio:g}"] = (
+                    f"ОЗ {sparks[j]:.1f}°, IMEP {cycle['imep'][i, j]:.2f} бар, "
+                    f"pmax {cycle['peak_pressure'][i, j]:.1f} бар, КПД {cycle['efficiency'][i, j]:.1f}%")
+            self.engine_cycle_result.setText("\n".join(lines))
+
+            # Индикаторная диаграмма при MBT и IMEP по углу опережения
+            self.engine_figure.clear()
+            ax_pressure = self.engine_figure.add_subplot(121)
+            ax_imep = self.engine_figure.add_subplot(122)
+            for i, ratio in enumerate(ratios):
+                ax_pressure.plot(cycle['angle'], cycle['pressure'][i, best[i]], label=f"ε = {ratio:g}")
+                ax_imep.plot(sparks, cycle['imep'][i], label=f"ε = {ratio:g}")
+                ax_imep.plot(sparks[best[i]], cycle['imep'][i, best[i]], 'k.')
+            ax_pressure.set_xlim(-90, 120)
+            ax_pressure.set_xlabel("Угол поворота коленвала, °")
+            ax_pressure.set_ylabel("Давление, бар")
+            ax_pressure.legend(fontsize=7)
+            ax_pressure.grid(True)
+            ax_imep.set_xlabel("Угол опережения зажигания, °")
+            ax_imep.set_ylabel("IMEP, бар")
+            ax_imep.grid(True)
+            self.engine_figure.tight_layout()
+            self.engine_canvas.draw()
+
+            # Сохраняем для отчета
+            if 'engine' not in self.report_data:
+                self.report_data['engine'] = {}
+            self.report_data['engine']['engine_cycle'] = {
+                'bore': f"{bore:.1f} мм",
+                'stroke': f"{stroke:.1f} мм",
+                'rod': f"{rod:.1f} мм",
+                'rpm': f"{rpm:.0f} об/мин",
+                'burn_duration': f"{burn_duration:.0f}°",
+                'variants': ratio_grid.size,
+                'mbt_table': mbt_table
+            }
+
+            # Сохраняем в базу данных
+            calc_id = self.db.save_calculation(
+                'engine_cycle',
+                {
+                    'bore': bore,
+                    'stroke': stroke,
+                    'rod': rod,
+                    'rpm': rpm,
+                    'burn_duration': burn_duration,
+                    'wall_temp': wall_temp,
+                    'intake_pressure': float(charge['manifold_pressure']),
+                    'intake_temp': float(charge['charge_temperature']),
+                    'fuel_type': fuel_type,
+                    'excess_air': excess_air,
+                    'compression_ratios': ratios,
+                    'spark_advances': [float(v) for v in sparks]
+                },
+                {
+                    'imep': [[float(v) for v in row] for row in cycle['imep']],
+                    'mbt': {f"{ratio:g}": float(sparks[best[i]]) for i, ratio in enumerate(ratios)},
+                    'peak_pressure': [float(cycle['peak_pressure'][i, best[i]]) for i in range(len(ratios))],
+                    'efficiency': [float(cycle['efficiency'][i, best[i]]) for i in range(len(ratios))]
+                }
+            )
+
+            self.update_report_tab()
+            self.statusBar().showMessage(f"Расчет рабочего цикла сохранен (ID: {calc_id})", 3000)
+
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Пожалуйста, введите корректные значения\n{str(e)}")
+
+    def set_engine_map(self, engine_map):
+        """Делает карту текущей и показывает ее"""
+        self.engine_map = engine_map
+        self.engine_map_label.setText(
+            f"{engine_map.name or 'без названия'}: {len(engine_map.rpm)} × {len(engine_map.torque)} узлов, "
+            f"{engine_map.rpm[0]:.0f}-{engine_map.rpm[-1]:.0f} об/мин, "
+            f"{engine_map.values.min():.0f}-{engine_map.values.max():.0f} г/(кВт·ч)")
+        self.engine_figure.clear()
+        ax = self.engine_figure.add_subplot(111)
+        self.engine_figure.colorbar(engine_map.plot(ax, title="Удельный расход, г/(кВт·ч)"), ax=ax)
+        self.engine_figure.tight_layout()
+        self.engine_canvas.draw()
+
+    def import_engine_map(self):
+        """Импорт карты из CSV (таблица или журнал стенда)"""
+        file_name, _ = QFileDialog.getOpenFileName(self, "Карта удельного расхода", "", "CSV Files (*.csv)")
+        if not file_name:
+            return
+        try:
+            self.set_engine_map(EngineMap.from_csv(file_name))
+        except (ValueError, IndexError, OSError) as e:
+            QMessageBox.warning(self, "Ошибка", f"Не удалось загрузить карту\n{str(e)}")
+
+    def generate_engine_map(self):
+        """Приближенная карта по характеристике момента с вкладки «Динамика»"""
+        try:
+            torque_rpm, torque_nm = parse_torque_curve(self.lap_torque_curve.text())
+            bsfc_min = float(self.engine_map_bsfc_min.text())
+            if bsfc_min <= 0:
+                raise ValueError("Удельный расход должен быть больше нуля")
+            self.set_engine_map(EngineMap.from_torque_curve(torque_rpm, torque_nm, bsfc_min,
+                                                            "По внешней характеристике"))
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Пожалуйста, введите корректные значения\n{str(e)}")
+
+    def open_engine_map(self):
+        file_name, _ = QFileDialog.getOpenFileName(self, "Карта удельного расхода", "", "NumPy (*.npz)")
+        if not file_name:
+            return
+        try:
+            self.set_engine_map(EngineMap.load(file_name))
+        except (ValueError, KeyError, OSError) as e:
+            QMessageBox.warning(self, "Ошибка", f"Не удалось открыть карту\n{str(e)}")
+
+    def save_engine_map(self):
+        if self.engine_map is None:
+            QMessageBox.warning(self, "Ошибка", "Сначала загрузите или постройте карту")
+            return
+        file_name, _ = QFileDialog.getSaveFileName(self, "Сохранить карту", "", "NumPy (*.npz)")
+        if not file_name:
+            return
+        try:
+            self.engine_map.save(file_name)
+            self.statusBar().showMessage(f"Карта сохранена: {file_name}", 3000)
+        except OSError as e:
+            QMessageBox.critical(self, "Ошибка", f"Ошибка сохранения карты:\n{str(e)}")
+
+    def calculate_engine_map(self):
+        """КПД, часовой расход и цикл впрыска по всей карте одним векторным расчетом"""
+        try:
+            engine_map = self.engine_map
+            if engine_map is None:
+                raise ValueError("Сначала загрузите или постройте карту")
+            _, _, fuel_type, fuel = self.selected_fuel()
+            fuel_energy = fuel['lhv']
+
+            rpm, torque, inside = engine_map.grid()
+            bsfc = engine_map.lookup(rpm, torque)  # г/(кВт·ч)
+            power_hp = rpm * torque / 9549 / 0.7355
+            fuel_flow = engine_map.fuel_flow(rpm, torque)  # кг/ч
+            efficiency = engine_efficiency_model(power_hp, np.where(fuel_flow > 0, fuel_flow, np.nan),
+                                                 fuel_energy)['efficiency']
+
+            # Цикл впрыска - если на вкладке «Топливная система» рассчитана производительность
+            duty = None
+            if self.fuel_system_flow.text():
+                total_flow = float(self.fuel_system_flow.text().split()[0])  # г/мин
+                duty = injector_duty_model(power_hp, bsfc * 0.7355 / 1000, rpm, total_flow)['duty_cycle']
+
+            masked = np.where(inside, efficiency, np.nan)
+            best = np.unravel_index(np.nanargmax(masked), masked.shape)
+            lines = [
+                f"Карта: {engine_map.name or 'без названия'}, топливо: {fuel_type}",
+                f"Максимальный КПД: {masked[best]:.1f}% при {rpm[best]:.0f} об/мин и {torque[best]:.0f} Н·м",
+                f"Минимальный удельный расход: {bsfc[best]:.0f} г/(кВт·ч)",
+                f"Максимальный часовой расход: {np.nanmax(np.where(inside, fuel_flow, np.nan)):.1f} кг/ч"
+            ]
+            if duty is not None:
+                duty_max = np.nanmax(np.where(inside, duty, np.nan))
+                lines.append(f"Максимальный цикл впрыска: {duty_max:.1f}%")
+                if duty_max > 85:
+                    lines.append("Внимание: цикл впрыска превышает 85% - производительности форсунок мало")
+            else:
+                lines.append("Цикл впрыска: рассчитайте производительность на вкладке «Топливная система»")
+            self.engine_map_result.setText("\n".join(lines))
+
+            panels = [(bsfc, "Удельный расход, г/(кВт·ч)"), (efficiency, "КПД, %")]
+            if duty is not None:
+                panels.append((duty, "Цикл впрыска, %"))
+            self.engine_figure.clear()
+            for index, (values, title) in enumerate(panels, start=1):
+                ax = self.engine_figure.add_subplot(1, len(panels), index)
+                engine_map.plot(ax, values, title=title)
+            self.engine_figure.tight_layout()
+            self.engine_canvas.draw()
+
+            # Сохранение для отчета
+            if 'engine' not in self.report_data:
+                self.report_data['engine'] = {}
+            self.report_data['engine']['engine_map'] = {
+                'map_name': engine_map.name or 'без названия',
+                'best_efficiency': f"{masked[best]:.1f}% ({rpm[best]:.0f} об/мин, {torque[best]:.0f} Н·м)",
+                'min_bsfc': f"{bsfc[best]:.0f} г/(кВт·ч)"
+            }
+            if duty is not None:
+                self.report_data['engine']['engine_map']['max_duty_cycle'] = f"{duty_max:.1f}%"
+
+            # Сохранение в БД
+            calc_id = self.db.save_calculation(
+                'engine_map',
+                {
+                    'map_name': engine_map.name,
+                    'rpm_range': [float(engine_map.rpm[0]), float(engine_map.rpm[-1])],
+                    'torque_range': [float(engine_map.torque[0]), float(engine_map.torque[-1])],
+                    'fuel_type': fuel_type
+                },
+                {
+                    'best_efficiency': float(masked[best]),
+                    'best_rpm': float(rpm[best]),
+                    'best_torque': float(torque[best]),
+                    'max_duty_cycle': None if duty is None else float(duty_max)
+                }
+            )
+
+            self.update_report_tab()
+            self.statusBar().showMessage(f"Расчет по карте сохранен (ID: {calc_id})", 3000)
+
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Пожалуйста, введите корректные значения\n{str(e)}")
+
+    def selected_fuel(self):
+        """Топливо, выбранное на вкладке «Двигатель»: ключ, доля этанола, название и свойства"""
+        fuel = self.engine_fuel_energy.currentData()
+        ethanol_share = self.engine_ethanol_share.value() if fuel == 'blend' else 0
+        title = f"E{ethanol_share}" if fuel == 'blend' else FUEL_PROPERTIES[fuel]['title']
+        props = {key: float(value) for key, value in fuel_properties(fuel, ethanol_share).items()}
+        return fuel, ethanol_share, title, props
+
+    def update_fuel_type(self):
+        """Доля этанола задается только для бензин-этанольной смеси"""
+        self.engine_ethanol_share.setEnabled(self.engine_fuel_energy.currentData() == 'blend')
+
+    def calculate_engine_efficiency(self):
+        try:
+            power_hp = float(self.engine_power_hp.text())
+            fuel_consumption = float(self.engine_fuel_consumption.text())
+            _, ethanol_share, fuel_type, fuel = self.selected_fuel()
+            fuel_energy = fuel['lhv']
+
+            efficiency = float(engine_efficiency_model(power_hp, fuel_consumption, fuel_energy)['efficiency']) / 100
+
+            self.engine_efficiency_result.setText(f"{efficiency * 100:.1f}%")
+
+            # Сохранение для отчета
+            self.report_data['engine'] = {
+                'power_hp': power_hp,
+                'fuel_consumption': fuel_consumption,
+                'fuel_type': fuel_type,
+                'efficiency': f"{efficiency * 100:.1f}%"
+            }
+
+            # Сохранение в БД
+            self.db.save_calculation(
+                'engine_efficiency',
+                {
+                    'power': f"{power_hp} л.с.",
+                    'fuel_consumption': f"{fuel_consumption} кг/ч",
+                    'fuel_type': self.engine_fuel_energy.currentText().split()[0],
+                    'ethanol_share': ethanol_share
+                },
+                {'efficiency': f"{efficiency * 100:.1f}%"}
+            )
+
+            self.update_report_tab()
+
+        except ValueError:
+            QMessageBox.warning(self, "Ошибка", "Пожалуйста, введите корректные числовые значения")
+
+    def calculate_mep(self):
+        try:
+            displacement = float(self.engine_displacement.text()) / 1e6  # в м³
+            torque = float(self.engine_torque.text())
+
+            mep = engine_mep_model(displacement * 1e6, torque)
+            mep_bar = float(mep['mep_bar'])  # в бар
+            mep_kgcm2 = float(mep['mep_kgcm2'])
+
+            self.mep_result.setText(f"{mep_bar:.2f} бар ({(mep_kgcm2):.2f} кгс/см²)")
+
+            # Сохранение для отчета
+            if 'engine' not in self.report_data:
+                self.report_data['engine'] = {}
+            self.report_data['engine'].update({
+                'displacement': f"{displacement * 1e6:.0f} см³",
+                'torque': f"{torque:.1f} Н·м",
+                'mep': f"{mep_bar:.2f} бар",
+                'mep_kgcm2': f"{mep_kgcm2:.2f} кгс/см²"
+            })
+
+            # Сохранение в БД
+            self.db.save_calculation(
+                'engine_mep',
+                {
+                    'displacement': f"{displacement * 1e6:.0f} см³",
+                    'torque': f"{torque:.1f} Н·м"
+                },
+                {
+                    'mep_bar': f"{mep_bar:.2f} бар",
+                    'mep_kgcm2': f"{mep_kgcm2:.2f} кгс/см²"
+                }
+            )
+
+            self.update_report_tab()
+
+        except ValueError:
+            QMessageBox.warning(self, "Ошибка", "Пожалуйста, введите рабочий объем и крутящий момент")
+
+    def calculate_power_from_torque(self):
+        try:
+            torque = float(self.engine_torque_for_power.text())
+            rpm = float(self.engine_rpm_for_power.text())
+
+            power = engine_power_model(torque, rpm)
+            power_hp = float(power['power_hp'])
+            power_kw = float(power['power_kw'])
+
+            self.power_result.setText(f"{power_hp:.1f} л.с. ({power_kw:.1f} кВт)")
+
+            # Сохранение для отчета
+            self.report_data['engine_power_calc'] = {
+                'torque': f"{torque:.1f} Н·м",
+                'rpm': f"{rpm:.0f} об/мин",
+                'power_hp': f"{power_hp:.1f} л.с.",
+                'power_kw': f"{power_kw:.1f} кВт"
+            }
+
+            # Сохранение в БД
+            self.db.save_calculation(
+                'engine_power',
+                {
+                    'torque': f"{torque:.1f} Н·м",
+                    'rpm': f"{rpm:.0f} об/мин"
+                },
+                {
+                    'power_hp': f"{power_hp:.1f} л.с.",
+                    'power_kw': f"{power_kw:.1f} кВт"
+                }
+            )
+
+            self.update_report_tab()
+
+        except ValueError:
+            QMessageBox.warning(self, "Ошибка", "Введите корректные значения момента и оборотов")
+
+    def calculate_air_flow(self):
+        try:
+            displacement = float(self.engine_displacement_air.text())  # в литрах
+            rpm = float(self.engine_rpm_air.text())
+            # Давление и плотность заряда по группе «Наддув»
+            settings = self.charge_air()
+            charge = charge_air_model(**settings)
+            manifold_pressure = float(charge['manifold_pressure'])
+            if self.engine_use_ve_table.isChecked() and self.ve_table is not None:
+                # Наполнение по таблице для давления во впуске
+                efficiency = float(self.ve_table.lookup(rpm, manifold_pressure))
+            else:
+                efficiency = self.engine_volumetric_efficiency.value()
+            air_flow = float(engine_air_flow_model(displacement, rpm, efficiency)['air_flow']
+                             * charge['density'] / 1.2)  # кг/ч
+
+            # Расход топлива по стехиометрическому соотношению выбранного топлива
+            _, ethanol_share, fuel_type, fuel = self.selected_fuel()
+            excess_air = self.engine_lambda.value()
+            fuel_flow = air_flow / (fuel['afr'] * excess_air)  # кг/ч
+
+            self.air_flow_result.setText(
+                f"{air_flow:.2f} кг/ч (впуск {manifold_pressure:.1f} кПа, "
+                f"{float(charge['charge_temperature']):.1f} °C)"
+            )
+            self.fuel_flow_result.setText(
+                f"{fuel_flow:.2f} кг/ч ({fuel_flow / fuel['density']:.2f} л/ч), "
+                f"{fuel_type}, AFR {fuel['afr'] * excess_air:.2f}"
+            )
+
+            # Сохранение для отчета
+            self.report_data['engine_air_flow'] = {
+                'displacement': f"{displacement:.1f} л",
+                'rpm': f"{rpm:.0f} об/мин",
+                'volumetric_efficiency': f"{efficiency:.2f}",
+                'manifold_pressure': f"{manifold_pressure:.1f} кПа",
+                'charge_temperature': f"{float(charge['charge_temperature']):.1f} °C",
+                'air_flow': f"{air_flow:.2f} кг/ч",
+                'fuel_type': fuel_type,
+                'excess_air': f"{excess_air:.2f}",
+                'fuel_flow': f"{fuel_flow:.2f} кг/ч"
+            }
+
+            # Сохранение в БД
+            self.db.save_calculation(
+                'engine_air_flow',
+                {
+                    'displacement': f"{displacement:.1f} л",
+                    'rpm': f"{rpm:.0f} об/мин",
+                    'volumetric_efficiency': f"{efficiency:.2f}",
+                    'manifold_pressure': f"{manifold_pressure:.1f} кПа",
+                    'fuel_type': fuel_type,
+                    'excess_air': f"{excess_air:.2f}"
+                },
+                {'air_flow': f"{air_flow:.2f} кг/ч", 'fuel_flow': f"{fuel_flow:.2f} кг/ч"}
+            )
+
+            self.update_report_tab()
+
+        except ValueError:
+            QMessageBox.warning(self, "Ошибка", "Введите объем двигателя и обороты")
+
+    def ve_axes(self):
+        """Оси таблицы наполнения из полей группы"""
+        rpm_from, rpm_to = [float(field.text()) for field in self.ve_rpm_range]
+        map_from, map_to = [float(field.text()) for field in self.ve_map_range]
+        rpm_step = float(self.ve_rpm_step.text())
+        map_step = float(self.ve_map_step.text())
+        if rpm_step <= 0 or map_step <= 0 or not 0 < rpm_from < rpm_to or not 0 < map_from < map_to:
+            raise ValueError("Некорректные диапазоны оборотов или давления")
+        return (np.arange(rpm_from, rpm_to + rpm_step / 2, rpm_step),
+                np.arange(map_from, map_to + map_step / 2, map_step))
+
+    def import_ve_log(self):
+        """Расчет таблицы наполнения по журналу в фоновом потоке"""
+        file_name, _ = QFileDialog.getOpenFileName(self, "Журнал ЭБУ", "", "CSV Files (*.csv)")
+        if not file_name:
+            return
+        try:
+            rpm_axis, map_axis = self.ve_axes()
+            if not self.engine_displacement_air.text():
+                raise ValueError("Укажите объем двигателя в группе «Расход воздуха двигателем»")
+            displacement = float(self.engine_displacement_air.text())
+            # Исходное наполнение - текущая таблица или значение поля КПД наполнения
+            base = self.ve_table if self.ve_table is not None else self.engine_volumetric_efficiency.value()
+            _, _, fuel_type, fuel = self.selected_fuel()
+            target_afr = fuel['afr'] * self.engine_lambda.value()
+            min_weight = self.ve_min_weight.value()
+
+            def task(progress, cancelled):
+                return fit_ve_table(read_log_chunks(file_name, progress_callback=progress), rpm_axis, map_axis,
+                                    displacement, base, target_afr, min_weight, is_cancelled=cancelled)
+
+            self.ve_worker = CalculationWorker(task, self)
+            self.ve_worker.progress.connect(self.ve_progress.setValue)
+            self.ve_worker.result_ready.connect(
+                lambda result: self.on_ve_fit_finished(file_name, displacement, target_afr, result))
+            self.ve_worker.failed.connect(self.on_ve_fit_failed)
+
+            self.ve_progress.setValue(0)
+            self.ve_import_btn.setEnabled(False)
+            self.ve_worker.start()
+
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Пожалуйста, введите корректные значения\n{str(e)}")
+
+    def on_ve_fit_failed(self, message):
+        self.ve_import_btn.setEnabled(True)
+        QMessageBox.critical(self, "Ошибка", f"Не удалось обработать журнал:\n{message}")
+
+    def on_ve_fit_finished(self, file_name, displacement, target_afr, result):
+        """Показывает таблицу наполнения, сохраняет ее в отчет и историю"""
+        self.ve_import_btn.setEnabled(True)
+        table, weights, rows, used = result
+        table.name = os.path.splitext(os.path.basename(file_name))[0]
+        self.ve_table = table
+        self.engine_use_ve_table.setChecked(True)
+        filled = int((weights >= self.ve_min_weight.value()).sum())
+
+        self.ve_result.setText(
+            f"{table.name}: записей {rows}, использовано {used}; ячеек по журналу {filled} из {weights.size}; "
+            f"наполнение {table.values.min():.2f}-{table.values.max():.2f}")
+        self.plot_ve_table(displacement)
+
+        # Сохраняем для отчета
+        if 'engine' not in self.report_data:
+            self.report_data['engine'] = {}
+        self.report_data['engine']['ve_table'] = {
+            'log_file': os.path.basename(file_name),
+            'rows': f"{rows} ({used} использовано)",
+            'filled_cells': f"{filled} из {weights.size}",
+            've_range': f"{table.values.min():.2f}-{table.values.max():.2f}"
+        }
+
+        # Сохраняем в базу данных
+        calc_id = self.db.save_calculation(
+            've_autotune',
+            {
+                'log_file': os.path.basename(file_name),
+                'displacement': displacement,
+                'target_afr': round(target_afr, 2),
+                'rpm_axis': [float(v) for v in table.rpm],
+                'map_axis': [float(v) for v in table.torque]
+            },
+            {
+                've': [[round(float(v), 4) for v in row] for row in table.values],
+                'rows': rows,
+                'used_rows': used,
+                'filled_cells': filled
+            }
+        )
+
+        self.update_report_tab()
+        self.statusBar().showMessage(f"Таблица наполнения сохранена (ID: {calc_id})", 3000)
+
+    def plot_ve_table(self, displacement=None):
+        """Таблица наполнения и расход воздуха по ней на всей сетке"""
+        table = self.ve_table
+        self.engine_figure.clear()
+        ax_ve = self.engine_figure.add_subplot(121 if displacement else 111)
+        self.engine_figure.colorbar(table.plot(ax_ve, title="Наполнение"), ax=ax_ve)
+        if displacement:
+            rpm, pressure, _ = table.grid()
+            ax_air = self.engine_figure.add_subplot(122)
+            table.plot(ax_air, table.air_flow(rpm, pressure, displacement), title="Расход воздуха, кг/ч")
+        self.engine_figure.tight_layout()
+        self.engine_canvas.draw()
+
+    def open_ve_table(self):
+        file_name, _ = QFileDialog.getOpenFileName(self, "Таблица наполнения", "", "NumPy (*.npz)")
+        if not file_name:
+            return
+        try:
+            self.ve_table = VETable.load(file_name)
+            self.engine_use_ve_table.setChecked(True)
+            self.ve_result.setText(f"{self.ve_table.name}: {len(self.ve_table.rpm)} × {len(self.ve_table.torque)} "
+                                   f"узлов, наполнение {self.ve_table.values.min():.2f}-"
+                                   f"{self.ve_table.values.max():.2f}")
+            self.plot_ve_table()
+        except (ValueError, KeyError, OSError) as e:
+            QMessageBox.warning(self, "Ошибка", f"Не удалось открыть таблицу\n{str(e)}")
+
+    def save_ve_table(self):
+        if self.ve_table is None:
+            QMessageBox.warning(self, "Ошибка", "Сначала рассчитайте или откройте таблицу наполнения")
+            return
+        file_name, _ = QFileDialog.getSaveFileName(self, "Сохранить таблицу", "", "NumPy (*.npz)")
+        if not file_name:
+            return
+        try:
+            self.ve_table.save(file_name)
+            self.statusBar().showMessage(f"Таблица сохранена: {file_name}", 3000)
+        except OSError as e:
+            QMessageBox.critical(self, "Ошибка", f"Ошибка сохранения таблицы:\n{str(e)}")
+
+    def charge_air(self):
+        """Параметры заряда во впуске по полям группы «Наддув»"""
+        values = [float(field.text()) for field in (self.boost_pressure, self.boost_ambient_pressure,
+                                                    self.boost_ambient_temp, self.boost_pressure_drop)]
+        boost, ambient_pressure, ambient_temp, pressure_drop = values
+        if ambient_pressure <= 0 or ambient_pressure + boost <= 0:
+            raise ValueError("Давление во впуске должно быть больше нуля")
+        return {
+            'boost': boost,
+            'ambient_pressure': ambient_pressure,
+            'ambient_temp': ambient_temp,
+            'compressor_efficiency': self.boost_compressor_efficiency.value(),
+            'intercooler_efficiency': self.boost_intercooler_efficiency.value(),
+            'pressure_drop': pressure_drop
+        }
+
+    def set_compressor_map(self, compressor_map):
+        self.compressor_map = compressor_map
+        self.compressor_map_label.setText(
+            f"{compressor_map.name}: расход {compressor_map.surge[0].min():.3f}-"
+            f"{compressor_map.choke[0].max():.3f} кг/с, степень до {compressor_map.surge[1].max():.2f}, "
+            f"КПД до {compressor_map.islands[:, 2].max() * 100:.0f}%")
+
+    def import_compressor_map(self):
+        """Импорт карты компрессора из CSV"""
+        file_name, _ = QFileDialog.getOpenFileName(self, "Карта компрессора", "", "CSV Files (*.csv)")
+        if not file_name:
+            return
+        try:
+            self.set_compressor_map(CompressorMap.from_csv(file_name))
+        except (KeyError, ValueError, OSError) as e:
+            QMessageBox.warning(self, "Ошибка", f"Некорректный формат карты компрессора\n{str(e)}")
+
+    def calculate_boost(self):
+        """Рабочая линия двигателя на карте компрессора по всему диапазону оборотов"""
+        try:
+            if not self.engine_displacement_air.text():
+                raise ValueError("Укажите объем двигателя в группе «Расход воздуха двигателем»")
+            displacement = float(self.engine_displacement_air.text())
+            charge = self.charge_air()
+            rpm_from, rpm_to = [float(field.text()) for field in self.boost_rpm_range]
+            rpm_step = float(self.boost_rpm_step.text())
+            if displacement <= 0 or rpm_step <= 0 or not 0 < rpm_from <= rpm_to:
+                raise ValueError("Некорректный объем двигателя или диапазон оборотов")
+
+            rpm = np.arange(rpm_from, rpm_to + rpm_step / 2, rpm_step)
+            manifold_pressure = charge['ambient_pressure'] + charge['boost']
+            if self.engine_use_ve_table.isChecked() and self.ve_table is not None:
+                volumetric_efficiency = self.ve_table.lookup(rpm, manifold_pressure)
+            else:
+                volumetric_efficiency = self.engine_volumetric_efficiency.value()
+
+            line = boost_operating_line(rpm, displacement, volumetric_efficiency, charge['boost'],
+                                        self.compressor_map, charge['ambient_pressure'], charge['ambient_temp'],
+                                        charge['compressor_efficiency'], charge['intercooler_efficiency'],
+                                        charge['pressure_drop'])
+
+            has_map = self.compressor_map is not None
+            lines = [
+                "=== РАБОЧАЯ ЛИНИЯ НАДДУВА ===",
+                f"Давление во впуске {manifold_pressure:.1f} кПа, степень повышения давления "
+                f"{line['pressure_ratio'][0]:.2f}",
+                "",
+                f"{'об/мин':>7} {'кг/ч':>7} {'кг/с прив.':>10} {'КПД':>5} {'T, °C':>6}"
+                + (f" {'Помпаж':>7} {'Запир.':>7}" if has_map else "")
+            ]
+            for i in range(0, len(rpm), -(-len(rpm) // 12)):
+                text = (f"{rpm[i]:7.0f} {line['air_flow'][i]:7.1f} {line['corrected_flow'][i]:10.3f} "
+                        f"{line['compressor_efficiency'][i] * 100:4.0f}% {line['charge_temperature'][i]:6.1f}")
+                if has_map:
+                    text += f" {line['surge_margin'][i]:6.1f}% {line['choke_margin'][i]:6.1f}%"
+                lines.append(text)
+            if has_map:
+                lines.append("")
+                lines.append(f"Минимальный запас по помпажу: {line['surge_margin'].min():.1f}% "
+                             f"при {rpm[np.argmin(line['surge_margin'])]:.0f} об/мин")
+                lines.append(f"Минимальный запас по запиранию: {line['choke_margin'].min():.1f}% "
+                             f"при {rpm[np.argmin(line['choke_margin'])]:.0f} об/мин")
+                if line['surge_margin'].min() < 0 or line['choke_margin'].min() < 0:
+                    lines.append("Внимание: рабочая линия выходит за границы карты компрессора")
+            self.boost_result.setText("\n".join(lines))
+
+            self.engine_figure.clear()
+            ax_map = self.engine_figure.add_subplot(121)
+            if has_map:
+                self.engine_figure.colorbar(self.compressor_map.plot(ax_map), ax=ax_map, label="КПД, %")
+            ax_map.plot(line['corrected_flow'], line['pressure_ratio'], 'o-', color='orange', markersize=3,
+                        label="Рабочая линия")
+            ax_map.set_xlabel("Приведенный расход, кг/с")
+            ax_map.set_ylabel("Степень повышения давления")
+            ax_map.legend(fontsize=7)
+            ax_map.grid(True)
+            ax_temp = self.engine_figure.add_subplot(122)
+            ax_temp.plot(rpm, line['air_flow'])
+            ax_temp.set_xlabel("Обороты, об/мин")
+            ax_temp.set_ylabel("Расход воздуха, кг/ч")
+            ax_temp.grid(True)
+            ax_charge = ax_temp.twinx()
+            ax_charge.plot(rpm, line['charge_temperature'], color='red')
+            ax_charge.set_ylabel("Температура заряда, °C", color='red')
+            self.engine_figure.tight_layout()
+            self.engine_canvas.draw()
+
+            # Сохраняем для отчета
+            if 'engine' not in self.report_data:
+                self.report_data['engine'] = {}
+            self.report_data['engine']['boost'] = {
+                'manifold_pressure': f"{manifold_pressure:.1f} кПа",
+                'pressure_ratio': f"{line['pressure_ratio'][0]:.2f}",
+                'charge_temperature': f"{line['charge_temperature'].max():.1f} °C",
+                'max_air_flow': f"{line['air_flow'].max():.1f} кг/ч"
+            }
+            if has_map:
+                self.report_data['engine']['boost'].update({
+                    'compressor': self.compressor_map.name,
+                    'surge_margin': f"{line['surge_margin'].min():.1f}%",
+                    'choke_margin': f"{line['choke_margin'].min():.1f}%"
+                })
+
+            # Сохраняем в базу данных
+            calc_id = self.db.save_calculation(
+                'boost_operating_line',
+                {
+                    'displacement': displacement,
+                    'boost': charge['boost'],
+                    'ambient_pressure': charge['ambient_pressure'],
+                    'ambient_temp': charge['ambient_temp'],
+                    'intercooler_efficiency': charge['intercooler_efficiency'],
+                    'compressor': self.compressor_map.name if has_map else None
+                },
+                {
+                    'rpm': [float(v) for v in rpm],
+                    'air_flow': [float(v) for v in line['air_flow']],
+                    'surge_margin': float(line['surge_margin'].min()) if has_map else None,
+                    'choke_margin': float(line['choke_margin'].min()) if has_map else None
+                }
+            )
+
+            self.update_report_tab()
+            self.statusBar().showMessage(f"Расчет наддува сохранен (ID: {calc_id})", 3000)
+
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Пожалуйста, введите корректные значения\n{str(e)}")
+
+    def calculate_compression_ratio(self):
+        try:
+            cylinder_volume = float(self.engine_cylinder_volume.text())  # см³
+            chamber_volume = float(self.engine_combustion_chamber_volume.text())  # см³
+
+            compression_ratio = float(engine_compression_model(cylinder_volume, chamber_volume)['compression_ratio'])
 
             self.compression_result.setText(f"{compression_ratio:.2f}:1")
 
@@ -1536,7 +7226,6 @@ class AdvancedVehicleCalculator(QMainWindow):
             if not gear_ratios:
                 raise ValueError("Введите хотя бы одну передачу")
 
-            wheel_circumference = math.pi * tire_diameter
             results = []
             speed_data = {}
 
@@ -1547,9 +7236,7 @@ class AdvancedVehicleCalculator(QMainWindow):
             results.append(separator)
 
             for i, gear_ratio in enumerate(gear_ratios):
-                total_ratio = gear_ratio * final_drive
-                speed_ms = (redline_rpm * wheel_circumference) / (total_ratio * 60)
-                speed_kmh = speed_ms * 3.6
+                speed_kmh = float(gear_speed_model(gear_ratio, final_drive, tire_diameter * 1000, redline_rpm)['speed'])
                 results.append(f"{i + 1:^7} | {gear_ratio:^12.2f} | {speed_kmh:^18.1f} км/ч")
                 speed_data[f"gear_{i + 1}"] = f"{speed_kmh:.1f} км/ч"
 
@@ -1589,7 +7276,7 @@ class AdvancedVehicleCalculator(QMainWindow):
             if speed1 == 0 or speed2 == 0:
                 raise ValueError("Скорость не может быть нулевой")
 
-            ratio = (rpm1 * speed2) / (rpm2 * speed1)
+            ratio = float(gear_ratio_model(rpm1, speed1, rpm2, speed2)['calculated_ratio'])
             self.trans_calculated_ratio.setText(f"{ratio:.3f}")
 
             # Сохраняем для отчета
@@ -1631,7 +7318,7 @@ class AdvancedVehicleCalculator(QMainWindow):
             if engine_power <= 0:
                 raise ValueError("Мощность двигателя должна быть больше 0")
 
-            efficiency = (wheel_power / engine_power) * 100
+            efficiency = float(transmission_efficiency_model(engine_power, wheel_power)['efficiency'])
             self.trans_efficiency_result.setText(f"{efficiency:.1f}%")
 
             # Сохраняем для отчета
@@ -1693,13 +7380,32 @@ class AdvancedVehicleCalculator(QMainWindow):
         self.dyn_tire_radius = QLineEdit("0.33")
         self.dyn_tire_radius.setPlaceholderText("в метрах")
 
+        # Шина по Magic Formula - ограничение тяги сцеплением ведущей оси
+        self.tire_models = dict(TIRE_LIBRARY)
+        self.dyn_tire_model = QComboBox()
+        self.dyn_tire_model.addItems(list(self.tire_models))
+        load_tire_btn = QPushButton("Загрузить (.tir, JSON)")
+        load_tire_btn.clicked.connect(self.load_tire_model)
+        tire_row = QHBoxLayout()
+        tire_row.addWidget(self.dyn_tire_model)
+        tire_row.addWidget(load_tire_btn)
+        self.dyn_road_mu = QDoubleSpinBox()
+        self.dyn_road_mu.setRange(0.1, 1.5)
+        self.dyn_road_mu.setSingleStep(0.05)
+        self.dyn_road_mu.setValue(1.0)
+
         calculate_traction_btn = QPushButton("Рассчитать тяговую силу")
         calculate_traction_btn.clicked.connect(self.calculate_traction_force)
+        plot_tire_btn = QPushButton("Характеристики шины")
+        plot_tire_btn.clicked.connect(self.plot_tire_curves)
 
         traction_layout.addRow("Передаточное число:", self.dyn_gear_ratio)
         traction_layout.addRow("Главная передача:", self.dyn_final_drive)
         traction_layout.addRow("Радиус колеса:", self.dyn_tire_radius)
+        traction_layout.addRow("Модель шины:", tire_row)
+        traction_layout.addRow("Сцепление покрытия (LMUX):", self.dyn_road_mu)
         traction_layout.addRow(calculate_traction_btn)
+        traction_layout.addRow(plot_tire_btn)
         traction_group.setLayout(traction_layout)
 
         # Группа "Разгонная динамика"
@@ -1729,6 +7435,157 @@ class AdvancedVehicleCalculator(QMainWindow):
         acceleration_layout.addRow(self.dyn_shift_points)
         acceleration_group.setLayout(acceleration_layout)
 
+        # Группа "Диаграмма g-g" - предельные ускорения в повороте
+        gg_group = QGroupBox("Диаграмма g-g (установившийся поворот)")
+        gg_layout = QGridLayout()
+
+        self.gg_cg_height = QLineEdit("500")
+        self.gg_cg_height.setPlaceholderText("мм")
+        self.gg_wheelbase = QLineEdit("2600")
+        self.gg_wheelbase.setPlaceholderText("мм")
+        self.gg_front_weight = QDoubleSpinBox()
+        self.gg_front_weight.setRange(30, 70)
+        self.gg_front_weight.setValue(55)
+        self.gg_front_weight.setSuffix("%")
+        self.gg_tracks = (QLineEdit("1500"), QLineEdit("1480"))
+        self.gg_tire_mu = QDoubleSpinBox()
+        self.gg_tire_mu.setRange(0.3, 2.5)
+        self.gg_tire_mu.setSingleStep(0.05)
+        self.gg_tire_mu.setValue(1.1)
+        self.gg_load_sensitivity = QDoubleSpinBox()
+        self.gg_load_sensitivity.setRange(0.0, 0.5)
+        self.gg_load_sensitivity.setSingleStep(0.01)
+        self.gg_load_sensitivity.setValue(0.1)
+        self.gg_lift_area = QDoubleSpinBox()
+        self.gg_lift_area.setRange(0.0, 5.0)
+        self.gg_lift_area.setSingleStep(0.1)
+        self.gg_lift_area.setValue(0.0)
+        self.gg_aero_balance = QDoubleSpinBox()
+        self.gg_aero_balance.setRange(0, 100)
+        self.gg_aero_balance.setValue(45)
+        self.gg_aero_balance.setSuffix("%")
+        self.gg_lltd = QDoubleSpinBox()
+        self.gg_lltd.setRange(20, 80)
+        self.gg_lltd.setValue(55)
+        self.gg_lltd.setSuffix("%")
+        self.gg_drive = QComboBox()
+        for key, title in DRIVE_LAYOUTS.items():
+            self.gg_drive.addItem(title, key)
+        self.gg_speed_range = (QLineEdit("20"), QLineEdit("200"))
+        self.gg_speed_count = QSpinBox()
+        self.gg_speed_count.setRange(2, 500)
+        self.gg_speed_count.setValue(50)
+
+        gg_fields = [
+            ("Высота центра масс, мм:", self.gg_cg_height),
+            ("Колесная база, мм:", self.gg_wheelbase),
+            ("Нагрузка на переднюю ось:", self.gg_front_weight),
+            ("Колея перед / зад, мм:", self.gg_tracks),
+            ("Коэффициент сцепления шин:", self.gg_tire_mu),
+            ("Чувствительность μ к нагрузке:", self.gg_load_sensitivity),
+            ("Прижимная сила Cz·A, м²:", self.gg_lift_area),
+            ("Аэробаланс на перед:", self.gg_aero_balance),
+            ("Доля поперечного переноса на перед (LLTD):", self.gg_lltd),
+            ("Привод:", self.gg_drive),
+            ("Скорости от / до, км/ч:", self.gg_speed_range),
+            ("Число скоростей:", self.gg_speed_count)
+        ]
+        for index, (title, widget) in enumerate(gg_fields):
+            row, column = index // 2, (index % 2) * 3
+            gg_layout.addWidget(QLabel(title), row, column)
+            if isinstance(widget, tuple):
+                gg_layout.addWidget(widget[0], row, column + 1)
+                gg_layout.addWidget(widget[1], row, column + 2)
+            else:
+                gg_layout.addWidget(widget, row, column + 1, 1, 2)
+
+        calculate_gg_btn = QPushButton("Построить диаграмму g-g")
+        calculate_gg_btn.clicked.connect(self.calculate_gg_diagram)
+        gg_layout.addWidget(calculate_gg_btn, (len(gg_fields) + 1) // 2, 0, 1, 6)
+        gg_group.setLayout(gg_layout)
+
+        # Группа "Моделирование круга" - использует огибающую g-g, трансмиссию и тормоза
+        lap_group = QGroupBox("Моделирование круга")
+        lap_layout = QFormLayout()
+
+        self.lap_track = None
+        self.lap_track_label = QLabel("Демонстрационная трасса")
+        load_track_btn = QPushButton("Загрузить трассу (CSV: distance, curvature)")
+        load_track_btn.clicked.connect(self.load_lap_track)
+        demo_track_btn = QPushButton("Демонстрационная трасса")
+        demo_track_btn.clicked.connect(self.reset_lap_track)
+        track_buttons = QHBoxLayout()
+        track_buttons.addWidget(load_track_btn)
+        track_buttons.addWidget(demo_track_btn)
+
+        self.lap_torque_curve = QLineEdit(DEFAULT_TORQUE_CURVE)
+        self.lap_torque_curve.setPlaceholderText("об/мин:Н·м через запятую")
+        self.lap_step = QDoubleSpinBox()
+        self.lap_step.setRange(0.5, 20)
+        self.lap_step.setValue(2.0)
+        self.lap_step.setSuffix(" м")
+
+        calculate_lap_btn = QPushButton("Моделировать круг")
+        calculate_lap_btn.clicked.connect(self.calculate_lap_time)
+
+        lap_layout.addRow(track_buttons)
+        lap_layout.addRow("Трасса:", self.lap_track_label)
+        lap_layout.addRow("Характеристика момента:", self.lap_torque_curve)
+        lap_layout.addRow("Шаг по дистанции:", self.lap_step)
+        lap_layout.addRow(calculate_lap_btn)
+        lap_group.setLayout(lap_layout)
+
+        # Группа "Старт с места" - поиск оборотов старта по сетке
+        launch_group = QGroupBox("Оптимизация старта")
+        launch_layout = QGridLayout()
+
+        self.launch_clutch_capacity = QLineEdit("400")
+        self.launch_clutch_capacity.setPlaceholderText("Н·м")
+        self.launch_engage_time = QDoubleSpinBox()
+        self.launch_engage_time.setRange(0.0, 3.0)
+        self.launch_engage_time.setSingleStep(0.05)
+        self.launch_engage_time.setValue(0.3)
+        self.launch_engage_time.setSuffix(" с")
+        self.launch_rpm_range = (QLineEdit("800"), QLineEdit("6500"))
+        self.launch_rpm_step = QLineEdit("250")
+        self.launch_grade = QDoubleSpinBox()
+        self.launch_grade.setRange(-30, 30)
+        self.launch_grade.setValue(0)
+        self.launch_grade.setSuffix("%")
+        self.launch_engine_inertia = QLineEdit("0.2")
+        self.launch_engine_inertia.setPlaceholderText("кг·м²")
+        self.launch_wheel_inertia = QLineEdit("2.5")
+        self.launch_wheel_inertia.setPlaceholderText("кг·м² (ведущая ось)")
+        self.launch_shift_time = QDoubleSpinBox()
+        self.launch_shift_time.setRange(0.0, 1.0)
+        self.launch_shift_time.setSingleStep(0.05)
+        self.launch_shift_time.setValue(0.2)
+        self.launch_shift_time.setSuffix(" с")
+
+        launch_fields = [
+            ("Момент сцепления, Н·м:", self.launch_clutch_capacity),
+            ("Время включения сцепления:", self.launch_engage_time),
+            ("Обороты старта от / до:", self.launch_rpm_range),
+            ("Шаг оборотов:", self.launch_rpm_step),
+            ("Уклон (подъем +):", self.launch_grade),
+            ("Время переключения:", self.launch_shift_time),
+            ("Инерция двигателя, кг·м²:", self.launch_engine_inertia),
+            ("Инерция ведущей оси, кг·м²:", self.launch_wheel_inertia)
+        ]
+        for index, (title, widget) in enumerate(launch_fields):
+            row, column = index // 2, (index % 2) * 3
+            launch_layout.addWidget(QLabel(title), row, column)
+            if isinstance(widget, tuple):
+                launch_layout.addWidget(widget[0], row, column + 1)
+                launch_layout.addWidget(widget[1], row, column + 2)
+            else:
+                launch_layout.addWidget(widget, row, column + 1, 1, 2)
+
+        calculate_launch_btn = QPushButton("Оптимизировать обороты старта")
+        calculate_launch_btn.clicked.connect(self.calculate_launch)
+        launch_layout.addWidget(calculate_launch_btn, (len(launch_fields) + 1) // 2, 0, 1, 6)
+        launch_group.setLayout(launch_layout)
+
         # Группа "Результаты"
         results_group = QGroupBox("Результаты расчетов")
         results_layout = QVBoxLayout()
@@ -1740,15 +7597,27 @@ class AdvancedVehicleCalculator(QMainWindow):
         results_layout.addWidget(self.dyn_results)
         results_group.setLayout(results_layout)
 
+        self.dyn_figure = Figure(figsize=(6, 4))
+        self.dyn_canvas = FigureCanvas(self.dyn_figure)
+        self.dyn_canvas.setMinimumHeight(350)
+
         # Добавляем все группы на вкладку
         layout.addWidget(params_group)
         layout.addWidget(traction_group)
         layout.addWidget(acceleration_group)
+        layout.addWidget(gg_group)
+        layout.addWidget(lap_group)
+        layout.addWidget(launch_group)
         layout.addWidget(results_group)
+        layout.addWidget(self.dyn_canvas)
         layout.addStretch()
 
         tab.setLayout(layout)
-        self.tabs.addTab(tab, "Динамика")
+
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setWidget(tab)
+        self.tabs.addTab(scroll, "Динамика")
 
     def calculate_traction_force(self):
         """Расчет тяговой силы на колесах"""
@@ -1763,8 +7632,9 @@ class AdvancedVehicleCalculator(QMainWindow):
                 raise ValueError("Радиус колеса не может быть нулевым")
 
             # Расчет тяговой силы (F = T * i * η / r)
-            traction_force = (torque * gear_ratio * final_drive * 0.9) / tire_radius  # η ≈ 0.9 (КПД)
-            equivalent_force = traction_force / 9.81
+            traction = traction_force_model(torque, gear_ratio, final_drive, tire_radius)  # η ≈ 0.9 (КПД)
+            traction_force = float(traction['traction_force'])
+            equivalent_force = float(traction['equivalent_force'])
 
             # Вывод результатов
             self.dyn_results.clear()
@@ -1774,16 +7644,44 @@ class AdvancedVehicleCalculator(QMainWindow):
             self.dyn_results.append(f"Тяговая сила на колесах: {traction_force:.2f} Н")
             self.dyn_results.append(f"Эквивалентная тяга: {equivalent_force:.2f} кгс")
 
+            traction_report = {
+                'torque': f"{torque} Н·м",
+                'gear_ratio': f"{gear_ratio * final_drive:.2f}",
+                'traction_force': f"{traction_force:.2f} Н",
+                'equivalent_force': f"{equivalent_force:.2f} кгс"
+            }
+
+            # Ограничение сцеплением ведущей оси при старте (нужна масса автомобиля)
+            tire = self.tire_models[self.dyn_tire_model.currentText()]
+            weight = float(self.dyn_weight.text()) if self.dyn_weight.text() else 0
+            limited = None
+            if weight > 0:
+                launch = traction_limited_force(traction_force, weight, tire,
+                                                self.gg_front_weight.value(),
+                                                float(self.gg_cg_height.text()),
+                                                float(self.gg_wheelbase.text()),
+                                                self.gg_drive.currentData(), self.dyn_road_mu.value())
+                limited = float(launch['force'])
+                grip_limit = float(launch['grip_limit'])
+                self.dyn_results.append(f"\nШина: {tire.name}, сцепление покрытия {self.dyn_road_mu.value():.2f}")
+                self.dyn_results.append(f"Предел сцепления ведущих колес: {grip_limit:.2f} Н")
+                self.dyn_results.append(f"Тяговая сила с учетом сцепления: {limited:.2f} Н "
+                                        f"({limited / (weight * 9.81):.2f} g)")
+                if limited < traction_force:
+                    self.dyn_results.append("Тяга ограничена пробуксовкой ведущих колес")
+                traction_report.update({
+                    'tire_model': tire.name,
+                    'grip_limit': f"{grip_limit:.2f} Н",
+                    'traction_limited_force': f"{limited:.2f} Н"
+                })
+            else:
+                self.dyn_results.append("\nУкажите массу автомобиля для учета сцепления шин")
+
             # Сохраняем для отчета
             if 'dynamics' not in self.report_data:
                 self.report_data['dynamics'] = {}
             self.report_data['dynamics'].update({
-                'traction_force': {
-                    'torque': f"{torque} Н·м",
-                    'gear_ratio': f"{gear_ratio * final_drive:.2f}",
-                    'traction_force': f"{traction_force:.2f} Н",
-                    'equivalent_force': f"{equivalent_force:.2f} кгс"
-                }
+                'traction_force': traction_report
             })
 
             # Сохраняем в базу данных
@@ -1793,11 +7691,14 @@ class AdvancedVehicleCalculator(QMainWindow):
                     'torque': torque,
                     'gear_ratio': gear_ratio,
                     'final_drive': final_drive,
-                    'tire_radius': tire_radius
+                    'tire_radius': tire_radius,
+                    'tire_model': tire.name,
+                    'road_mu': self.dyn_road_mu.value()
                 },
                 {
                     'traction_force': traction_force,
-                    'equivalent_force': equivalent_force
+                    'equivalent_force': equivalent_force,
+                    'traction_limited_force': limited
                 }
             )
 
@@ -1806,6 +7707,51 @@ class AdvancedVehicleCalculator(QMainWindow):
         except Exception as e:
             self.dyn_results.append(f"Ошибка расчета: {str(e)}")
 
+    def load_tire_model(self):
+        """Загрузка коэффициентов шины из .tir или JSON"""
+        file_name, _ = QFileDialog.getOpenFileName(self, "Модель шины", "",
+                                                   "Tire Files (*.tir *.json);;All Files (*)")
+        if not file_name:
+            return
+        try:
+            if file_name.lower().endswith('.json'):
+                tire = TireModel.from_json(file_name)
+            else:
+                tire = TireModel.from_tir(file_name)
+            self.tire_models[tire.name] = tire
+            if self.dyn_tire_model.findText(tire.name) < 0:
+                self.dyn_tire_model.addItem(tire.name)
+            self.dyn_tire_model.setCurrentText(tire.name)
+        except (ValueError, OSError) as e:
+            QMessageBox.warning(self, "Ошибка", f"Не удалось загрузить модель шины\n{str(e)}")
+
+    def plot_tire_curves(self):
+        """Продольная и боковая силы шины по сетке скольжений и нагрузок"""
+        tire = self.tire_models[self.dyn_tire_model.currentText()]
+        mu_scale = self.dyn_road_mu.value()
+        loads = np.array([0.5, 1.0, 1.5]) * tire.params['FNOMIN']
+        slip = np.linspace(-0.3, 0.3, 301)
+        angle = np.linspace(-15, 15, 301)
+        fx = tire.fx(slip[None, :], loads[:, None], mu_scale)
+        fy = tire.fy(np.radians(angle)[None, :], loads[:, None], mu_scale)
+
+        self.dyn_figure.clear()
+        ax_x = self.dyn_figure.add_subplot(121)
+        ax_y = self.dyn_figure.add_subplot(122)
+        for i, load in enumerate(loads):
+            ax_x.plot(slip * 100, fx[i], label=f"Fz = {load:.0f} Н")
+            ax_y.plot(angle, fy[i], label=f"Fz = {load:.0f} Н")
+        ax_x.set_xlabel("Продольное скольжение, %")
+        ax_x.set_ylabel("Fx, Н")
+        ax_y.set_xlabel("Угол увода, °")
+        ax_y.set_ylabel("Fy, Н")
+        for ax in (ax_x, ax_y):
+            ax.legend(fontsize=7)
+            ax.grid(True)
+        self.dyn_figure.suptitle(tire.name)
+        self.dyn_figure.tight_layout()
+        self.dyn_canvas.draw()
+
     def calculate_acceleration(self):
         """Расчет разгонной динамики автомобиля"""
         try:
@@ -1816,59 +7762,398 @@ class AdvancedVehicleCalculator(QMainWindow):
             frontal_area = self.dyn_frontal_area.value()
             rolling_resist = self.dyn_rolling_resist.value()
 
-            if weight == 0:
-                raise ValueError("Масса автомобиля не может быть нулевой")
+            if weight == 0:
+                raise ValueError("Масса автомобиля не может быть нулевой")
+
+            # Удельная мощность, теоретическая максимальная скорость (упрощенно)
+            # и время разгона 0-100 км/ч (эмпирическая формула)
+            dynamics = acceleration_model(weight, power, drag_coef, frontal_area)
+            specific_power = float(dynamics['specific_power'])  # кВт/т
+            max_speed = float(dynamics['max_speed']) / 3.6  # м/с
+            t_0_100 = float(dynamics['acceleration_0_100'])
+
+            # Вывод результатов
+            self.dyn_results.clear()
+            self.dyn_results.append("=== РЕЗУЛЬТАТЫ РАСЧЕТА РАЗГОНА ===")
+            self.dyn_results.append(f"Удельная мощность: {specific_power:.2f} кВт/т")
+            self.dyn_results.append(f"Теоретическая макс. скорость: {max_speed * 3.6:.1f} км/ч")
+            self.dyn_results.append(f"Примерное время 0-100 км/ч: {t_0_100:.2f} сек")
+            self.dyn_results.append("\nПримечание: расчеты приблизительные")
+
+            # Сохраняем для отчета
+            if 'dynamics' not in self.report_data:
+                self.report_data['dynamics'] = {}
+            self.report_data['dynamics'].update({
+                'acceleration': {
+                    'specific_power': f"{specific_power:.2f} кВт/т",
+                    'max_speed': f"{max_speed * 3.6:.1f} км/ч",
+                    'acceleration_0_100': f"{t_0_100:.2f} сек"
+                }
+            })
+
+            # Сохраняем в базу данных
+            self.db.save_calculation(
+                'acceleration',
+                {
+                    'weight': weight,
+                    'power': power,
+                    'drag_coef': drag_coef,
+                    'frontal_area': frontal_area,
+                    'rolling_resist': rolling_resist
+                },
+                {
+                    'specific_power': specific_power,
+                    'max_speed': max_speed * 3.6,
+                    'acceleration_0_100': t_0_100
+                }
+            )
+
+            self.update_report_tab()
+
+        except Exception as e:
+            self.dyn_results.append(f"Ошибка расчета: {str(e)}")
+
+    def calculate_gg_diagram(self):
+        """Огибающая g-g по сетке скоростей с переносом нагрузки и аэродинамикой"""
+        try:
+            mass = float(self.dyn_weight.text()) if self.dyn_weight.text() else 0
+            power_hp = float(self.dyn_power.text()) if self.dyn_power.text() else 0
+            cg_height = float(self.gg_cg_height.text())
+            wheelbase = float(self.gg_wheelbase.text())
+            track_front, track_rear = [float(field.text()) for field in self.gg_tracks]
+            speed_min, speed_max = [float(field.text()) for field in self.gg_speed_range]
+
+            if mass <= 0:
+                raise ValueError("Масса автомобиля не может быть нулевой")
+            if cg_height <= 0 or wheelbase <= 0 or track_front <= 0 or track_rear <= 0:
+                raise ValueError("Размеры автомобиля должны быть больше нуля")
+            if not 0 <= speed_min < speed_max:
+                raise ValueError("Некорректный диапазон скоростей")
+
+            vehicle = {
+                'cg_height': cg_height,
+                'wheelbase': wheelbase,
+                'front_weight': self.gg_front_weight.value(),
+                'track_front': track_front,
+                'track_rear': track_rear,
+                'tire_mu': self.gg_tire_mu.value(),
+                'load_sensitivity': self.gg_load_sensitivity.value(),
+                'drag_area': self.dyn_drag_coef.value() * self.dyn_frontal_area.value(),
+                'lift_area': self.gg_lift_area.value(),
+                'aero_balance': self.gg_aero_balance.value(),
+                'lltd': self.gg_lltd.value(),
+                'power': power_hp * 0.7355 if power_hp > 0 else None,  # кВт
+                'drive': self.gg_drive.currentData(),
+                'rolling_resist': self.dyn_rolling_resist.value()
+            }
+            speeds = np.linspace(speed_min, speed_max, self.gg_speed_count.value())
+            envelope = cached_gg_envelope(mass, speeds, **vehicle)
+
+            self.dyn_results.clear()
+            self.dyn_results.append("=== ДИАГРАММА G-G ===")
+            self.dyn_results.append(f"{'Скорость, км/ч':>15} {'разгон, g':>10} {'поворот, g':>11} {'торможение, g':>14}")
+            for i in np.unique(np.linspace(0, len(speeds) - 1, min(len(speeds), 10)).astype(int)):
+                self.dyn_results.append(f"{speeds[i]:15.0f} {envelope['max_accel'][i]:10.2f} "
+                                        f"{envelope['max_lateral'][i]:11.2f} {envelope['max_brake'][i]:14.2f}")
+
+            # Огибающие для нескольких скоростей (симметрично для левого и правого поворота)
+            self.dyn_figure.clear()
+            ax = self.dyn_figure.add_subplot(111)
+            for i in np.unique(np.linspace(0, len(speeds) - 1, min(len(speeds), 6)).astype(int)):
+                lateral = np.concatenate([envelope['ay'][i], -envelope['ay'][i][::-1]])
+                longitudinal = np.concatenate([envelope['ax'][i], envelope['ax'][i][::-1]])
+                ax.plot(lateral, longitudinal, label=f"{speeds[i]:.0f} км/ч")
+            ax.set_xlabel("Поперечное ускорение, g")
+            ax.set_ylabel("Продольное ускорение, g")
+            ax.set_aspect('equal', adjustable='datalim')
+            ax.legend(fontsize=7)
+            ax.grid(True)
+            self.dyn_figure.tight_layout()
+            self.dyn_canvas.draw()
+
+            # Сохраняем для отчета
+            if 'dynamics' not in self.report_data:
+                self.report_data['dynamics'] = {}
+            self.report_data['dynamics']['gg_diagram'] = {
+                f"{speeds[i]:.0f} км/ч": f"разгон {envelope['max_accel'][i]:.2f} g, "
+                                         f"поворот {envelope['max_lateral'][i]:.2f} g, "
+                                         f"торможение {envelope['max_brake'][i]:.2f} g"
+                for i in (0, len(speeds) // 2, len(speeds) - 1)
+            }
+
+            # Сохраняем в базу данных
+            calc_id = self.db.save_calculation(
+                'gg_diagram',
+                {'weight': mass, 'speeds': [float(speed_min), float(speed_max), len(speeds)], **vehicle},
+                {
+                    'speeds': speeds.tolist(),
+                    'max_accel': envelope['max_accel'].tolist(),
+                    'max_lateral': envelope['max_lateral'].tolist(),
+                    'max_brake': envelope['max_brake'].tolist()
+                }
+            )
+
+            self.update_report_tab()
+            self.statusBar().showMessage(f"Диаграмма g-g сохранена (ID: {calc_id})", 3000)
+
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Пожалуйста, введите корректные значения\n{str(e)}")
+
+    def load_lap_track(self):
+        """Загрузка трассы из CSV"""
+        file_name, _ = QFileDialog.getOpenFileName(self, "Трасса", "", "CSV Files (*.csv)")
+        if not file_name:
+            return
+        try:
+            distance, curvature = load_track_csv(file_name)
+            self.lap_track = (os.path.basename(file_name), distance, curvature)
+            self.lap_track_label.setText(f"{self.lap_track[0]}: {distance[-1]:.0f} м")
+        except (KeyError, ValueError, IndexError, OSError) as e:
+            QMessageBox.warning(self, "Ошибка", f"Не удалось загрузить трассу\n{str(e)}")
+
+    def reset_lap_track(self):
+        self.lap_track = None
+        self.lap_track_label.setText("Демонстрационная трасса")
+
+    def lap_vehicle(self):
+        """Параметры автомобиля для моделирования круга с вкладок динамики, трансмиссии и тормозов"""
+        mass = float(self.dyn_weight.text()) if self.dyn_weight.text() else 0
+        if mass <= 0:
+            raise ValueError("Масса автомобиля не может быть нулевой")
+        gear_ratios = [float(field.text()) for field in self.trans_gear_ratios if field.text()]
+        if not gear_ratios or not self.trans_final_drive.text() or not self.trans_tire_diameter.text():
+            raise ValueError("Заполните передаточные числа, главную передачу и диаметр колеса "
+                             "на вкладке «Трансмиссия»")
+        torque_rpm, torque_nm = parse_torque_curve(self.lap_torque_curve.text())
+
+        # Предел тормозных механизмов - если на вкладке «Торможение» заданы их размеры
+        brake_force = None
+        if self.brake_piston_diameter.text() and self.brake_disc_diameter.text() \
+                and self.brake_fluid_pressure.text():
+            brake_torque = brake_torque_model(self.brake_piston_count.value(),
+                                              float(self.brake_piston_diameter.text()),
+                                              float(self.brake_disc_diameter.text()),
+                                              self.brake_pad_coef.value(),
+                                              float(self.brake_fluid_pressure.text()))['brake_torque']
+            brake_force = float(4 * brake_torque / float(self.brake_tire_radius.text()))
+
+        return {
+            'mass': mass,
+            'torque_rpm': torque_rpm,
+            'torque_nm': torque_nm,
+            'gear_ratios': gear_ratios,
+            'final_drive': float(self.trans_final_drive.text()),
+            'tire_radius': float(self.trans_tire_diameter.text()) / 2000,
+            'redline': float(self.trans_redline_rpm.text()),
+            'brake_force': brake_force,
+            'cg_height': float(self.gg_cg_height.text()),
+            'wheelbase': float(self.gg_wheelbase.text()),
+            'front_weight': self.gg_front_weight.value(),
+            'track_front': float(self.gg_tracks[0].text()),
+            'track_rear': float(self.gg_tracks[1].text()),
+            'tire_mu': self.gg_tire_mu.value(),
+            'load_sensitivity': self.gg_load_sensitivity.value(),
+            'drag_area': self.dyn_drag_coef.value() * self.dyn_frontal_area.value(),
+            'lift_area': self.gg_lift_area.value(),
+            'aero_balance': self.gg_aero_balance.value(),
+            'lltd': self.gg_lltd.value(),
+            'drive': self.gg_drive.currentData(),
+            'rolling_resist': self.dyn_rolling_resist.value()
+        }
+
+    def calculate_lap_time(self):
+        """Время круга, скорость, передачи и энергия торможения по дистанции"""
+        try:
+            vehicle = self.lap_vehicle()
+            if self.lap_track is None:
+                track_name = "Демонстрационная трасса"
+                distance, curvature = demo_track()
+            else:
+                track_name, distance, curvature = self.lap_track
+
+            start = time.perf_counter()
+            lap = simulate_lap(distance, curvature, ds=self.lap_step.value(), **vehicle)
+            elapsed = time.perf_counter() - start
+
+            minutes, seconds = divmod(lap['lap_time'], 60)
+            lap_text = f"{int(minutes)}:{seconds:06.3f}"
+            gears, counts = np.unique(lap['gear'], return_counts=True)
+            self.dyn_results.clear()
+            self.dyn_results.append("=== МОДЕЛИРОВАНИЕ КРУГА ===")
+            self.dyn_results.append(f"Трасса: {track_name}, {lap['distance'][-1]:.0f} м")
+            self.dyn_results.append(f"Время круга: {lap_text}")
+            self.dyn_results.append(f"Средняя скорость: {lap['distance'][-1] / lap['lap_time'] * 3.6:.1f} км/ч")
+            self.dyn_results.append(f"Скорость: мин. {lap['speed'].min():.1f}, макс. {lap['speed'].max():.1f} км/ч")
+            self.dyn_results.append(f"Энергия торможения за круг: {lap['brake_energy'][-1] / 1000:.2f} МДж")
+            self.dyn_results.append("Доля дистанции на передачах: " + ", ".join(
+                f"{gear}: {count / len(lap['gear']) * 100:.0f}%" for gear, count in zip(gears, counts)))
+            if vehicle['brake_force'] is None:
+                self.dyn_results.append("Тормозные механизмы не заданы - замедление ограничено сцеплением")
+            self.dyn_results.append(f"Время расчета: {elapsed * 1000:.0f} мс")
+
+            self.dyn_figure.clear()
+            ax_speed = self.dyn_figure.add_subplot(311)
+            ax_speed.plot(lap['distance'], lap['speed'])
+            ax_speed.set_ylabel("км/ч")
+            ax_speed.grid(True)
+            ax_gear = self.dyn_figure.add_subplot(312, sharex=ax_speed)
+            ax_gear.step(lap['distance'], lap['gear'], where='post')
+            ax_gear.set_ylabel("Передача")
+            ax_gear.grid(True)
+            ax_energy = self.dyn_figure.add_subplot(313, sharex=ax_speed)
+            ax_energy.plot(lap['distance'], lap['brake_energy'] / 1000)
+            ax_energy.set_ylabel("Торм., МДж")
+            ax_energy.set_xlabel("Дистанция, м")
+            ax_energy.grid(True)
+            self.dyn_figure.tight_layout()
+            self.dyn_canvas.draw()
+
+            # Сохраняем для отчета
+            if 'dynamics' not in self.report_data:
+                self.report_data['dynamics'] = {}
+            self.report_data['dynamics']['lap_simulation'] = {
+                'track': f"{track_name}, {lap['distance'][-1]:.0f} м",
+                'lap_time': lap_text,
+                'average_speed': f"{lap['distance'][-1] / lap['lap_time'] * 3.6:.1f} км/ч",
+                'max_speed': f"{lap['speed'].max():.1f} км/ч",
+                'brake_energy': f"{lap['brake_energy'][-1] / 1000:.2f} МДж"
+            }
+
+            # Сохраняем в базу данных
+            params = {key: value for key, value in vehicle.items() if key not in ('torque_rpm', 'torque_nm')}
+            params.update({'track': track_name, 'torque_curve': self.lap_torque_curve.text()})
+            calc_id = self.db.save_calculation(
+                'lap_simulation',
+                params,
+                {
+                    'lap_time': lap['lap_time'],
+                    'max_speed': float(lap['speed'].max()),
+                    'min_speed': float(lap['speed'].min()),
+                    'brake_energy': float(lap['brake_energy'][-1])
+                }
+            )
 
-            # Расчет удельной мощности (л.с./т)
-            specific_power = (power * 1000) / (weight * 9.81)  # Переводим в кВт/т
+            self.update_report_tab()
+            self.statusBar().showMessage(f"Моделирование круга сохранено (ID: {calc_id})", 3000)
 
-            # Расчет теоретической максимальной скорости (упрощенный)
-            rho = 1.225  # Плотность воздуха кг/м3
-            max_speed = (2 * power * 735.5 / (rho * drag_coef * frontal_area)) ** (1 / 3)  # м/с
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Пожалуйста, введите корректные значения\n{str(e)}")
 
-            # Расчет времени разгона 0-100 км/ч (эмпирическая формула)
-            t_0_100 = 2.5 * math.sqrt(weight / (power * 0.7))  # Примерная формула
+    def calculate_launch(self):
+        """Время на 60 футов и до 100 км/ч по сетке оборотов старта"""
+        try:
+            vehicle = self.lap_vehicle()
+            rpm_from, rpm_to = [float(field.text()) for field in self.launch_rpm_range]
+            rpm_step = float(self.launch_rpm_step.text())
+            clutch_capacity = float(self.launch_clutch_capacity.text())
+            engine_inertia = float(self.launch_engine_inertia.text())
+            wheel_inertia = float(self.launch_wheel_inertia.text())
+
+            if rpm_step <= 0 or not 0 < rpm_from <= rpm_to:
+                raise ValueError("Некорректный диапазон оборотов старта")
+            if clutch_capacity <= 0 or engine_inertia <= 0 or wheel_inertia <= 0:
+                raise ValueError("Момент сцепления и моменты инерции должны быть больше нуля")
+
+            tire = self.tire_models[self.dyn_tire_model.currentText()]
+            launch_rpm = np.arange(rpm_from, rpm_to + rpm_step * 1e-6, rpm_step)
+            setup = {
+                'clutch_capacity': clutch_capacity,
+                'engage_time': self.launch_engage_time.value(),
+                'engine_inertia': engine_inertia,
+                'wheel_inertia': wheel_inertia,
+                'shift_time': self.launch_shift_time.value(),
+                'grade': self.launch_grade.value()
+            }
+            result = simulate_launch(
+                launch_rpm, vehicle['mass'], vehicle['torque_rpm'], vehicle['torque_nm'],
+                vehicle['gear_ratios'], vehicle['final_drive'], vehicle['tire_radius'], vehicle['redline'],
+                tire, self.dyn_road_mu.value(), vehicle['front_weight'], vehicle['cg_height'],
+                vehicle['wheelbase'], vehicle['drive'], drag_area=vehicle['drag_area'],
+                rolling_resist=vehicle['rolling_resist'], **setup)
+
+            if np.isnan(result['time_60ft']).all():
+                raise ValueError("Ни в одном варианте автомобиль не прошел 60 футов - "
+                                 "проверьте момент сцепления и уклон")
+            best_60ft = int(np.nanargmin(result['time_60ft']))
+            best_100 = int(np.nanargmin(result['time_100'])) if not np.isnan(result['time_100']).all() else None
 
-            # Вывод результатов
             self.dyn_results.clear()
-            self.dyn_results.append("=== РЕЗУЛЬТАТЫ РАСЧЕТА РАЗГОНА ===")
-            self.dyn_results.append(f"Удельная мощность: {specific_power:.2f} кВт/т")
-            self.dyn_results.append(f"Теоретическая макс. скорость: {max_speed * 3.6:.1f} км/ч")
-            self.dyn_results.append(f"Примерное время 0-100 км/ч: {t_0_100:.2f} сек")
-            self.dyn_results.append("\nПримечание: расчеты приблизительные")
+            self.dyn_results.append("=== ОПТИМИЗАЦИЯ СТАРТА ===")
+            self.dyn_results.append(f"Шина: {tire.name}, сцепление покрытия {self.dyn_road_mu.value():.2f}, "
+                                    f"уклон {setup['grade']:g}%")
+            self.dyn_results.append(f"{'об/мин':>8} {'60 футов, с':>12} {'0-100, с':>9} {'сцепление, кДж':>15}")
+            for i, rpm in enumerate(launch_rpm):
+                if result['stalled'][i]:
+                    self.dyn_results.append(f"{rpm:8.0f}   двигатель заглох")
+                    continue
+                t_100 = f"{result['time_100'][i]:9.2f}" if not np.isnan(result['time_100'][i]) else f"{'-':>9}"
+                self.dyn_results.append(f"{rpm:8.0f} {result['time_60ft'][i]:12.3f} {t_100} "
+                                        f"{result['clutch_energy'][i] / 1000:15.1f}")
+            self.dyn_results.append(f"\nЛучшие обороты для 60 футов: {launch_rpm[best_60ft]:.0f} об/мин "
+                                    f"({result['time_60ft'][best_60ft]:.3f} с)")
+            if best_100 is not None:
+                self.dyn_results.append(f"Лучшие обороты для 0-100 км/ч: {launch_rpm[best_100]:.0f} об/мин "
+                                        f"({result['time_100'][best_100]:.2f} с)")
+
+            self.dyn_figure.clear()
+            ax_times = self.dyn_figure.add_subplot(121)
+            ax_times.plot(launch_rpm, result['time_60ft'], marker='o', label="60 футов")
+            ax_times.plot(launch_rpm, result['time_100'], marker='s', label="0-100 км/ч")
+            ax_times.set_xlabel("Обороты старта, об/мин")
+            ax_times.set_ylabel("Время, с")
+            ax_times.legend(fontsize=7)
+            ax_times.grid(True)
+            ax_trace = self.dyn_figure.add_subplot(122)
+            ax_trace.plot(result['time'], result['speed'][best_60ft], label="Скорость, км/ч")
+            ax_trace.plot(result['time'], np.clip(result['slip'][best_60ft], -50, 100), label="Скольжение, %")
+            ax_trace.set_xlabel("Время, с")
+            ax_trace.legend(fontsize=7)
+            ax_trace.grid(True)
+            self.dyn_figure.tight_layout()
+            self.dyn_canvas.draw()
+
+            launch_report = {
+                'tire_model': tire.name,
+                'best_rpm_60ft': f"{launch_rpm[best_60ft]:.0f} об/мин",
+                'time_60ft': f"{result['time_60ft'][best_60ft]:.3f} с"
+            }
+            if best_100 is not None:
+                launch_report.update({
+                    'best_rpm_100': f"{launch_rpm[best_100]:.0f} об/мин",
+                    'time_0_100': f"{result['time_100'][best_100]:.2f} с"
+                })
 
             # Сохраняем для отчета
             if 'dynamics' not in self.report_data:
                 self.report_data['dynamics'] = {}
-            self.report_data['dynamics'].update({
-                'acceleration': {
-                    'specific_power': f"{specific_power:.2f} кВт/т",
-                    'max_speed': f"{max_speed * 3.6:.1f} км/ч",
-                    'acceleration_0_100': f"{t_0_100:.2f} сек"
-                }
-            })
+            self.report_data['dynamics']['launch'] = launch_report
 
             # Сохраняем в базу данных
-            self.db.save_calculation(
-                'acceleration',
+            calc_id = self.db.save_calculation(
+                'launch_optimization',
                 {
-                    'weight': weight,
-                    'power': power,
-                    'drag_coef': drag_coef,
-                    'frontal_area': frontal_area,
-                    'rolling_resist': rolling_resist
+                    'weight': vehicle['mass'],
+                    'tire_model': tire.name,
+                    'road_mu': self.dyn_road_mu.value(),
+                    'gear_ratios': vehicle['gear_ratios'],
+                    'final_drive': vehicle['final_drive'],
+                    'launch_rpm': [float(rpm_from), float(rpm_to), float(rpm_step)],
+                    **setup
                 },
                 {
-                    'specific_power': specific_power,
-                    'max_speed': max_speed * 3.6,
-                    'acceleration_0_100': t_0_100
+                    'launch_rpm': launch_rpm.tolist(),
+                    'time_60ft': [None if np.isnan(t) else float(t) for t in result['time_60ft']],
+                    'time_100': [None if np.isnan(t) else float(t) for t in result['time_100']],
+                    'best_rpm_60ft': float(launch_rpm[best_60ft]),
+                    'best_rpm_100': None if best_100 is None else float(launch_rpm[best_100])
                 }
             )
 
             self.update_report_tab()
+            self.statusBar().showMessage(f"Оптимизация старта сохранена (ID: {calc_id})", 3000)
 
-        except Exception as e:
-            self.dyn_results.append(f"Ошибка расчета: {str(e)}")
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Пожалуйста, введите корректные значения\n{str(e)}")
 
     def calculate_shift_points(self):
         """Расчет оптимальных точек переключения передач"""
@@ -1881,7 +8166,7 @@ class AdvancedVehicleCalculator(QMainWindow):
                 raise ValueError("Не все параметры двигателя указаны")
 
             # Расчет оптимальных точек переключения (обычно на 10-15% выше пика мощности)
-            shift_rpm = rpm * 1.1
+            shift_rpm = float(shift_points_model(rpm, 1.0, 1.0, 1.0)['optimal_rpm'])
 
             # Расчет скорости на каждой передаче (примерные передаточные числа)
             gear_ratios = [3.5, 2.1, 1.5, 1.1, 0.9]  # Пример для 5-ступенчатой КПП
@@ -1894,7 +8179,7 @@ class AdvancedVehicleCalculator(QMainWindow):
 
             shift_speeds = {}
             for i, gear in enumerate(gear_ratios, 1):
-                speed = (shift_rpm * 60 * 2 * math.pi * tire_radius) / (gear * final_drive * 1000) * 3.6
+                speed = float(shift_points_model(rpm, gear, final_drive, tire_radius)['speed'])
                 self.dyn_results.append(f"Передача {i}: {speed:.1f} км/ч при {shift_rpm:.0f} об/мин")
                 shift_speeds[f'gear_{i}'] = f"{speed:.1f} км/ч"
 
@@ -1996,6 +8281,87 @@ class AdvancedVehicleCalculator(QMainWindow):
         self.brake_front_percent.setSuffix("%")
         brake_layout.addWidget(self.brake_front_percent, 3, 3)
 
+        # Параметры автомобиля для динамического торможения
+        brake_layout.addWidget(QLabel("Высота центра масс:"), 4, 2)
+        self.brake_cg_height = QLineEdit("550")
+        self.brake_cg_height.setPlaceholderText("в мм")
+        brake_layout.addWidget(self.brake_cg_height, 4, 3)
+
+        brake_layout.addWidget(QLabel("Колесная база:"), 5, 0)
+        self.brake_wheelbase = QLineEdit("2600")
+        self.brake_wheelbase.setPlaceholderText("в мм")
+        brake_layout.addWidget(self.brake_wheelbase, 5, 1)
+
+        brake_layout.addWidget(QLabel("Нагрузка на переднюю ось:"), 5, 2)
+        self.brake_static_front = QDoubleSpinBox()
+        self.brake_static_front.setRange(30, 70)
+        self.brake_static_front.setValue(55)
+        self.brake_static_front.setSuffix("%")
+        brake_layout.addWidget(self.brake_static_front, 5, 3)
+
+        brake_layout.addWidget(QLabel("Радиус колеса:"), 6, 0)
+        self.brake_tire_radius = QLineEdit("0.31")
+        self.brake_tire_radius.setPlaceholderText("в метрах")
+        brake_layout.addWidget(self.brake_tire_radius, 6, 1)
+
+        brake_layout.addWidget(QLabel("Толщина диска:"), 6, 2)
+        self.brake_disc_thickness = QLineEdit("28")
+        self.brake_disc_thickness.setPlaceholderText("в мм")
+        brake_layout.addWidget(self.brake_disc_thickness, 6, 3)
+
+        # Группа "Динамическое торможение"
+        simulation_group = QGroupBox("Динамическое торможение (скорость × сцепление × баланс)")
+        simulation_layout = QFormLayout()
+
+        self.brake_sim_speeds = QLineEdit("60, 100, 130, 160")
+        self.brake_sim_speeds.setPlaceholderText("км/ч через запятую")
+        self.brake_sim_road_coefs = QLineEdit("0.3, 0.5, 0.8, 1.0")
+        self.brake_sim_road_coefs.setPlaceholderText("через запятую")
+        self.brake_sim_balances = QLineEdit("55, 60, 65, 70, 75, 80")
+        self.brake_sim_balances.setPlaceholderText("% через запятую")
+
+        calculate_simulation_btn = QPushButton("Моделировать торможение")
+        calculate_simulation_btn.clicked.connect(self.calculate_braking_simulation)
+
+        simulation_layout.addRow("Скорости (км/ч):", self.brake_sim_speeds)
+        simulation_layout.addRow("Коэф. сцепления:", self.brake_sim_road_coefs)
+        simulation_layout.addRow("Баланс передних тормозов (%):", self.brake_sim_balances)
+        simulation_layout.addRow(calculate_simulation_btn)
+        simulation_group.setLayout(simulation_layout)
+
+        # Группа "Тепловой режим" - серия циклов торможения для кнопки "Нагрев тормозов"
+        thermal_group = QGroupBox("Тепловой режим (серия торможений)")
+        thermal_layout = QFormLayout()
+
+        self.brake_thermal_cycle = QComboBox()
+        for cycle_key, cycle in BRAKE_CYCLES.items():
+            self.brake_thermal_cycle.addItem(cycle['title'], cycle_key)
+        self.brake_thermal_cycle.currentIndexChanged.connect(
+            lambda: self.brake_thermal_cycles.setValue(
+                BRAKE_CYCLES[self.brake_thermal_cycle.currentData()]['cycles']))
+
+        self.brake_thermal_cycles = QSpinBox()
+        self.brake_thermal_cycles.setRange(1, 10000)
+        self.brake_thermal_cycles.setValue(BRAKE_CYCLES[self.brake_thermal_cycle.currentData()]['cycles'])
+
+        self.brake_ambient_temp = QDoubleSpinBox()
+        self.brake_ambient_temp.setRange(-40, 50)
+        self.brake_ambient_temp.setValue(20)
+        self.brake_ambient_temp.setSuffix(" °C")
+
+        self.brake_vented_disc = QCheckBox("Вентилируемый диск")
+        self.brake_vented_disc.setChecked(True)
+
+        thermal_layout.addRow("Цикл:", self.brake_thermal_cycle)
+        thermal_layout.addRow("Число циклов:", self.brake_thermal_cycles)
+        thermal_layout.addRow("Температура воздуха:", self.brake_ambient_temp)
+        thermal_layout.addRow(self.brake_vented_disc)
+        thermal_group.setLayout(thermal_layout)
+
+        groups_row = QHBoxLayout()
+        groups_row.addWidget(simulation_group)
+        groups_row.addWidget(thermal_group)
+
         # Кнопки расчетов (нижний ряд)
         button_row = QHBoxLayout()
 
@@ -2018,14 +8384,19 @@ class AdvancedVehicleCalculator(QMainWindow):
         # Результаты
         self.brake_result = QTextEdit()
         self.brake_result.setReadOnly(True)
-        self.brake_result.setStyleSheet("font-weight: bold; color: #000000;")
+        self.brake_result.setStyleSheet("font-weight: bold; color: #000000; font-family: monospace;")
+
+        self.brake_figure = Figure(figsize=(6, 2.5))
+        self.brake_canvas = FigureCanvas(self.brake_figure)
 
         # Собираем все вместе
         brake_group.setLayout(brake_layout)
 
         main_layout.addWidget(brake_group)
         main_layout.addLayout(button_row)
+        main_layout.addLayout(groups_row)
         main_layout.addWidget(self.brake_result)
+        main_layout.addWidget(self.brake_canvas)
 
         tab.setLayout(main_layout)
         self.tabs.addTab(tab, "Торможение")
@@ -2039,11 +8410,9 @@ class AdvancedVehicleCalculator(QMainWindow):
             pad_coef = self.brake_pad_coef.value()
             pressure = float(self.brake_fluid_pressure.text()) * 1e5  # бар в Па
 
-            piston_area = math.pi * (piston_dia ** 2) / 4
-            piston_force = pressure * piston_area
-            normal_force = piston_force * piston_count
-            effective_radius = 0.4 * (disc_dia / 2)  # Эффективный радиус
-            brake_torque = normal_force * pad_coef * effective_radius
+            torque = brake_torque_model(piston_count, piston_dia * 1000, disc_dia * 1000, pad_coef, pressure / 1e5)
+            brake_torque = float(torque['brake_torque'])
+            normal_force = float(torque['friction_force']) / pad_coef
 
             result_text = (
                 "=== ТОРМОЗНОЙ МОМЕНТ ===\n"
@@ -2104,16 +8473,13 @@ class AdvancedVehicleCalculator(QMainWindow):
             if weight == 0:
                 raise ValueError("Масса не может быть нулевой")
 
-            # Переводим скорость из км/ч в м/с
-            speed_mps = speed / 3.6
-            # Учитываем перераспределение веса при торможении (примерно 30% смещение)
-            front_load = weight * 9.81 * (front_percent + 0.3)
-            rear_load = weight * 9.81 * ((1 - front_percent) - 0.3)
-
-            # Тормозной путь: S = v² / (2 * μ * g)
-            stopping_distance = (speed_mps ** 2) / (2 * road_coef * 9.81)
-            deceleration = road_coef * 9.81  # м/с²
-            stopping_time = speed_mps / deceleration
+            # Тормозной путь: S = v² / (2 * μ * g), с учетом перераспределения веса
+            stopping = stopping_distance_model(speed, weight, road_coef, front_percent * 100)
+            front_load = float(stopping['front_load'])
+            rear_load = float(stopping['rear_load'])
+            stopping_distance = float(stopping['stopping_distance'])
+            deceleration = float(stopping['deceleration']) * 9.81  # м/с²
+            stopping_time = float(stopping['stopping_time'])
 
             result_text = (
                 "=== ТОРМОЗНОЙ ПУТЬ ===\n"
@@ -2176,9 +8542,10 @@ class AdvancedVehicleCalculator(QMainWindow):
                 raise ValueError("Введите массу автомобиля")
 
             # Расчет распределения тормозных сил
-            front_force = brake_torque * front_percent
-            rear_force = brake_torque * (1 - front_percent)
-            optimal_percent = 0.6 + (weight - 1000) * 0.0001  # Эмпирическая формула
+            balance = brake_balance_model(front_percent * 100, brake_torque, weight)
+            front_force = float(balance['front_force'])
+            rear_force = float(balance['rear_force'])
+            optimal_percent = float(balance['optimal_percent']) / 100  # Эмпирическая формула
 
             balance_rating = "Оптимальный" if abs(front_percent - optimal_percent) < 0.05 else \
                 "Смещен вперед" if front_percent > optimal_percent else "Смещен назад"
@@ -2229,29 +8596,44 @@ class AdvancedVehicleCalculator(QMainWindow):
             QMessageBox.warning(self, "Ошибка", f"Сначала рассчитайте тормозной момент\n{str(e)}")
 
     def calculate_brake_temperature(self):
-        """Расчет нагрева тормозов"""
+        """Расчет нагрева тормозов: одно торможение и серия циклов с охлаждением"""
         try:
             speed = float(self.brake_speed.text())
             weight = float(self.brake_vehicle_weight.text())
             disc_dia = float(self.brake_disc_diameter.text()) / 1000  # в метрах
-            disc_thickness = float(
-                QInputDialog.getText(self, "Толщина диска", "Введите толщину тормозного диска (мм):")[0]) / 1000
+            disc_thickness = float(self.brake_disc_thickness.text()) / 1000
+            front_percent = self.brake_front_percent.value()
+            ambient = self.brake_ambient_temp.value()
+            cycle_key = self.brake_thermal_cycle.currentData()
+            n_cycles = self.brake_thermal_cycles.value()
 
             if weight == 0 or disc_dia == 0 or disc_thickness == 0:
                 raise ValueError("Параметры не могут быть нулевыми")
 
-            # Кинетическая энергия: E = 0.5 * m * v²
-            speed_mps = speed / 3.6
-            kinetic_energy = 0.5 * weight * (speed_mps ** 2)
-
-            # Предположим, что 90% энергии переходит в тепло
-            heat_energy = kinetic_energy * 0.9
+            # Кинетическая энергия E = 0.5 * m * v², 90% переходит в тепло диска
+            heating = brake_temperature_model(speed, weight, disc_dia * 1000, disc_thickness * 1000)
+            kinetic_energy = float(heating['kinetic_energy']) * 1000
+            heat_energy = float(heating['heat_energy']) * 1000
+            temperature_rise = float(heating['temperature_rise'])
+
+            # Серия циклов торможения с конвективным охлаждением
+            cycle = BRAKE_CYCLES[cycle_key]
+            thermal = simulate_brake_thermal(
+                cycle['segments'], n_cycles, weight, disc_dia * 1000, disc_thickness * 1000,
+                front_percent=front_percent, ambient=ambient,
+                drag_coef=self.dyn_drag_coef.value(),
+                frontal_area=self.dyn_frontal_area.value(),
+                rolling_resist=self.dyn_rolling_resist.value(),
+                vented=self.brake_vented_disc.isChecked()
+            )
+            peak = float(thermal['peak_temperature'])
+            final = float(thermal['final_temperature'])
+            steady_peak = float(thermal['steady_peak'])
+            cycles_300 = float(thermal['cycles_to_300'])
+            cycles_600 = float(thermal['cycles_to_600'])
 
-            # Объем диска (упрощенно)
-            disc_volume = math.pi * (disc_dia / 2) ** 2 * disc_thickness
-            # Плотность чугуна ~7200 кг/м³, теплоемкость ~500 Дж/(кг·K)
-            disc_mass = disc_volume * 7200
-            temperature_rise = heat_energy / (disc_mass * 500)
+            def limit_text(cycles):
+                return "не достигается" if np.isnan(cycles) else f"на {cycles:.0f}-м цикле"
 
             result_text = (
                 "=== НАГРЕВ ТОРМОЗНЫХ ДИСКОВ ===\n"
@@ -2262,12 +8644,35 @@ class AdvancedVehicleCalculator(QMainWindow):
                 f"Кинетическая энергия: {kinetic_energy / 1000:.1f} кДж\n"
                 f"Тепловая энергия: {heat_energy / 1000:.1f} кДж\n"
                 f"Повышение температуры: {temperature_rise:.1f} °C\n\n"
+                f"=== СЕРИЯ ЦИКЛОВ: {cycle['title']} ===\n"
+                f"Циклов: {n_cycles} по {thermal['cycle_time']:.1f} с\n"
+                f"Пиковая температура переднего диска: {peak:.0f} °C\n"
+                f"Температура в конце серии: {final:.0f} °C\n"
+                f"Установившийся пик (бесконечная серия): {steady_peak:.0f} °C\n"
+                f"Порог 300°C: {limit_text(cycles_300)}\n"
+                f"Порог 600°C: {limit_text(cycles_600)}\n\n"
                 "Критические значения:\n"
                 "> 300°C - Возможна деформация\n"
                 "> 600°C - Потеря эффективности"
             )
             self.brake_result.setText(result_text)
 
+            # График температуры и скорости по времени
+            self.brake_figure.clear()
+            ax_temp = self.brake_figure.add_subplot(111)
+            step = max(1, thermal['time'].size // 5000)
+            ax_temp.plot(thermal['time'][::step], thermal['temperature'][::step], color='tab:red')
+            for limit in BRAKE_TEMPERATURE_LIMITS:
+                ax_temp.axhline(limit, color='gray', linestyle='--', linewidth=0.8)
+            ax_temp.set_xlabel("Время, с")
+            ax_temp.set_ylabel("Температура диска, °C")
+            ax_temp.grid(True)
+            ax_speed = ax_temp.twinx()
+            ax_speed.plot(thermal['time'][::step], thermal['speed'][::step], color='tab:blue', alpha=0.3)
+            ax_speed.set_ylabel("Скорость, км/ч")
+            self.brake_figure.tight_layout()
+            self.brake_canvas.draw()
+
             # Сохраняем для отчета
             if 'braking' not in self.report_data:
                 self.report_data['braking'] = {}
@@ -2279,7 +8684,13 @@ class AdvancedVehicleCalculator(QMainWindow):
                     'disc_thickness': f"{disc_thickness * 1000:.1f} мм",
                     'kinetic_energy': f"{kinetic_energy / 1000:.1f} кДж",
                     'heat_energy': f"{heat_energy / 1000:.1f} кДж",
-                    'temperature_rise': f"{temperature_rise:.1f} °C"
+                    'temperature_rise': f"{temperature_rise:.1f} °C",
+                    'brake_cycle': f"{cycle['title']}, {n_cycles} циклов",
+                    'peak_temperature': f"{peak:.0f} °C",
+                    'final_temperature': f"{final:.0f} °C",
+                    'steady_peak': f"{steady_peak:.0f} °C",
+                    'cycles_to_300': limit_text(cycles_300),
+                    'cycles_to_600': limit_text(cycles_600)
                 }
             })
 
@@ -2290,12 +8701,18 @@ class AdvancedVehicleCalculator(QMainWindow):
                     'speed': speed,
                     'weight': weight,
                     'disc_diameter': disc_dia,
-                    'disc_thickness': disc_thickness
+                    'disc_thickness': disc_thickness,
+                    'brake_cycle': cycle_key,
+                    'cycles': n_cycles,
+                    'ambient_temperature': ambient
                 },
                 {
                     'kinetic_energy': kinetic_energy,
                     'heat_energy': heat_energy,
-                    'temperature_rise': temperature_rise
+                    'temperature_rise': temperature_rise,
+                    'peak_temperature': peak,
+                    'final_temperature': final,
+                    'steady_peak': steady_peak
                 }
             )
 
@@ -2304,6 +8721,149 @@ class AdvancedVehicleCalculator(QMainWindow):
         except ValueError:
             QMessageBox.warning(self, "Ошибка", "Пожалуйста, введите корректные параметры")
 
+    def calculate_braking_simulation(self):
+        """Динамическое торможение: таблица скорость × сцепление × баланс и графики"""
+        try:
+            piston_count = self.brake_piston_count.value()
+            piston_dia = float(self.brake_piston_diameter.text())  # мм
+            disc_dia = float(self.brake_disc_diameter.text())  # мм
+            pad_coef = self.brake_pad_coef.value()
+            pressure = float(self.brake_fluid_pressure.text())  # бар
+            weight = float(self.brake_vehicle_weight.text())
+            cg_height = float(self.brake_cg_height.text()) / 1000  # в метрах
+            wheelbase = float(self.brake_wheelbase.text()) / 1000
+            static_front = self.brake_static_front.value()
+            tire_radius = float(self.brake_tire_radius.text())
+
+            speeds = [float(v) for v in self.brake_sim_speeds.text().replace(';', ',').split(',') if v.strip()]
+            road_coefs = [float(v) for v in self.brake_sim_road_coefs.text().replace(';', ',').split(',') if v.strip()]
+            balances = [float(v) for v in self.brake_sim_balances.text().replace(';', ',').split(',') if v.strip()]
+
+            if weight <= 0 or wheelbase <= 0 or tire_radius <= 0:
+                raise ValueError("Масса, колесная база и радиус колеса должны быть больше нуля")
+            if not speeds or not road_coefs or not balances:
+                raise ValueError("Задайте списки скоростей, коэффициентов сцепления и балансов")
+
+            brake_torque = float(brake_torque_model(piston_count, piston_dia, disc_dia, pad_coef, pressure)['brake_torque'])
+            vehicle = {
+                'weight': weight,
+                'brake_torque': brake_torque,
+                'tire_radius': tire_radius,
+                'cg_height': cg_height,
+                'wheelbase': wheelbase,
+                'static_front': static_front,
+                'drag_coef': self.dyn_drag_coef.value(),
+                'frontal_area': self.dyn_frontal_area.value(),
+                'rolling_resist': self.dyn_rolling_resist.value()
+            }
+
+            table = braking_table(speeds, road_coefs, balances, **vehicle)
+
+            # Текущая точка (скорость, сцепление и баланс из полей вкладки)
+            speed = float(self.brake_speed.text()) if self.brake_speed.text() else speeds[-1]
+            road_coef = self.brake_road_coef.value()
+            front_percent = self.brake_front_percent.value()
+            nominal = simulate_braking(speed, road_coef, front_percent, **vehicle)
+
+            lines = [
+                "=== ДИНАМИЧЕСКОЕ ТОРМОЖЕНИЕ ===",
+                f"Тормозной момент механизма: {brake_torque:.1f} Н·м",
+                "Тормозной путь (м) по балансу передних тормозов;",
+                "F - блокировка передней оси, R - блокировка задней оси",
+                "",
+                "Скорость   μ    | " + " | ".join(f"{b:>7.0f}%" for b in balances) + " | Лучший баланс"
+            ]
+            best_balances = {}
+            for i, v in enumerate(speeds):
+                for j, mu in enumerate(road_coefs):
+                    cells = []
+                    for k in range(len(balances)):
+                        marks = ("F" if not np.isnan(table['front_lock_time'][i, j, k]) else " ") + \
+                                ("R" if not np.isnan(table['rear_lock_time'][i, j, k]) else " ")
+                        cells.append(f"{table['stopping_distance'][i, j, k]:6.1f}{marks}")
+                    # Лучший баланс - минимальный путь без блокировки задней оси
+                    distances = np.where(np.isnan(table['rear_lock_time'][i, j]),
+                                         table['stopping_distance'][i, j], np.inf)
+                    best = int(np.argmin(distances)) if np.isfinite(distances).any() else None
+                    best_text = f"{balances[best]:.0f}%" if best is not None else "-"
+                    best_balances[f"{v:.0f} км/ч, μ={mu:.2f}"] = best_text
+                    lines.append(f"{v:6.0f}  {mu:5.2f}  | " + " | ".join(cells) + f" | {best_text}")
+
+            front_lock = float(nominal['front_lock_time'])
+            rear_lock = float(nominal['rear_lock_time'])
+            lines += [
+                "",
+                f"Текущая настройка: {speed:.0f} км/ч, μ = {road_coef:.2f}, баланс {front_percent:.0f}%",
+                f"Тормозной путь: {float(nominal['stopping_distance']):.2f} м",
+                f"Время торможения: {float(nominal['stopping_time']):.2f} с",
+                f"Среднее замедление: {float(nominal['mean_deceleration']):.2f} g",
+                f"Блокировка передней оси: {'нет' if np.isnan(front_lock) else f'через {front_lock:.2f} с'}",
+                f"Блокировка задней оси: {'нет' if np.isnan(rear_lock) else f'через {rear_lock:.2f} с'}"
+            ]
+            self.brake_result.setText("\n".join(lines))
+
+            # Графики скорости и замедления для текущей настройки
+            self.brake_figure.clear()
+            ax_speed = self.brake_figure.add_subplot(121)
+            ax_speed.plot(nominal['time'], nominal['speed'])
+            ax_speed.set_xlabel("Время, с")
+            ax_speed.set_ylabel("Скорость, км/ч")
+            ax_speed.grid(True)
+            ax_decel = self.brake_figure.add_subplot(122)
+            ax_decel.plot(nominal['distance'], nominal['deceleration'])
+            ax_decel.set_xlabel("Путь, м")
+            ax_decel.set_ylabel("Замедление, g")
+            ax_decel.grid(True)
+            self.brake_figure.tight_layout()
+            self.brake_canvas.draw()
+
+            simulation = {
+                'speed': f"{speed} км/ч",
+                'road_coef': f"{road_coef:.2f}",
+                'front_percent': f"{front_percent:.1f}%",
+                'stopping_distance': f"{float(nominal['stopping_distance']):.2f} м",
+                'stopping_time': f"{float(nominal['stopping_time']):.2f} с",
+                'deceleration': f"{float(nominal['mean_deceleration']):.2f} g",
+                'front_lock_time': "нет" if np.isnan(front_lock) else f"{front_lock:.2f} с",
+                'rear_lock_time': "нет" if np.isnan(rear_lock) else f"{rear_lock:.2f} с"
+            }
+
+            # Сохраняем для отчета
+            if 'braking' not in self.report_data:
+                self.report_data['braking'] = {}
+            self.report_data['braking'].update({
+                'braking_simulation': simulation,
+                'optimal_balance_table': best_balances
+            })
+
+            # Сохраняем в базу данных
+            calc_id = self.db.save_calculation(
+                'braking_simulation',
+                {
+                    'speed': speed,
+                    'weight': weight,
+                    'road_coef': road_coef,
+                    'front_percent': front_percent,
+                    'brake_torque': brake_torque,
+                    'cg_height': cg_height,
+                    'wheelbase': wheelbase,
+                    'static_front': static_front,
+                    'tire_radius': tire_radius
+                },
+                {
+                    'stopping_distance': float(nominal['stopping_distance']),
+                    'stopping_time': float(nominal['stopping_time']),
+                    'deceleration': float(nominal['mean_deceleration']),
+                    'optimal_balance': best_balances
+                }
+            )
+
+            self.update_report_tab()
+            self.statusBar().showMessage(f"Моделирование торможения сохранено (ID: {calc_id})", 3000)
+
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Пожалуйста, введите корректные параметры\n{str(e)}")
+
     # ==================== НОВАЯ ВКЛАДКА: ПОДВЕСКА ====================
 
     def create_suspension_tab(self):
@@ -2388,6 +8948,34 @@ class AdvancedVehicleCalculator(QMainWindow):
         damping_layout.addRow("Коэффициент отбоя:", self.suspension_rebound_coeff)
         damping_layout.addRow("Коэффициент сжатия:", self.suspension_bump_coeff)
         damping_layout.addRow("Коэффициент демпфирования:", self.suspension_damping_ratio)
+
+        # Многоточечная характеристика амортизатора
+        self.damper_curve = None
+        self.damper_velocity = QDoubleSpinBox()
+        self.damper_velocity.setRange(0.01, 2.0)
+        self.damper_velocity.setSingleStep(0.05)
+        self.damper_velocity.setDecimals(2)
+        self.damper_velocity.setValue(0.1)
+        self.damper_velocity.setSuffix(" м/с")
+        self.damper_velocity.valueChanged.connect(self.apply_damper_curve)
+        self.damper_part_number = QLineEdit()
+        self.damper_part_number.setPlaceholderText("артикул из каталога")
+
+        damper_buttons = QHBoxLayout()
+        load_curve_btn = QPushButton("Характеристика со стенда (CSV)")
+        load_curve_btn.clicked.connect(lambda: self.load_damper_curve('csv'))
+        catalog_curve_btn = QPushButton("Из каталога")
+        catalog_curve_btn.clicked.connect(lambda: self.load_damper_curve('catalog'))
+        damper_buttons.addWidget(load_curve_btn)
+        damper_buttons.addWidget(self.damper_part_number)
+        damper_buttons.addWidget(catalog_curve_btn)
+
+        self.damper_curve_label = QLabel("")
+        self.damper_curve_label.setStyleSheet("font-weight: bold; color: #0066CC;")
+
+        damping_layout.addRow(damper_buttons)
+        damping_layout.addRow("Скорость штока для эквивалентного коэффициента:", self.damper_velocity)
+        damping_layout.addRow(self.damper_curve_label)
         damping_group.setLayout(damping_layout)
 
         # Группа "Кинематика подвески"
@@ -2408,19 +8996,339 @@ class AdvancedVehicleCalculator(QMainWindow):
         kinematics_layout.addRow("Высота оси вращения:", self.suspension_pivot_height)
         kinematics_layout.addRow(calculate_kinematics_btn)
         kinematics_layout.addRow("Мгновенный центр вращения:", self.suspension_instant_center)
-        kinematics_group.setLayout(kinematics_layout)
-
 
+        # Кинематика по точкам крепления (поперечная плоскость)
+        self.kin_geometry = QComboBox()
+        for geometry_key, geometry in SUSPENSION_GEOMETRIES.items():
+            self.kin_geometry.addItem(geometry['title'], geometry_key)
+        self.kin_geometry.currentIndexChanged.connect(self.update_hardpoint_table)
+
+        self.kin_hardpoints = QTableWidget()
+        self.kin_hardpoints.setColumnCount(3)
+        self.kin_hardpoints.setHorizontalHeaderLabels(["Точка", "Y, мм", "Z, мм"])
+        self.kin_hardpoints.verticalHeader().setVisible(False)
+        self.kin_hardpoints.horizontalHeader().setStretchLastSection(True)
+        self.kin_hardpoints.setMinimumHeight(200)
+
+        self.kin_static_camber = QDoubleSpinBox()
+        self.kin_static_camber.setRange(-5, 5)
+        self.kin_static_camber.setValue(-1)
+        self.kin_static_camber.setSuffix("°")
+        self.kin_travel = QSpinBox()
+        self.kin_travel.setRange(10, 150)
+        self.kin_travel.setValue(80)
+        self.kin_travel.setSuffix(" мм")
+        self.kin_steps = QSpinBox()
+        self.kin_steps.setRange(11, 2001)
+        self.kin_steps.setValue(321)
+
+        calculate_hardpoints_btn = QPushButton("Рассчитать по точкам крепления")
+        calculate_hardpoints_btn.clicked.connect(self.calculate_hardpoint_kinematics)
+
+        self.kin_result = QLabel("")
+        self.kin_result.setStyleSheet("font-weight: bold; color: #0066CC;")
+
+        kinematics_layout.addRow("Схема подвески:", self.kin_geometry)
+        kinematics_layout.addRow(self.kin_hardpoints)
+        kinematics_layout.addRow("Статический развал:", self.kin_static_camber)
+        kinematics_layout.addRow("Ход сжатия/отбоя (±):", self.kin_travel)
+        kinematics_layout.addRow("Число положений:", self.kin_steps)
+        kinematics_layout.addRow(calculate_hardpoints_btn)
+        kinematics_layout.addRow(self.kin_result)
+        kinematics_group.setLayout(kinematics_layout)
+        self.update_hardpoint_table()
+
+        # Группа "Подбор по каталогу" - обращение расчетов частоты и демпфирования
+        catalog_group = QGroupBox("Подбор пружин и амортизаторов по каталогу")
+        catalog_layout = QFormLayout()
+
+        self.catalog_target_frequency = QDoubleSpinBox()
+        self.catalog_target_frequency.setRange(0.3, 5.0)
+        self.catalog_target_frequency.setSingleStep(0.05)
+        self.catalog_target_frequency.setValue(1.5)
+        self.catalog_target_frequency.setSuffix(" Гц")
+        self.catalog_target_damping = QDoubleSpinBox()
+        self.catalog_target_damping.setRange(0.05, 2.0)
+        self.catalog_target_damping.setSingleStep(0.05)
+        self.catalog_target_damping.setValue(0.3)
+        self.catalog_rebound_share = QDoubleSpinBox()
+        self.catalog_rebound_share.setRange(10, 90)
+        self.catalog_rebound_share.setValue(60)
+        self.catalog_rebound_share.setSuffix("%")
+        self.catalog_min_length = QLineEdit()
+        self.catalog_min_length.setPlaceholderText("мм, не обязательно")
+        self.catalog_max_length = QLineEdit()
+        self.catalog_max_length.setPlaceholderText("мм, не обязательно")
+
+        catalog_buttons = QHBoxLayout()
+        import_springs_btn = QPushButton("Импорт пружин (CSV)")
+        import_springs_btn.clicked.connect(lambda: self.import_catalog('springs'))
+        import_dampers_btn = QPushButton("Импорт амортизаторов (CSV)")
+        import_dampers_btn.clicked.connect(lambda: self.import_catalog('dampers'))
+        demo_catalog_btn = QPushButton("Демонстрационный каталог")
+        demo_catalog_btn.clicked.connect(self.create_demo_catalog)
+        catalog_buttons.addWidget(import_springs_btn)
+        catalog_buttons.addWidget(import_dampers_btn)
+        catalog_buttons.addWidget(demo_catalog_btn)
+
+        match_catalog_btn = QPushButton("Подобрать")
+        match_catalog_btn.clicked.connect(self.match_catalog_parts)
+
+        self.catalog_size_label = QLabel("")
+        self.catalog_result = QTextEdit()
+        self.catalog_result.setReadOnly(True)
+        self.catalog_result.setStyleSheet("font-family: monospace;")
+        self.catalog_result.setMinimumHeight(200)
+
+        catalog_layout.addRow("Целевая частота:", self.catalog_target_frequency)
+        catalog_layout.addRow("Целевой коэф. демпфирования:", self.catalog_target_damping)
+        catalog_layout.addRow("Доля отбоя в демпфировании:", self.catalog_rebound_share)
+        catalog_layout.addRow("Свободная длина пружины от:", self.catalog_min_length)
+        catalog_layout.addRow("Свободная длина пружины до:", self.catalog_max_length)
+        catalog_layout.addRow(catalog_buttons)
+        catalog_layout.addRow(self.catalog_size_label)
+        catalog_layout.addRow(match_catalog_btn)
+        catalog_layout.addRow(self.catalog_result)
+        catalog_group.setLayout(catalog_layout)
+
+        # Группа "Крен" - жесткость в крене и распределение поперечной нагрузки
+        roll_group = QGroupBox("Крен и распределение поперечной нагрузки")
+        roll_layout = QGridLayout()
+
+        self.roll_mass = QLineEdit("1300")
+        self.roll_mass.setPlaceholderText("кг")
+        self.roll_cg_height = QLineEdit("500")
+        self.roll_cg_height.setPlaceholderText("мм")
+        self.roll_front_weight = QDoubleSpinBox()
+        self.roll_front_weight.setRange(30, 70)
+        self.roll_front_weight.setValue(55)
+        self.roll_front_weight.setSuffix("%")
+        self.roll_wheelbase = QLineEdit("2600")
+        self.roll_wheelbase.setPlaceholderText("мм")
+        self.roll_target_lltd = QDoubleSpinBox()
+        self.roll_target_lltd.setRange(20, 80)
+        self.roll_target_lltd.setValue(58)
+        self.roll_target_lltd.setSuffix("%")
+        self.roll_max_g = QDoubleSpinBox()
+        self.roll_max_g.setRange(0.2, 3.0)
+        self.roll_max_g.setSingleStep(0.1)
+        self.roll_max_g.setValue(1.2)
+        self.roll_max_g.setSuffix(" g")
+
+        roll_layout.addWidget(QLabel("Масса автомобиля, кг:"), 0, 0)
+        roll_layout.addWidget(self.roll_mass, 0, 1)
+        roll_layout.addWidget(QLabel("Высота центра масс, мм:"), 0, 2)
+        roll_layout.addWidget(self.roll_cg_height, 0, 3)
+        roll_layout.addWidget(QLabel("Нагрузка на переднюю ось:"), 1, 0)
+        roll_layout.addWidget(self.roll_front_weight, 1, 1)
+        roll_layout.addWidget(QLabel("Колесная база, мм:"), 1, 2)
+        roll_layout.addWidget(self.roll_wheelbase, 1, 3)
+        roll_layout.addWidget(QLabel("Целевая доля переноса на перед (LLTD):"), 2, 0)
+        roll_layout.addWidget(self.roll_target_lltd, 2, 1)
+        roll_layout.addWidget(QLabel("Поперечное ускорение до:"), 2, 2)
+        roll_layout.addWidget(self.roll_max_g, 2, 3)
+
+        # Параметры осей: столбцы «перед» и «зад»
+        roll_layout.addWidget(QLabel("Передняя ось"), 3, 1)
+        roll_layout.addWidget(QLabel("Задняя ось"), 3, 2)
+        axle_rows = [
+            ('roll_track', "Колея, мм", ("1500", "1480")),
+            ('roll_center', "Высота центра крена, мм", ("60", "100")),
+            ('roll_wheel_rates', "Жесткости колеса, Н/мм (варианты)", ("25, 30, 35", "20, 25, 30")),
+            ('roll_bar_diameters', "Диаметры стабилизатора, мм (варианты)", ("18, 20, 22, 24, 26", "14, 16, 18, 20")),
+            ('roll_bar_arm', "Плечо рычага стабилизатора, мм", ("200", "180")),
+            ('roll_bar_length', "Длина торсиона, мм", ("800", "800")),
+            ('roll_bar_ratio', "Передаточное отношение стабилизатора", ("0.6", "0.6"))
+        ]
+        for row, (name, title, defaults) in enumerate(axle_rows, start=4):
+            fields = (QLineEdit(defaults[0]), QLineEdit(defaults[1]))
+            setattr(self, name, fields)
+            roll_layout.addWidget(QLabel(title + ":"), row, 0)
+            roll_layout.addWidget(fields[0], row, 1)
+            roll_layout.addWidget(fields[1], row, 2)
+
+        calculate_roll_btn = QPushButton("Рассчитать крен и подобрать стабилизаторы")
+        calculate_roll_btn.clicked.connect(self.calculate_roll_balance)
+
+        self.roll_result = QTextEdit()
+        self.roll_result.setReadOnly(True)
+        self.roll_result.setStyleSheet("font-family: monospace;")
+        self.roll_result.setMinimumHeight(200)
+
+        roll_layout.addWidget(calculate_roll_btn, 4 + len(axle_rows), 0, 1, 4)
+        roll_layout.addWidget(self.roll_result, 5 + len(axle_rows), 0, 1, 4)
+        roll_group.setLayout(roll_layout)
+
+        # Группа "Развеска по углам" - регулировка опор пружин по показаниям весов
+        corner_group = QGroupBox("Развеска по углам")
+        corner_layout = QGridLayout()
+
+        self.corner_wheelbase = QLineEdit("2600")
+        self.corner_wheelbase.setPlaceholderText("мм")
+        self.corner_tracks = (QLineEdit("1500"), QLineEdit("1480"))
+        self.corner_target_cross = QDoubleSpinBox()
+        self.corner_target_cross.setRange(30, 70)
+        self.corner_target_cross.setDecimals(1)
+        self.corner_target_cross.setValue(50)
+        self.corner_target_cross.setSuffix("%")
+        self.corner_target_front = QDoubleSpinBox()
+        self.corner_target_front.setRange(30, 70)
+        self.corner_target_front.setDecimals(1)
+        self.corner_target_front.setValue(52)
+        self.corner_target_front.setSuffix("%")
+        self.corner_ballast = QLineEdit("0")
+        self.corner_ballast.setPlaceholderText("кг")
+        self.corner_step = QLineEdit("0.75")
+        self.corner_step.setPlaceholderText("мм (например, полоборота гайки)")
+        self.corner_max_steps = QSpinBox()
+        self.corner_max_steps.setRange(1, 12)
+        self.corner_max_steps.setValue(6)
+
+        corner_layout.addWidget(QLabel("Колесная база, мм:"), 0, 0)
+        corner_layout.addWidget(self.corner_wheelbase, 0, 1)
+        corner_layout.addWidget(QLabel("Колея перед / зад, мм:"), 0, 2)
+        corner_layout.addWidget(self.corner_tracks[0], 0, 3)
+        corner_layout.addWidget(self.corner_tracks[1], 0, 4)
+        corner_layout.addWidget(QLabel("Целевая диагональ (ПП + ЛЗ):"), 1, 0)
+        corner_layout.addWidget(self.corner_target_cross, 1, 1)
+        corner_layout.addWidget(QLabel("Целевая доля передней оси:"), 1, 2)
+        corner_layout.addWidget(self.corner_target_front, 1, 3)
+        corner_layout.addWidget(QLabel("Балласт, кг:"), 2, 0)
+        corner_layout.addWidget(self.corner_ballast, 2, 1)
+        corner_layout.addWidget(QLabel("Шаг регулировки опоры, мм:"), 2, 2)
+        corner_layout.addWidget(self.corner_step, 2, 3)
+        corner_layout.addWidget(QLabel("Шагов в каждую сторону:"), 3, 0)
+        corner_layout.addWidget(self.corner_max_steps, 3, 1)
+
+        # Параметры углов: столбцы ЛП, ПП, ЛЗ, ПЗ
+        for column, corner in enumerate(CORNERS, start=1):
+            corner_layout.addWidget(QLabel(corner), 4, column)
+        corner_rows = [
+            ('corner_scales', "Показания весов, кг", ("360", "340", "300", "320")),
+            ('corner_spring_rates', "Жесткость пружины, Н/мм", ("40", "40", "30", "30")),
+            ('corner_motion_ratios', "Коэффициент рычага (MR)", ("0.8", "0.8", "0.75", "0.75"))
+        ]
+        for row, (name, title, defaults) in enumerate(corner_rows, start=5):
+            fields = tuple(QLineEdit(value) for value in defaults)
+            setattr(self, name, fields)
+            corner_layout.addWidget(QLabel(title), row, 0)
+            for column, field in enumerate(fields, start=1):
+                corner_layout.addWidget(field, row, column)
+
+        calculate_corner_btn = QPushButton("Рассчитать регулировку опор")
+        calculate_corner_btn.clicked.connect(self.calculate_corner_weights)
+
+        self.corner_result = QTextEdit()
+        self.corner_result.setReadOnly(True)
+        self.corner_result.setStyleSheet("font-family: monospace;")
+        self.corner_result.setMinimumHeight(200)
+
+        corner_layout.addWidget(calculate_corner_btn, 5 + len(corner_rows), 0, 1, 5)
+        corner_layout.addWidget(self.corner_result, 6 + len(corner_rows), 0, 1, 5)
+        corner_group.setLayout(corner_layout)
+
+        # Группа "Динамика подвески" - моделирование на профиле дороги
+        ride_group = QGroupBox("Динамика подвески на дороге")
+        ride_layout = QFormLayout()
+
+        self.ride_model = QComboBox()
+        self.ride_model.addItem("Четверть автомобиля", 'quarter')
+        self.ride_model.addItem("Половина автомобиля", 'half')
+        self.ride_road = QComboBox()
+        for road_class in ISO_8608_CLASSES:
+            self.ride_road.addItem(f"ISO 8608, класс {road_class}", road_class)
+        self.ride_road.addItem("Одиночная неровность", 'bump')
+        self.ride_road.setCurrentIndex(2)
+
+        self.ride_unsprung_mass = QLineEdit("40")
+        self.ride_unsprung_mass.setPlaceholderText("кг на колесо")
+        self.ride_tire_rate = QLineEdit("250")
+        self.ride_tire_rate.setPlaceholderText("Н/мм")
+        self.ride_speed = QLineEdit("60")
+        self.ride_speed.setPlaceholderText("км/ч")
+        self.ride_bump_height = QLineEdit("50")
+        self.ride_bump_height.setPlaceholderText("мм")
+        self.ride_wheelbase = QLineEdit("2600")
+        self.ride_wheelbase.setPlaceholderText("мм")
+        self.ride_duration = QDoubleSpinBox()
+        self.ride_duration.setRange(1, 120)
+        self.ride_duration.setValue(10)
+        self.ride_duration.setSuffix(" с")
+        self.ride_wheel_rates = QLineEdit("20, 25, 30, 35")
+        self.ride_wheel_rates.setPlaceholderText("Н/мм через запятую")
+        self.ride_damping_ratios = QLineEdit("0.2, 0.3, 0.4, 0.5, 0.7")
+        self.ride_damping_ratios.setPlaceholderText("через запятую")
+
+        self.ride_use_damper_curve = QCheckBox("Амортизатор по загруженной характеристике (вместо вариантов демпфирования)")
+
+        calculate_ride_btn = QPushButton("Моделировать движение")
+        calculate_ride_btn.clicked.connect(self.calculate_ride_simulation)
+
+        self.ride_result = QTextEdit()
+        self.ride_result.setReadOnly(True)
+        self.ride_result.setStyleSheet("font-family: monospace;")
+        self.ride_result.setMinimumHeight(200)
+
+        ride_layout.addRow("Модель:", self.ride_model)
+        ride_layout.addRow("Профиль дороги:", self.ride_road)
+        ride_layout.addRow("Высота неровности:", self.ride_bump_height)
+        ride_layout.addRow("Скорость:", self.ride_speed)
+        ride_layout.addRow("Длительность:", self.ride_duration)
+        ride_layout.addRow("Неподрессоренная масса:", self.ride_unsprung_mass)
+        ride_layout.addRow("Жесткость шины:", self.ride_tire_rate)
+        ride_layout.addRow("Колесная база:", self.ride_wheelbase)
+        ride_layout.addRow("Жесткости колеса (варианты):", self.ride_wheel_rates)
+        ride_layout.addRow("Коэф. демпфирования (варианты):", self.ride_damping_ratios)
+        ride_layout.addRow(self.ride_use_damper_curve)
+        ride_layout.addRow(calculate_ride_btn)
+        ride_layout.addRow(self.ride_result)
+        ride_group.setLayout(ride_layout)
+
+        # Группа "Частотная характеристика" - использует массы и сетку вариантов выше
+        frf_group = QGroupBox("Частотная характеристика (0.1-30 Гц)")
+        frf_layout = QFormLayout()
+
+        self.frf_points = QSpinBox()
+        self.frf_points.setRange(50, 5000)
+        self.frf_points.setValue(500)
+
+        calculate_frf_btn = QPushButton("Построить АЧХ и ФЧХ")
+        calculate_frf_btn.clicked.connect(self.calculate_frequency_response)
+
+        self.frf_result = QTextEdit()
+        self.frf_result.setReadOnly(True)
+        self.frf_result.setStyleSheet("font-family: monospace;")
+        self.frf_result.setMinimumHeight(150)
+
+        frf_layout.addRow("Число частот:", self.frf_points)
+        frf_layout.addRow(calculate_frf_btn)
+        frf_layout.addRow(self.frf_result)
+        frf_group.setLayout(frf_layout)
+
+        self.suspension_figure = Figure(figsize=(6, 3))
+        self.suspension_canvas = FigureCanvas(self.suspension_figure)
+        self.suspension_canvas.setMinimumHeight(300)
 
         layout.addWidget(spring_group)
         layout.addWidget(freq_group)
+        layout.addWidget(corner_group)
         layout.addWidget(damping_group)
         layout.addWidget(kinematics_group)
+        layout.addWidget(catalog_group)
+        layout.addWidget(roll_group)
+        layout.addWidget(ride_group)
+        layout.addWidget(frf_group)
+        layout.addWidget(self.suspension_canvas)
 
         layout.addStretch()
 
         tab.setLayout(layout)
-        self.tabs.addTab(tab, "Подвеска")
+
+        # Вкладка длинная - помещаем ее в область прокрутки
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setWidget(tab)
+        self.tabs.addTab(scroll, "Подвеска")
 
     def calculate_wheel_rate(self):
         try:
@@ -2428,8 +9336,9 @@ class AdvancedVehicleCalculator(QMainWindow):
             motion_ratio = float(self.suspension_motion_ratio.text())
             preload = float(self.suspension_spring_preload.text())
 
-            wheel_rate = spring_rate * (motion_ratio ** 2)
-            force_at_ride = spring_rate * preload * motion_ratio
+            rates = wheel_rate_model(spring_rate, motion_ratio, preload)
+            wheel_rate = float(rates['wheel_rate'])
+            force_at_ride = float(rates['force_at_ride'])
 
             self.suspension_wheel_rate.setText(f"{wheel_rate:.2f} Н/мм")
             self.suspension_force_at_ride.setText(f"{force_at_ride:.2f} Н")
@@ -2468,10 +9377,10 @@ class AdvancedVehicleCalculator(QMainWindow):
             weight = float(self.suspension_weight.text())
             corner_weight = float(self.suspension_corner_weight.text())
             wheel_rate_nmm = float(self.suspension_wheel_rate.text().split()[0])
-            wheel_rate = wheel_rate_nmm * 1000  # Н/мм в Н/м
 
-            frequency = (1 / (2 * math.pi)) * math.sqrt(wheel_rate / (weight * 9.81))
-            ride_height_change = (corner_weight * 9.81) / (wheel_rate_nmm * 1000)
+            ride = suspension_frequency_model(weight, corner_weight, wheel_rate_nmm)
+            frequency = float(ride['frequency'])
+            ride_height_change = float(ride['ride_height_change']) / 1000  # в метрах
 
             self.suspension_frequency.setText(f"{frequency:.2f} Гц")
             self.suspension_ride_height_change.setText(f"{ride_height_change * 1000:.1f} мм")
@@ -2513,9 +9422,10 @@ class AdvancedVehicleCalculator(QMainWindow):
             bump = float(self.suspension_bump.text())
             crit_damping = float(self.suspension_crit_damping.text())
 
-            rebound_coeff = rebound / crit_damping
-            bump_coeff = bump / crit_damping
-            damping_ratio = (rebound_coeff + bump_coeff) / 2
+            damping = damping_model(rebound, bump, crit_damping)
+            rebound_coeff = float(damping['rebound_coeff'])
+            bump_coeff = float(damping['bump_coeff'])
+            damping_ratio = float(damping['damping_ratio'])
 
             self.suspension_rebound_coeff.setText(f"{rebound_coeff:.2f}")
             self.suspension_bump_coeff.setText(f"{bump_coeff:.2f}")
@@ -2552,41 +9462,872 @@ class AdvancedVehicleCalculator(QMainWindow):
         except ValueError:
             QMessageBox.warning(self, "Ошибка", "Пожалуйста, введите корректные значения")
 
+    def load_damper_curve(self, source):
+        """Загружает характеристику амортизатора из CSV стенда или из каталога"""
+        try:
+            if source == 'csv':
+                file_name, _ = QFileDialog.getOpenFileName(self, "Характеристика амортизатора", "",
+                                                           "CSV Files (*.csv)")
+                if not file_name:
+                    return
+                self.damper_curve = DamperCurve.from_csv(file_name)
+            else:
+                part_number = self.damper_part_number.text().strip()
+                damper_id = self.db.find_damper(part_number)
+                if damper_id is None:
+                    raise ValueError(f"Амортизатор «{part_number}» не найден в каталоге")
+                points = np.array(self.db.damper_curve(damper_id))
+                self.damper_curve = DamperCurve.fit(points[:, 0], points[:, 1], name=part_number)
+            self.apply_damper_curve()
+
+            # Сохраняем в базу данных
+            curve = self.damper_curve
+            calc_id = self.db.save_calculation(
+                'damper_curve_fit',
+                {'source': source, 'name': curve.name,
+                 'points': [] if curve.points is None else curve.points.tolist()},
+                {side: [float(v) for v in curve.params[side]] for side in DamperCurve.SIDES}
+            )
+            self.statusBar().showMessage(f"Характеристика амортизатора сохранена (ID: {calc_id})", 3000)
+
+        except (KeyError, ValueError, OSError) as e:
+            QMessageBox.warning(self, "Ошибка", f"Не удалось загрузить характеристику\n{str(e)}")
+
+    def apply_damper_curve(self):
+        """Эквивалентные коэффициенты характеристики -> поля отбоя и сжатия и расчет демпфирования"""
+        try:
+            curve = self.damper_curve
+            if curve is None:
+                return
+            motion_ratio = float(self.suspension_motion_ratio.text())
+            bump, rebound = curve.equivalent_coefficients(self.damper_velocity.value())
+
+            summary = []
+            for side, title in (('bump', "Сжатие"), ('rebound', "Отбой")):
+                low, high, knee = curve.params[side]
+                summary.append(f"{title}: {curve.characteristic(side)}, {low:.0f} → {high:.0f} Н·с/м, "
+                               f"колено {knee:.3f} м/с")
+            self.damper_curve_label.setText(f"{curve.name}\n" + "\n".join(summary))
+
+            # Коэффициенты штока приводятся к колесу
+            self.suspension_bump.setText(f"{bump * motion_ratio ** 2:.0f}")
+            self.suspension_rebound.setText(f"{rebound * motion_ratio ** 2:.0f}")
+            if not self.suspension_crit_damping.text() and self.suspension_weight.text() \
+                    and self.suspension_wheel_rate.text():
+                wheel_rate = float(self.suspension_wheel_rate.text().split()[0]) * 1000
+                weight = float(self.suspension_weight.text())
+                self.suspension_crit_damping.setText(f"{2 * np.sqrt(wheel_rate * weight):.0f}")
+
+            # График характеристики и точек стенда
+            self.suspension_figure.clear()
+            ax = self.suspension_figure.add_subplot(111)
+            limit = 1.0 if curve.points is None else max(np.abs(curve.points[:, 0]).max(), 0.1)
+            velocity = np.linspace(-limit, limit, 401)
+            ax.plot(velocity, curve.force(velocity), label="Подобранная характеристика")
+            if curve.points is not None:
+                ax.plot(curve.points[:, 0], curve.points[:, 1], 'o', label="Точки стенда")
+            ax.set_xlabel("Скорость штока, м/с (+ сжатие)")
+            ax.set_ylabel("Сила, Н")
+            ax.legend(fontsize=7)
+            ax.grid(True)
+            self.suspension_figure.tight_layout()
+            self.suspension_canvas.draw()
+
+            if self.suspension_crit_damping.text():
+                self.calculate_damping()
+
+            # Сохраняем для отчета
+            if 'suspension' not in self.report_data:
+                self.report_data['suspension'] = {}
+            self.report_data['suspension']['damper_curve'] = {
+                'name': curve.name,
+                'bump_characteristic': curve.characteristic('bump'),
+                'rebound_characteristic': curve.characteristic('rebound'),
+                'bump_knee': f"{curve.params['bump'][2]:.3f} м/с",
+                'rebound_knee': f"{curve.params['rebound'][2]:.3f} м/с",
+                'equivalent_velocity': f"{self.damper_velocity.value():.2f} м/с",
+                'bump_coef': f"{bump:.0f} Н·с/м",
+                'rebound_coef': f"{rebound:.0f} Н·с/м"
+            }
+            self.update_report_tab()
+
+        except ValueError:
+            QMessageBox.warning(self, "Ошибка", "Проверьте коэффициент рычага и массу")
+
     def calculate_kinematics(self):
         try:
             arm_length = float(self.suspension_arm_length.text())
             pivot_height = float(self.suspension_pivot_height.text())
 
-            instant_center_height = pivot_height + arm_length * 0.5  # Упрощенный расчет
-            self.suspension_instant_center.setText(f"{instant_center_height:.1f} мм от земли")
+            instant_center_height = float(kinematics_model(arm_length, pivot_height)['instant_center_height'])  # Упрощенный расчет
+            self.suspension_instant_center.setText(f"{instant_center_height:.1f} мм от земли")
+
+            # Сохранение в отчет
+            if 'suspension' not in self.report_data:
+                self.report_data['suspension'] = {}
+
+            self.report_data['suspension'].update({
+                'arm_length': f"{arm_length:.1f} мм",
+                'pivot_height': f"{pivot_height:.1f} мм",
+                'instant_center_height': f"{instant_center_height:.1f} мм"
+            })
+
+            # Сохранение в базу данных
+            calc_id = self.db.save_calculation(
+                'suspension_kinematics',
+                {
+                    'arm_length': arm_length,
+                    'pivot_height': pivot_height
+                },
+                {
+                    'instant_center_height': instant_center_height
+                }
+            )
+
+            self.update_report_tab()
+            self.statusBar().showMessage(f"Расчет кинематики сохранен (ID: {calc_id})", 3000)
+
+        except ValueError:
+            QMessageBox.warning(self, "Ошибка", "Пожалуйста, введите корректные значения")
+
+    def calculate_ride_simulation(self):
+        """Моделирование подвески на дороге для сетки жесткостей и демпфирования"""
+        try:
+            sprung_mass = float(self.suspension_weight.text())
+            unsprung_mass = float(self.ride_unsprung_mass.text())
+            tire_rate = float(self.ride_tire_rate.text()) * 1000  # Н/м
+            speed = float(self.ride_speed.text())
+            wheelbase = float(self.ride_wheelbase.text()) / 1000
+            duration = self.ride_duration.value()
+            wheel_rates = [float(v) for v in self.ride_wheel_rates.text().replace(';', ',').split(',') if v.strip()]
+            damping_ratios = [float(v) for v in self.ride_damping_ratios.text().replace(';', ',').split(',') if v.strip()]
+
+            if sprung_mass <= 0 or unsprung_mass <= 0 or tire_rate <= 0 or speed <= 0:
+                raise ValueError("Массы, жесткость шины и скорость должны быть больше нуля")
+            if not wheel_rates or not damping_ratios:
+                raise ValueError("Задайте списки жесткостей колеса и коэффициентов демпфирования")
+
+            model = self.ride_model.currentData()
+            road = self.ride_road.currentData()
+            length = speed / 3.6 * duration + wheelbase + 1.0
+            if road == 'bump':
+                bump_height = float(self.ride_bump_height.text()) / 1000
+                road_x, road_z = bump_road(length, bump_height, position=2.0 + wheelbase)
+                road_title = f"неровность {bump_height * 1000:.0f} мм"
+            else:
+                road_x, road_z = iso8608_road(road, length, seed=0)
+                road_title = f"ISO 8608 класс {road}"
+
+            # Сетка вариантов: жесткость колеса × коэффициент демпфирования
+            rate = np.asarray(wheel_rates)[:, None] * 1000  # Н/м
+            damper = None
+            if self.ride_use_damper_curve.isChecked():
+                # Нелинейный амортизатор по характеристике, приведенной к колесу
+                if self.damper_curve is None:
+                    raise ValueError("Сначала загрузите характеристику амортизатора")
+                motion_ratio = float(self.suspension_motion_ratio.text())
+                curve = self.damper_curve
+
+                def curve_force(wheel_velocity):
+                    return motion_ratio * curve.force(motion_ratio * wheel_velocity)
+
+                damper = curve_force
+                equivalent = np.mean(curve.equivalent_coefficients(self.damper_velocity.value())) * motion_ratio ** 2
+                zeta = equivalent / (2 * np.sqrt(rate * sprung_mass))
+                damping = 0.0
+            else:
+                zeta = np.broadcast_to(np.asarray(damping_ratios)[None, :], (len(wheel_rates), len(damping_ratios)))
+                damping = 2 * zeta * np.sqrt(rate * sprung_mass)
+
+            ride = simulate_ride(road_x, road_z, speed, sprung_mass, unsprung_mass, rate, damping,
+                                 tire_rate, model=model, wheelbase=wheelbase, damper=damper,
+                                 duration=duration)
+
+            lines = [
+                f"=== ДИНАМИКА ПОДВЕСКИ: {self.ride_model.currentText().upper()} ===",
+                f"Дорога: {road_title}, скорость {speed:.0f} км/ч, {duration:.0f} с",
+                "",
+                f"{'k, Н/мм':>8} {'ζ':>5} | {'a СКЗ':>7} {'a пик':>7} | {'ΔFz, %':>7} {'Fz min, %':>9} | "
+                f"{'ход СКЗ':>8} {'ход, мм':>15}"
+            ]
+            for i, k in enumerate(wheel_rates):
+                for j in range(zeta.shape[1]):
+                    lines.append(
+                        f"{k:8.1f} {zeta[i, j]:5.2f} | {ride['body_accel_rms'][i, j]:7.3f} "
+                        f"{ride['body_accel_peak'][i, j]:7.2f} | "
+                        f"{ride['tire_load_variation'][i, j] * 100:7.1f} "
+                        f"{ride['min_tire_load'][i, j] * 100:9.1f} | "
+                        f"{ride['travel_rms'][i, j] * 1000:8.1f} "
+                        f"{ride['travel_min'][i, j] * 1000:+7.1f}/{ride['travel_max'][i, j] * 1000:+7.1f}"
+                    )
+
+            comfort = np.unravel_index(np.argmin(ride['body_accel_rms']), ride['body_accel_rms'].shape)
+            grip = np.unravel_index(np.argmin(ride['tire_load_variation']), ride['tire_load_variation'].shape)
+            comfort_text = f"k = {wheel_rates[comfort[0]]:g} Н/мм, ζ = {zeta[comfort]:.2f}"
+            grip_text = f"k = {wheel_rates[grip[0]]:g} Н/мм, ζ = {zeta[grip]:.2f}"
+            lines += [
+                "",
+                "a - ускорение кузова (м/с²), ΔFz - вариация нагрузки на шину,",
+                "ход: + сжатие, - отбой",
+                f"Лучший комфорт: {comfort_text}",
+                f"Лучшее сцепление: {grip_text}"
+            ]
+            self.ride_result.setText("\n".join(lines))
+
+            # Графики: комфорт и сцепление в зависимости от демпфирования
+            self.suspension_figure.clear()
+            ax_comfort = self.suspension_figure.add_subplot(121)
+            ax_grip = self.suspension_figure.add_subplot(122)
+            for i, k in enumerate(wheel_rates):
+                ax_comfort.plot(zeta[i], ride['body_accel_rms'][i], marker='o', label=f"{k:g} Н/мм")
+                ax_grip.plot(zeta[i], ride['tire_load_variation'][i] * 100, marker='o')
+            ax_comfort.set_xlabel("Коэффициент демпфирования")
+            ax_comfort.set_ylabel("СКЗ ускорения кузова, м/с²")
+            ax_comfort.legend(fontsize=7)
+            ax_comfort.grid(True)
+            ax_grip.set_xlabel("Коэффициент демпфирования")
+            ax_grip.set_ylabel("Вариация нагрузки на шину, %")
+            ax_grip.grid(True)
+            self.suspension_figure.tight_layout()
+            self.suspension_canvas.draw()
+
+            # Сохранение в отчет
+            if 'suspension' not in self.report_data:
+                self.report_data['suspension'] = {}
+            self.report_data['suspension'].update({
+                'ride_simulation': {
+                    'ride_model': self.ride_model.currentText(),
+                    'road_profile': road_title,
+                    'speed': f"{speed:.0f} км/ч",
+                    'best_comfort': comfort_text,
+                    'body_accel_rms': f"{ride['body_accel_rms'][comfort]:.3f} м/с²",
+                    'best_grip': grip_text,
+                    'tire_load_variation': f"{ride['tire_load_variation'][grip] * 100:.1f}%"
+                }
+            })
+
+            # Сохранение в базу данных
+            calc_id = self.db.save_calculation(
+                'ride_simulation',
+                {
+                    'ride_model': model,
+                    'road_profile': road,
+                    'speed': speed,
+                    'weight': sprung_mass,
+                    'unsprung_mass': unsprung_mass,
+                    'tire_rate': tire_rate / 1000,
+                    'wheel_rates': wheel_rates,
+                    'damping_ratios': [[float(v) for v in row] for row in zeta],
+                    'damper_curve': self.damper_curve.name if damper is not None else None
+                },
+                {
+                    'body_accel_rms': [[float(v) for v in row] for row in ride['body_accel_rms']],
+                    'tire_load_variation': [[float(v) for v in row] for row in ride['tire_load_variation']],
+                    'travel_rms': [[float(v) for v in row] for row in ride['travel_rms']]
+                }
+            )
+
+            self.update_report_tab()
+            self.statusBar().showMessage(f"Моделирование подвески сохранено (ID: {calc_id})", 3000)
+
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Пожалуйста, введите корректные значения\n{str(e)}")
+
+    def calculate_frequency_response(self):
+        """АЧХ и ФЧХ подвески от профиля дороги для сетки жесткостей и демпфирования"""
+        try:
+            sprung_mass = float(self.suspension_weight.text())
+            unsprung_mass = float(self.ride_unsprung_mass.text())
+            tire_rate = float(self.ride_tire_rate.text()) * 1000  # Н/м
+            wheel_rates = [float(v) for v in self.ride_wheel_rates.text().replace(';', ',').split(',') if v.strip()]
+            damping_ratios = [float(v) for v in self.ride_damping_ratios.text().replace(';', ',').split(',') if v.strip()]
+
+            if sprung_mass <= 0 or unsprung_mass <= 0 or tire_rate <= 0:
+                raise ValueError("Массы и жесткость шины должны быть больше нуля")
+            if not wheel_rates or not damping_ratios:
+                raise ValueError("Задайте списки жесткостей колеса и коэффициентов демпфирования")
+
+            frequencies = np.geomspace(0.1, 30, self.frf_points.value())
+            rate = np.asarray(wheel_rates)[:, None] * 1000
+            damping = 2 * np.asarray(damping_ratios)[None, :] * np.sqrt(rate * sprung_mass)
+
+            response = cached_transmissibility(frequencies, sprung_mass, unsprung_mass, rate, damping, tire_rate)
+            body = frf_peaks(frequencies, response['body'])
+            wheel = frf_peaks(frequencies, response['wheel'])
+            tire_force = np.abs(response['tire_force']).max(axis=-1)
+
+            lines = [
+                "=== ЧАСТОТНАЯ ХАРАКТЕРИСТИКА ПОДВЕСКИ (0.1-30 Гц) ===",
+                "",
+                f"{'k, Н/мм':>8} {'ζ':>5} | {'кузов, Гц':>9} {'усил.':>6} | {'колесо, Гц':>10} {'усил.':>6} | "
+                f"{'Fz max, 1/м':>11}"
+            ]
+            for i, k in enumerate(wheel_rates):
+                for j, zeta in enumerate(damping_ratios):
+                    lines.append(
+                        f"{k:8.1f} {zeta:5.2f} | {body['body_frequency'][i, j]:9.2f} "
+                        f"{body['body_gain'][i, j]:6.2f} | {wheel['wheel_frequency'][i, j]:10.2f} "
+                        f"{wheel['wheel_gain'][i, j]:6.2f} | {tire_force[i, j]:11.1f}"
+                    )
+            lines += [
+                "",
+                "Усиление - модуль передаточной функции в резонансе,",
+                "Fz max - максимум динамической нагрузки на шину к статической на 1 м профиля"
+            ]
+            self.frf_result.setText("\n".join(lines))
+
+            # Графики АЧХ кузова и колеса, ФЧХ кузова
+            self.suspension_figure.clear()
+            ax_gain = self.suspension_figure.add_subplot(121)
+            ax_phase = self.suspension_figure.add_subplot(122)
+            # Для больших сеток рисуем равномерную выборку из не более 30 вариантов
+            variants = [(i, j) for i in range(len(wheel_rates)) for j in range(len(damping_ratios))]
+            if len(variants) > 30:
+                variants = [variants[n] for n in np.linspace(0, len(variants) - 1, 30).astype(int)]
+            for i, j in variants:
+                line, = ax_gain.loglog(frequencies, np.abs(response['body'][i, j]), linewidth=1,
+                                       label=f"{wheel_rates[i]:g} Н/мм, ζ={damping_ratios[j]:g}")
+                ax_gain.loglog(frequencies, np.abs(response['wheel'][i, j]), linewidth=0.8,
+                               linestyle='--', color=line.get_color())
+                ax_phase.semilogx(frequencies, np.degrees(np.angle(response['body'][i, j])),
+                                  linewidth=1, color=line.get_color())
+            ax_gain.set_xlabel("Частота, Гц")
+            ax_gain.set_ylabel("Передача (кузов —, колесо - -)")
+            ax_gain.grid(True, which='both', alpha=0.3)
+            if len(variants) <= 10:
+                ax_gain.legend(fontsize=6)
+            ax_phase.set_xlabel("Частота, Гц")
+            ax_phase.set_ylabel("Фаза кузова, °")
+            ax_phase.grid(True, which='both', alpha=0.3)
+            self.suspension_figure.tight_layout()
+            self.suspension_canvas.draw()
+
+            # Настройка с наименьшим резонансом кузова
+            best = np.unravel_index(np.argmin(body['body_gain']), body['body_gain'].shape)
+            best_text = f"k = {wheel_rates[best[0]]:g} Н/мм, ζ = {damping_ratios[best[1]]:g}"
+
+            # Сохранение в отчет
+            if 'suspension' not in self.report_data:
+                self.report_data['suspension'] = {}
+            self.report_data['suspension'].update({
+                'frequency_response': {
+                    'variants': len(wheel_rates) * len(damping_ratios),
+                    'best_body_control': best_text,
+                    'body_frequency': f"{body['body_frequency'][best]:.2f} Гц",
+                    'body_gain': f"{body['body_gain'][best]:.2f}",
+                    'wheel_frequency': f"{wheel['wheel_frequency'][best]:.2f} Гц",
+                    'wheel_gain': f"{wheel['wheel_gain'][best]:.2f}"
+                }
+            })
+
+            # Сохранение в базу данных
+            calc_id = self.db.save_calculation(
+                'suspension_frequency_response',
+                {
+                    'weight': sprung_mass,
+                    'unsprung_mass': unsprung_mass,
+                    'tire_rate': tire_rate / 1000,
+                    'wheel_rates': wheel_rates,
+                    'damping_ratios': damping_ratios
+                },
+                {
+                    'body_frequency': [[float(v) for v in row] for row in body['body_frequency']],
+                    'body_gain': [[float(v) for v in row] for row in body['body_gain']],
+                    'wheel_frequency': [[float(v) for v in row] for row in wheel['wheel_frequency']],
+                    'wheel_gain': [[float(v) for v in row] for row in wheel['wheel_gain']]
+                }
+            )
+
+            self.update_report_tab()
+            self.statusBar().showMessage(f"Частотная характеристика сохранена (ID: {calc_id})", 3000)
+
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Пожалуйста, введите корректные значения\n{str(e)}")
+
+    def update_hardpoint_table(self):
+        """Заполняет таблицу точек крепления для выбранной схемы подвески"""
+        geometry = SUSPENSION_GEOMETRIES[self.kin_geometry.currentData()]
+        self.kin_hardpoints.setRowCount(len(geometry['hardpoints']))
+        for row, (key, label, (y, z)) in enumerate(geometry['hardpoints']):
+            name_item = QTableWidgetItem(label)
+            name_item.setFlags(name_item.flags() & ~Qt.ItemIsEditable)
+            name_item.setData(Qt.UserRole, key)
+            self.kin_hardpoints.setItem(row, 0, name_item)
+            self.kin_hardpoints.setItem(row, 1, QTableWidgetItem(f"{y:g}"))
+            self.kin_hardpoints.setItem(row, 2, QTableWidgetItem(f"{z:g}"))
+        self.kin_hardpoints.resizeColumnsToContents()
+
+    def calculate_hardpoint_kinematics(self):
+        """Кинематика по точкам крепления: развал, центр крена и передаточное отношение по ходу"""
+        try:
+            geometry = self.kin_geometry.currentData()
+            hardpoints = {}
+            for row in range(self.kin_hardpoints.rowCount()):
+                key = self.kin_hardpoints.item(row, 0).data(Qt.UserRole)
+                hardpoints[key] = (float(self.kin_hardpoints.item(row, 1).text()),
+                                   float(self.kin_hardpoints.item(row, 2).text()))
+            static_camber = self.kin_static_camber.value()
+            max_travel = self.kin_travel.value()
+            travel = np.linspace(-max_travel, max_travel, self.kin_steps.value())
+
+            kinematics = suspension_kinematics(hardpoints, travel, geometry, static_camber)
+            static = np.argmin(np.abs(travel))
+            camber_gain = float(kinematics['camber_gain'][static])
+            roll_center = float(kinematics['roll_center_height'][static])
+            ic_y = float(kinematics['instant_center_y'][static])
+            ic_z = float(kinematics['instant_center_height'][static])
+            motion_ratio = float(kinematics['motion_ratio'][static])
+
+            self.kin_result.setText(
+                f"Изменение развала: {camber_gain * 25.4:+.3f} °/дюйм ({camber_gain:+.4f} °/мм)\n"
+                f"Развал при ходе ±{max_travel} мм: {kinematics['camber'][-1]:+.2f}° / {kinematics['camber'][0]:+.2f}°\n"
+                f"Высота центра крена: {roll_center:.1f} мм "
+                f"({kinematics['roll_center_height'].min():.1f}...{kinematics['roll_center_height'].max():.1f} мм по ходу)\n"
+                f"Мгновенный центр: Y = {ic_y:.0f} мм, Z = {ic_z:.0f} мм\n"
+                f"Передаточное отношение пружины: {motion_ratio:.3f} "
+                f"({kinematics['motion_ratio'].min():.3f}...{kinematics['motion_ratio'].max():.3f})"
+            )
+            self.suspension_instant_center.setText(f"{ic_z:.1f} мм от земли")
+
+            # Передаточное отношение идет в расчет жесткости колеса
+            self.suspension_motion_ratio.setText(f"{motion_ratio:.3f}")
+            if self.suspension_spring_rate.text():
+                self.calculate_wheel_rate()
+
+            # Кривые по ходу подвески
+            self.suspension_figure.clear()
+            curves = [
+                ('camber', "Развал, °"),
+                ('roll_center_height', "Центр крена, мм"),
+                ('motion_ratio', "Передаточное отношение"),
+                ('track_change', "Изменение колеи, мм")
+            ]
+            for index, (key, title) in enumerate(curves):
+                ax = self.suspension_figure.add_subplot(2, 2, index + 1)
+                ax.plot(travel, kinematics[key])
+                ax.set_xlabel("Ход колеса, мм", fontsize=8)
+                ax.set_ylabel(title, fontsize=8)
+                ax.tick_params(labelsize=7)
+                ax.grid(True)
+            self.suspension_figure.tight_layout()
+            self.suspension_canvas.draw()
+
+            # Сохранение в отчет
+            if 'suspension' not in self.report_data:
+                self.report_data['suspension'] = {}
+            self.report_data['suspension'].update({
+                'hardpoint_kinematics': {
+                    'geometry': SUSPENSION_GEOMETRIES[geometry]['title'],
+                    'camber_gain': f"{camber_gain:+.4f} °/мм",
+                    'roll_center_height': f"{roll_center:.1f} мм",
+                    'instant_center_height': f"{ic_z:.1f} мм",
+                    'motion_ratio': f"{motion_ratio:.3f}"
+                }
+            })
+
+            # Сохранение в базу данных
+            calc_id = self.db.save_calculation(
+                'suspension_hardpoint_kinematics',
+                {
+                    'geometry': geometry,
+                    'hardpoints': hardpoints,
+                    'static_camber': static_camber,
+                    'travel': max_travel
+                },
+                {
+                    'camber_gain': camber_gain,
+                    'roll_center_height': roll_center,
+                    'instant_center_height': ic_z,
+                    'motion_ratio': motion_ratio
+                }
+            )
+
+            self.update_report_tab()
+            self.statusBar().showMessage(f"Кинематика подвески сохранена (ID: {calc_id})", 3000)
+
+        except (ValueError, AttributeError) as e:
+            QMessageBox.warning(self, "Ошибка", f"Проверьте координаты точек крепления\n{str(e)}")
+
+    def calculate_roll_balance(self):
+        """Крен, распределение поперечного переноса нагрузки и подбор стабилизаторов"""
+        try:
+            def values(field):
+                return [float(v) for v in field.text().replace(';', ',').split(',') if v.strip()]
+
+            mass = float(self.roll_mass.text())
+            cg_height = float(self.roll_cg_height.text())
+            front_weight = self.roll_front_weight.value()
+            wheelbase = float(self.roll_wheelbase.text())
+            tire_rate = float(self.ride_tire_rate.text())
+            track = [float(self.roll_track[axle].text()) for axle in (0, 1)]
+            roll_center = [float(self.roll_center[axle].text()) for axle in (0, 1)]
+            lever_arm = [float(self.roll_bar_arm[axle].text()) for axle in (0, 1)]
+            bar_length = [float(self.roll_bar_length[axle].text()) for axle in (0, 1)]
+            bar_ratio = [float(self.roll_bar_ratio[axle].text()) for axle in (0, 1)]
+            wheel_rates = [values(self.roll_wheel_rates[axle]) for axle in (0, 1)]
+            bar_diameters = [values(self.roll_bar_diameters[axle]) for axle in (0, 1)]
+            target = self.roll_target_lltd.value()
+
+            if mass <= 0 or min(track) <= 0 or min(lever_arm) <= 0 or min(bar_length) <= 0:
+                raise ValueError("Масса, колея и размеры стабилизаторов должны быть больше нуля")
+            if not all(wheel_rates) or not all(bar_diameters):
+                raise ValueError("Задайте жесткости колеса и диаметры стабилизаторов для обеих осей")
+
+            # Сетка: стабилизатор перед × стабилизатор зад × пружины перед × пружины зад
+            grid = np.meshgrid(*[np.asarray(v) for v in (bar_diameters[0], bar_diameters[1],
+                                                         wheel_rates[0], wheel_rates[1])], indexing='ij')
+            roll = [
+                axle_roll_stiffness(grid[2 + axle], track[axle],
+                                    antiroll_bar_stiffness(grid[axle], lever_arm[axle], bar_length[axle],
+                                                           bar_ratio[axle], track[axle]),
+                                    tire_rate)
+                for axle in (0, 1)
+            ]
+            lateral_g = np.linspace(0, self.roll_max_g.value(), 25)
+            balance = lateral_load_transfer(mass, cg_height, front_weight, wheelbase, track[0], track[1],
+                                            roll_center[0], roll_center[1], roll[0], roll[1], lateral_g)
+
+            # Ранжирование по отклонению LLTD от цели
+            order = np.argsort(np.abs(balance['lltd'] - target), axis=None)
+            best = np.unravel_index(order[0], balance['lltd'].shape)
+
+            def describe(index):
+                return (f"стаб. {grid[0][index]:g}/{grid[1][index]:g} мм, "
+                        f"пружины {grid[2][index]:g}/{grid[3][index]:g} Н/мм")
+
+            lines = [
+                "=== КРЕН И РАСПРЕДЕЛЕНИЕ ПОПЕРЕЧНОЙ НАГРУЗКИ ===",
+                f"Вариантов: {balance['lltd'].size}, целевая доля передней оси: {target:.1f}%",
+                "",
+                f"{'Стаб. П/З, мм':>14} {'Колесо П/З, Н/мм':>17} | {'Kφ П/З, Н·м/°':>15} | "
+                f"{'LLTD, %':>7} {'крен, °/g':>9}"
+            ]
+            for flat in order[:10]:
+                index = np.unravel_index(flat, balance['lltd'].shape)
+                lines.append(
+                    f"{grid[0][index]:6g} / {grid[1][index]:<5g} {grid[2][index]:8g} / {grid[3][index]:<6g} | "
+                    f"{np.radians(roll[0][index]):6.0f} / {np.radians(roll[1][index]):<6.0f} | "
+                    f"{balance['lltd'][index]:7.1f} {balance['roll_gradient'][index]:9.2f}"
+                )
+            lines += ["", f"Лучший вариант: {describe(best)}"]
+            lifted = balance['front_inner'][best] <= 0
+            if lifted.any():
+                lines.append(f"Отрыв внутреннего переднего колеса при {lateral_g[np.argmax(lifted)]:.2f} g")
+            lifted = balance['rear_inner'][best] <= 0
+            if lifted.any():
+                lines.append(f"Отрыв внутреннего заднего колеса при {lateral_g[np.argmax(lifted)]:.2f} g")
+            self.roll_result.setText("\n".join(lines))
+
+            # Графики: нагрузки на колеса лучшего варианта и LLTD по стабилизаторам
+            self.suspension_figure.clear()
+            ax_loads = self.suspension_figure.add_subplot(121)
+            for key, title in (('front_outer', "Перед, внешнее"), ('front_inner', "Перед, внутреннее"),
+                               ('rear_outer', "Зад, внешнее"), ('rear_inner', "Зад, внутреннее")):
+                ax_loads.plot(lateral_g, balance[key][best] / 9.81, label=title)
+            ax_loads.set_xlabel("Поперечное ускорение, g")
+            ax_loads.set_ylabel("Нагрузка на колесо, кг")
+            ax_loads.legend(fontsize=7)
+            ax_loads.grid(True)
+            ax_lltd = self.suspension_figure.add_subplot(122)
+            for j, rear_bar in enumerate(bar_diameters[1]):
+                ax_lltd.plot(bar_diameters[0], balance['lltd'][:, j, best[2], best[3]],
+                             marker='o', label=f"зад {rear_bar:g} мм")
+            ax_lltd.axhline(target, color='gray', linestyle='--')
+            ax_lltd.set_xlabel("Диаметр переднего стабилизатора, мм")
+            ax_lltd.set_ylabel("LLTD, %")
+            ax_lltd.legend(fontsize=7)
+            ax_lltd.grid(True)
+            self.suspension_figure.tight_layout()
+            self.suspension_canvas.draw()
+
+            # Сохранение в отчет
+            if 'suspension' not in self.report_data:
+                self.report_data['suspension'] = {}
+            self.report_data['suspension'].update({
+                'roll_balance': {
+                    'best_setup': describe(best),
+                    'roll_stiffness_front': f"{np.radians(roll[0][best]):.0f} Н·м/°",
+                    'roll_stiffness_rear': f"{np.radians(roll[1][best]):.0f} Н·м/°",
+                    'lltd': f"{balance['lltd'][best]:.1f}%",
+                    'roll_gradient': f"{balance['roll_gradient'][best]:.2f} °/g"
+                }
+            })
+
+            # Сохранение в базу данных
+            calc_id = self.db.save_calculation(
+                'suspension_roll',
+                {
+                    'weight': mass,
+                    'cg_height': cg_height,
+                    'front_percent': front_weight,
+                    'wheelbase': wheelbase,
+                    'track': track,
+                    'roll_center': roll_center,
+                    'wheel_rates': wheel_rates,
+                    'bar_diameters': bar_diameters,
+                    'target_lltd': target
+                },
+                {
+                    'best_setup': describe(best),
+                    'lltd': float(balance['lltd'][best]),
+                    'roll_gradient': float(balance['roll_gradient'][best])
+                }
+            )
+
+            self.update_report_tab()
+            self.statusBar().showMessage(f"Расчет крена сохранен (ID: {calc_id})", 3000)
+
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Пожалуйста, введите корректные значения\n{str(e)}")
+
+    def calculate_corner_weights(self):
+        """Регулировка опор пружин под целевую диагональ и распределение по осям"""
+        try:
+            scales = [float(field.text()) for field in self.corner_scales]
+            spring_rates = [float(field.text()) for field in self.corner_spring_rates]
+            motion_ratios = [float(field.text()) for field in self.corner_motion_ratios]
+            wheelbase = float(self.corner_wheelbase.text())
+            track_front, track_rear = [float(field.text()) for field in self.corner_tracks]
+            ballast = float(self.corner_ballast.text() or 0)
+            step = float(self.corner_step.text())
+            target_cross = self.corner_target_cross.value()
+            target_front = self.corner_target_front.value()
+
+            if min(scales) <= 0 or min(spring_rates) <= 0 or min(motion_ratios) <= 0:
+                raise ValueError("Показания весов, жесткости и коэффициенты рычага должны быть больше нуля")
+            if wheelbase <= 0 or track_front <= 0 or track_rear <= 0 or step <= 0 or ballast < 0:
+                raise ValueError("Проверьте размеры, шаг регулировки и массу балласта")
+
+            geometry = (scales, spring_rates, motion_ratios, wheelbase, track_front, track_rear)
+            current = weight_distribution(scales)
+            solution = solve_corner_weights(*geometry, target_cross, target_front, ballast)
+            candidates = corner_weight_candidates(*geometry, target_cross, step, self.corner_max_steps.value(),
+                                                  ballast, solution['ballast_offset'],
+                                                  center=solution['perch'])
+            best = {key: value[0] for key, value in candidates.items()}
+
+            def perch_text(perch):
+                return ", ".join(f"{corner} {value:+.2f}" for corner, value in zip(CORNERS, perch))
+
+            lines = [
+                "=== РАЗВЕСКА ПО УГЛАМ ===",
+                f"Текущая развеска: {', '.join(f'{c} {w:.1f}' for c, w in zip(CORNERS, scales))} кг",
+                f"Диагональ {current['cross']:.2f}%, перед {current['front']:.2f}%, лево {current['left']:.2f}%",
+                "",
+                "Точное решение (МНК), смещение опор пружин, мм (+ поднять угол):",
+                f"  {perch_text(solution['perch'])}",
+                f"  Нагрузки: {', '.join(f'{c} {w:.1f}' for c, w in zip(CORNERS, solution['loads']))} кг",
+                f"  Диагональ {solution['cross']:.2f}%, перед {solution['front']:.2f}%"
+            ]
+            if ballast > 0:
+                lines.append(f"  Балласт {ballast:g} кг: {solution['ballast_offset'][0]:+.0f} мм назад, "
+                             f"{solution['ballast_offset'][1]:+.0f} мм влево от центра масс")
+            else:
+                lines.append("  Распределение по осям опорами не меняется - задайте массу балласта")
+
+            lines += ["", f"Лучшие варианты с шагом {step:g} мм "
+                          f"(из {len(candidates['score'])}):",
+                      "  " + " ".join(f"{c:>7}" for c in CORNERS) + " | диагональ  Δh СКЗ, мм"]
+            for i in range(min(10, len(candidates['score']))):
+                lines.append("  " + " ".join(f"{v:+7.2f}" for v in candidates['perch'][i]) +
+                             f" | {candidates['cross'][i]:8.2f}%  "
+                             f"{np.sqrt((candidates['rise'][i] ** 2).mean()):6.2f}")
+            self.corner_result.setText("\n".join(lines))
+
+            # График нагрузок по углам
+            self.suspension_figure.clear()
+            ax = self.suspension_figure.add_subplot(111)
+            positions = np.arange(4)
+            ax.bar(positions - 0.25, scales, width=0.25, label="Весы")
+            ax.bar(positions, solution['loads'], width=0.25, label="МНК")
+            ax.bar(positions + 0.25, best['loads'], width=0.25, label=f"Шаг {step:g} мм")
+            ax.set_xticks(positions)
+            ax.set_xticklabels(CORNERS)
+            ax.set_ylabel("Нагрузка на колесо, кг")
+            ax.legend(fontsize=7)
+            ax.grid(True, axis='y')
+            self.suspension_figure.tight_layout()
+            self.suspension_canvas.draw()
+
+            # Сохранение в отчет
+            if 'suspension' not in self.report_data:
+                self.report_data['suspension'] = {}
+            self.report_data['suspension']['corner_weights'] = {
+                'scales': ", ".join(f"{c} {w:.1f}" for c, w in zip(CORNERS, scales)) + " кг",
+                'cross_weight': f"{current['cross']:.2f}% → {best['cross']:.2f}%",
+                'front_axle_share': f"{current['front']:.2f}% → {best['front']:.2f}%",
+                'perch_adjustment': perch_text(best['perch']) + " мм"
+            }
+
+            # Сохранение в базу данных
+            calc_id = self.db.save_calculation(
+                'corner_weight',
+                {
+                    'scales': scales,
+                    'spring_rates': spring_rates,
+                    'motion_ratios': motion_ratios,
+                    'wheelbase': wheelbase,
+                    'track': [track_front, track_rear],
+                    'target_cross': target_cross,
+                    'target_front': target_front,
+                    'ballast': ballast,
+                    'step': step
+                },
+                {
+                    'perch': [float(v) for v in solution['perch']],
+                    'ballast_offset': [float(v) for v in solution['ballast_offset']],
+                    'best_perch': [float(v) for v in best['perch']],
+                    'loads': [float(v) for v in best['loads']],
+                    'cross_weight': float(best['cross']),
+                    'front_percent': float(best['front'])
+                }
+            )
+
+            self.update_report_tab()
+            self.statusBar().showMessage(f"Расчет развески сохранен (ID: {calc_id})", 3000)
+
+        except (ValueError, np.linalg.LinAlgError) as e:
+            QMessageBox.warning(self, "Ошибка", f"Пожалуйста, введите корректные значения\n{str(e)}")
+
+    def update_catalog_size(self):
+        """Обновляет надпись с размером каталога"""
+        springs, dampers = self.db.catalog_size()
+        self.catalog_size_label.setText(f"В каталоге: пружин {springs}, амортизаторов {dampers}")
+        injectors, pumps = self.db.fuel_catalog_size()
+        self.fuel_catalog_size_label.setText(f"В каталоге: форсунок {injectors}, насосов {pumps}")
+        pistons, gaskets, heads = self.db.engine_parts_size()
+        self.engine_parts_size_label.setText(f"В каталоге: поршней {pistons}, прокладок {gaskets}, головок {heads}")
+
+    def import_catalog(self, kind):
+        """Импорт пружин или амортизаторов из CSV
+
+        Пружины: part_number, manufacturer, rate (Н/мм), free_length (мм),
+        inner_diameter (мм). Амортизаторы - по строке на точку
+        характеристики: part_number, manufacturer, velocity (м/с, отбой
+        отрицательный), force (Н).
+        """
+        file_name, _ = QFileDialog.getOpenFileName(self, "Импорт каталога", "", "CSV Files (*.csv)")
+        if not file_name:
+            return
+        try:
+            rows = read_catalog_csv(file_name)
+            if kind == 'springs':
+                added = self.db.add_springs([
+                    (row['part_number'], row.get('manufacturer', ''), float(row['rate']),
+                     float(row['free_length']) if row.get('free_length') else None,
+                     float(row['inner_diameter']) if row.get('inner_diameter') else None)
+                    for row in rows
+                ])
+            else:
+                curves = {}
+                for row in rows:
+                    key = (row['part_number'], row.get('manufacturer', ''))
+                    curves.setdefault(key, []).append((float(row['velocity']), float(row['force'])))
+                added = self.db.add_dampers([(part, maker, points) for (part, maker), points in curves.items()])
+
+            self.update_catalog_size()
+            self.statusBar().showMessage(f"Импортировано записей: {added}", 3000)
+
+        except (KeyError, ValueError, OSError) as e:
+            QMessageBox.warning(self, "Ошибка", f"Некорректный формат файла каталога\n{str(e)}")
+
+    def create_demo_catalog(self):
+        """Заполняет каталог синтетическими данными для проверки подбора"""
+        springs, dampers = demo_catalog()
+        self.db.add_springs(springs)
+        self.db.add_dampers(dampers)
+        self.update_catalog_size()
+
+    def match_catalog_parts(self):
+        """Подбор пружин и амортизаторов из каталога под целевую частоту и демпфирование"""
+        try:
+            weight = float(self.suspension_weight.text())
+            motion_ratio = float(self.suspension_motion_ratio.text())
+            target_frequency = self.catalog_target_frequency.value()
+            target_ratio = self.catalog_target_damping.value()
+            min_length = float(self.catalog_min_length.text()) if self.catalog_min_length.text() else None
+            max_length = float(self.catalog_max_length.text()) if self.catalog_max_length.text() else None
+            if weight <= 0 or motion_ratio <= 0:
+                raise ValueError("Масса и коэффициент рычага должны быть больше нуля")
+
+            # Обращение расчета частоты: жесткость колеса, затем пружины (wheel = spring · MR²)
+            wheel_rate = float(required_wheel_rate(target_frequency, weight))
+            spring_rate = wheel_rate / motion_ratio ** 2
+            springs = self.db.nearest_springs(spring_rate, 5, min_length, max_length)
+
+            # Критическое демпфирование - из поля вкладки или 2·√(k·m) для найденной жесткости
+            if self.suspension_crit_damping.text():
+                crit_damping = float(self.suspension_crit_damping.text())
+            else:
+                crit_damping = 2 * np.sqrt(wheel_rate * 1000 * weight)
+            target = required_damping(target_ratio, crit_damping, self.catalog_rebound_share.value() / 100)
+            # Коэффициенты на колесе пересчитываются к штоку амортизатора
+            dampers = self.db.nearest_dampers(target['bump'] / motion_ratio ** 2,
+                                              target['rebound'] / motion_ratio ** 2, 5)
+
+            lines = [
+                "=== ПОДБОР ПО КАТАЛОГУ ===",
+                f"Требуемая жесткость колеса: {wheel_rate:.1f} Н/мм, пружины: {spring_rate:.1f} Н/мм",
+                f"Требуемые коэффициенты на колесе: отбой {target['rebound']:.0f}, сжатие {target['bump']:.0f}",
+                "",
+                "Пружины:"
+            ]
+            for _, part, maker, rate, length, diameter in springs:
+                frequency = float(suspension_frequency_model(weight, 0, rate * motion_ratio ** 2)['frequency'])
+                lines.append(f"  {part:<14} {maker or '':<10} {rate:7.1f} Н/мм  L0 = {length or 0:.0f} мм  "
+                             f"-> {frequency:.2f} Гц")
+            lines.append("\nАмортизаторы:")
+            for _, part, maker, bump, rebound, _ in dampers:
+                ratio = float(damping_model(rebound * motion_ratio ** 2, bump * motion_ratio ** 2,
+                                            crit_damping)['damping_ratio'])
+                lines.append(f"  {part:<14} {maker or '':<10} сжатие {bump:6.0f}  отбой {rebound:6.0f} Н·с/м  "
+                             f"-> ζ = {ratio:.2f}")
+            if not springs and not dampers:
+                lines.append("\nКаталог пуст - импортируйте CSV или создайте демонстрационный каталог")
+            self.catalog_result.setText("\n".join(lines))
+
+            # Лучшие детали сразу подставляются в поля расчета жесткости и демпфирования
+            if springs:
+                self.suspension_spring_rate.setText(f"{springs[0][3]:g}")
+            if dampers:
+                self.suspension_bump.setText(f"{dampers[0][3] * motion_ratio ** 2:.0f}")
+                self.suspension_rebound.setText(f"{dampers[0][4] * motion_ratio ** 2:.0f}")
+                self.suspension_crit_damping.setText(f"{crit_damping:.0f}")
 
             # Сохранение в отчет
             if 'suspension' not in self.report_data:
                 self.report_data['suspension'] = {}
-
             self.report_data['suspension'].update({
-                'arm_length': f"{arm_length:.1f} мм",
-                'pivot_height': f"{pivot_height:.1f} мм",
-                'instant_center_height': f"{instant_center_height:.1f} мм"
+                'catalog_match': {
+                    'frequency': f"{target_frequency:.2f} Гц",
+                    'damping_ratio': f"{target_ratio:.2f}",
+                    'spring_rate': f"{spring_rate:.1f} Н/мм",
+                    'spring_part': springs[0][1] if springs else "-",
+                    'damper_part': dampers[0][1] if dampers else "-"
+                }
             })
 
             # Сохранение в базу данных
             calc_id = self.db.save_calculation(
-                'suspension_kinematics',
+                'suspension_catalog_match',
                 {
-                    'arm_length': arm_length,
-                    'pivot_height': pivot_height
+                    'weight': weight,
+                    'motion_ratio': motion_ratio,
+                    'frequency': target_frequency,
+                    'damping_ratio': target_ratio
                 },
                 {
-                    'instant_center_height': instant_center_height
+                    'spring_rate': spring_rate,
+                    'springs': [row[1] for row in springs],
+                    'dampers': [row[1] for row in dampers]
                 }
             )
 
             self.update_report_tab()
-            self.statusBar().showMessage(f"Расчет кинематики сохранен (ID: {calc_id})", 3000)
+            self.statusBar().showMessage(f"Подбор по каталогу сохранен (ID: {calc_id})", 3000)
 
-        except ValueError:
-            QMessageBox.warning(self, "Ошибка", "Пожалуйста, введите корректные значения")
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Пожалуйста, введите корректные значения\n{str(e)}")
 
     def save_all_suspension_calculations(self):
         """Сохраняет все расчеты подвески как единый комплексный расчет"""
@@ -2696,6 +10437,15 @@ class AdvancedVehicleCalculator(QMainWindow):
         injector_layout.addRow("Удельный расход топлива:", self.fuel_bsfc)
         injector_layout.addRow(calculate_injector_btn)
         injector_layout.addRow("Максимальный цикл впрыска:", self.fuel_injector_duty)
+
+        flex_fuel_btn = QPushButton("Расчет для смесей бензин/этанол E0-E100")
+        flex_fuel_btn.clicked.connect(self.calculate_flex_fuel_sweep)
+        self.flex_fuel_result = QTextEdit()
+        self.flex_fuel_result.setReadOnly(True)
+        self.flex_fuel_result.setStyleSheet("font-family: monospace;")
+        self.flex_fuel_result.setMaximumHeight(200)
+        injector_layout.addRow(flex_fuel_btn)
+        injector_layout.addRow(self.flex_fuel_result)
         injector_group.setLayout(injector_layout)
 
         # Новая группа "Оптимизация топливной системы"
@@ -2720,13 +10470,318 @@ class AdvancedVehicleCalculator(QMainWindow):
 
         optimize_group.setLayout(optimize_layout)
 
+        # Группа "Подбор по каталогу" - форсунки, насос и давление
+        fuel_catalog_group = QGroupBox("Подбор форсунок и насоса по каталогу")
+        fuel_catalog_layout = QGridLayout()
+
+        self.fuel_catalog_pressure_range = (QLineEdit("2.5"), QLineEdit("6.0"))
+        self.fuel_catalog_pressure_step = QLineEdit("0.5")
+        self.fuel_catalog_min_duty = QDoubleSpinBox()
+        self.fuel_catalog_min_duty.setRange(5, 95)
+        self.fuel_catalog_min_duty.setValue(40)
+        self.fuel_catalog_min_duty.setSuffix("%")
+        self.fuel_catalog_pump_margin = QDoubleSpinBox()
+        self.fuel_catalog_pump_margin.setRange(0, 200)
+        self.fuel_catalog_pump_margin.setValue(20)
+        self.fuel_catalog_pump_margin.setSuffix("%")
+
+        fuel_catalog_fields = [
+            ("Давление от / до, бар:", self.fuel_catalog_pressure_range),
+            ("Шаг давления:", self.fuel_catalog_pressure_step),
+            ("Минимальный цикл:", self.fuel_catalog_min_duty),
+            ("Запас подачи насоса:", self.fuel_catalog_pump_margin)
+        ]
+        for index, (title, widget) in enumerate(fuel_catalog_fields):
+            row, column = index // 2, (index % 2) * 3
+            fuel_catalog_layout.addWidget(QLabel(title), row, column)
+            if isinstance(widget, tuple):
+                fuel_catalog_layout.addWidget(widget[0], row, column + 1)
+                fuel_catalog_layout.addWidget(widget[1], row, column + 2)
+            else:
+                fuel_catalog_layout.addWidget(widget, row, column + 1, 1, 2)
+
+        fuel_catalog_buttons = QHBoxLayout()
+        import_injectors_btn = QPushButton("Импорт форсунок (CSV)")
+        import_injectors_btn.clicked.connect(lambda: self.import_fuel_catalog('injectors'))
+        import_pumps_btn = QPushButton("Импорт насосов (CSV)")
+        import_pumps_btn.clicked.connect(lambda: self.import_fuel_catalog('pumps'))
+        demo_fuel_catalog_btn = QPushButton("Демонстрационный каталог")
+        demo_fuel_catalog_btn.clicked.connect(self.create_demo_fuel_catalog)
+        fuel_catalog_buttons.addWidget(import_injectors_btn)
+        fuel_catalog_buttons.addWidget(import_pumps_btn)
+        fuel_catalog_buttons.addWidget(demo_fuel_catalog_btn)
+
+        match_fuel_btn = QPushButton("Подобрать форсунки и насос")
+        match_fuel_btn.clicked.connect(self.match_fuel_parts)
+
+        self.fuel_catalog_size_label = QLabel("")
+        self.fuel_catalog_result = QTextEdit()
+        self.fuel_catalog_result.setReadOnly(True)
+        self.fuel_catalog_result.setStyleSheet("font-family: monospace;")
+        self.fuel_catalog_result.setMinimumHeight(200)
+
+        row = (len(fuel_catalog_fields) + 1) // 2
+        fuel_catalog_layout.addLayout(fuel_catalog_buttons, row, 0, 1, 6)
+        fuel_catalog_layout.addWidget(self.fuel_catalog_size_label, row + 1, 0, 1, 6)
+        fuel_catalog_layout.addWidget(match_fuel_btn, row + 2, 0, 1, 6)
+        fuel_catalog_layout.addWidget(self.fuel_catalog_result, row + 3, 0, 1, 6)
+        fuel_catalog_group.setLayout(fuel_catalog_layout)
+
+        # Группа "Карта цикла впрыска" - обороты × нагрузка
+        injector_map_group = QGroupBox("Карта времени и цикла впрыска")
+        injector_map_layout = QGridLayout()
+
+        self.injector_map_data = None
+        self.injector_map_rpm_range = (QLineEdit("1000"), QLineEdit("7000"))
+        self.injector_map_rpm_step = QLineEdit("500")
+        self.injector_map_loads = QLineEdit("10, 20, 30, 40, 50, 60, 70, 80, 90, 100")
+        self.injector_map_loads.setPlaceholderText("% от максимального момента")
+        self.injector_map_voltage = QDoubleSpinBox()
+        self.injector_map_voltage.setRange(6.0, 18.0)
+        self.injector_map_voltage.setSingleStep(0.5)
+        self.injector_map_voltage.setValue(13.5)
+        self.injector_map_voltage.setSuffix(" В")
+        self.injector_map_dead_time = QLineEdit(INJECTOR_DEAD_TIME)
+        self.injector_map_dead_time.setPlaceholderText("В:мс, ...")
+        self.injector_map_threshold = QDoubleSpinBox()
+        self.injector_map_threshold.setRange(10, 100)
+        self.injector_map_threshold.setValue(85)
+        self.injector_map_threshold.setSuffix("%")
+
+        injector_map_fields = [
+            ("Обороты от / до:", self.injector_map_rpm_range),
+            ("Шаг оборотов:", self.injector_map_rpm_step),
+            ("Нагрузка, %:", self.injector_map_loads),
+            ("Напряжение сети:", self.injector_map_voltage),
+            ("Мертвое время (В:мс):", self.injector_map_dead_time),
+            ("Допустимый цикл:", self.injector_map_threshold)
+        ]
+        for index, (title, widget) in enumerate(injector_map_fields):
+            row, column = index // 2, (index % 2) * 3
+            injector_map_layout.addWidget(QLabel(title), row, column)
+            if isinstance(widget, tuple):
+                injector_map_layout.addWidget(widget[0], row, column + 1)
+                injector_map_layout.addWidget(widget[1], row, column + 2)
+            else:
+                injector_map_layout.addWidget(widget, row, column + 1, 1, 2)
+
+        calculate_injector_map_btn = QPushButton("Рассчитать карту впрыска")
+        calculate_injector_map_btn.clicked.connect(self.calculate_injector_map)
+        export_injector_map_btn = QPushButton("Экспорт калибровки (CSV)")
+        export_injector_map_btn.clicked.connect(self.export_injector_map)
+        row = (len(injector_map_fields) + 1) // 2
+        injector_map_layout.addWidget(calculate_injector_map_btn, row, 0, 1, 3)
+        injector_map_layout.addWidget(export_injector_map_btn, row, 3, 1, 3)
+
+        self.injector_map_result = QLabel("")
+        self.injector_map_result.setStyleSheet("font-weight: bold; color: #0066CC;")
+        self.injector_map_table = QTableWidget()
+        self.injector_map_table.setMinimumHeight(250)
+        injector_map_layout.addWidget(self.injector_map_result, row + 1, 0, 1, 6)
+        injector_map_layout.addWidget(self.injector_map_table, row + 2, 0, 1, 6)
+        injector_map_group.setLayout(injector_map_layout)
+
+        # Группа "Расход в ездовом цикле" - масса, аэродинамика и трансмиссия с других вкладок
+        cycle_group = QGroupBox("Расход топлива в ездовом цикле")
+        cycle_layout = QFormLayout()
+
+        self.cycle_data = None
+        self.cycle_name = QComboBox()
+        for key, title in DRIVE_CYCLES.items():
+            self.cycle_name.addItem(title, key)
+        load_cycle_btn = QPushButton("Загрузить цикл (CSV: time, speed)")
+        load_cycle_btn.clicked.connect(self.load_drive_cycle)
+        cycle_row = QHBoxLayout()
+        cycle_row.addWidget(self.cycle_name)
+        cycle_row.addWidget(load_cycle_btn)
+
+        self.cycle_bsfc_min = QLineEdit("245")
+        self.cycle_bsfc_min.setPlaceholderText("г/(кВт·ч)")
+        self.cycle_fuel_density = QDoubleSpinBox()
+        self.cycle_fuel_density.setRange(0.5, 1.0)
+        self.cycle_fuel_density.setDecimals(3)
+        self.cycle_fuel_density.setSingleStep(0.005)
+        self.cycle_fuel_density.setValue(0.745)
+        self.cycle_fuel_density.setSuffix(" кг/л")
+        self.cycle_idle_fuel = QLineEdit("0.25")
+        self.cycle_idle_fuel.setPlaceholderText("г/с")
+        self.cycle_upshift_rpm = QLineEdit("1500")
+        self.cycle_upshift_rpm.setPlaceholderText("об/мин")
+        self.cycle_masses = QLineEdit()
+        self.cycle_masses.setPlaceholderText("кг через запятую (пусто - масса с вкладки «Динамика»)")
+        self.cycle_final_drives = QLineEdit()
+        self.cycle_final_drives.setPlaceholderText("через запятую (пусто - с вкладки «Трансмиссия»)")
+
+        calculate_cycle_btn = QPushButton("Рассчитать расход в цикле")
+        calculate_cycle_btn.clicked.connect(self.calculate_drive_cycle)
+
+        self.cycle_result = QTextEdit()
+        self.cycle_result.setReadOnly(True)
+        self.cycle_result.setStyleSheet("font-family: monospace;")
+        self.cycle_result.setMinimumHeight(180)
+
+        cycle_layout.addRow("Цикл:", cycle_row)
+        cycle_layout.addRow("Минимальный удельный расход:", self.cycle_bsfc_min)
+        cycle_layout.addRow("Плотность топлива:", self.cycle_fuel_density)
+        cycle_layout.addRow("Расход на холостом ходу:", self.cycle_idle_fuel)
+        cycle_layout.addRow("Обороты переключения вверх:", self.cycle_upshift_rpm)
+        cycle_layout.addRow("Варианты массы:", self.cycle_masses)
+        cycle_layout.addRow("Варианты главной передачи:", self.cycle_final_drives)
+        cycle_layout.addRow(calculate_cycle_btn)
+        cycle_layout.addRow(self.cycle_result)
+        cycle_group.setLayout(cycle_layout)
+
+        self.fuel_figure = Figure(figsize=(6, 4))
+        self.fuel_canvas = FigureCanvas(self.fuel_figure)
+        self.fuel_canvas.setMinimumHeight(350)
+
         layout.addWidget(flow_group)
         layout.addWidget(injector_group)
         layout.addWidget(optimize_group)
+        layout.addWidget(fuel_catalog_group)
+        layout.addWidget(injector_map_group)
+        layout.addWidget(cycle_group)
+        layout.addWidget(self.fuel_canvas)
         layout.addStretch()
 
         tab.setLayout(layout)
-        self.tabs.addTab(tab, "Топливная система")
+
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setWidget(tab)
+        self.tabs.addTab(scroll, "Топливная система")
+
+    def load_drive_cycle(self):
+        """Загрузка ездового цикла из CSV"""
+        file_name, _ = QFileDialog.getOpenFileName(self, "Ездовой цикл", "", "CSV Files (*.csv)")
+        if not file_name:
+            return
+        try:
+            name = os.path.basename(file_name)
+            self.cycle_data = (name, *load_cycle_csv(file_name))
+            if self.cycle_name.findData('csv') < 0:
+                self.cycle_name.addItem(name, 'csv')
+            index = self.cycle_name.findData('csv')
+            self.cycle_name.setItemText(index, name)
+            self.cycle_name.setCurrentIndex(index)
+        except (KeyError, ValueError, IndexError, OSError) as e:
+            QMessageBox.warning(self, "Ошибка", f"Не удалось загрузить цикл\n{str(e)}")
+
+    def calculate_drive_cycle(self):
+        """Расход топлива в цикле для сетки вариантов массы и главной передачи"""
+        try:
+            def values(field):
+                return [float(v) for v in field.text().replace(';', ',').split(',') if v.strip()]
+
+            vehicle = self.lap_vehicle()
+            cycle_key = self.cycle_name.currentData()
+            if cycle_key == 'csv':
+                cycle_title, cycle_time, cycle_speed = self.cycle_data
+            else:
+                cycle_title = self.cycle_name.currentText()
+                cycle_time, cycle_speed = drive_cycle(cycle_key)
+
+            bsfc_min = float(self.cycle_bsfc_min.text())
+            idle_fuel = float(self.cycle_idle_fuel.text())
+            upshift_rpm = float(self.cycle_upshift_rpm.text())
+            masses = values(self.cycle_masses) or [vehicle['mass']]
+            final_drives = values(self.cycle_final_drives) or [vehicle['final_drive']]
+            if bsfc_min <= 0 or idle_fuel < 0 or min(masses) <= 0 or min(final_drives) <= 0:
+                raise ValueError("Удельный расход, массы и передаточные числа должны быть больше нуля")
+
+            # Удельный расход - по карте с вкладки «Двигатель», если она задана
+            if self.engine_map is not None:
+                bsfc = self.engine_map
+            else:
+                def bsfc(rpm, torque):
+                    return default_bsfc(rpm, torque, vehicle['torque_rpm'], vehicle['torque_nm'], bsfc_min)
+
+            mass_grid, drive_grid = [a.ravel() for a in np.meshgrid(masses, final_drives, indexing='ij')]
+            start = time.perf_counter()
+            result = simulate_drive_cycle(
+                cycle_time, cycle_speed, mass_grid, vehicle['gear_ratios'], drive_grid,
+                vehicle['tire_radius'], vehicle['torque_rpm'], vehicle['torque_nm'],
+                drag_area=vehicle['drag_area'], rolling_resist=vehicle['rolling_resist'], bsfc=bsfc,
+                upshift_rpm=upshift_rpm, redline=vehicle['redline'], idle_fuel=idle_fuel,
+                fuel_density=self.cycle_fuel_density.value())
+            elapsed = time.perf_counter() - start
+
+            best = int(np.argmin(result['consumption']))
+            lines = [
+                f"=== РАСХОД ТОПЛИВА: {cycle_title} ===",
+                "Удельный расход: " + (f"карта «{self.engine_map.name}»" if self.engine_map is not None
+                                       else f"по внешней характеристике, минимум {bsfc_min:.0f} г/(кВт·ч)"),
+                f"Длительность {cycle_time[-1]:.0f} с, путь {result['distance'][0]:.2f} км, "
+                f"средняя скорость {result['distance'][0] / cycle_time[-1] * 3600:.1f} км/ч",
+                f"Вариантов: {len(mass_grid)}, расчет {elapsed * 1000:.0f} мс "
+                f"({len(mass_grid) / max(elapsed, 1e-9):.0f} вариантов/с)",
+                "",
+                f"{'Масса, кг':>10} {'Гл. пер.':>9} {'Топливо, г':>11} {'л/100 км':>9}"
+            ]
+            for i in np.argsort(result['consumption'])[:15]:
+                lines.append(f"{mass_grid[i]:10.0f} {drive_grid[i]:9.2f} {result['fuel'][i]:11.0f} "
+                             f"{result['consumption'][i]:9.2f}")
+            lines += ["", f"Лучший вариант: масса {mass_grid[best]:.0f} кг, главная передача "
+                          f"{drive_grid[best]:.2f} - {result['consumption'][best]:.2f} л/100 км"]
+            self.cycle_result.setText("\n".join(lines))
+
+            # Скорость, передача и расход по времени для лучшего варианта
+            self.fuel_figure.clear()
+            ax_speed = self.fuel_figure.add_subplot(311)
+            ax_speed.plot(cycle_time, cycle_speed)
+            ax_speed.set_ylabel("км/ч")
+            ax_speed.grid(True)
+            ax_gear = self.fuel_figure.add_subplot(312, sharex=ax_speed)
+            ax_gear.step(cycle_time, result['gear'][best], where='post')
+            ax_gear.set_ylabel("Передача")
+            ax_gear.grid(True)
+            ax_fuel = self.fuel_figure.add_subplot(313, sharex=ax_speed)
+            ax_fuel.plot(cycle_time, result['fuel_rate'][best])
+            ax_fuel.set_ylabel("Расход, г/с")
+            ax_fuel.set_xlabel("Время, с")
+            ax_fuel.grid(True)
+            self.fuel_figure.tight_layout()
+            self.fuel_canvas.draw()
+
+            # Сохраняем для отчета
+            if 'fuel_system' not in self.report_data:
+                self.report_data['fuel_system'] = {}
+            self.report_data['fuel_system']['drive_cycle'] = {
+                'cycle': cycle_title,
+                'distance': f"{result['distance'][best]:.2f} км",
+                'fuel_mass': f"{result['fuel'][best]:.0f} г",
+                'consumption': f"{result['consumption'][best]:.2f} л/100 км",
+                'best_setup': f"масса {mass_grid[best]:.0f} кг, главная передача {drive_grid[best]:.2f}"
+            }
+
+            # Сохраняем в базу данных
+            calc_id = self.db.save_calculation(
+                'drive_cycle_fuel',
+                {
+                    'cycle': cycle_title,
+                    'masses': masses,
+                    'final_drives': final_drives,
+                    'gear_ratios': vehicle['gear_ratios'],
+                    'tire_radius': vehicle['tire_radius'],
+                    'bsfc_min': bsfc_min,
+                    'bsfc_map': self.engine_map.name if self.engine_map is not None else None,
+                    'idle_fuel': idle_fuel,
+                    'upshift_rpm': upshift_rpm,
+                    'fuel_density': self.cycle_fuel_density.value()
+                },
+                {
+                    'consumption': [float(v) for v in result['consumption']],
+                    'fuel': [float(v) for v in result['fuel']],
+                    'distance': float(result['distance'][best]),
+                    'best_consumption': float(result['consumption'][best])
+                }
+            )
+
+            self.update_report_tab()
+            self.statusBar().showMessage(f"Расчет расхода в цикле сохранен (ID: {calc_id})", 3000)
+
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Пожалуйста, введите корректные значения\n{str(e)}")
 
     def calculate_fuel_system_flow(self):
         try:
@@ -2736,13 +10791,12 @@ class AdvancedVehicleCalculator(QMainWindow):
             temp = float(self.fuel_temp.text())
             system_type = self.fuel_system_type.currentText()
 
-            # Коррекция на температуру (примерная формула)
-            temp_correction = 1 + (temp - 20) * 0.001
-            # Коррекция на тип системы
+            # Коррекция на тип системы (коррекция на температуру - в модели)
             system_factor = 1.0 if system_type == "Инжектор" else 0.9 if system_type == "Прямой впрыск" else 0.7
 
-            corrected_flow = flow * math.sqrt(pressure / 3.0) * temp_correction * system_factor
-            total_flow = corrected_flow * count
+            system_flow = fuel_system_flow_model(count, flow, pressure, temp, system_factor)
+            corrected_flow = float(system_flow['corrected_flow'])
+            total_flow = float(system_flow['total_flow'])
 
             result_text = f"{total_flow:.1f} г/мин или {total_flow / 60:.2f} г/сек"
             self.fuel_system_flow.setText(result_text)
@@ -2793,15 +10847,16 @@ class AdvancedVehicleCalculator(QMainWindow):
 
             total_flow = float(total_flow_text.split()[0]) / 60  # г/мин в г/сек
 
-            required_flow = (power * bsfc) / 3600 * 1000
-            duty_cycle = (required_flow / total_flow) * 100
-
-            # Расчет времени открытия форсунки на оборотах
-            cycle_time = 60 / rpm * 1000  # время цикла в мс
-            injector_open_time = cycle_time * duty_cycle / 100
+            # Расчет цикла впрыска и времени открытия форсунки на оборотах;
+            # удельный расход и производительность заданы для бензина
+            fuel_key, ethanol_share, fuel_type, _ = self.selected_fuel()
+            duty = fuel_injector_duty_model(power, bsfc, rpm, total_flow * 60, fuel_key, ethanol_share)
+            required_flow = float(duty['required_volume']) / 3600
+            duty_cycle = float(duty['duty_cycle'])
+            injector_open_time = float(duty['injector_open_time'])
 
             self.fuel_injector_duty.setText(
-                f"{duty_cycle:.1f}% ({injector_open_time:.2f} мс при {rpm} об/мин)"
+                f"{duty_cycle:.1f}% ({injector_open_time:.2f} мс при {rpm} об/мин, {fuel_type})"
             )
             self.fuel_required_volume.setText(f"{required_flow * 3600:.1f} г/час")
 
@@ -2812,6 +10867,7 @@ class AdvancedVehicleCalculator(QMainWindow):
                 'engine_power': f"{power:.1f} л.с.",
                 'bsfc': f"{bsfc:.2f} кг/(л.с.*час)",
                 'rpm': f"{rpm:.0f} об/мин",
+                'fuel_type': fuel_type,
                 'duty_cycle': f"{duty_cycle:.1f}%",
                 'injector_open_time': f"{injector_open_time:.2f} мс",
                 'required_volume': f"{required_flow * 3600:.1f} г/час"
@@ -2824,7 +10880,8 @@ class AdvancedVehicleCalculator(QMainWindow):
                     'power': power,
                     'bsfc': bsfc,
                     'rpm': rpm,
-                    'total_flow': total_flow * 60  # сохраняем в г/мин
+                    'total_flow': total_flow * 60,  # сохраняем в г/мин
+                    'fuel_type': fuel_type
                 },
                 {
                     'duty_cycle': duty_cycle,
@@ -2839,6 +10896,382 @@ class AdvancedVehicleCalculator(QMainWindow):
         except (ValueError, AttributeError) as e:
             QMessageBox.warning(self, "Ошибка", f"Пожалуйста, проверьте введенные данные\n{str(e)}")
 
+    def import_fuel_catalog(self, kind):
+        """Импорт форсунок или насосов из CSV
+
+        Форсунки: part_number, manufacturer, flow (г/мин), ref_pressure (бар),
+        dead_time (мс). Насосы - по строке на точку характеристики:
+        part_number, manufacturer, pressure (бар), flow (л/ч).
+        """
+        file_name, _ = QFileDialog.getOpenFileName(self, "Импорт каталога", "", "CSV Files (*.csv)")
+        if not file_name:
+            return
+        try:
+            rows = read_catalog_csv(file_name)
+            if kind == 'injectors':
+                added = self.db.add_injectors([
+                    (row['part_number'], row.get('manufacturer', ''), float(row['flow']),
+                     float(row['ref_pressure']) if row.get('ref_pressure') else 3.0,
+                     float(row['dead_time']) if row.get('dead_time') else 0.0)
+                    for row in rows
+                ])
+            else:
+                curves = {}
+                for row in rows:
+                    key = (row['part_number'], row.get('manufacturer', ''))
+                    curves.setdefault(key, []).append((float(row['pressure']), float(row['flow'])))
+                added = self.db.add_pumps([(part, maker, points) for (part, maker), points in curves.items()])
+
+            self.update_catalog_size()
+            self.statusBar().showMessage(f"Импортировано записей: {added}", 3000)
+
+        except (KeyError, ValueError, OSError) as e:
+            QMessageBox.warning(self, "Ошибка", f"Некорректный формат файла каталога\n{str(e)}")
+
+    def create_demo_fuel_catalog(self):
+        """Заполняет каталог форсунок и насосов синтетическими данными"""
+        injectors, pumps = demo_fuel_catalog()
+        self.db.add_injectors(injectors)
+        self.db.add_pumps(pumps)
+        self.update_catalog_size()
+
+    def match_fuel_parts(self):
+        """Подбор сочетаний форсунок, насоса и давления под мощность и целевой цикл впрыска"""
+        try:
+            power = float(self.fuel_engine_power.text())
+            bsfc = float(self.fuel_bsfc.text())
+            rpm = float(self.fuel_rpm.text())
+            target_duty = float(self.fuel_target_duty.text())
+            temperature = float(self.fuel_temp.text())
+            count = self.fuel_injector_count.value()
+            min_duty = self.fuel_catalog_min_duty.value()
+            pump_margin = self.fuel_catalog_pump_margin.value()
+            fuel_density = self.cycle_fuel_density.value()
+            pressure_from, pressure_to = [float(field.text()) for field in self.fuel_catalog_pressure_range]
+            pressure_step = float(self.fuel_catalog_pressure_step.text())
+            if power <= 0 or bsfc <= 0 or rpm <= 0:
+                raise ValueError("Мощность, удельный расход и обороты должны быть больше нуля")
+            if not min_duty < target_duty <= 100:
+                raise ValueError("Целевой цикл должен быть больше минимального и не больше 100%")
+            if pressure_step <= 0 or not 0 < pressure_from <= pressure_to:
+                raise ValueError("Некорректный диапазон давления")
+
+            system_type = self.fuel_system_type.currentText()
+            system_factor = 1.0 if system_type == "Инжектор" else 0.9 if system_type == "Прямой впрыск" else 0.7
+            pressures = np.arange(pressure_from, pressure_to + pressure_step / 2, pressure_step)
+
+            start = time.perf_counter()
+            # Границы поиска по индексу: производительность при 3 бар, при которой цикл
+            # (без мертвого времени) равен целевому на максимальном давлении и
+            # минимальному - на минимальном
+            required_flow = power * bsfc * 1000 / 60  # г/мин
+            temp_factor = float(fuel_system_flow_model(1, 1.0, 3.0, temperature, system_factor)['total_flow'])
+            low = required_flow * 100 / (target_duty * count * np.sqrt(pressures[-1] / 3.0) * temp_factor)
+            high = required_flow * 100 / (min_duty * count * np.sqrt(pressures[0] / 3.0) * temp_factor)
+            injectors = self.db.injectors_in_range(low, high)
+            required_pump = power * bsfc / fuel_density * (1 + pump_margin / 100)
+            pump_ids, pump_parts, pump_makers, pump_flow = pump_flow_matrix(
+                self.db.pump_curves(required_pump), pressures)
+
+            if injectors and pump_ids:
+                injector_data = np.array([row[3:6] for row in injectors], dtype=float)
+                result = fuel_part_combinations(
+                    injector_data[:, 0], injector_data[:, 1], np.nan_to_num(injector_data[:, 2]), pump_flow,
+                    pressures, power, bsfc, rpm, count, target_duty, min_duty, temperature, system_factor,
+                    fuel_density, pump_margin)
+            else:
+                result = {'count': 0, 'injector': [], 'required_pump_flow': required_pump}
+            elapsed = time.perf_counter() - start
+
+            lines = [
+                "=== ПОДБОР ФОРСУНОК И НАСОСА ===",
+                f"Требуемый расход: {required_flow:.0f} г/мин, подача насоса с запасом: "
+                f"{result['required_pump_flow']:.0f} л/ч",
+                f"Кандидатов: форсунок {len(injectors)}, насосов {len(pump_ids)}; "
+                f"допустимых сочетаний: {result['count']} ({elapsed * 1000:.0f} мс)",
+                "",
+                f"{'Форсунка':<12} {'г/мин':>6} {'Насос':<10} {'бар':>5} {'Цикл':>6} {'Подача л/ч':>10}"
+            ]
+            best = []
+            for n, i in enumerate(result['injector']):
+                j = result['pump'][n]
+                part, maker, flow, ref_pressure = injectors[i][1:5]
+                lines.append(f"{part:<12} {flow:6.0f} {pump_parts[j]:<10} {result['pressure'][n]:5.1f} "
+                             f"{result['duty_cycle'][n]:5.1f}% {result['pump_flow'][n]:10.0f}")
+                best.append(f"{part} + {pump_parts[j]} при {result['pressure'][n]:.1f} бар")
+            if not result['count']:
+                lines.append("\nДопустимых сочетаний нет - расширьте диапазон давления или каталог")
+            self.fuel_catalog_result.setText("\n".join(lines))
+
+            # Лучшее сочетание подставляется в поля расчета производительности
+            if result['count']:
+                part, maker, flow, ref_pressure = injectors[result['injector'][0]][1:5]
+                self.fuel_injector_flow.setText(f"{flow * np.sqrt(3.0 / ref_pressure):.0f}")
+                self.fuel_pressure.setText(f"{result['pressure'][0]:g}")
+
+            # Сохранение в отчет
+            if 'fuel_system' not in self.report_data:
+                self.report_data['fuel_system'] = {}
+            self.report_data['fuel_system']['catalog_match'] = {
+                'target_duty': f"{target_duty}%",
+                'injector_part': best[0].split(' + ')[0] if best else "-",
+                'pump_part': best[0].split(' + ')[1].split(' при ')[0] if best else "-",
+                'fuel_pressure': f"{result['pressure'][0]:.1f} бар" if best else "-",
+                'duty_cycle': f"{result['duty_cycle'][0]:.1f}%" if best else "-"
+            }
+
+            # Сохранение в базу данных
+            calc_id = self.db.save_calculation(
+                'fuel_catalog_match',
+                {
+                    'power': power,
+                    'bsfc': bsfc,
+                    'rpm': rpm,
+                    'injector_count': count,
+                    'target_duty': target_duty,
+                    'pressure_range': [pressure_from, pressure_to, pressure_step]
+                },
+                {
+                    'combinations': result['count'],
+                    'best': best[:5]
+                }
+            )
+
+            self.update_report_tab()
+            self.statusBar().showMessage(f"Подбор по каталогу сохранен (ID: {calc_id})", 3000)
+
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Пожалуйста, введите корректные значения\n{str(e)}")
+
+    def calculate_injector_map(self):
+        """Время впрыска и цикл по всей сетке обороты × нагрузка
+
+        Максимальный момент берется из карты двигателя (если она задана) или
+        из характеристики момента на вкладке «Динамика», удельный расход - из
+        карты или из поля «Удельный расход топлива».
+        """
+        try:
+            total_flow_text = self.fuel_system_flow.text()
+            if not total_flow_text:
+                raise ValueError("Сначала выполните расчет производительности системы")
+            total_flow = float(total_flow_text.split()[0])  # г/мин
+
+            rpm_from, rpm_to = [float(field.text()) for field in self.injector_map_rpm_range]
+            rpm_step = float(self.injector_map_rpm_step.text())
+            loads = [float(v) for v in self.injector_map_loads.text().replace(';', ',').split(',') if v.strip()]
+            if rpm_step <= 0 or not 0 < rpm_from <= rpm_to:
+                raise ValueError("Некорректный диапазон оборотов")
+            if not loads or min(loads) < 0:
+                raise ValueError("Задайте значения нагрузки от 0 до 100%")
+
+            dead_points = []
+            for item in self.injector_map_dead_time.text().replace(';', ',').split(','):
+                if item.strip():
+                    volt, dead = item.split(':')
+                    dead_points.append((float(volt), float(dead)))
+            if not dead_points:
+                raise ValueError("Задайте мертвое время форсунки")
+            dead_points.sort()
+            voltage = self.injector_map_voltage.value()
+            dead_time = float(np.interp(voltage, [p[0] for p in dead_points], [p[1] for p in dead_points]))
+
+            engine_map = self.engine_map
+            if engine_map is not None and engine_map.full_load is not None:
+                torque_rpm, torque_nm = engine_map.full_load
+            else:
+                torque_rpm, torque_nm = parse_torque_curve(self.lap_torque_curve.text())
+
+            rpm_axis = np.arange(rpm_from, rpm_to + rpm_step / 2, rpm_step)
+            load_axis = np.array(sorted(loads))
+            rpm, load = np.meshgrid(rpm_axis, load_axis, indexing='ij')
+            torque = np.interp(rpm, torque_rpm, torque_nm) * load / 100
+            if engine_map is not None:
+                bsfc = engine_map.lookup(rpm, torque) * 0.7355 / 1000  # г/(кВт·ч) в кг/(л.с.*час)
+            else:
+                bsfc = float(self.fuel_bsfc.text())
+
+            result = injector_pulse_map(rpm, torque, bsfc, total_flow, dead_time)
+            pulse_width, duty = result['pulse_width'], result['duty_cycle']
+            threshold = self.injector_map_threshold.value()
+            over = duty > threshold
+
+            # Таблица: строки - обороты, столбцы - нагрузка, в ячейке время впрыска
+            table = self.injector_map_table
+            table.clear()
+            table.setRowCount(len(rpm_axis))
+            table.setColumnCount(len(load_axis))
+            table.setHorizontalHeaderLabels([f"{v:g}%" for v in load_axis])
+            table.setVerticalHeaderLabels([f"{v:.0f}" for v in rpm_axis])
+            for i in range(len(rpm_axis)):
+                for j in range(len(load_axis)):
+                    item = QTableWidgetItem(f"{pulse_width[i, j]:.2f}")
+                    item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+                    item.setToolTip(f"{rpm_axis[i]:.0f} об/мин, {load_axis[j]:g}%: "
+                                    f"{torque[i, j]:.0f} Н·м, цикл {duty[i, j]:.1f}%")
+                    if over[i, j]:
+                        item.setBackground(QColor(255, 150, 150))
+                    table.setItem(i, j, item)
+            table.resizeColumnsToContents()
+
+            peak = np.unravel_index(np.argmax(duty), duty.shape)
+            self.injector_map_result.setText(
+                f"Время впрыска, мс (мертвое время {dead_time:.2f} мс при {voltage:.1f} В). "
+                f"Максимальный цикл {duty[peak]:.1f}% при {rpm_axis[peak[0]]:.0f} об/мин и "
+                f"{load_axis[peak[1]]:g}%; выше {threshold:.0f}%: {int(over.sum())} ячеек"
+            )
+            self.injector_map_data = {
+                'rpm': rpm_axis,
+                'load': load_axis,
+                'effective_time': result['effective_time'],
+                'dead_time': dead_points
+            }
+
+            # Сохраняем для отчета
+            if 'fuel_system' not in self.report_data:
+                self.report_data['fuel_system'] = {}
+            self.report_data['fuel_system']['injector_map'] = {
+                'battery_voltage': f"{voltage:.1f} В",
+                'dead_time': f"{dead_time:.2f} мс",
+                'max_duty_cycle': f"{duty[peak]:.1f}% ({rpm_axis[peak[0]]:.0f} об/мин, {load_axis[peak[1]]:g}%)",
+                'cells_over_threshold': f"{int(over.sum())} из {over.size} (> {threshold:.0f}%)"
+            }
+
+            # Сохраняем в базу данных
+            calc_id = self.db.save_calculation(
+                'injector_map',
+                {
+                    'total_flow': total_flow,
+                    'rpm_range': [rpm_from, rpm_to, rpm_step],
+                    'loads': [float(v) for v in load_axis],
+                    'battery_voltage': voltage,
+                    'dead_time': dead_time,
+                    'bsfc_map': engine_map.name if engine_map is not None else None
+                },
+                {
+                    'pulse_width': [[round(float(v), 3) for v in row] for row in pulse_width],
+                    'max_duty_cycle': float(duty[peak]),
+                    'cells_over_threshold': int(over.sum())
+                }
+            )
+
+            self.update_report_tab()
+            self.statusBar().showMessage(f"Карта впрыска сохранена (ID: {calc_id})", 3000)
+
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Пожалуйста, введите корректные значения\n{str(e)}")
+
+    def export_injector_map(self):
+        """Калибровочная таблица для ЭБУ
+
+        Эффективное время впрыска (без мертвого времени) по сетке обороты ×
+        нагрузка и таблица мертвого времени по напряжению - ЭБУ добавляет
+        поправку на напряжение сам.
+        """
+        if self.injector_map_data is None:
+            QMessageBox.warning(self, "Ошибка", "Сначала рассчитайте карту впрыска")
+            return
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Экспорт калибровки", "Карта_впрыска.csv", "CSV Files (*.csv)")
+        if not file_name:
+            return
+        if not file_name.lower().endswith('.csv'):
+            file_name += '.csv'
+
+        data = self.injector_map_data
+        try:
+            with open(file_name, mode='w', newline='', encoding='utf-8-sig') as csv_file:
+                writer = csv.writer(csv_file, delimiter=';')
+                writer.writerow(["Эффективное время впрыска, мс"])
+                writer.writerow(["об/мин \\ нагрузка, %"] + [f"{v:g}" for v in data['load']])
+                for rpm, row in zip(data['rpm'], data['effective_time']):
+                    writer.writerow([f"{rpm:.0f}"] + [f"{v:.3f}" for v in row])
+                writer.writerow([])
+                writer.writerow(["Мертвое время форсунки"])
+                writer.writerow(["Напряжение, В", "Время, мс"])
+                for voltage, dead_time in data['dead_time']:
+                    writer.writerow([f"{voltage:g}", f"{dead_time:.3f}"])
+            self.statusBar().showMessage(f"Калибровка сохранена: {file_name}", 3000)
+        except OSError as e:
+            QMessageBox.critical(self, "Ошибка", f"Ошибка экспорта:\n{str(e)}")
+
+    def calculate_flex_fuel_sweep(self):
+        """Цикл впрыска и требуемая производительность форсунок для смесей E0-E100"""
+        try:
+            power = float(self.fuel_engine_power.text())
+            bsfc = float(self.fuel_bsfc.text())
+            rpm = float(self.fuel_rpm.text())
+            target_duty = float(self.fuel_target_duty.text())
+            total_flow_text = self.fuel_system_flow.text()
+            if not total_flow_text:
+                raise ValueError("Сначала выполните расчет производительности системы")
+            total_flow = float(total_flow_text.split()[0])  # г/мин
+            if target_duty <= 0:
+                raise ValueError("Целевой цикл должен быть больше нуля")
+
+            shares = np.arange(0, 101, 5)
+            props = fuel_properties('blend', shares)
+            duty = fuel_injector_duty_model(power, bsfc, rpm, total_flow, 'blend', shares)['duty_cycle']
+            # Производительность форсунки (по бензину), при которой цикл равен целевому
+            injector_flow = total_flow / self.fuel_injector_count.value() * duty / target_duty
+
+            lines = [
+                "=== СМЕСИ БЕНЗИН/ЭТАНОЛ ===",
+                f"{'Смесь':>6} {'AFR':>6} {'МДж/кг':>7} {'кг/л':>6} {'Цикл':>7} {'Форсунка, г/мин':>16}"
+            ]
+            for i in range(0, len(shares), 2):
+                lines.append(f"{'E' + str(shares[i]):>6} {props['afr'][i]:6.2f} {props['lhv'][i]:7.1f} "
+                             f"{props['density'][i]:6.3f} {duty[i]:6.1f}% {injector_flow[i]:16.0f}")
+            lines.append(f"\nДля E0-E100 при цикле {target_duty:g}% нужна форсунка "
+                         f"{injector_flow.max():.0f} г/мин (по бензину)")
+            self.flex_fuel_result.setText("\n".join(lines))
+
+            self.fuel_figure.clear()
+            ax_duty = self.fuel_figure.add_subplot(211)
+            ax_duty.plot(shares, duty)
+            ax_duty.axhline(target_duty, color='red', linestyle='--')
+            ax_duty.set_ylabel("Цикл впрыска, %")
+            ax_duty.grid(True)
+            ax_flow = self.fuel_figure.add_subplot(212, sharex=ax_duty)
+            ax_flow.plot(shares, injector_flow)
+            ax_flow.set_ylabel("Форсунка, г/мин")
+            ax_flow.set_xlabel("Содержание этанола, % (об.)")
+            ax_flow.grid(True)
+            self.fuel_figure.tight_layout()
+            self.fuel_canvas.draw()
+
+            # Сохраняем для отчета
+            if 'fuel_system' not in self.report_data:
+                self.report_data['fuel_system'] = {}
+            self.report_data['fuel_system']['flex_fuel'] = {
+                'duty_e0': f"{duty[0]:.1f}%",
+                'duty_e85': f"{duty[list(shares).index(85)]:.1f}%",
+                'duty_e100': f"{duty[-1]:.1f}%",
+                'required_injector_flow': f"{injector_flow.max():.0f} г/мин"
+            }
+
+            # Сохраняем в базу данных
+            calc_id = self.db.save_calculation(
+                'flex_fuel_sweep',
+                {
+                    'power': power,
+                    'bsfc': bsfc,
+                    'rpm': rpm,
+                    'total_flow': total_flow,
+                    'target_duty': target_duty
+                },
+                {
+                    'ethanol_share': [int(v) for v in shares],
+                    'duty_cycle': [float(v) for v in duty],
+                    'required_injector_flow': float(injector_flow.max())
+                }
+            )
+
+            self.update_report_tab()
+            self.statusBar().showMessage(f"Расчет для смесей сохранен (ID: {calc_id})", 3000)
+
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", f"Пожалуйста, введите корректные значения\n{str(e)}")
+
     def calculate_optimal_fuel_params(self):
         """Расчет оптимальных параметров топливной системы"""
         try:
@@ -2852,12 +11285,11 @@ class AdvancedVehicleCalculator(QMainWindow):
             required_flow = float(self.report_data['fuel_system']['required_volume'].split()[0]) / 3600  # г/час в г/сек
             current_duty = float(self.report_data['fuel_system']['duty_cycle'].split('%')[0])
 
-            # Расчет оптимальной производительности
-            optimal_flow = (required_flow * 100) / target_duty * 60  # г/сек в г/мин
-
-            # Расчет оптимального давления (базовое давление 3 бар)
+            # Расчет оптимальной производительности и давления (базовое давление 3 бар)
             current_flow = float(self.report_data['fuel_system']['total_flow'].split()[0])
-            optimal_pressure = 3.0 * (optimal_flow / current_flow) ** 2
+            optimal = fuel_optimization_model(target_duty, required_flow * 3600, current_flow)
+            optimal_flow = float(optimal['optimal_flow'])  # г/мин
+            optimal_pressure = float(optimal['optimal_pressure'])
 
             self.fuel_optimal_flow.setText(f"{optimal_flow:.1f} г/мин")
             self.fuel_optimal_pressure.setText(f"{optimal_pressure:.1f} бар")
@@ -2889,6 +11321,557 @@ class AdvancedVehicleCalculator(QMainWindow):
         except (ValueError, KeyError) as e:
             QMessageBox.warning(self, "Ошибка", f"Не удалось рассчитать оптимальные параметры\n{str(e)}")
 
+    # ==================== ВКЛАДКА ИССЛЕДОВАНИЕ ====================
+    def create_research_tab(self):
+        tab = QWidget()
+        layout = QVBoxLayout()
+
+        # Группа "План эксперимента"
+        design_group = QGroupBox("План эксперимента")
+        design_layout = QVBoxLayout()
+
+        form_layout = QFormLayout()
+        self.sweep_calc_type = QComboBox()
+        for calc_type, model in CALCULATION_MODELS.items():
+            self.sweep_calc_type.addItem(model['title'], calc_type)
+        self.sweep_calc_type.currentIndexChanged.connect(self.update_sweep_inputs)
+
+        self.sweep_design = QComboBox()
+        for design, title in SWEEP_DESIGNS.items():
+            self.sweep_design.addItem(title, design)
+
+        self.sweep_points = QSpinBox()
+        self.sweep_points.setRange(10, 10000000)
+        self.sweep_points.setValue(10000)
+        self.sweep_points.setSingleStep(10000)
+
+        form_layout.addRow("Тип расчета:", self.sweep_calc_type)
+        form_layout.addRow("План эксперимента:", self.sweep_design)
+        form_layout.addRow("Число точек (гиперкуб/случайный):", self.sweep_points)
+
+        # Таблица входов: при заполненном списке используется список,
+        # при числе точек > 1 - диапазон, иначе значение "Мин" фиксировано
+        self.sweep_inputs_table = QTableWidget()
+        self.sweep_inputs_table.setColumnCount(5)
+        self.sweep_inputs_table.setHorizontalHeaderLabels([
+            "Параметр", "Мин", "Макс", "Точек", "Список значений"
+        ])
+        self.sweep_inputs_table.verticalHeader().setVisible(False)
+        self.sweep_inputs_table.horizontalHeader().setStretchLastSection(True)
+
+        button_row = QHBoxLayout()
+        self.sweep_run_btn = QPushButton("Запустить исследование")
+        self.sweep_run_btn.clicked.connect(self.run_parameter_sweep)
+        self.sweep_cancel_btn = QPushButton("Остановить")
+        self.sweep_cancel_btn.setEnabled(False)
+        self.sweep_cancel_btn.clicked.connect(self.cancel_parameter_sweep)
+        sweep_export_btn = QPushButton("Экспорт результатов в CSV")
+        sweep_export_btn.clicked.connect(self.export_sweep_results)
+        button_row.addWidget(self.sweep_run_btn)
+        button_row.addWidget(self.sweep_cancel_btn)
+        button_row.addWidget(sweep_export_btn)
+
+        self.sweep_progress = QProgressBar()
+        self.sweep_progress.setRange(0, 100)
+
+        design_layout.addLayout(form_layout)
+        design_layout.addWidget(self.sweep_inputs_table)
+        design_layout.addLayout(button_row)
+        design_layout.addWidget(self.sweep_progress)
+        design_group.setLayout(design_layout)
+
+        # Группа "Результаты исследования"
+        results_group = QGroupBox("Результаты исследования")
+        results_layout = QVBoxLayout()
+
+        self.sweep_summary = QLabel("")
+        self.sweep_summary.setStyleSheet("font-weight: bold; color: #0066CC;")
+        self.sweep_results_table = QTableWidget()
+        self.sweep_results_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.sweep_results_table.verticalHeader().setVisible(False)
+
+        plot_row = QHBoxLayout()
+        self.sweep_plot_x = QComboBox()
+        self.sweep_plot_y = QComboBox()
+        sweep_plot_btn = QPushButton("Построить график")
+        sweep_plot_btn.clicked.connect(self.plot_sweep_results)
+        plot_row.addWidget(QLabel("Ось X:"))
+        plot_row.addWidget(self.sweep_plot_x)
+        plot_row.addWidget(QLabel("Ось Y:"))
+        plot_row.addWidget(self.sweep_plot_y)
+        plot_row.addWidget(sweep_plot_btn)
+
+        self.sweep_figure = Figure(figsize=(6, 3))
+        self.sweep_canvas = FigureCanvas(self.sweep_figure)
+
+        results_layout.addWidget(self.sweep_summary)
+        results_layout.addWidget(self.sweep_results_table)
+        results_layout.addLayout(plot_row)
+        results_layout.addWidget(self.sweep_canvas)
+        results_group.setLayout(results_layout)
+
+        top_row = QHBoxLayout()
+        top_row.addWidget(design_group)
+        top_row.addWidget(self.create_uncertainty_group())
+
+        layout.addLayout(top_row)
+        layout.addWidget(results_group)
+
+        self.sweep_worker = None
+        self.sweep_store = None
+        self.update_sweep_inputs()
+
+        tab.setLayout(layout)
+        self.tabs.addTab(tab, "Исследование")
+
+    def update_sweep_inputs(self):
+        """Заполняет таблицу входов для выбранного типа расчета"""
+        model = CALCULATION_MODELS[self.sweep_calc_type.currentData()]
+        self.sweep_inputs_table.setRowCount(len(model['inputs']))
+        for row, (key, label, default) in enumerate(model['inputs']):
+            name_item = QTableWidgetItem(label)
+            name_item.setFlags(name_item.flags() & ~Qt.ItemIsEditable)
+            name_item.setData(Qt.UserRole, key)
+            self.sweep_inputs_table.setItem(row, 0, name_item)
+            self.sweep_inputs_table.setItem(row, 1, QTableWidgetItem(f"{default:g}"))
+            self.sweep_inputs_table.setItem(row, 2, QTableWidgetItem(f"{default:g}"))
+            self.sweep_inputs_table.setItem(row, 3, QTableWidgetItem("1"))
+            self.sweep_inputs_table.setItem(row, 4, QTableWidgetItem(""))
+        self.sweep_inputs_table.resizeColumnsToContents()
+
+    def read_sweep_variables(self):
+        """Читает диапазоны и списки значений из таблицы входов"""
+        variables, fixed, continuous = {}, {}, {}
+        for row in range(self.sweep_inputs_table.rowCount()):
+            key = self.sweep_inputs_table.item(row, 0).data(Qt.UserRole)
+            label = self.sweep_inputs_table.item(row, 0).text()
+            try:
+                minimum = float(self.sweep_inputs_table.item(row, 1).text())
+                maximum = float(self.sweep_inputs_table.item(row, 2).text())
+                count = int(float(self.sweep_inputs_table.item(row, 3).text()))
+                values_text = self.sweep_inputs_table.item(row, 4).text().strip()
+                values = [float(v) for v in values_text.replace(';', ',').split(',') if v.strip()]
+            except (ValueError, AttributeError):
+                raise ValueError(f"Некорректные значения для параметра «{label}»")
+
+            if values:
+                variables[key] = values
+                continuous[key] = False
+            elif count > 1:
+                variables[key] = np.linspace(minimum, maximum, count)
+                continuous[key] = True
+            else:
+                fixed[key] = minimum
+        return variables, fixed, continuous
+
+    def run_parameter_sweep(self):
+        """Запускает исследование в фоновом потоке"""
+        try:
+            calc_type = self.sweep_calc_type.currentData()
+            design = self.sweep_design.currentData()
+            variables, fixed, continuous = self.read_sweep_variables()
+
+            if not variables:
+                raise ValueError("Задайте диапазон или список хотя бы для одного параметра")
+
+            sweep = ParameterSweep(calc_type, variables, fixed, design,
+                                   n_points=self.sweep_points.value(), continuous=continuous)
+            if sweep.size > 50000000:
+                raise ValueError(f"Слишком большой план: {sweep.size} точек")
+
+            if self.sweep_store:
+                self.sweep_store.close()
+            self.sweep_store = SweepResultStore(sweep.input_keys + sweep.output_keys, sweep.size)
+            store = self.sweep_store
+
+            self.sweep_worker = CalculationWorker(
+                lambda progress, cancelled: sweep.run(store, progress, cancelled), self)
+            self.sweep_worker.progress.connect(self.sweep_progress.setValue)
+            self.sweep_worker.result_ready.connect(
+                lambda result: self.on_sweep_finished(sweep, variables, fixed))
+            self.sweep_worker.failed.connect(self.on_sweep_failed)
+
+            self.sweep_progress.setValue(0)
+            self.sweep_run_btn.setEnabled(False)
+            self.sweep_cancel_btn.setEnabled(True)
+            self.statusBar().showMessage(f"Исследование: {sweep.size} точек...")
+            self.sweep_worker.start()
+
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", str(e))
+
+    def cancel_parameter_sweep(self):
+        if self.sweep_worker and self.sweep_worker.isRunning():
+            self.sweep_worker.cancel()
+
+    def on_sweep_failed(self, message):
+        self.sweep_run_btn.setEnabled(True)
+        self.sweep_cancel_btn.setEnabled(False)
+        QMessageBox.critical(self, "Ошибка", f"Исследование прервано:\n{message}")
+
+    def on_sweep_finished(self, sweep, variables, fixed):
+        """Выводит результаты исследования и сохраняет сводку в историю"""
+        self.sweep_run_btn.setEnabled(True)
+        self.sweep_cancel_btn.setEnabled(False)
+        store = self.sweep_store
+        if not store.count:
+            self.statusBar().showMessage("Исследование остановлено", 3000)
+            return
+
+        labels = dict((key, label) for key, label, _ in sweep.model['inputs'])
+        labels.update(dict(sweep.model['outputs']))
+
+        # Таблица: первые строки результатов
+        preview_rows = store.rows(0, 500)
+        self.sweep_results_table.clear()
+        self.sweep_results_table.setColumnCount(len(store.columns))
+        self.sweep_results_table.setHorizontalHeaderLabels([labels[c] for c in store.columns])
+        self.sweep_results_table.setRowCount(len(preview_rows))
+        for row, values in enumerate(preview_rows):
+            for col, value in enumerate(values):
+                self.sweep_results_table.setItem(row, col, QTableWidgetItem(f"{value:.4g}"))
+        self.sweep_results_table.resizeColumnsToContents()
+
+        self.sweep_plot_x.clear()
+        self.sweep_plot_y.clear()
+        for column in store.columns:
+            self.sweep_plot_x.addItem(labels[column], column)
+            self.sweep_plot_y.addItem(labels[column], column)
+        if variables:
+            self.sweep_plot_x.setCurrentIndex(store.columns.index(next(iter(variables))))
+        self.sweep_plot_y.setCurrentIndex(len(sweep.input_keys))
+
+        summary = store.summary()
+        self.sweep_summary.setText(
+            f"Рассчитано точек: {store.count} из {sweep.size} "
+            f"(показаны первые {len(preview_rows)})"
+        )
+        self.plot_sweep_results()
+
+        # Сохраняем для отчета
+        self.report_data['parameter_sweep'] = {
+            'calculation_type': sweep.model['title'],
+            'design': SWEEP_DESIGNS[sweep.design],
+            'points': store.count,
+            **{labels[key]: f"мин {summary[key][0]:.4g} / сред {summary[key][1]:.4g} / макс {summary[key][2]:.4g}"
+               for key in sweep.output_keys}
+        }
+
+        # Сохраняем в базу данных
+        calc_id = self.db.save_calculation(
+            'parameter_sweep',
+            {
+                'calculation_type': sweep.calc_type,
+                'design': sweep.design,
+                'points': store.count,
+                'ranges': {k: [float(np.min(v)), float(np.max(v)), len(v)] for k, v in variables.items()},
+                'fixed': fixed
+            },
+            {key: list(summary[key]) for key in sweep.output_keys}
+        )
+
+        self.update_report_tab()
+        self.statusBar().showMessage(f"Исследование завершено (ID: {calc_id})", 5000)
+
+    def plot_sweep_results(self):
+        """Строит график по выборке результатов (не более 5000 точек)"""
+        if not self.sweep_store or not self.sweep_store.count:
+            return
+        x_key = self.sweep_plot_x.currentData()
+        y_key = self.sweep_plot_y.currentData()
+        if not x_key or not y_key:
+            return
+
+        indices = self.sweep_store.sample_indices(5000)
+        x = self.sweep_store.column(x_key)[indices]
+        y = self.sweep_store.column(y_key)[indices]
+
+        self.sweep_figure.clear()
+        ax = self.sweep_figure.add_subplot(111)
+        ax.scatter(x, y, s=4, alpha=0.5)
+        ax.set_xlabel(self.sweep_plot_x.currentText())
+        ax.set_ylabel(self.sweep_plot_y.currentText())
+        ax.grid(True)
+        self.sweep_figure.tight_layout()
+        self.sweep_canvas.draw()
+
+    def export_sweep_results(self):
+        """Экспорт всех точек исследования в CSV"""
+        if not self.sweep_store or not self.sweep_store.count:
+            QMessageBox.warning(self, "Ошибка", "Нет результатов исследования для экспорта")
+            return
+
+        options = QFileDialog.Options()
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Экспорт результатов исследования",
+            f"Исследование_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            "CSV Files (*.csv)", options=options
+        )
+        if not file_name:
+            return
+        if not file_name.lower().endswith('.csv'):
+            file_name += '.csv'
+
+        try:
+            self.sweep_store.export_csv(file_name)
+            QMessageBox.information(self, "Успешно", f"Результаты экспортированы в:\n{file_name}")
+        except OSError as e:
+            QMessageBox.critical(self, "Ошибка", f"Ошибка экспорта:\n{str(e)}")
+
+    def create_uncertainty_group(self):
+        """Группа анализа чувствительности и неопределенности"""
+        uq_group = QGroupBox("Чувствительность и неопределенность")
+        uq_layout = QVBoxLayout()
+
+        form_layout = QFormLayout()
+        self.uq_calc_type = QComboBox()
+        for calc_type, model in CALCULATION_MODELS.items():
+            self.uq_calc_type.addItem(model['title'], calc_type)
+        self.uq_calc_type.currentIndexChanged.connect(self.update_uncertainty_inputs)
+
+        self.uq_samples = QSpinBox()
+        self.uq_samples.setRange(1000, 10000000)
+        self.uq_samples.setValue(1000000)
+        self.uq_samples.setSingleStep(100000)
+
+        form_layout.addRow("Тип расчета:", self.uq_calc_type)
+        form_layout.addRow("Число выборок:", self.uq_samples)
+
+        # Таблица входов: номинал, закон распределения и разброс (%)
+        self.uq_inputs_table = QTableWidget()
+        self.uq_inputs_table.setColumnCount(4)
+        self.uq_inputs_table.setHorizontalHeaderLabels([
+            "Параметр", "Номинал", "Распределение", "Разброс (%)"
+        ])
+        self.uq_inputs_table.verticalHeader().setVisible(False)
+        self.uq_inputs_table.horizontalHeader().setStretchLastSection(True)
+
+        button_row = QHBoxLayout()
+        local_btn = QPushButton("Локальная чувствительность")
+        local_btn.clicked.connect(self.calculate_local_sensitivity)
+        self.uq_sobol_btn = QPushButton("Индексы Соболя")
+        self.uq_sobol_btn.clicked.connect(lambda: self.run_uncertainty_analysis('sobol'))
+        self.uq_mc_btn = QPushButton("Монте-Карло")
+        self.uq_mc_btn.clicked.connect(lambda: self.run_uncertainty_analysis('monte_carlo'))
+        self.uq_cancel_btn = QPushButton("Остановить")
+        self.uq_cancel_btn.setEnabled(False)
+        self.uq_cancel_btn.clicked.connect(self.cancel_uncertainty_analysis)
+        button_row.addWidget(local_btn)
+        button_row.addWidget(self.uq_sobol_btn)
+        button_row.addWidget(self.uq_mc_btn)
+        button_row.addWidget(self.uq_cancel_btn)
+
+        self.uq_progress = QProgressBar()
+        self.uq_progress.setRange(0, 100)
+
+        self.uq_result = QTextEdit()
+        self.uq_result.setReadOnly(True)
+        self.uq_result.setStyleSheet("font-family: monospace;")
+
+        uq_layout.addLayout(form_layout)
+        uq_layout.addWidget(self.uq_inputs_table)
+        uq_layout.addLayout(button_row)
+        uq_layout.addWidget(self.uq_progress)
+        uq_layout.addWidget(self.uq_result)
+        uq_group.setLayout(uq_layout)
+
+        self.uq_worker = None
+        self.update_uncertainty_inputs()
+        return uq_group
+
+    def update_uncertainty_inputs(self):
+        """Заполняет таблицу входов для анализа неопределенности"""
+        model = CALCULATION_MODELS[self.uq_calc_type.currentData()]
+        self.uq_inputs_table.setRowCount(len(model['inputs']))
+        for row, (key, label, default) in enumerate(model['inputs']):
+            kind, spread = UNCERTAIN_INPUTS.get(key, ('normal', 0.0))
+
+            name_item = QTableWidgetItem(label)
+            name_item.setFlags(name_item.flags() & ~Qt.ItemIsEditable)
+            name_item.setData(Qt.UserRole, key)
+            self.uq_inputs_table.setItem(row, 0, name_item)
+            self.uq_inputs_table.setItem(row, 1, QTableWidgetItem(f"{default:g}"))
+
+            distribution = QComboBox()
+            for dist_key, title in INPUT_DISTRIBUTIONS.items():
+                distribution.addItem(title, dist_key)
+            distribution.setCurrentIndex(list(INPUT_DISTRIBUTIONS).index(kind))
+            self.uq_inputs_table.setCellWidget(row, 2, distribution)
+            self.uq_inputs_table.setItem(row, 3, QTableWidgetItem(f"{spread:g}"))
+        self.uq_inputs_table.resizeColumnsToContents()
+
+    def read_uncertainty_inputs(self):
+        """Номинальные значения и распределения входов с ненулевым разбросом"""
+        nominal, distributions = {}, {}
+        for row in range(self.uq_inputs_table.rowCount()):
+            key = self.uq_inputs_table.item(row, 0).data(Qt.UserRole)
+            label = self.uq_inputs_table.item(row, 0).text()
+            try:
+                value = float(self.uq_inputs_table.item(row, 1).text())
+                spread = float(self.uq_inputs_table.item(row, 3).text())
+            except (ValueError, AttributeError):
+                raise ValueError(f"Некорректные значения для параметра «{label}»")
+            if spread < 0:
+                raise ValueError(f"Разброс параметра «{label}» не может быть отрицательным")
+
+            nominal[key] = value
+            if spread > 0:
+                kind = self.uq_inputs_table.cellWidget(row, 2).currentData()
+                if kind == 'lognormal' and value <= 0:
+                    raise ValueError(f"Логнормальное распределение параметра «{label}» "
+                                     "требует положительного номинала")
+                distributions[key] = (kind, value, spread)
+        return nominal, distributions
+
+    def calculate_local_sensitivity(self):
+        """Эластичности выходов по входам в номинальной точке"""
+        try:
+            calc_type = self.uq_calc_type.currentData()
+            model = CALCULATION_MODELS[calc_type]
+            nominal, _ = self.read_uncertainty_inputs()
+            labels = dict((key, label) for key, label, _ in model['inputs'])
+
+            sensitivities = local_sensitivities(calc_type, nominal)
+
+            lines = [f"=== ЛОКАЛЬНАЯ ЧУВСТВИТЕЛЬНОСТЬ: {model['title'].upper()} ===",
+                     "Изменение выхода (%) при изменении входа на 1%"]
+            report = {}
+            for out_key, out_label in model['outputs']:
+                lines.append(f"\n{out_label}:")
+                report[out_key] = {}
+                for in_key, (derivative, elasticity) in sensitivities[out_key].items():
+                    lines.append(f"  {labels[in_key]:<45} {elasticity:+8.3f}   (dy/dx = {derivative:.4g})")
+                    report[out_key][labels[in_key]] = f"{elasticity:+.3f}"
+            self.uq_result.setText("\n".join(lines))
+
+            # Сохраняем для отчета
+            self.report_data['sensitivity'] = {
+                'calculation_type': model['title'],
+                **report
+            }
+
+            # Сохраняем в базу данных
+            calc_id = self.db.save_calculation(
+                'local_sensitivity',
+                {'calculation_type': calc_type, 'nominal': nominal},
+                {k: {i: v[1] for i, v in s.items()} for k, s in sensitivities.items()}
+            )
+
+            self.update_report_tab()
+            self.statusBar().showMessage(f"Анализ чувствительности сохранен (ID: {calc_id})", 3000)
+
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", str(e))
+
+    def run_uncertainty_analysis(self, method):
+        """Запускает расчет индексов Соболя или Монте-Карло в фоновом потоке"""
+        try:
+            calc_type = self.uq_calc_type.currentData()
+            nominal, distributions = self.read_uncertainty_inputs()
+            if not distributions:
+                raise ValueError("Задайте разброс хотя бы для одного входа")
+            n_samples = self.uq_samples.value()
+
+            if method == 'sobol':
+                def task(progress, cancelled):
+                    return sobol_indices(calc_type, distributions, n_samples, nominal,
+                                         progress_callback=progress, is_cancelled=cancelled)
+            else:
+                def task(progress, cancelled):
+                    return monte_carlo(calc_type, distributions, n_samples, nominal,
+                                       progress_callback=progress, is_cancelled=cancelled)
+
+            self.uq_worker = CalculationWorker(task, self)
+            self.uq_worker.progress.connect(self.uq_progress.setValue)
+            self.uq_worker.result_ready.connect(
+                lambda result: self.on_uncertainty_finished(method, calc_type, distributions,
+                                                            n_samples, result))
+            self.uq_worker.failed.connect(
+                lambda message: self.on_uncertainty_failed(message))
+
+            self.uq_progress.setValue(0)
+            self.uq_sobol_btn.setEnabled(False)
+            self.uq_mc_btn.setEnabled(False)
+            self.uq_cancel_btn.setEnabled(True)
+            self.uq_worker.start()
+
+        except ValueError as e:
+            QMessageBox.warning(self, "Ошибка", str(e))
+
+    def cancel_uncertainty_analysis(self):
+        if self.uq_worker and self.uq_worker.isRunning():
+            self.uq_worker.cancel()
+
+    def on_uncertainty_failed(self, message):
+        self.uq_sobol_btn.setEnabled(True)
+        self.uq_mc_btn.setEnabled(True)
+        self.uq_cancel_btn.setEnabled(False)
+        QMessageBox.critical(self, "Ошибка", f"Расчет прерван:\n{message}")
+
+    def on_uncertainty_finished(self, method, calc_type, distributions, n_samples, result):
+        """Выводит индексы Соболя или процентили выходов и сохраняет их"""
+        self.uq_sobol_btn.setEnabled(True)
+        self.uq_mc_btn.setEnabled(True)
+        self.uq_cancel_btn.setEnabled(False)
+        if not result:
+            self.statusBar().showMessage("Анализ неопределенности остановлен", 3000)
+            return
+
+        model = CALCULATION_MODELS[calc_type]
+        labels = dict((key, label) for key, label, _ in model['inputs'])
+        out_labels = dict(model['outputs'])
+        report = {}
+
+        if method == 'sobol':
+            lines = [f"=== ИНДЕКСЫ СОБОЛЯ: {model['title'].upper()} ===",
+                     f"Выборок: {n_samples}",
+                     f"{'':<45} {'S1':>8} {'ST':>8}"]
+            for out_key, indices in result.items():
+                lines.append(f"\n{out_labels[out_key]}:")
+                report[out_key] = {}
+                for in_key, (first, total) in indices.items():
+                    lines.append(f"  {labels[in_key]:<43} {first:8.3f} {total:8.3f}")
+                    report[out_key][labels[in_key]] = f"S1 = {first:.3f}, ST = {total:.3f}"
+            section, db_type = 'sobol_indices', 'sobol_indices'
+        else:
+            lines = [f"=== МОНТЕ-КАРЛО: {model['title'].upper()} ===",
+                     f"Выборок: {n_samples}",
+                     f"{'':<45} {'P5':>10} {'P50':>10} {'P95':>10}"]
+            for out_key, stats in result.items():
+                lines.append(f"{out_labels[out_key]:<45} {stats['P5']:10.4g} "
+                             f"{stats['P50']:10.4g} {stats['P95']:10.4g}")
+                report[out_key] = {
+                    'mean': f"{stats['mean']:.4g}",
+                    'std': f"{stats['std']:.4g}",
+                    'P5': f"{stats['P5']:.4g}",
+                    'P50': f"{stats['P50']:.4g}",
+                    'P95': f"{stats['P95']:.4g}"
+                }
+            section, db_type = 'uncertainty', 'monte_carlo'
+
+        self.uq_result.setText("\n".join(lines))
+
+        # Сохраняем для отчета
+        self.report_data[section] = {
+            'calculation_type': model['title'],
+            'samples': n_samples,
+            **report
+        }
+
+        # Сохраняем в базу данных
+        calc_id = self.db.save_calculation(
+            db_type,
+            {
+                'calculation_type': calc_type,
+                'samples': n_samples,
+                'distributions': {k: list(v) for k, v in distributions.items()}
+            },
+            result
+        )
+
+        self.update_report_tab()
+        self.statusBar().showMessage(f"Анализ неопределенности сохранен (ID: {calc_id})", 3000)
+
     # ==================== ВКЛАДКА ОТЧЕТ ====================
     def create_report_tab(self):
         tab = QWidget()
@@ -2937,8 +11920,11 @@ class AdvancedVehicleCalculator(QMainWindow):
             'fuel_system': 'Топливная система',
             'fuel_system_flow': 'Производительность системы',
             'injector_duty': 'Время впрыска',
-            'fuel_optimization': 'Оптимизация системы'
-
+            'fuel_optimization': 'Оптимизация системы',
+            'parameter_sweep': 'Исследование параметров',
+            'sensitivity': 'Локальная чувствительность',
+            'sobol_indices': 'Индексы Соболя',
+            'uncertainty': 'Неопределенность (Монте-Карло)'
         }
 
         # Словарь для перевода параметров
@@ -3017,6 +12003,12 @@ class AdvancedVehicleCalculator(QMainWindow):
             "kinetic_energy": "Кинетическая энергия (кДж)",
             "heat_energy": "Тепловая энергия (кДж)",
             "temperature_rise": "Рост температуры (°C)",
+            "cg_height": "Высота центра масс (м)",
+            "wheelbase": "Колесная база (м)",
+            "static_front": "Статическая нагрузка на переднюю ось (%)",
+            "tire_radius": "Радиус колеса (м)",
+            "cycles": "Число циклов",
+            "ambient_temperature": "Температура воздуха (°C)",
 
             # Двигатель
             "power_hp": "Мощность (л.с.)",
@@ -3101,7 +12093,145 @@ class AdvancedVehicleCalculator(QMainWindow):
             # Дополнительные параметры
             "kinetic_energy": "Кинетическая энергия (кДж)",
             "heat_energy": "Тепловая энергия (кДж)",
-            "disc_thickness": "Толщина тормозного диска (мм)"
+            "disc_thickness": "Толщина тормозного диска (мм)",
+
+            # Исследования
+            "calculation_type": "Тип расчета",
+            "design": "План эксперимента",
+            "points": "Число точек",
+            "braking_simulation": "Динамическое торможение",
+            "optimal_balance_table": "Лучший баланс без блокировки задней оси",
+            "front_lock_time": "Блокировка передней оси",
+            "rear_lock_time": "Блокировка задней оси",
+            "brake_cycle": "Цикл торможений",
+            "peak_temperature": "Пиковая температура диска",
+            "final_temperature": "Температура в конце серии",
+            "steady_peak": "Установившийся пик температуры",
+            "cycles_to_300": "Превышение 300°C",
+            "cycles_to_600": "Превышение 600°C",
+            "ride_simulation": "Динамика подвески",
+            "ride_model": "Модель подвески",
+            "road_profile": "Профиль дороги",
+            "best_comfort": "Лучший комфорт",
+            "body_accel_rms": "СКЗ ускорения кузова",
+            "best_grip": "Лучшее сцепление",
+            "tire_load_variation": "Вариация нагрузки на шину",
+            "frequency_response": "Частотная характеристика",
+            "variants": "Число вариантов",
+            "best_body_control": "Наименьший резонанс кузова",
+            "body_frequency": "Резонанс кузова",
+            "body_gain": "Усиление в резонансе кузова",
+            "wheel_frequency": "Резонанс колеса",
+            "wheel_gain": "Усиление в резонансе колеса",
+            "hardpoint_kinematics": "Кинематика по точкам крепления",
+            "geometry": "Схема подвески",
+            "camber_gain": "Изменение развала",
+            "roll_center_height": "Высота центра крена",
+            "roll_balance": "Крен и распределение нагрузки",
+            "best_setup": "Лучший вариант",
+            "roll_stiffness_front": "Жесткость в крене, перед",
+            "roll_stiffness_rear": "Жесткость в крене, зад",
+            "lltd": "Доля переноса нагрузки на переднюю ось",
+            "roll_gradient": "Градиент крена",
+            "catalog_match": "Подбор по каталогу",
+            "spring_part": "Пружина",
+            "damper_part": "Амортизатор",
+            "damper_curve": "Характеристика амортизатора",
+            "bump_characteristic": "Характер сжатия",
+            "rebound_characteristic": "Характер отбоя",
+            "bump_knee": "Колено сжатия",
+            "rebound_knee": "Колено отбоя",
+            "equivalent_velocity": "Скорость эквивалентного коэффициента",
+            "bump_coef": "Эквивалентный коэффициент сжатия",
+            "rebound_coef": "Эквивалентный коэффициент отбоя",
+            "corner_weights": "Развеска по углам",
+            "scales": "Показания весов",
+            "cross_weight": "Диагональная нагрузка",
+            "front_axle_share": "Доля передней оси",
+            "perch_adjustment": "Смещение опор пружин",
+            "gg_diagram": "Диаграмма g-g",
+            "lap_simulation": "Моделирование круга",
+            "track": "Трасса",
+            "lap_time": "Время круга",
+            "average_speed": "Средняя скорость",
+            "brake_energy": "Энергия торможения за круг",
+            "tire_model": "Модель шины",
+            "grip_limit": "Предел сцепления ведущих колес",
+            "traction_limited_force": "Тяговая сила с учетом сцепления",
+            "launch": "Оптимизация старта",
+            "best_rpm_60ft": "Обороты старта для 60 футов",
+            "time_60ft": "Время на 60 футов",
+            "best_rpm_100": "Обороты старта для 0-100 км/ч",
+            "time_0_100": "Время разгона 0-100 км/ч",
+            "drive_cycle": "Расход в ездовом цикле",
+            "cycle": "Цикл",
+            "distance": "Путь",
+            "fuel_mass": "Масса топлива",
+            "consumption": "Расход топлива",
+            "engine_map": "Карта удельного расхода",
+            "map_name": "Карта",
+            "best_efficiency": "Максимальный КПД",
+            "min_bsfc": "Минимальный удельный расход",
+            "max_duty_cycle": "Максимальный цикл впрыска",
+            "injector_map": "Карта впрыска",
+            "battery_voltage": "Напряжение сети",
+            "dead_time": "Мертвое время форсунки",
+            "cells_over_threshold": "Ячеек выше допустимого цикла",
+            "injector_part": "Форсунка",
+            "pump_part": "Топливный насос",
+            "fuel_pressure": "Давление топлива",
+            "flex_fuel": "Смеси бензин/этанол",
+            "duty_e0": "Цикл впрыска на E0",
+            "duty_e85": "Цикл впрыска на E85",
+            "duty_e100": "Цикл впрыска на E100",
+            "required_injector_flow": "Требуемая производительность форсунки",
+            "ethanol_share": "Содержание этанола",
+            "excess_air": "Коэффициент избытка воздуха",
+            "fuel_flow": "Расход топлива",
+            "ve_table": "Таблица наполнения",
+            "log_file": "Журнал",
+            "rows": "Записей",
+            "filled_cells": "Ячеек по журналу",
+            "ve_range": "Диапазон наполнения",
+            "boost": "Наддув",
+            "manifold_pressure": "Давление во впуске",
+            "pressure_ratio": "Степень повышения давления",
+            "charge_temperature": "Температура заряда",
+            "max_air_flow": "Максимальный расход воздуха",
+            "compressor": "Компрессор",
+            "surge_margin": "Запас по помпажу",
+            "choke_margin": "Запас по запиранию",
+            "engine_cycle": "Рабочий цикл",
+            "bore": "Диаметр цилиндра",
+            "stroke": "Ход поршня",
+            "rod": "Длина шатуна",
+            "burn_duration": "Продолжительность сгорания",
+            "mbt_table": "Опережение наибольшего IMEP (MBT)",
+            "engine_geometry": "Геометрия двигателя",
+            "clearance_volume": "Объем камеры сжатия",
+            "static_cr": "Статическая степень сжатия",
+            "dynamic_cr": "Динамическая степень сжатия",
+            "quench": "Вытеснитель",
+            "mean_piston_speed": "Средняя скорость поршня",
+            "rod_ratio": "Отношение длины шатуна к ходу",
+            "build_combinations": "Подбор поршней, прокладок и головок",
+            "target_cr": "Целевая степень сжатия",
+            "combinations": "Допустимых сочетаний",
+            "best_build": "Лучшее сочетание",
+            "intake_tuning": "Настройка впуска и выпуска",
+            "target_rpm": "Обороты настройки",
+            "harmonic_order": "Порядок гармоники",
+            "intake_runner_length": "Длина впускного канала",
+            "exhaust_primary_length": "Длина трубы выпуска",
+            "helmholtz_length": "Длина канала по Гельмгольцу",
+            "plenum_volume": "Объем ресивера",
+            "tuning_map": "Карты настройки впуска",
+            "length_range": "Диапазон длины",
+            "diameter_range": "Диапазон диаметра",
+            "rpm_range": "Диапазон оборотов",
+            "samples": "Число выборок",
+            "mean": "Среднее",
+            "std": "Стандартное отклонение"
         }
 
         report_html = "<h1>Отчет по расчету характеристик автомобиля</h1>"
@@ -3182,7 +12312,11 @@ class AdvancedVehicleCalculator(QMainWindow):
                 'aerodynamics': 'Аэродинамика',
                 'braking': 'Тормозная система',
                 'suspension': 'Подвеска',
-                'fuel_system': 'Топливная система'
+                'fuel_system': 'Топливная система',
+                'parameter_sweep': 'Исследование параметров',
+                'sensitivity': 'Локальная чувствительность',
+                'sobol_indices': 'Индексы Соболя',
+                'uncertainty': 'Неопределенность (Монте-Карло)'
             }
 
             param_translations = {
@@ -3226,6 +12360,17 @@ class AdvancedVehicleCalculator(QMainWindow):
             "kinetic_energy": "Кинетическая энергия (кДж)",
             "heat_energy": "Тепловая энергия (кДж)",
             "temperature_rise": "Рост температуры (°C)",
+            "cg_height": "Высота центра масс (м)",
+            "wheelbase": "Колесная база (м)",
+            "static_front": "Статическая нагрузка на переднюю ось (%)",
+            "tire_radius": "Радиус колеса (м)",
+            "optimal_balance": "Лучший баланс",
+            "brake_cycle": "Цикл торможений",
+            "cycles": "Число циклов",
+            "ambient_temperature": "Температура воздуха (°C)",
+            "peak_temperature": "Пиковая температура диска (°C)",
+            "final_temperature": "Температура в конце серии (°C)",
+            "steady_peak": "Установившийся пик температуры (°C)",
 
             # Двигатель
             "power_hp": "Мощность (л.с.)",
@@ -3310,7 +12455,134 @@ class AdvancedVehicleCalculator(QMainWindow):
             # Дополнительные параметры
             "kinetic_energy": "Кинетическая энергия (кДж)",
             "heat_energy": "Тепловая энергия (кДж)",
-            "disc_thickness": "Толщина тормозного диска (мм)"
+            "disc_thickness": "Толщина тормозного диска (мм)",
+            "braking_simulation": "Динамическое торможение",
+            "optimal_balance_table": "Лучший баланс без блокировки задней оси",
+            "front_lock_time": "Блокировка передней оси",
+            "rear_lock_time": "Блокировка задней оси",
+            "brake_cycle": "Цикл торможений",
+            "cycles_to_300": "Превышение 300°C",
+            "cycles_to_600": "Превышение 600°C",
+            "ride_simulation": "Динамика подвески",
+            "ride_model": "Модель подвески",
+            "road_profile": "Профиль дороги",
+            "best_comfort": "Лучший комфорт",
+            "body_accel_rms": "СКЗ ускорения кузова",
+            "best_grip": "Лучшее сцепление",
+            "tire_load_variation": "Вариация нагрузки на шину",
+            "frequency_response": "Частотная характеристика",
+            "variants": "Число вариантов",
+            "best_body_control": "Наименьший резонанс кузова",
+            "body_frequency": "Резонанс кузова",
+            "body_gain": "Усиление в резонансе кузова",
+            "wheel_frequency": "Резонанс колеса",
+            "wheel_gain": "Усиление в резонансе колеса",
+            "hardpoint_kinematics": "Кинематика по точкам крепления",
+            "geometry": "Схема подвески",
+            "camber_gain": "Изменение развала",
+            "roll_center_height": "Высота центра крена",
+            "roll_balance": "Крен и распределение нагрузки",
+            "best_setup": "Лучший вариант",
+            "roll_stiffness_front": "Жесткость в крене, перед",
+            "roll_stiffness_rear": "Жесткость в крене, зад",
+            "lltd": "Доля переноса нагрузки на переднюю ось",
+            "roll_gradient": "Градиент крена",
+            "catalog_match": "Подбор по каталогу",
+            "spring_part": "Пружина",
+            "damper_part": "Амортизатор",
+            "damper_curve": "Характеристика амортизатора",
+            "bump_characteristic": "Характер сжатия",
+            "rebound_characteristic": "Характер отбоя",
+            "bump_knee": "Колено сжатия",
+            "rebound_knee": "Колено отбоя",
+            "equivalent_velocity": "Скорость эквивалентного коэффициента",
+            "bump_coef": "Эквивалентный коэффициент сжатия",
+            "rebound_coef": "Эквивалентный коэффициент отбоя",
+            "corner_weights": "Развеска по углам",
+            "scales": "Показания весов",
+            "cross_weight": "Диагональная нагрузка",
+            "front_axle_share": "Доля передней оси",
+            "perch_adjustment": "Смещение опор пружин",
+            "gg_diagram": "Диаграмма g-g",
+            "lap_simulation": "Моделирование круга",
+            "track": "Трасса",
+            "lap_time": "Время круга",
+            "average_speed": "Средняя скорость",
+            "brake_energy": "Энергия торможения за круг",
+            "tire_model": "Модель шины",
+            "grip_limit": "Предел сцепления ведущих колес",
+            "traction_limited_force": "Тяговая сила с учетом сцепления",
+            "launch": "Оптимизация старта",
+            "best_rpm_60ft": "Обороты старта для 60 футов",
+            "time_60ft": "Время на 60 футов",
+            "best_rpm_100": "Обороты старта для 0-100 км/ч",
+            "time_0_100": "Время разгона 0-100 км/ч",
+            "drive_cycle": "Расход в ездовом цикле",
+            "cycle": "Цикл",
+            "distance": "Путь",
+            "fuel_mass": "Масса топлива",
+            "consumption": "Расход топлива",
+            "engine_map": "Карта удельного расхода",
+            "map_name": "Карта",
+            "best_efficiency": "Максимальный КПД",
+            "min_bsfc": "Минимальный удельный расход",
+            "max_duty_cycle": "Максимальный цикл впрыска",
+            "injector_map": "Карта впрыска",
+            "battery_voltage": "Напряжение сети",
+            "dead_time": "Мертвое время форсунки",
+            "cells_over_threshold": "Ячеек выше допустимого цикла",
+            "injector_part": "Форсунка",
+            "pump_part": "Топливный насос",
+            "fuel_pressure": "Давление топлива",
+            "flex_fuel": "Смеси бензин/этанол",
+            "duty_e0": "Цикл впрыска на E0",
+            "duty_e85": "Цикл впрыска на E85",
+            "duty_e100": "Цикл впрыска на E100",
+            "required_injector_flow": "Требуемая производительность форсунки",
+            "ethanol_share": "Содержание этанола",
+            "excess_air": "Коэффициент избытка воздуха",
+            "fuel_flow": "Расход топлива",
+            "ve_table": "Таблица наполнения",
+            "log_file": "Журнал",
+            "rows": "Записей",
+            "filled_cells": "Ячеек по журналу",
+            "ve_range": "Диапазон наполнения",
+            "boost": "Наддув",
+            "manifold_pressure": "Давление во впуске",
+            "pressure_ratio": "Степень повышения давления",
+            "charge_temperature": "Температура заряда",
+            "max_air_flow": "Максимальный расход воздуха",
+            "compressor": "Компрессор",
+            "surge_margin": "Запас по помпажу",
+            "choke_margin": "Запас по запиранию",
+            "engine_cycle": "Рабочий цикл",
+            "bore": "Диаметр цилиндра",
+            "stroke": "Ход поршня",
+            "rod": "Длина шатуна",
+            "burn_duration": "Продолжительность сгорания",
+            "mbt_table": "Опережение наибольшего IMEP (MBT)",
+            "engine_geometry": "Геометрия двигателя",
+            "clearance_volume": "Объем камеры сжатия",
+            "static_cr": "Статическая степень сжатия",
+            "dynamic_cr": "Динамическая степень сжатия",
+            "quench": "Вытеснитель",
+            "mean_piston_speed": "Средняя скорость поршня",
+            "rod_ratio": "Отношение длины шатуна к ходу",
+            "build_combinations": "Подбор поршней, прокладок и головок",
+            "target_cr": "Целевая степень сжатия",
+            "combinations": "Допустимых сочетаний",
+            "best_build": "Лучшее сочетание",
+            "intake_tuning": "Настройка впуска и выпуска",
+            "target_rpm": "Обороты настройки",
+            "harmonic_order": "Порядок гармоники",
+            "intake_runner_length": "Длина впускного канала",
+            "exhaust_primary_length": "Длина трубы выпуска",
+            "helmholtz_length": "Длина канала по Гельмгольцу",
+            "plenum_volume": "Объем ресивера",
+            "tuning_map": "Карты настройки впуска",
+            "length_range": "Диапазон длины",
+            "diameter_range": "Диапазон диаметра",
+            "rpm_range": "Диапазон оборотов"
         }
 
             # Содержание отчета
@@ -3387,6 +12659,22 @@ class AdvancedVehicleCalculator(QMainWindow):
             doc.setHtml(self.report_text.toHtml())
             doc.print_(printer)
 
+    def closeEvent(self, event):
+        """Останавливает фоновые расчеты и удаляет временные файлы при выходе"""
+        if self.sweep_worker and self.sweep_worker.isRunning():
+            self.sweep_worker.cancel()
+            self.sweep_worker.wait()
+        if self.uq_worker and self.uq_worker.isRunning():
+            self.uq_worker.cancel()
+            self.uq_worker.wait()
+        if self.ve_worker and self.ve_worker.isRunning():
+            self.ve_worker.cancel()
+            self.ve_worker.wait()
+        if self.sweep_store:
+            self.sweep_store.close()
+        self.db.close()
+        super().closeEvent(event)
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)